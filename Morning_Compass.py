@@ -2,12 +2,10 @@ import streamlit as st
 import os
 st.set_page_config(page_title="Markmentum | Morning Compass", layout="wide")
 from pathlib import Path
-import base64
 import textwrap
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from urllib.parse import quote_plus
 from html import escape
 import time
 import requests
@@ -17,6 +15,12 @@ except Exception:
     Document = None
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils import html_tables as ht
+from utils.export_catalog import withdraw_published
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
+
+withdraw_published()   # drop export copies older versions served from ./static without a login
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -153,15 +157,11 @@ LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 # -------------------------
 # Header (logo centered)
 # -------------------------
-def _image_to_base64(path: Path) -> str:
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_to_base64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -173,28 +173,13 @@ if LOGO_PATH.exists():
 #ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 #INFO_VALUE_KEY = "dd_show_information_charts_value"
 
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-
-    # current toggle states (default False if not set yet)
-    adv_on  = st.session_state.get(ADV_VALUE_KEY, False)
-    info_on = st.session_state.get(INFO_VALUE_KEY, False)
-
-    adv_flag  = "1" if adv_on  else "0"
-    info_flag = "1" if info_on else "0"
-
-    proof = make_proof()
-
-    return (
-        f'<a href="?page=Deep%20Dive'
-        f'&ticker={quote_plus(t)}'
-        f'&adv={adv_flag}'
-        f'&info={info_flag}'
-        f'&proof={proof}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
+def _mk_ticker_links(tickers) -> list[str]:
+    # current toggle states (default False if not set yet); one proof per render
+    return ht.ticker_links(
+        tickers,
+        adv_on=st.session_state.get(ADV_VALUE_KEY, False),
+        info_on=st.session_state.get(INFO_VALUE_KEY, False),
+        proof=make_proof(),
     )
 
 qp = st.query_params
@@ -286,54 +271,30 @@ def load_txt_text(txt_path: str) -> str:
         return f"⚠️ Could not open bottom line file: {e}"
 
 # ---------- UI renderers ----------
-def mm_badge_html(x):
-        try:
-            if pd.isna(x):
-                return ""
-            v = float(x)
-        except Exception:
-            return ""
+def mm_badge_cells(col) -> list[str]:
+    # stepped bins (deep red / red / gray pill / green / dark green);
+    # block so it fills the cell nicely; cell stays right-aligned from CSS
+    return ht.span_cells(ht.fmt_int(col), ht.badge_bg(col), align=None)
 
-        if v <= -100:
-            bg, alpha = "rgba(185,28,28,0.35)", 0.35   # deep red
-        elif v < -25:
-            bg, alpha = "rgba(239,68,68,0.28)", 0.28   # red
-        elif v <= 25:
-            bg, alpha = "rgba(229,231,235,1.00)", 1.00 # gray pill
-        elif v < 100:
-            bg, alpha = "rgba(16,185,129,0.28)", 0.28  # green
-        else:
-            bg, alpha = "rgba(6,95,70,0.35)", 0.35     # dark green
 
-        label = f"{int(round(v)):,}"
-        # block so it fills the cell nicely; cell stays right-aligned from CSS
-        return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">{label}</span>'
+def rr_tinted_cells(col, cap=3.0) -> list[str]:
+    # 0.12 → 0.40 opacity by |R/R| (capped), numeric label with 1 decimal
+    return ht.span_cells(ht.fmt_num(col, 1), ht.divergent_bg(col, cap), align=None)
 
 
-def rr_tinted_html(x, cap=3.0):
-        try:
-            if pd.isna(x): 
-                return ""
-            v = float(x)
-        except Exception:
-            return ""
-
-        # scale 0..1 (capped), keep near-zero very light
-        s = min(abs(v) / cap, 1.0)
-        alpha = 0.12 + 0.28 * s     # 0.12 → 0.40 opacity
-
-        if v > 0:
-            # green (tailwind-ish 10B981)
-            bg = f"rgba(16,185,129,{alpha:.3f})"
-        elif v < 0:
-            # red (EF4444)
-            bg = f"rgba(239,68,68,{alpha:.3f})"
-        else:
-            bg = "transparent"
-
-        # numeric label with 1 decimal, same as before
-        label = f"{v:,.1f}"
-        return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px;">{label}</span>'
+def compass_card(d: pd.DataFrame, cols: dict) -> dict:
+    """Column cells for the Morning Compass cards (shared by all five tables)."""
+    return {
+        "Name":           d["Ticker_name"],
+        "Ticker":         _mk_ticker_links(d["Ticker"]),
+        "Close":          ht.fmt_num(d["Close"], 2),
+        "% Change":       ht.fmt_pct(d[cols["ret"]], 2),
+        "Probable Low":   ht.fmt_num(d[cols["pr_low"]], 2),
+        "Probable High":  ht.fmt_num(d[cols["pr_high"]], 2),
+        "Risk / Reward":  rr_tinted_cells(d[cols["rr"]]),
+        "MM Score":       mm_badge_cells(d["model_score"]),
+        "Δ MM Score":     ht.fmt_int(d["model_score_delta"]),
+    }
 
 # =========================
 # Timeframe config
@@ -394,95 +355,7 @@ def load_csv_by_id(n: int, base_dir: Path) -> pd.DataFrame:
 # -------------------------
 # Morning Compass – styling
 # -------------------------
-st.markdown("""
-<style>
-/* Center the single card on the page */
-.card-wrap { display:flex; justify-content:center; }
-.card { 
-  border:1px solid #cfcfcf; border-radius:8px; background:#fff;
-  padding:12px 12px 8px 12px; width:100%;
-  max-width:1320px;  /* was 1120px -> more room so names show */
-}
-
-/* Table styling to match Daily Overview */
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td {
-  border:1px solid #d9d9d9; padding:6px 8px; font-size:13px;
-  overflow:hidden; text-overflow:ellipsis;
-}
-.tbl th { background:#f2f2f2; font-weight:700; color:#1a1a1a; text-align:left; }
-
-/* Alignment rules */
-.tbl th:nth-child(2), .tbl td:nth-child(2) { text-align:center; }    /* Ticker centered */
-
-/* HEADERS from Close..MM Score Change centered */
-.tbl th:nth-child(n+3) { text-align:center; }
-
-/* CELLS from Close..MM Score Change right-aligned */
-.tbl td:nth-child(n+3) { text-align:right; white-space:nowrap; }
-
-/* Name column = 40ch, allow wrapping so full name shows */
-.tbl col.col-name { min-width:40ch; width:40ch; max-width:40ch; }
-.tbl th:nth-child(1), .tbl td:nth-child(1) {
-  white-space:normal;               /* allow wrap */
-  overflow:visible; text-overflow:clip;
-}
-
-/* Keep ticker links bold without underline */
-.tbl a { text-decoration:none; font-weight:600; }
-            
-/* Correlation tables: center 15D/30D/90D cells */
-.tbl.corr th:nth-child(n+2),
-.tbl.corr td:nth-child(n+2) {
-  text-align: center !important;
-}
-
-/* keep correlation numbers on one line */
-.tbl.corr td:nth-child(n+2) { white-space: nowrap; }
-
-
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* bottom line inside the card, attached to table border */
-.bl {
-  border-top: 1px solid #e5e5e5;
-  margin-top: 8px;
-  padding-top: 10px;
-  font-size: 13px;
-  line-height: 1.45;
-  color: #1a1a1a;
-}
-.card .note {
-  font-size: 0.85em;
-  color: #6c757d;   /* muted gray */
-  line-height: 1.3;
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
+apply_theme("morning_compass", "scrollbars")
 
 # -------------------------
 # Load Morning Compass CSV
@@ -575,39 +448,6 @@ if df_main.empty or not all(c in df_main.columns for c in req):
     st.info(f"Morning Compass: `qry_graph_data_{cfg_tf['ids']['main']}.csv` is missing or columns are incomplete.")
 else:
     df_render = df_main.copy()
-    df_render["Ticker"] = df_render["Ticker"].apply(_mk_ticker_link)
-
-    # formatters (reuse existing helpers defined above)
-    def fmt_num(x, nd=2):
-        try:
-            if pd.isna(x): return ""
-            return f"{float(x):,.{nd}f}"
-        except Exception: return ""
-    def fmt_pct(x, nd=2):
-        try:
-            if pd.isna(x): return ""
-            return f"{float(x)*100:,.{nd}f}%"
-        except Exception: return ""
-    def fmt_int(x):
-        try:
-            if pd.isna(x): return ""
-            return f"{int(round(float(x))):,}"
-        except Exception: return ""
-
-    df_card = pd.DataFrame({
-        "Name":           df_render["Ticker_name"],
-        "Ticker":         df_render["Ticker"],
-        "Close":          df_render["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       df_render[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   df_render[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  df_render[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  df_render[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       df_render["model_score"].map(mm_badge_html),
-        "Δ MM Score":df_render["model_score_delta"].map(fmt_int),
-    })
-
-    table_html = df_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    table_html = table_html.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup = """
     <colgroup>
       <col class="col-name">
@@ -621,7 +461,7 @@ else:
       <col>
     </colgroup>
     """.strip()
-    table_html = table_html.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    table_html = ht.render_table(compass_card(df_render, cols), classes="tbl", colgroup=colgroup)
 
     # Bottom line docx switches with timeframe
     import os
@@ -721,28 +561,12 @@ if df74.empty or not all(c in df74.columns for c in req74):
     st.info(f"Top Five Leaders/Laggards by % Change: `qry_graph_data_{cfg_tf['ids']['leaders']}.csv` is missing or columns are incomplete.")
 else:
     d = df74.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_74_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "Δ MM Score":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_74 = df_74_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_74 = tbl_html_74.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup = """
     <colgroup>
       <col class="col-name"><col><col><col><col><col><col><col><col>
     </colgroup>
     """.strip()
-    tbl_html_74 = tbl_html_74.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_74 = ht.render_table(compass_card(d, cols), classes="tbl", colgroup=colgroup)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -775,28 +599,12 @@ if df75.empty or not all(c in df75.columns for c in req75):
     st.info(f"Top Five Leaders/Laggards by MM Score: `qry_graph_data_{cfg_tf['ids']['mm']}.csv` is missing or columns are incomplete.")
 else:
     d = df75.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_75_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "Δ MM Score":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_75 = df_75_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_75 = tbl_html_75.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup = """
     <colgroup>
       <col class="col-name"><col><col><col><col><col><col><col><col>
     </colgroup>
     """.strip()
-    tbl_html_75 = tbl_html_75.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_75 = ht.render_table(compass_card(d, cols), classes="tbl", colgroup=colgroup)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -829,28 +637,12 @@ if df77.empty or not all(c in df77.columns for c in req77):
     st.info(f"Top Five Leaders/Laggards by MM Score Change: `qry_graph_data_{cfg_tf['ids']['delta']}.csv` is missing or columns are incomplete.")
 else:
     d = df77.copy()
-    d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-    df_77_card = pd.DataFrame({
-        "Name":           d["Ticker_name"],
-        "Ticker":         d["Ticker"],
-        "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-        "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-        "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-        "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-        "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-        "MM Score":       d["model_score"].map(mm_badge_html),
-        "Δ MM Score":d["model_score_delta"].map(fmt_int),
-    })
-
-    tbl_html_77 = df_77_card.to_html(index=False, classes="tbl", escape=False, border=0)
-    tbl_html_77 = tbl_html_77.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup = """
     <colgroup>
       <col class="col-name"><col><col><col><col><col><col><col><col>
     </colgroup>
     """.strip()
-    tbl_html_77 = tbl_html_77.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    tbl_html_77 = ht.render_table(compass_card(d, cols), classes="tbl", colgroup=colgroup)
 
     note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
     note_html_safe = escape(note_text)
@@ -900,28 +692,12 @@ if show_cat:
             sel = st.selectbox("Category", present, index=0)
 
         d = df76[df76["Category"] == sel].copy()
-        d["Ticker"] = d["Ticker"].apply(_mk_ticker_link)
-
-        df_cat_card = pd.DataFrame({
-            "Name":           d["Ticker_name"],
-            "Ticker":         d["Ticker"],
-            "Close":          d["Close"].map(lambda v: fmt_num(v, 2)),
-            "% Change":       d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
-            "Probable Low":   d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
-            "Probable High":  d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
-            "Risk / Reward":  d[cols["rr"]].map(rr_tinted_html),
-            "MM Score":       d["model_score"].map(mm_badge_html),
-            "Δ MM Score":d["model_score_delta"].map(fmt_int),
-        })
-
-        tbl_html_76 = df_cat_card.to_html(index=False, classes="tbl", escape=False, border=0)
-        tbl_html_76 = tbl_html_76.replace('class="dataframe tbl"', 'class="tbl"')
         colgroup = """
         <colgroup>
           <col class="col-name"><col><col><col><col><col><col><col><col>
         </colgroup>
         """.strip()
-        tbl_html_76 = tbl_html_76.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+        tbl_html_76 = ht.render_table(compass_card(d, cols), classes="tbl", colgroup=colgroup)
 
         note_text = "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly."
         note_html_safe = escape(note_text)
@@ -947,19 +723,4 @@ if show_cat:
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
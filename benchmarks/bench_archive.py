@@ -0,0 +1,103 @@
+# benchmarks/bench_archive.py
+#
+# "Download ALL" on the Downloads page (pages/14).  First the archive
+# formats and levels utils/export_archive.py can be configured with: build
+# time and size over the current exports.  Then server memory as sessions
+# ask for the archive: the old page built a ZIP in memory on click and kept
+# it in st.session_state (one copy per session, simulated here by holding
+# each build), while the page now links one shared archive on disk (each
+# session is a headless AppTest run of the page, kept alive).
+#
+#   python benchmarks/bench_archive.py [--sessions 5]
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils import export_archive, export_catalog  # noqa: E402
+
+PAGE = "pages/14_Downloads.py"
+LEVELS = {"zip": [1, 6, 9], "tar.zst": [3, 10, 19]}
+
+
+def _session_zip(files) -> bytes:
+    """What the page did per click before: the whole ZIP built in memory."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path_str, outname in files:
+            with open(path_str, "rb") as f:
+                zf.writestr(outname, f.read())
+    return buf.getvalue()
+
+
+def formats(files):
+    raw = sum(os.path.getsize(p) for p, _ in files)
+    print(f"{len(files)} exports, {raw / 1e6:.1f} MB\n")
+    print(f"{'format':10s}{'level':>6s}{'build s':>9s}{'MB':>8s}{'ratio':>7s}")
+    for fmt, levels in LEVELS.items():
+        if fmt == "tar.zst" and not _has_zstd():
+            print(f"{fmt:10s}  (zstandard not installed)")
+            continue
+        for level in levels:
+            with tempfile.TemporaryFile() as fh:
+                t0 = time.perf_counter()
+                export_archive.write(fh, files, fmt, level)
+                dt = time.perf_counter() - t0
+                size = fh.tell()
+            print(f"{fmt:10s}{level:6d}{dt:9.2f}{size / 1e6:8.2f}{raw / size:7.1f}")
+
+
+def _has_zstd() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def sessions(files, n: int):
+    print(f"\n{'sessions':>8s}{'old heap MB':>13s}{'shared heap MB':>16s}")
+    while export_archive.archive(files) is None:
+        time.sleep(0.2)
+
+    tracemalloc.start()
+    held, base = [], tracemalloc.get_traced_memory()[0]
+    old = []
+    for _ in range(n):
+        held.append(_session_zip(files))
+        old.append((tracemalloc.get_traced_memory()[0] - base) / 1e6)
+    del held
+
+    apps, base = [], tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        at = AppTest.from_file(str(APP_DIR / PAGE), default_timeout=120)
+        at.session_state["authenticated"] = True
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        apps.append(at)
+        print(f"{i + 1:8d}{old[i]:13.1f}{(tracemalloc.get_traced_memory()[0] - base) / 1e6:16.1f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=5)
+    args = ap.parse_args()
+    files = export_catalog.available()
+    formats(files)
+    sessions(files, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
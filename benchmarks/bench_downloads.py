@@ -0,0 +1,74 @@
+# benchmarks/bench_downloads.py
+#
+# What a view of the Downloads page (pages/14) costs when nobody downloads
+# anything.  Each session is a fresh headless AppTest run (authenticated);
+# per view it reports the element bytes sent over the websocket, the bytes
+# parked in Streamlit's in-memory media store (what st.download_button
+# with data= keeps per rendered button), and Python heap growth.  For
+# comparison, "eager" is what reading every listed export into a
+# download_button would hold: the sum of their sizes.
+#
+#   python benchmarks/bench_downloads.py [--sessions 5]
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils import export_catalog  # noqa: E402
+
+PAGE = "pages/14_Downloads.py"
+
+
+def _element_bytes(node) -> int:
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None and hasattr(proto, "ByteSize") else 0
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        size += sum(_element_bytes(c) for c in children.values())
+    return size
+
+
+def _media_bytes() -> int:
+    return sum(
+        len(f.content)
+        for store in gc.get_objects() if isinstance(store, MemoryMediaFileStorage)
+        for f in store._files_by_id.values()
+    )
+
+
+def _eager_bytes() -> int:
+    return sum(Path(path).stat().st_size for path, _ in export_catalog.available())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=5)
+    args = ap.parse_args()
+
+    tracemalloc.start()
+    apps = []
+    print(f"{'session':>8s}{'elements B':>12s}{'media B':>12s}{'heap +KB':>10s}")
+    for i in range(args.sessions):
+        before = tracemalloc.get_traced_memory()[0]
+        at = AppTest.from_file(str(APP_DIR / PAGE), default_timeout=120)
+        at.session_state["authenticated"] = True
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        apps.append(at)           # keep sessions alive, as open browser tabs would
+        grown = (tracemalloc.get_traced_memory()[0] - before) / 1024
+        print(f"{i + 1:8d}{_element_bytes(at._tree):12,d}{_media_bytes():12,d}{grown:10,.0f}")
+
+    print(f"\neager download_buttons would push {_eager_bytes():,d} B per view")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_exports.py
+#
+# A member's nightly sync from the Downloads page (pages/14): re-downloading
+# every export as a full CSV vs the rows dated after the previous date, as
+# CSV, Parquet and Feather from utils/export_store.py.  Per variant it
+# reports the bytes transferred and the client-side parse time (pandas
+# reading the file from memory), summed over the exports, plus the time
+# to cut the delta files from the release store.
+#
+#   python benchmarks/bench_exports.py [--repeat 5] [--as-of 2026-03-19]
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils import export_catalog, export_store  # noqa: E402
+
+READERS = {
+    "csv":     pd.read_csv,
+    "parquet": pd.read_parquet,
+    "feather": pd.read_feather,
+}
+
+
+def _parse_ms(data: bytes, fmt: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        READERS[fmt](io.BytesIO(data))
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--as-of", help="ISO date (default: the previous date of the daily exports)")
+    args = ap.parse_args()
+
+    files = export_catalog.available()
+    t0 = time.perf_counter()
+    while (store := export_store.ready(files)) is None:
+        if err := export_store.failed(files):
+            sys.exit(f"release store build failed: {err}")
+        time.sleep(0.1)
+    print(f"release store: {store.name} ({time.perf_counter() - t0:.2f} s incl. build)")
+
+    dated = [(p, d) for p, _ in files if (d := export_store.dates(store, p)) is not None and len(d)]
+    as_of = args.as_of or max(d[-2] for _, d in dated if len(d) > 1)
+
+    totals = {"full csv": [0, 0.0]} | {f"delta {fmt}": [0, 0.0] for fmt in export_store.FORMATS}
+    cut = 0.0
+    for path, _ in dated:
+        data = Path(path).read_bytes()
+        totals["full csv"][0] += len(data)
+        totals["full csv"][1] += _parse_ms(data, "csv", args.repeat)
+        for fmt in export_store.FORMATS:
+            t0 = time.perf_counter()
+            part = export_store.delta(store, path, as_of, fmt)
+            cut += time.perf_counter() - t0
+            data = part.read_bytes()
+            totals[f"delta {fmt}"][0] += len(data)
+            totals[f"delta {fmt}"][1] += _parse_ms(data, fmt, args.repeat)
+
+    print(f"{len(dated)} dated exports, rows after {as_of}; delta files cut in {cut * 1000:.0f} ms\n")
+    full_bytes, full_ms = totals["full csv"]
+    print(f"{'variant':15s}{'bytes':>12s}{'x less':>8s}{'parse ms':>10s}{'x faster':>10s}")
+    for name, (size, ms) in totals.items():
+        print(f"{name:15s}{size:12,d}{full_bytes / size:8.0f}{ms:10.1f}{full_ms / ms:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
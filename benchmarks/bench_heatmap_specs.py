@@ -0,0 +1,107 @@
+# benchmarks/bench_heatmap_specs.py
+#
+# Heatmap pages (03-05) rerun cost and chart payloads.  Each page is run
+# headless with streamlit.testing's AppTest; every rerun picks the next
+# category, first with st.cache_data cleared before each rerun (every
+# Vega-Lite spec rebuilt) and then with the specs cached per (page,
+# selection, release).  For each chart of the last rerun it reports what is
+# sent to the browser: the spec JSON, the named Arrow datasets, and the same
+# rows as inline JSON records for comparison.  History playback scrubs
+# through dates and counts how often the dataset name stays the same (data
+# the browser already has).
+#
+#   python benchmarks/bench_heatmap_specs.py [--reruns 5] [--scrub 10]
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import streamlit as st
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+PAGES = [
+    "pages/03_Performance_Heatmap.py",
+    "pages/04_Sharpe_Rank_Heatmap.py",
+    "pages/05_Markmentum_Heatmap.py",
+]
+
+
+def _charts(at) -> list:
+    return [el.proto for el in at.get("vega_lite_chart")]
+
+
+def _payload(proto) -> tuple[int, int, int]:
+    """(spec JSON bytes, Arrow dataset bytes, same rows as JSON records bytes)."""
+    arrow = sum(len(d.data.data) for d in proto.datasets)
+    records = sum(
+        len(pa.ipc.open_stream(d.data.data).read_pandas().to_json(orient="records").encode())
+        for d in proto.datasets
+    )
+    return len(proto.spec.encode()), arrow, records
+
+
+def _rerun(at, cached: bool) -> float:
+    if not cached:
+        st.cache_data.clear()
+    t0 = time.perf_counter()
+    at.run()
+    dt = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return dt
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--reruns", type=int, default=5)
+    ap.add_argument("--scrub", type=int, default=10, help="history dates to step through")
+    args = ap.parse_args()
+
+    for page in PAGES:
+        at = AppTest.from_file(str(APP_DIR / page), default_timeout=120)
+        at.session_state["authenticated"] = True
+        at.run()
+        box = next(s for s in at.selectbox if s.label == "Category")
+        cats = box.options
+
+        times = {}
+        for cached in (False, True):
+            runs = []
+            for i in range(args.reruns):
+                next(s for s in at.selectbox if s.label == "Category").set_value(cats[i % len(cats)])
+                runs.append(_rerun(at, cached))
+            times[cached] = statistics.median(runs)
+
+        print(f"\n{Path(page).name}: rerun {times[False] * 1000:.0f} ms rebuilding specs, "
+              f"{times[True] * 1000:.0f} ms cached")
+        print(f"  {'chart':6s}{'spec B':>9s}{'arrow B':>10s}{'json rows B':>13s}")
+        for i, proto in enumerate(_charts(at)):
+            spec, arrow, records = _payload(proto)
+            print(f"  {i:<6d}{spec:9,d}{arrow:10,d}{records:13,d}")
+
+        slider = [s for s in at.select_slider if s.label == "Date"]
+        if not slider:
+            continue
+        dates = slider[0].options
+        names, same = None, 0
+        for when in dates[-args.scrub:]:
+            next(s for s in at.select_slider if s.label == "Date").set_value(when)
+            _rerun(at, True)
+            proto = _charts(at)[-1]
+            now = [d.name for d in proto.datasets]
+            same += now == names
+            names = now
+        print(f"  history: {args.scrub} dates scrubbed, dataset unchanged on {same} of {args.scrub - 1} steps "
+              f"({json.loads(proto.spec).get('transform')})")
+
+
+if __name__ == "__main__":
+    main()
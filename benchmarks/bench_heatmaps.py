@@ -0,0 +1,101 @@
+# benchmarks/bench_heatmaps.py
+#
+# Heatmap cell preparation for pages 03-05: the old per-rerun path (melt,
+# groupby-apply robust vmax, DataFrame.apply(axis=1) normalisation) vs
+# utils/heatmap_engine.py, cold (first build for a release) and warm (the
+# per-rerun cost once cached).  Checks both give the same norm values.
+#
+#   python benchmarks/bench_heatmaps.py [--repeat 20]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils import heatmap_engine, latest_frames  # noqa: E402
+
+
+def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
+    s = pd.to_numeric(series, errors="coerce").abs().dropna()
+    if s.empty:
+        return floor
+    vmax = float(np.quantile(s, q))
+    return max(floor, np.ceil(vmax / step) * step)
+
+
+def row_apply(metric: str, category: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """What the pages did on every rerun before the engine."""
+    spec = heatmap_engine.METRICS[metric]
+    df, _ = getattr(latest_frames, spec.frame)()
+    df = df.rename(columns=spec.columns)
+    tfs = list(spec.columns.values())
+    for c in tfs:
+        df[c] = df[c] * spec.scale
+
+    def cells(wide, ids):
+        long = wide.melt(id_vars=ids, value_vars=tfs, var_name="Timeframe", value_name=spec.value)
+        vmax = long.groupby("Timeframe")[spec.value].apply(_robust_vmax).to_dict()
+        for tf, cap in spec.vmax_cap.items():
+            vmax[tf] = min(cap, max(vmax[tf], 1.0))
+
+        def norm(tf, v):
+            if tf in spec.centered:
+                center, width = spec.centered[tf]
+                return float(np.clip((v - center) / width, -1, 1))
+            return float(np.clip(v / vmax[tf], -1, 1))
+        return long, norm
+
+    glong, norm = cells(df.groupby("Category", dropna=True, as_index=False)[tfs].mean(), ["Category"])
+    glong["norm"] = glong.apply(lambda r: norm(r["Timeframe"], r[spec.value]), axis=1)
+    tlong, norm = cells(df, list(spec.ids))
+    tsel = tlong.loc[tlong["Category"] == category].copy()
+    tsel["norm"] = tsel.apply(lambda r: norm(r["Timeframe"], r[spec.value]), axis=1)
+    return glong, tsel
+
+
+def engine(metric: str, category: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return heatmap_engine.category_cells(metric), heatmap_engine.ticker_cells(metric, category)
+
+
+def best(fn, repeat):
+    t = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        t = min(t, time.perf_counter() - t0)
+    return t * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--category", default="Information Technology")
+    args = ap.parse_args()
+
+    print(f"{'metric':14s}{'cells':>8s}{'row-apply ms':>14s}{'engine cold ms':>16s}{'engine warm ms':>16s}")
+    for metric in heatmap_engine.METRICS:
+        _, old = row_apply(metric, args.category)
+        heatmap_engine._grids.cache_clear()
+        t0 = time.perf_counter()
+        _, new = engine(metric, args.category)
+        cold = (time.perf_counter() - t0) * 1000
+        key = ["Ticker", "Timeframe"]
+        a = old.sort_values(key)["norm"].to_numpy()
+        b = new.sort_values(key)["norm"].to_numpy()
+        assert np.allclose(a, b, equal_nan=True), metric
+
+        t_old = best(lambda: row_apply(metric, args.category), args.repeat)
+        t_new = best(lambda: engine(metric, args.category), args.repeat)
+        spec = heatmap_engine.METRICS[metric]
+        cells = len(getattr(latest_frames, spec.frame)()[0]) * len(spec.columns)
+        print(f"{metric:14s}{cells:8,d}{t_old:14.1f}{cold:16.1f}{t_new:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# benchmarks/bench_html_tables.py
+#
+# Per-cell callbacks + DataFrame.to_html (what the pages used to do) vs the
+# column-wise renderer in utils/html_tables.py, on the full 653-row universe.
+#
+#   python benchmarks/bench_html_tables.py [--repeat 20]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils import html_tables as ht  # noqa: E402
+
+DATA_DIR = APP_DIR / "data"
+
+
+# -------------------------
+# Legacy per-cell path (verbatim from the pages)
+# -------------------------
+def _fmt_num(x, nd=0):
+    try:
+        if pd.isna(x): return ""
+        return f"{float(x):,.{nd}f}"
+    except Exception:
+        return ""
+
+def _fmt_pct(x, nd=2):
+    try:
+        if pd.isna(x): return ""
+        return f"{float(x):,.{nd}f}%"
+    except Exception:
+        return ""
+
+def _divergent_tint_html(val, vmax):
+    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
+        return ""
+    s = min(abs(float(val)) / float(vmax), 1.0)
+    alpha = 0.12 + 0.28 * s
+    if val > 0:
+        bg = f"rgba(16,185,129,{alpha:.3f})"
+    elif val < 0:
+        bg = f"rgba(239,68,68,{alpha:.3f})"
+    else:
+        bg = "transparent"
+    label = _fmt_pct(val, 2)
+    return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:2px; text-align:right;">{label}</span>'
+
+def _score_cell_html(score, cap=105.0):
+    if score is None or pd.isna(score):
+        return ""
+    s = float(score)
+    if s >= 25:
+        rel = min(abs(s) / cap, 1.0)
+        alpha = 0.12 + 0.28 * rel
+        bg = f"rgba(16,185,129,{alpha:.3f})"
+        color = "#0b513a"
+    elif s <= -25:
+        rel = min(abs(s) / cap, 1.0)
+        alpha = 0.12 + 0.28 * rel
+        bg = f"rgba(239,68,68,{alpha:.3f})"
+        color = "#641515"
+    else:
+        bg = "rgba(156,163,175,0.18)"
+        color = "#374151"
+    label = _fmt_num(s, 0)
+    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+
+def _Rank_cell_html(score, cap=100.0):
+    if score is None or pd.isna(score):
+        return ""
+    s = float(np.clip(score, 0, cap))
+    if s >= 70:
+        rel = (s - 70.0) / 30.0
+        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
+        bg = f"rgba(16,185,129,{alpha:.3f})"
+        color = "#0b513a"
+    elif s <= 30:
+        rel = (30.0 - s) / 30.0
+        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
+        bg = f"rgba(239,68,68,{alpha:.3f})"
+        color = "#641515"
+    else:
+        bg = "rgba(156,163,175,0.18)"
+        color = "#374151"
+    label = _fmt_num(s, 0)
+    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+
+def _delta_cell_html(val, vmax):
+    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
+        return ""
+    s = min(abs(float(val)) / float(vmax), 1.0)
+    alpha = 0.12 + 0.28 * s
+    if val > 0:
+        bg = f"rgba(16,185,129,{alpha:.3f})"
+    elif val < 0:
+        bg = f"rgba(239,68,68,{alpha:.3f})"
+    else:
+        bg = "transparent"
+    label = _fmt_num(val, 0)
+    return f'<span style="display:block; background:{bg}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+
+def tint_cell(val, cap=0.03, neutral=0.0005):
+    if val is None or pd.isna(val):
+        return ""
+    v = float(val)
+    if -neutral <= v <= neutral:
+        bg = "transparent"
+    else:
+        strength = min(abs(v) / cap, 1.0)
+        alpha = 0.15 + 0.35 * strength
+        bg = f"rgba(16,185,129,{alpha:.2f})" if v > 0 else f"rgba(239,68,68,{alpha:.2f})"
+    return (
+        f'<span style="display:block; background:{bg}; '
+        f'padding:0 6px; border-radius:3px; text-align:right;">{v*100:,.1f}%</span>'
+    )
+
+
+def _vmax(col):
+    return float(np.nanmax(np.abs(col.to_numpy(dtype=float)))) or 0.0
+
+
+def legacy_tables(sb: pd.DataFrame) -> list[str]:
+    pct_cols = ["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]
+    d_cols = ["MM_Score_daily_change", "MM_Score_wtd_change", "MM_Score_mtd_change", "MM_Score_qtd_change"]
+    trend_cols = ["st_trend", "mt_trend", "lt_trend", "st_trend_change", "mt_trend_change", "lt_trend_change"]
+
+    perf = pd.DataFrame({"Name": sb["Ticker_name"], "Ticker": sb["Ticker"]})
+    for c in pct_cols:
+        vm = _vmax(sb[c] * 100)
+        perf[c] = [_divergent_tint_html(v, vm) for v in sb[c] * 100]
+
+    mm = pd.DataFrame({"Name": sb["Ticker_name"], "Ticker": sb["Ticker"],
+                       "Score": [_score_cell_html(v) for v in sb["MM_Score"]],
+                       "Rank": [_Rank_cell_html(v) for v in sb["Sharpe_Rank"]]})
+    for c in d_cols:
+        vm = _vmax(sb[c])
+        mm[c] = [_delta_cell_html(v, vm) for v in sb[c]]
+
+    tr = pd.DataFrame({"Name": sb["Ticker_name"], "Ticker": sb["Ticker"]})
+    for c in trend_cols:
+        tr[c] = [tint_cell(v) for v in sb[c]]
+
+    out = []
+    for df in (perf, mm, tr):
+        html = df.to_html(index=False, classes="tbl", escape=False, border=0)
+        out.append(html.replace('class="dataframe tbl"', 'class="tbl"'))
+    return out
+
+
+def engine_tables(sb: pd.DataFrame) -> list[str]:
+    pct_cols = ["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]
+    d_cols = ["MM_Score_daily_change", "MM_Score_wtd_change", "MM_Score_mtd_change", "MM_Score_qtd_change"]
+    trend_cols = ["st_trend", "mt_trend", "lt_trend", "st_trend_change", "mt_trend_change", "lt_trend_change"]
+
+    perf = {"Name": sb["Ticker_name"], "Ticker": sb["Ticker"]}
+    for c in pct_cols:
+        v = sb[c] * 100
+        perf[c] = ht.span_cells(ht.fmt_num(v, 2, suffix="%"), ht.divergent_bg(v, _vmax(v)))
+
+    bg, color = ht.score_bg(sb["MM_Score"])
+    rbg, rcolor, rs = ht.rank_bg(sb["Sharpe_Rank"])
+    mm = {"Name": sb["Ticker_name"], "Ticker": sb["Ticker"],
+          "Score": ht.span_cells(ht.fmt_num(sb["MM_Score"], 0), bg, color, pad="0 6px"),
+          "Rank": ht.span_cells(ht.fmt_num(rs, 0), rbg, rcolor, pad="0 6px")}
+    for c in d_cols:
+        mm[c] = ht.span_cells(ht.fmt_num(sb[c], 0), ht.divergent_bg(sb[c], _vmax(sb[c])), pad="0 6px")
+
+    tr = {"Name": sb["Ticker_name"], "Ticker": sb["Ticker"]}
+    for c in trend_cols:
+        tr[c] = ht.span_cells(ht.fmt_pct(sb[c], 1),
+                              ht.divergent_bg(sb[c], 0.03, lo=0.15, span=0.35, nd=2, neutral=0.0005),
+                              pad="0 6px", radius="3px")
+
+    return [ht.render_table(t) for t in (perf, mm, tr)]
+
+
+def _cells(html: str) -> list[str]:
+    # compare cell content only (to_html trims cells and turns runs of
+    # spaces into &nbsp;, which renders the same once the browser collapses them)
+    return [c.split("</td>")[0].replace("&nbsp;", " ").strip() for c in html.split("<td>")[1:]]
+
+
+def _time(fn, sb, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(sb)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    sb = pd.read_csv(DATA_DIR / "signal_box.csv")
+
+    for old, new in zip(legacy_tables(sb), engine_tables(sb)):
+        assert _cells(old) == _cells(new), "renderer output differs from legacy cells"
+
+    t_old = _time(legacy_tables, sb, args.repeat)
+    t_new = _time(engine_tables, sb, args.repeat)
+    print(f"rows={len(sb)} tables=3 (perf/score+rank+delta/trend), best of {args.repeat}")
+    print(f"  legacy per-cell + to_html : {t_old * 1000:8.2f} ms")
+    print(f"  utils.html_tables         : {t_new * 1000:8.2f} ms")
+    print(f"  ratio                     : {t_new / t_old:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_pack_assembly.py
+#
+# Time and peak memory of assembling a full Research Pack (cover + every
+# module, default options) from module PDFs: the old pypdf re-parse merge
+# vs the byte-level page-stream merge in utils/pdf_merge.py.  Module PDFs
+# are built once up front (serially, bypassing the disk cache); the build
+# itself is reported for scale.  Peak memory is tracemalloc's peak for the
+# merge alone, output held in memory in both cases.
+#
+#   python benchmarks/bench_pack_assembly.py [--repeat 20]
+
+import argparse
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from pypdf import PdfReader, PdfWriter  # noqa: E402
+
+from utils import research_pack as rp  # noqa: E402
+from utils.pdf_merge import write_merged_pdf  # noqa: E402
+
+
+def merge_pypdf(blobs: list[bytes]) -> bytes:
+    # the pre-change merge_pdf_bytes_in_order
+    writer = PdfWriter()
+    for blob in blobs:
+        for page in PdfReader(io.BytesIO(blob)).pages:
+            writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def merge_stream(blobs: list[bytes]) -> bytes:
+    out = io.BytesIO()
+    write_merged_pdf(blobs, out)
+    return out.getvalue()
+
+
+def measure(fn, blobs, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(blobs)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(blobs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, statistics.median(times), peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    parts = rp.pack_parts([(m.key, m.default_options()) for m in rp.REGISTERED_MODULES])
+    t0 = time.perf_counter()
+    blobs = [blob for key, opts in parts for blob in rp.build_part(key, opts)[0]]
+    build_s = time.perf_counter() - t0
+    print(f"module builds (serial, uncached): {build_s * 1000:8.1f} ms  "
+          f"{len(blobs)} parts, {sum(map(len, blobs)):,d} B")
+
+    pages = None
+    print(f"{'merge':10s} {'median':>10s} {'peak mem':>12s} {'output':>10s} {'pages':>6s}")
+    for name, fn in (("pypdf", merge_pypdf), ("stream", merge_stream)):
+        out, med, peak = measure(fn, blobs, args.repeat)
+        n = len(PdfReader(io.BytesIO(out)).pages)
+        pages = pages if pages is not None else n
+        assert n == pages, f"{name}: {n} pages, expected {pages}"
+        print(f"{name:10s} {med * 1000:8.2f}ms {peak:>10,d} B {len(out):>8,d} B {n:>6d}")
+
+
+if __name__ == "__main__":
+    main()
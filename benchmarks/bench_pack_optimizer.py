@@ -0,0 +1,78 @@
+# benchmarks/bench_pack_optimizer.py
+#
+# Research Pack bytes and build time with the pack optimizer off and on
+# (MM_PACK_OPTIMIZE=0 / 1).  The mode is read when utils.research_pack is
+# imported, so each mode runs in its own interpreter, with a throwaway pack
+# cache so every module is really built.  The pack is every module with
+# default options, optionally plus Deep Dive tear sheets for the first N
+# tickers of the stat box universe.
+#
+#   python benchmarks/bench_pack_optimizer.py [--tickers 10] [--detail]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+_CHILD = r"""
+import io, json, sys, time
+sys.path.insert(0, sys.argv[1])
+from utils import research_pack as rp, standard_packs as sp, tear_sheet as ts
+
+n, detail = int(sys.argv[2]), sys.argv[3] == "1"
+parts = sp.standard_parts("all_modules")
+if n:
+    tickers = list(ts.ticker_directory()["Ticker"][:n])
+    parts += rp.pack_parts([("deep_dive_tear_sheets", {"tickers": tickers, "window": "6M", "detail": detail})])[1:]
+
+t0 = time.perf_counter()
+results = rp.build_parts(parts, parallel=False)
+t1 = time.perf_counter()
+out = io.BytesIO()
+rp.write_pdfs_in_order([b for blobs, _ in results for b in blobs], out)
+t2 = time.perf_counter()
+print(json.dumps({"modules": sum(len(b) for blobs, _ in results for b in blobs),
+                  "pack": len(out.getvalue()), "build_s": t1 - t0, "merge_s": t2 - t1}))
+"""
+
+
+def run(mode: str, tickers: int, detail: bool) -> dict:
+    with tempfile.TemporaryDirectory() as cache:
+        env = {**os.environ, "MM_PACK_OPTIMIZE": mode, "MM_PACK_CACHE_DIR": cache, "MM_PACK_WORKERS": "1"}
+        res = subprocess.run(
+            [sys.executable, "-c", _CHILD, str(APP_DIR), str(tickers), "1" if detail else "0"],
+            env=env, capture_output=True, text=True, check=True,
+        )
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickers", type=int, default=0, help="add tear sheets for the first N tickers")
+    ap.add_argument("--detail", action="store_true", help="tear sheets with the detail page")
+    args = ap.parse_args()
+
+    off = run("0", args.tickers, args.detail)
+    on = run("1", args.tickers, args.detail)
+
+    print(f"all modules (default options) + {args.tickers} tear sheet(s), serial, cold cache")
+    print(f"{'':22s}{'optimizer off':>16s}{'optimizer on':>16s}{'change':>10s}")
+    for label, key, fmt in [("module PDFs (bytes)", "modules", "{:,.0f}"),
+                            ("merged pack (bytes)", "pack", "{:,.0f}"),
+                            ("module build (s)", "build_s", "{:.2f}"),
+                            ("merge (ms)", "merge_s", None)]:
+        a, b = off[key], on[key]
+        if fmt is None:
+            a_s, b_s = f"{a * 1000:.1f}", f"{b * 1000:.1f}"
+        else:
+            a_s, b_s = fmt.format(a), fmt.format(b)
+        print(f"{label:22s}{a_s:>16s}{b_s:>16s}{(b / a - 1) if a else 0:>+10.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_rerun_bytes.py
+#
+# Bytes each page pushes to the browser on its first run and on a plain
+# rerun (what every widget interaction costs).  Pages are executed headless
+# with streamlit.testing's AppTest as an authenticated session; the size is
+# the serialized element protos of the run, i.e. the delta payload the
+# websocket carries (minus a few bytes of framing per message).
+#
+#   python benchmarks/bench_rerun_bytes.py [pages/07_Vantage_Point.py ...]
+
+import argparse
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+DEFAULT_PAGES = [
+    "Morning_Compass.py",
+    "pages/02_Market_Overview.py",
+    "pages/03_Performance_Heatmap.py",
+    "pages/04_Sharpe_Rank_Heatmap.py",
+    "pages/05_Markmentum_Heatmap.py",
+    "pages/06_Directional_Trends.py",
+    "pages/07_Vantage_Point.py",
+    "pages/09_Signals.py",
+    "pages/10_Universe.py",
+    "pages/11_About.py",
+    "pages/13_Contact.py",
+]
+
+
+def _walk(node, acc):
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        size = proto.ByteSize()
+        acc["total"] += size
+        body = getattr(proto, "body", "") or getattr(proto, "srcdoc", "")
+        if isinstance(body, str) and "<style" in body:
+            acc["css"] += size
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        for child in children.values():
+            _walk(child, acc)
+    return acc
+
+
+def measure(page: str, timeout: float = 120):
+    at = AppTest.from_file(str(APP_DIR / page), default_timeout=timeout)
+    at.session_state["authenticated"] = True
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    first = _walk(at._tree, {"total": 0, "css": 0})
+    at.run()
+    rerun = _walk(at._tree, {"total": 0, "css": 0})
+    return first, rerun
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pages", nargs="*", default=DEFAULT_PAGES)
+    args = ap.parse_args()
+
+    print(f"{'page':36s} {'first run':>11s} {'rerun':>11s} {'rerun css':>11s}")
+    tot_first = tot_rerun = 0
+    for page in args.pages:
+        first, rerun = measure(page)
+        tot_first += first["total"]
+        tot_rerun += rerun["total"]
+        print(f"{page:36s} {first['total']:>11,d} {rerun['total']:>11,d} {rerun['css']:>11,d}")
+    print(f"{'total':36s} {tot_first:>11,d} {tot_rerun:>11,d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# benchmarks/bench_research_pack.py
+#
+# Build every Research Pack module, and then a full pack, against data/
+# outside Streamlit, recording per target: wall time, CPU time, peak RSS and
+# output size (bytes, pages).  Each target runs in its own interpreter with
+# a throwaway pack cache, so peak RSS is that target's alone and every
+# build is cold; --repeat adds warm builds in the same process (CSV reads
+# and chart images cached; for the full pack the module PDFs too) and
+# reports the best.
+#
+# Results are written as JSON (with git commit, python and CPU count) so
+# runs can be kept and compared; --compare prints the change against an
+# earlier file.  --profile writes a cProfile dump per target next to the
+# JSON and stores its hottest functions in the results.
+#
+#   python benchmarks/bench_research_pack.py [--tickers 10] [--repeat 3]
+#       [--profile] [--top 15] [--out results.json] [--compare old.json]
+#       [--only markmentum_heatmap ...]
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = APP_DIR / "benchmarks" / "results"
+PACK = "pack"
+
+
+# -------------------------
+# Child: build one target and print its measurements
+# -------------------------
+def _peak_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024    # Linux reports KiB
+
+
+def _pages(blobs: list[bytes]) -> int:
+    import io
+    from pypdf import PdfReader
+    return sum(len(PdfReader(io.BytesIO(b)).pages) for b in blobs)
+
+
+def _child(target: str, tickers: int, repeat: int, profile: str | None, top: int) -> dict:
+    sys.path.insert(0, str(APP_DIR))
+    import io
+
+    from utils import research_pack as rp, tear_sheet as ts
+
+    def _options(key: str) -> list[tuple[str, dict]]:
+        module = rp.MODULE_BY_KEY[key]
+        options = module.default_options()
+        if key == "deep_dive_tear_sheets":
+            options = {**options, "tickers": list(ts.ticker_directory()["Ticker"][:tickers])}
+        return [(key, part) for part in module.parts(options)]
+
+    if target == PACK:
+        parts = rp.pack_parts([p for m in rp.REGISTERED_MODULES for p in _options(m.key)])
+
+        def build() -> list[bytes]:
+            out = io.BytesIO()
+            rp.build_pack(parts, out, parallel=False)
+            return [out.getvalue()]
+    else:
+        parts = _options(target)
+
+        def build() -> list[bytes]:
+            return [b for key, options in parts for b in rp.build_part(key, options)[0]]
+
+    rss_before = _peak_rss_bytes()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    runs = []
+    blobs: list[bytes] = []
+    for i in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler and i == 0:
+            profiler.enable()
+        blobs = build()
+        if profiler and i == 0:
+            profiler.disable()
+        runs.append((time.perf_counter() - wall, time.process_time() - cpu))
+
+    result = {
+        "target": target,
+        "parts": len(parts),
+        "wall_s": runs[0][0],
+        "cpu_s": runs[0][1],
+        "warm_wall_s": min(r[0] for r in runs[1:]) if repeat > 1 else None,
+        "warm_cpu_s": min(r[1] for r in runs[1:]) if repeat > 1 else None,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "peak_rss_build_bytes": max(0, _peak_rss_bytes() - rss_before),
+        "bytes": sum(len(b) for b in blobs),
+        "pages": _pages(blobs),
+    }
+
+    if profiler:
+        import pstats
+        profiler.dump_stats(profile)
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)    # cumulative
+        result["profile"] = profile
+        result["hot"] = [
+            {"function": f"{Path(fn).name}:{line}({name})", "ncalls": nc, "tottime_s": tt, "cumtime_s": ct}
+            for (fn, line, name), (_cc, nc, tt, ct, _callers) in rows
+            if not fn.startswith("<") and "bench_research_pack" not in fn
+        ][:top]
+    return result
+
+
+# -------------------------
+# Parent: run each target in a fresh interpreter, save / compare
+# -------------------------
+def _run_target(target: str, args, profile: str | None) -> dict:
+    with tempfile.TemporaryDirectory() as cache:
+        env = {**os.environ, "MM_PACK_CACHE_DIR": cache, "MM_PACK_WORKERS": "1"}
+        cmd = [sys.executable, __file__, "--child", target, "--tickers", str(args.tickers),
+               "--repeat", str(args.repeat), "--top", str(args.top)]
+        if profile:
+            cmd += ["--profile-path", profile]
+        res = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if res.returncode != 0:
+        return {"target": target, "error": res.stderr.strip().splitlines()[-1:] or ["failed"]}
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _mb(n) -> str:
+    return f"{n / 1e6:8.1f}" if n is not None else f"{'-':>8s}"
+
+
+def _print_table(results: list[dict], previous: dict[str, dict]) -> None:
+    print(f"{'target':24s}{'wall s':>8s}{'cpu s':>8s}{'warm s':>8s}{'rss MB':>8s}{'+build':>8s}"
+          f"{'bytes':>12s}{'pages':>7s}" + (f"{'vs prev':>10s}" if previous else ""))
+    for r in results:
+        if "error" in r:
+            print(f"{r['target']:24s}  ERROR {r['error'][0]}")
+            continue
+        warm = f"{r['warm_wall_s']:8.2f}" if r["warm_wall_s"] is not None else f"{'-':>8s}"
+        line = (f"{r['target']:24s}{r['wall_s']:8.2f}{r['cpu_s']:8.2f}{warm}"
+                f"{_mb(r['peak_rss_bytes'])}{_mb(r['peak_rss_build_bytes'])}"
+                f"{r['bytes']:12,d}{r['pages']:7d}")
+        prev = previous.get(r["target"])
+        if prev and prev.get("wall_s"):
+            line += f"{r['wall_s'] / prev['wall_s'] - 1:>+10.1%}"
+        print(line)
+    for r in results:
+        for h in r.get("hot", []):
+            if h is r["hot"][0]:
+                print(f"\n{r['target']} – hottest (cumulative), profile: {r['profile']}")
+            print(f"  {h['cumtime_s']:8.3f}s cum {h['tottime_s']:8.3f}s own {h['ncalls']:>9,d}  {h['function']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark Research Pack modules and a full pack.")
+    ap.add_argument("--tickers", type=int, default=10, help="watchlist size for the tear sheet module")
+    ap.add_argument("--repeat", type=int, default=1, help="builds per target (first is cold)")
+    ap.add_argument("--profile", action="store_true", help="cProfile each target (dumps next to --out)")
+    ap.add_argument("--top", type=int, default=15, help="hottest functions kept per profiled target")
+    ap.add_argument("--only", nargs="*", help="module keys (and/or 'pack') to run")
+    ap.add_argument("--out", type=Path, help="results JSON (default benchmarks/results/research_pack-<time>.json)")
+    ap.add_argument("--compare", type=Path, help="earlier results JSON to compare wall time against")
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--profile-path", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.tickers, max(1, args.repeat), args.profile_path, args.top)))
+        return
+
+    sys.path.insert(0, str(APP_DIR))
+    from utils.research_pack import REGISTERED_MODULES
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out = args.out or RESULTS_DIR / f"research_pack-{stamp}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    targets = args.only or [m.key for m in REGISTERED_MODULES] + [PACK]
+    results = []
+    for target in targets:
+        profile = str(out.with_name(f"{out.stem}.{target}.prof")) if args.profile else None
+        results.append(_run_target(target, args, profile))
+        r = results[-1]
+        print(f"  {target}: " + (f"{r['wall_s']:.2f} s" if "wall_s" in r else "failed"), file=sys.stderr)
+
+    doc = {
+        "created": stamp,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "optimize": os.environ.get("MM_PACK_OPTIMIZE", "1") != "0",
+        "tickers": args.tickers,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    previous = {}
+    if args.compare:
+        previous = {r["target"]: r for r in json.loads(args.compare.read_text(encoding="utf-8"))["results"]}
+    _print_table(results, previous)
+    print(f"\nresults: {out}")
+
+
+if __name__ == "__main__":
+    main()
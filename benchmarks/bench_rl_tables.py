@@ -0,0 +1,180 @@
+# benchmarks/bench_rl_tables.py
+#
+# Per-cell iterrows / df.iloc shading (what the Research Pack tables used to
+# do) vs the column-wise version in utils/rl_tables.py, on a synthetic
+# Sharpe Rank table.  Times Table construction + setStyle, and the same plus
+# a full doc.build() (split across pages, draw) into memory.
+#
+#   python benchmarks/bench_rl_tables.py [--rows 2000] [--repeat 5]
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils import research_pack as rp  # noqa: E402
+
+COLS = ["Name", "Ticker", "Rank", "Daily", "WTD", "MTD", "QTD"]
+
+
+# -------------------------
+# Legacy per-cell path (verbatim from research_pack before rl_tables)
+# -------------------------
+def _blend_with_white(rgb_255, alpha):
+    a = float(max(0.0, min(alpha, 1.0)))
+    r, g, b = [c / 255.0 for c in rgb_255]
+    rr = 1.0 * (1.0 - a) + r * a
+    gg = 1.0 * (1.0 - a) + g * a
+    bb = 1.0 * (1.0 - a) + b * a
+    return colors.Color(rr, gg, bb)
+
+def _sr_rank_bg(score, cap=100.0):
+    if score is None or pd.isna(score):
+        return None
+    s = float(np.clip(float(score), 0.0, float(cap)))
+    if s >= 70.0:
+        rel = (s - 70.0) / 30.0
+        alpha = 0.05 + 0.14 * max(0.0, min(rel, 1.0))
+        return _blend_with_white((16, 185, 129), alpha)
+    elif s <= 30.0:
+        rel = (30.0 - s) / 30.0
+        alpha = 0.05 + 0.14 * max(0.0, min(rel, 1.0))
+        return _blend_with_white((239, 68, 68), alpha)
+    else:
+        return _blend_with_white((156, 163, 175), 0.08)
+
+def _sr_delta_bg(val, vmax):
+    if val is None or pd.isna(val) or vmax is None or float(vmax) <= 0:
+        return None
+    v = float(val)
+    s = min(abs(v) / float(vmax), 1.0)
+    alpha = 0.05 + 0.14 * s
+    if v > 0:
+        return _blend_with_white((16, 185, 129), alpha)
+    elif v < 0:
+        return _blend_with_white((239, 68, 68), alpha)
+    else:
+        return None
+
+def _sr_fmt_int(x) -> str:
+    try:
+        if x is None or pd.isna(x):
+            return ""
+        v = int(round(float(x)))
+        return "0" if v == 0 else str(v)
+    except Exception:
+        return ""
+
+def legacy_table(df: pd.DataFrame, vmax_map: dict) -> Table:
+    cols = df.columns.tolist()
+    data = [[("Δ " + c) if c in ("Daily", "WTD", "MTD", "QTD") else c for c in cols]]
+    for _, r in df.iterrows():
+        row = []
+        for c in cols:
+            if c in ("Rank", "Daily", "WTD", "MTD", "QTD"):
+                row.append(_sr_fmt_int(r.get(c)))
+            else:
+                row.append("" if pd.isna(r.get(c)) else str(r.get(c)))
+        data.append(row)
+    t = Table(data, hAlign="CENTER")
+    ts = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),
+        ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+    j = cols.index("Rank")
+    for i in range(1, len(data)):
+        rv = pd.to_numeric(df.iloc[i-1].get("Rank"), errors="coerce")
+        ts.add("BACKGROUND", (j, i), (j, i), _sr_rank_bg(rv))
+    for c in ("Daily", "WTD", "MTD", "QTD"):
+        j = cols.index(c)
+        col_vmax = vmax_map.get(c, 1.0) or 1.0
+        for i in range(1, len(data)):
+            v = pd.to_numeric(df.iloc[i-1].get(c), errors="coerce")
+            ts.add("BACKGROUND", (j, i), (j, i), _sr_delta_bg(v, col_vmax))
+    t.setStyle(ts)
+    return t
+
+
+def engine_table(df: pd.DataFrame, vmax_map: dict) -> Table:
+    return rp._sr_make_colored_table(df, vmax_map, include_ticker=True)
+
+
+# -------------------------
+# Harness
+# -------------------------
+def synthetic(n: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Name":   [f"Instrument {i:04d}" for i in range(n)],
+        "Ticker": [f"T{i:04d}" for i in range(n)],
+        "Rank":   rng.integers(1, 101, n).astype(float),
+        "Daily":  rng.normal(0, 4, n).round(),
+        "WTD":    rng.normal(0, 8, n).round(),
+        "MTD":    rng.normal(0, 15, n).round(),
+        "QTD":    rng.normal(0, 25, n).round(),
+    })
+    for c in ("Rank", "Daily", "WTD", "MTD", "QTD"):      # a few gaps, as in the real data
+        df.loc[rng.random(n) < 0.02, c] = np.nan
+    return df
+
+
+def _build_doc(table: Table) -> int:
+    buf = io.BytesIO()
+    SimpleDocTemplate(buf, pagesize=landscape(letter)).build([table])
+    return len(buf.getvalue())
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    df = synthetic(args.rows)
+    vmax = {c: rp._sr_vmax(df[c]) for c in ("Daily", "WTD", "MTD", "QTD")}
+
+    n_old = sum(1 for cmd in legacy_table(df, vmax)._bkgrndcmds if cmd[0] == "BACKGROUND")
+    n_new = sum(1 for cmd in engine_table(df, vmax)._bkgrndcmds if cmd[0] == "BACKGROUND")
+
+    t_old = _time(lambda: legacy_table(df, vmax), args.repeat)
+    t_new = _time(lambda: engine_table(df, vmax), args.repeat)
+    d_old = _time(lambda: _build_doc(legacy_table(df, vmax)), args.repeat)
+    d_new = _time(lambda: _build_doc(engine_table(df, vmax)), args.repeat)
+
+    print(f"rows={args.rows} cols={len(COLS)}, best of {args.repeat}")
+    print(f"  BACKGROUND commands       : legacy {n_old}, rl_tables {n_new}")
+    print(f"  table + style  legacy     : {t_old * 1000:8.1f} ms")
+    print(f"  table + style  rl_tables  : {t_new * 1000:8.1f} ms   ({t_old / t_new:.1f}x)")
+    print(f"  + doc.build    legacy     : {d_old * 1000:8.1f} ms")
+    print(f"  + doc.build    rl_tables  : {d_new * 1000:8.1f} ms   ({d_old / d_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
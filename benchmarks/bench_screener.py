@@ -0,0 +1,94 @@
+# benchmarks/bench_screener.py
+#
+# Signal Screener queries (utils/screener.py: sorted indexes + packed
+# bitmaps) vs the same filter / sort done with pandas boolean masks and
+# sort_values, on signal_box.csv tiled up to larger universes.  Also reports
+# the one-off index build per release.
+#
+#   python benchmarks/bench_screener.py [--sizes 653 10000 100000] [--repeat 50]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils.screener import SIGNAL_BOX, OneOf, Range, SignalScreener  # noqa: E402
+
+QUERIES = {
+    "bullish tape, rank>=50, MM wtd up": (
+        [OneOf("Tape_Bias", ("Buy", "Leaning Bullish")), Range("Sharpe_Rank", 50, None),
+         Range("MM_Score_wtd_change", 0, None)],
+        "MM_Score", True),
+    "2 sectors, crowded short, %QTD < 0": (
+        [OneOf("Category", ("Information Technology", "Financials")),
+         OneOf("Volatility_Spread_Quadrant", ("Crowded Short",)), Range("quarter_pct_change", None, 0.0)],
+        "quarter_pct_change", False),
+    "5 ranges": (
+        [Range("Sharpe_Rank", 20, 80), Range("MM_Score", -50, 50), Range("st_trend", 0, None),
+         Range("mt_trend", 0, None), Range("lt_trend_change", None, 0.01)],
+        "Sharpe_Rank", True),
+}
+
+
+def tiled(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    reps = -(-n // len(df))
+    out = pd.concat([df] * reps, ignore_index=True).iloc[:n].copy()
+    out["Ticker"] = [f"{t}.{i // len(df)}" for i, t in enumerate(out["Ticker"])]
+    return out
+
+
+def pandas_query(df: pd.DataFrame, filters, sort_by, descending, limit):
+    m = pd.Series(True, index=df.index)
+    for f in filters:
+        if isinstance(f, Range):
+            if f.lo is not None:
+                m &= df[f.column] >= f.lo
+            if f.hi is not None:
+                m &= df[f.column] <= f.hi
+        else:
+            m &= df[f.column].isin(f.values)
+    hit = df[m].sort_values([sort_by, "Ticker"], ascending=[not descending, True], na_position="last")
+    return hit.iloc[:limit], int(m.sum())
+
+
+def best(fn, repeat):
+    t = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        t = min(t, time.perf_counter() - t0)
+    return t * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="*", default=[653, 10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    base = pd.read_csv(SIGNAL_BOX)
+    for n in args.sizes:
+        df = tiled(base, n)
+        t0 = time.perf_counter()
+        sc = SignalScreener(df)
+        build = (time.perf_counter() - t0) * 1000
+        print(f"\nuniverse {n:,} rows   index build {build:,.1f} ms")
+        print(f"  {'query':40s}{'matches':>9s}{'pandas ms':>11s}{'screener ms':>13s}")
+        for name, (filters, sort_by, desc) in QUERIES.items():
+            _, total = sc.query(filters, sort_by, desc, 50)
+            _, total_pd = pandas_query(sc.df, filters, sort_by, desc, 50)
+            assert total == total_pd, (name, total, total_pd)
+            t_pd = best(lambda: pandas_query(sc.df, filters, sort_by, desc, 50), args.repeat)
+            t_sc = best(lambda: sc.query(filters, sort_by, desc, 50), args.repeat)
+            print(f"  {name:40s}{total:9,d}{t_pd:11.2f}{t_sc:13.2f}")
+
+
+if __name__ == "__main__":
+    np.seterr(all="ignore")
+    main()
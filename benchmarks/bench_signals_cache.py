@@ -0,0 +1,86 @@
+# benchmarks/bench_signals_cache.py
+#
+# Signals page latency, and what a Signals visit costs the rest of the
+# server's cache.  Sessions are simulated headless with streamlit.testing's
+# AppTest in one process, so they share st.cache_data the way sessions on
+# one server do.  Each round visits the given pages in order (Signals in
+# the middle by default).  CSV reads (pd.read_csv calls) count cache misses.
+# A page's hit rate is 1 - reads / reads on its cold first visit.
+#
+#   python benchmarks/bench_signals_cache.py [--rounds 5]
+#       [--pages pages/07_Vantage_Point.py pages/09_Signals.py pages/10_Universe.py]
+
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+DEFAULT_PAGES = [
+    "pages/07_Vantage_Point.py",
+    "pages/09_Signals.py",
+    "pages/10_Universe.py",
+]
+
+_reads = {"n": 0}
+_read_csv = pd.read_csv
+
+
+def _counting_read_csv(*args, **kwargs):
+    _reads["n"] += 1
+    return _read_csv(*args, **kwargs)
+
+
+def visit(page: str, timeout: float = 120) -> tuple[float, int]:
+    """(seconds, CSV reads) for one authenticated first run of a page in a new session."""
+    at = AppTest.from_file(str(APP_DIR / page), default_timeout=timeout)
+    at.session_state["authenticated"] = True
+    before = _reads["n"]
+    t0 = time.perf_counter()
+    at.run()
+    dt = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return dt, _reads["n"] - before
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--pages", nargs="*", default=DEFAULT_PAGES)
+    args = ap.parse_args()
+
+    pd.read_csv = _counting_read_csv
+    times = defaultdict(list)
+    reads = defaultdict(list)
+    for _ in range(args.rounds):
+        for page in args.pages:
+            dt, n = visit(page)
+            times[page].append(dt)
+            reads[page].append(n)
+
+    print(f"{args.rounds} rounds of {len(args.pages)} page visits (new session per visit)")
+    print(f"{'page':34s}{'cold s':>8s}{'warm s':>8s}{'cold reads':>12s}{'warm reads':>12s}{'hit rate':>10s}")
+    hits = total = 0
+    for page in args.pages:
+        cold, warm = reads[page][0], reads[page][1:]
+        warm_mean = statistics.mean(warm) if warm else 0.0
+        rate = 1.0 - warm_mean / cold if cold and warm else 1.0
+        hits += sum(max(cold - n, 0) for n in warm)
+        total += cold * len(warm)
+        warm_s = f"{statistics.median(times[page][1:]):8.3f}" if warm else f"{'-':>8s}"
+        print(f"{Path(page).name:34s}{times[page][0]:8.3f}{warm_s}{cold:12d}{warm_mean:12.1f}{rate:>10.0%}")
+    if total:
+        print(f"{'all pages':34s}{'':8s}{'':8s}{'':12s}{'':12s}{hits / total:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_universe.py
+#
+# Universe page (pages/10) per-keystroke cost as the universe grows: the
+# old path (copy the frame, str.lower().str.contains on Ticker and Name,
+# ship every match to st.dataframe) vs utils/universe.py (indexed search,
+# one page of PAGE_SIZE rows).  ticker_data.csv is tiled k times with
+# suffixed tickers to simulate larger universes; for a run of keystrokes
+# ("a", "ap", "app", ...) it reports the median time per keystroke and the
+# Arrow bytes the table sends.
+#
+#   python benchmarks/bench_universe.py [--scales 1 10 100] [--query apple]
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from utils import universe  # noqa: E402
+
+PAGE_SIZE = 50
+
+
+def _arrow_bytes(df: pd.DataFrame) -> int:
+    table = pa.Table.from_pandas(df)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return len(sink.getvalue())
+
+
+def _tiled(base: pd.DataFrame, k: int) -> pd.DataFrame:
+    parts = []
+    for i in range(k):
+        part = base.copy()
+        if i:
+            part["Ticker"] = part["Ticker"] + f".{i}"
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def old_keystroke(df: pd.DataFrame, q: str) -> pd.DataFrame:
+    """What the page did per rerun before the engine."""
+    ql = q.strip().lower()
+    return df[
+        df["Ticker"].str.lower().str.contains(ql, na=False)
+        | df["Name"].str.lower().str.contains(ql, na=False)
+    ].copy()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--query", default="apple")
+    args = ap.parse_args()
+
+    base = pd.read_csv(universe.TICKER_DATA)
+    keys = [args.query[:i] for i in range(1, len(args.query) + 1)]
+    print(f"{'rows':>9s}{'old ms':>9s}{'old B':>12s}{'engine ms':>11s}{'engine B':>10s}{'build ms':>10s}")
+    for k in args.scales:
+        raw = _tiled(base, k)
+        t0 = time.perf_counter()
+        uni = universe.Universe(raw)
+        build = (time.perf_counter() - t0) * 1000
+        old_df = uni.df.copy()
+
+        old_t, old_b, new_t, new_b = [], [], [], []
+        for q in keys:
+            t0 = time.perf_counter()
+            view = old_keystroke(old_df, q)
+            old_t.append((time.perf_counter() - t0) * 1000)
+            old_b.append(_arrow_bytes(view))
+
+            t0 = time.perf_counter()
+            page, _ = uni.page(q, "Day %", True, 0, PAGE_SIZE)
+            new_t.append((time.perf_counter() - t0) * 1000)
+            new_b.append(_arrow_bytes(page))
+
+        print(f"{uni.n:9,d}{statistics.median(old_t):9.2f}{max(old_b):12,d}"
+              f"{statistics.median(new_t):11.2f}{max(new_b):10,d}{build:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
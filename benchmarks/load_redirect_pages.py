@@ -0,0 +1,71 @@
+# benchmarks/load_redirect_pages.py
+#
+# Script-thread occupancy of the Account / Log Out redirect pages under
+# concurrent visits.  Each visit is a fresh authenticated AppTest session;
+# the time its run() takes is how long a script-runner thread is held.
+# AppTest adds a fixed per-run overhead, so a one-line control page is
+# measured the same way and reported alongside.
+#
+#   python benchmarks/load_redirect_pages.py [--visits 40] [--concurrency 8]
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+PAGES = ["pages/16_Account.py", "pages/17_Log_Out.py"]
+
+CONTROL_SCRIPT = 'import streamlit as st\nst.write("control")\n'
+
+
+def visit(page: str) -> float:
+    at = AppTest.from_file(str(APP_DIR / page), default_timeout=60)
+    at.session_state["authenticated"] = True
+    t0 = time.perf_counter()
+    try:
+        at.run()
+    except KeyError:
+        # both pages call st.session_state.clear(), which also wipes
+        # AppTest's own bookkeeping key; the run itself has finished
+        return time.perf_counter() - t0
+    dt = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(f"{page}: {at.exception[0].message}")
+    return dt
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--visits", type=int, default=40)
+    ap.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(CONTROL_SCRIPT)
+
+    targets = [("control (1-line page)", f.name)] + [(p, p) for p in PAGES]
+    print(f"visits={args.visits} concurrency={args.concurrency}")
+    for label, page in targets:
+        visit(page)  # warm imports / module caches
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            held = list(pool.map(visit, [page] * args.visits))
+        wall = time.perf_counter() - t0
+        print(
+            f"{label:24s} "
+            f"thread-held/visit: median {statistics.median(held) * 1000:8.1f} ms  "
+            f"max {max(held) * 1000:8.1f} ms  total {sum(held):7.2f} s  "
+            f"wall {wall:6.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
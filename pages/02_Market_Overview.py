@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – Market Overview", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -56,7 +58,6 @@ if not st.session_state.get("authenticated"):
 
 
 from pathlib import Path
-import base64
 import textwrap
 import pandas as pd
 import numpy as np
@@ -68,112 +69,7 @@ import time
 # -------------------------
 # Page & shared style
 # -------------------------
-st.markdown("""
-<style>
-/* ---------------- Base layout ---------------- */
-div[data-testid="stHorizontalBlock"]{
-  display:flex;
-  flex-wrap: wrap;
-  gap: 28px;
-}
-
-/* Each Streamlit column acts like a grid item */
-div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-  flex: 1 1 32%;
-  min-width: 300px;
-}
-
-/* App container width */
-[data-testid="stAppViewContainer"] .main .block-container,
-section.main > div {
-  width: 95vw;
-  max-width: 2100px;
-  margin-left: auto;
-  margin-right: auto;
-}
-
-/* Typography + card shell */
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-.card {
-  border:1px solid #cfcfcf;
-  border-radius:8px;
-  background:#fff;
-  padding:12px 12px 8px 12px;
-}
-
-/* Choose a STANDARD width for all non-desktop cards */
-.card {
-  max-width: 720px;
-  width: 100%;
-}
-.card h3 { margin:0 0 8px 0; font-size:16px; font-weight:700; color:#1a1a1a; }
-
-/* Tables */
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td { border:1px solid #d9d9d9; padding:6px 8px; font-size:13px; overflow:hidden; text-overflow:ellipsis; }
-.tbl th { background:#f2f2f2; font-weight:700; text-align:left; }
-.center { text-align:center; }
-.right  { text-align:right; white-space:nowrap; }
-/* Center ONLY the table headers for Ticker and Percent/Shares */
-.tbl thead th.col-ticker { text-align: center; }
-.tbl thead th.col-value  { text-align: center; }
-
-/* Column widths (desktop defaults) */
-th.col-company, td.col-company { white-space:nowrap; min-width:11ch; width:39ch; max-width:39ch; }
-th.col-category, td.col-category { white-space:nowrap; min-width:6ch;  width:22ch; max-width:22ch; }
-th.col-ticker,   td.col-ticker   { width:74px; }
-
-/* Shares column (Row 1 / Card 3) */
-.shares-wide th.col-value, .shares-wide td.col-value { width:100px !important; white-space:nowrap; }
-
-/* ---------------- Breakpoints ---------------- */
-
-/* DESKTOP (>=1700px): force 3-up */
-@media (min-width: 1700px){
-  div[data-testid="stHorizontalBlock"] { flex-wrap: nowrap; }
-  div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-    flex: 0 0 32%;
-    min-width: 300px;
-  }
-  .card { max-width: none; }
-}
-
-/* NON-DESKTOP (<1699.98px): ALWAYS 1-up, centered, fixed standard width */
-@media (max-width: 1699.98px){
-  div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-    flex: 0 0 100%;
-  }
-  .card{
-    max-width: 720px;
-    margin-left: auto;
-    margin-right: auto;
-  }
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
+apply_theme("market_overview", "scrollbars")
 
 # -------------------------
 # Paths (portable for Cloud)
@@ -241,10 +137,6 @@ if dest.replace("%20", " ") == "deep dive":
 def row_spacer(height_px: int = 14):
     st.markdown(f"<div style='height:{height_px}px'></div>", unsafe_allow_html=True)
 
-def _image_to_base64(path: Path) -> str:
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 @st.cache_data(show_spinner=False)
 def load_csv(path: Path) -> pd.DataFrame:
     if not path.exists():
@@ -392,7 +284,7 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_to_base64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -700,19 +592,4 @@ components.html(mr_html, height=900, scrolling=True)
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only.
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security,
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general,
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed.
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material.
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum Heatmap", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -58,14 +60,14 @@ if not st.session_state.get("authenticated"):
 # Markmentum — Model Score + Δ (Daily/WTD/MTD/QTD)
 
 from pathlib import Path
-import base64
 import pandas as pd
-import numpy as np
 import altair as alt
 
-from urllib.parse import quote_plus
 #import os
 
+from utils import heatmap_engine, heatmap_history, latest_frames, vega_specs
+from utils.html_tables import render_table, span_cells, divergent_bg, score_bg, fmt_num, ticker_links
+
 # -------------------------
 # Paths
 # -------------------------
@@ -77,23 +79,19 @@ ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
 # Score sources (as specified)
-CSV_BASE   = DATA_DIR / "model_score_day_change.csv"            # Ticker, Ticker_name, Category, Date, model_score, previous_model_score, model_score_daily_change (optional)
-CSV_WTD    = DATA_DIR / "model_score_wtd_change.csv"       # model_score_wtd_change, current_model_score, previous_model_score
-CSV_MTD    = DATA_DIR / "model_score_mtd_change.csv"       # model_score_mtd_change, current_model_score, previous_model_score
-CSV_QTD    = DATA_DIR / "model_score_qtd_change.csv"       # model_score_qtd_change, current_model_score, previous_model_score
+CSV_BASE   = latest_frames.MM_CSV_BASE            # Ticker, Ticker_name, Category, Date, model_score, previous_model_score, model_score_daily_change (optional)
+CSV_WTD    = latest_frames.MM_CSV_WTD       # model_score_wtd_change, current_model_score, previous_model_score
+CSV_MTD    = latest_frames.MM_CSV_MTD       # model_score_mtd_change, current_model_score, previous_model_score
+CSV_QTD    = latest_frames.MM_CSV_QTD       # model_score_qtd_change, current_model_score, previous_model_score
 
 # -------------------------
 # Header: logo centered
 # -------------------------
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -103,30 +101,16 @@ if LOGO_PATH.exists():
 #ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 #INFO_VALUE_KEY = "dd_show_information_charts_value"
 
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-
-    # current toggle states (default False if not set yet)
-    adv_on  = st.session_state.get(ADV_VALUE_KEY, False)
-    info_on = st.session_state.get(INFO_VALUE_KEY, False)
-
-    adv_flag  = "1" if adv_on  else "0"
-    info_flag = "1" if info_on else "0"
-
-    proof = make_proof()
-
-    return (
-        f'<a href="?page=Deep%20Dive'
-        f'&ticker={quote_plus(t)}'
-        f'&adv={adv_flag}'
-        f'&info={info_flag}'
-        f'&proof={proof}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
+def _mk_ticker_links(tickers) -> list[str]:
+    # current toggle states (default False if not set yet); one proof per render
+    return ticker_links(
+        tickers,
+        adv_on=st.session_state.get(ADV_VALUE_KEY, False),
+        info_on=st.session_state.get(INFO_VALUE_KEY, False),
+        proof=make_proof(),
     )
 
+
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 
@@ -151,119 +135,26 @@ if dest.replace("%20", " ") == "deep dive":
 # -------------------------
 # Helpers
 # -------------------------
-def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
-    s = pd.to_numeric(series, errors="coerce").abs().dropna()
-    if s.empty:
-        return floor
-    vmax = float(np.quantile(s, q))
-    return max(floor, np.ceil(vmax / step) * step)
-
-def _fmt_num(x, nd=0):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x):,.{nd}f}"
-    except Exception:
-        return ""
-
-# Score cell tint: Buy green, Neutral gray, Sell red; stronger beyond ±100
-def _score_cell_html(score: float, cap: float = 105.0) -> str:
-    if score is None or pd.isna(score):
-        return ""
-    s = float(score)
-
-    # Classification
-    if s >= 25:
-        # Buy — green intensity grows with |s|; beyond 100 gets darker
-        rel = min(abs(s) / cap, 1.0)
-        alpha = 0.12 + 0.28 * rel       # 0.12 → 0.40
-        bg = f"rgba(16,185,129,{alpha:.3f})"
-        color = "#0b513a"
-    elif s <= -25:
-        # Sell — red intensity grows with |s|; beyond -100 gets darker
-        rel = min(abs(s) / cap, 1.0)
-        alpha = 0.12 + 0.28 * rel
-        bg = f"rgba(239,68,68,{alpha:.3f})"
-        color = "#641515"
-    else:
-        # Neutral — light gray (fixed)
-        bg = "rgba(156,163,175,0.18)"   # gray-400 @ ~18%
-        color = "#374151"
-
-    label = _fmt_num(s, 0)
-    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+def _delta_vmax(frame: pd.DataFrame) -> dict[str, float]:
+    """Robust |max| per Δ column, by heatmap_engine's scaling rule (q=0.98, floor 1, step 1)."""
+    cols = latest_frames.DELTA_COLS
+    return dict(zip(cols, heatmap_engine.robust_vmax(frame[cols].to_numpy(dtype=float))))
+
+# Score cell tint: Buy green, Neutral gray, Sell red; stronger beyond ±100 (whole column at once)
+def _score_cells(col, cap: float = 105.0) -> list[str]:
+    bg, color = score_bg(col, cap=cap)
+    return span_cells(fmt_num(col, 0), bg, color, pad="0 6px")
 
 # Change column tint (independent scale per timeframe)
-def _delta_cell_html(val: float, vmax: float) -> str:
-    if val is None or pd.isna(val) or vmax is None or vmax <= 0:
-        return ""
-    s = min(abs(float(val)) / float(vmax), 1.0)
-    alpha = 0.12 + 0.28 * s
-    if val > 0:
-        bg = f"rgba(16,185,129,{alpha:.3f})"   # green
-    elif val < 0:
-        bg = f"rgba(239,68,68,{alpha:.3f})"   # red
-    else:
-        bg = "transparent"
-    label = _fmt_num(val, 0)
-    return f'<span style="display:block; background:{bg}; padding:0 6px; border-radius:2px; text-align:right;">{label}</span>'
+def _delta_cells(col, vmax: float) -> list[str]:
+    return span_cells(fmt_num(col, 0), divergent_bg(col, vmax), pad="0 6px")
 
 # -------------------------
 # Load sources + assemble model-score frame
 # -------------------------
-@st.cache_data(show_spinner=False)
 def load_markmentum_frames():
-    # Base / daily
-    cols_keep = [
-        "Ticker","Ticker_name","Category","Date",
-        "model_score","previous_model_score","model_score_daily_change"
-    ]
-    base = pd.read_csv(CSV_BASE) if CSV_BASE.exists() else pd.DataFrame(columns=cols_keep)
-    # hygiene + latest row per ticker
-    if not base.empty and "Date" in base.columns:
-        base["_dt"] = pd.to_datetime(base["Date"], errors="coerce")
-        base = (base.sort_values(["Ticker","_dt"], ascending=[True, False])
-                    .drop_duplicates(subset=["Ticker"], keep="first"))
-    for c in ["model_score","previous_model_score","model_score_daily_change"]:
-        if c in base.columns:
-            base[c] = pd.to_numeric(base[c], errors="coerce")
-    if "model_score_daily_change" not in base.columns or base["model_score_daily_change"].isna().all():
-        if "model_score" in base.columns and "previous_model_score" in base.columns:
-            base["model_score_daily_change"] = base["model_score"] - base["previous_model_score"]
-
-    # WTD / MTD / QTD
-    def _load_delta(p, delta_col):
-        if not p.exists():
-            return pd.DataFrame(columns=["Ticker", delta_col])
-        df = pd.read_csv(p)
-        if "Ticker" not in df.columns:
-            return pd.DataFrame(columns=["Ticker", delta_col])
-        df[delta_col] = pd.to_numeric(df.get(delta_col), errors="coerce")
-        df = df[["Ticker", delta_col]].drop_duplicates("Ticker", keep="first")
-        return df
-
-    wtd = _load_delta(CSV_WTD, "model_score_wtd_change")
-    mtd = _load_delta(CSV_MTD, "model_score_mtd_change")
-    qtd = _load_delta(CSV_QTD, "model_score_qtd_change")
-
-    # Merge
-    df = base.copy()
-    for add in (wtd, mtd, qtd):
-        df = df.merge(add, on="Ticker", how="left")
-
-    # Final schema
-    df = df.rename(columns={
-        "Ticker_name": "Name",
-        "model_score": "Score",
-        "model_score_daily_change": "ΔDaily",
-        "model_score_wtd_change":   "ΔWTD",
-        "model_score_mtd_change":   "ΔMTD",
-        "model_score_qtd_change":   "ΔQTD",
-    })
-    # Type hygiene
-    for c in ["Score","ΔDaily","ΔWTD","ΔMTD","ΔQTD"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
+    # latest row per ticker with WTD / MTD / QTD merged in, shared with the Research Pack PDF
+    df, _ = latest_frames.markmentum()
     return df
 
 scores = load_markmentum_frames()
@@ -281,69 +172,8 @@ if "Date" in scores.columns:
 # -------------------------
 # Shared CSS
 # -------------------------
-st.markdown("""
-<style>
-.card-wrap { display:flex; justify-content:center; }
-.card{
-  border:1px solid #cfcfcf; border-radius:8px; background:#fff;
-  padding:12px 12px 10px 12px; width:100%;
-  max-width:900px;
-}
-@media (max-width:1100px){
-  .card { max-width:100%; }
-}
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td {
-  border:1px solid #d9d9d9; padding:6px 8px; font-size:13px;
-  overflow:hidden; text-overflow:ellipsis;
-}
-.tbl th { background:#f2f2f2; font-weight:700; color:#1a1a1a; text-align:left; }
-.tbl th:nth-child(n+3) { text-align:center; } /* numeric headings centered */
-.tbl td:nth-child(n+3) { text-align:right; white-space:nowrap; }
-
-/* Center the Ticker column (2nd column) */
-.tbl th:nth-child(2),
-.tbl td:nth-child(2) { text-align: center; }
-
-/* Make the ticker link fill the cell so the centering is perfect */
-.tbl td:nth-child(2) a {
-  display: inline-block;
-  width: 100%;
-}
-
-.tbl col.col-name-wide   { width:22ch; min-width:22ch; max-width:22ch; }
-.tbl col.col-ticker-nar  { width:7ch; }
-.tbl col.col-num         { width:8ch; }
-
-.tbl th:nth-child(1), .tbl td:nth-child(1) { white-space:normal; overflow:visible; text-overflow:clip; }
-.subnote { border-top:1px solid #e5e5e5; margin-top:8px; padding-top:10px; font-size:11px; color:#6c757d; }
-.card h3 { margin:0 0 -6px 0; font-size:16px; font-weight:700; color:#1a1a1a; text-align:center; }
-.card .subtitle { margin:0 0 8px 0; font-size:14px; font-weight:500; color:#6b7280; text-align:center; }
-.vspace-16 { height:16px; }
-</style>
-""", unsafe_allow_html=True)
-
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
+apply_theme("markmentum_heatmap", "scrollbars")
 
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
 
 # -------------------------
 # Title
@@ -366,37 +196,26 @@ macro_list = [
     "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
     "GLD","DXY","TLT","BTC=F"
 ]
-scores["_dt"] = pd.to_datetime(scores["Date"], errors="coerce")
-latest = (
-    scores.sort_values(["Ticker","_dt"], ascending=[True, False])
-          .drop_duplicates(subset=["Ticker"], keep="first")
-)
+latest = scores   # latest_frames already keeps one (latest) row per ticker
 
 m = latest[latest["Ticker"].isin(macro_list)].copy()
 m["__ord__"] = m["Ticker"].map({t:i for i,t in enumerate(macro_list)})
 m = m.sort_values(["__ord__"], kind="stable")
-m["Ticker_link"] = m["Ticker"].map(_mk_ticker_link)
+m["Ticker_link"] = _mk_ticker_links(m["Ticker"])
 
 # independent scaling for deltas by timeframe (within macro card)
-vmaxM = {
-    "ΔDaily": _robust_vmax(m["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(m["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(m["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(m["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmaxM = _delta_vmax(m)
 
-m_render = pd.DataFrame({
+m_render = {
     "Name":   m["Name"],
     "Ticker": m["Ticker_link"],
-    "Score":  [ _score_cell_html(v) for v in m["Score"] ],
-    "Δ Daily":  [ _delta_cell_html(v, vmaxM["ΔDaily"]) for v in m["ΔDaily"] ],
-    "Δ WTD":    [ _delta_cell_html(v, vmaxM["ΔWTD"])   for v in m["ΔWTD"]   ],
-    "Δ MTD":    [ _delta_cell_html(v, vmaxM["ΔMTD"])   for v in m["ΔMTD"]   ],
-    "Δ QTD":    [ _delta_cell_html(v, vmaxM["ΔQTD"])   for v in m["ΔQTD"]   ],
-})
-
-html_macro = m_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_macro = html_macro.replace('class="dataframe tbl"', 'class="tbl"')
+    "Score":  _score_cells(m["Score"]),
+    "Δ Daily":  _delta_cells(m["ΔDaily"], vmaxM["ΔDaily"]),
+    "Δ WTD":    _delta_cells(m["ΔWTD"], vmaxM["ΔWTD"]),
+    "Δ MTD":    _delta_cells(m["ΔMTD"], vmaxM["ΔMTD"]),
+    "Δ QTD":    _delta_cells(m["ΔQTD"], vmaxM["ΔQTD"]),
+}
+
 colgroup_macro = """
 <colgroup>
   <col class="col-name-wide">  <!-- Name -->
@@ -408,7 +227,7 @@ colgroup_macro = """
   <col class="col-num">        <!-- QTD -->
 </colgroup>
 """.strip()
-html_macro = html_macro.replace('<table class="tbl">', f'<table class="tbl">{colgroup_macro}', 1)
+html_macro = render_table(m_render, classes="tbl", colgroup=colgroup_macro)
 
 st.markdown(
     f"""
@@ -448,24 +267,17 @@ order_map = {name: i for i, name in enumerate(preferred_order)}
 grouped["__ord__"] = grouped["Category"].map(order_map)
 grouped = grouped.sort_values(["__ord__", "Category"], kind="stable").drop(columns="__ord__")
 
-vmax_cat = {
-    "ΔDaily": _robust_vmax(grouped["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(grouped["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(grouped["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(grouped["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmax_cat = _delta_vmax(grouped)
 
-g_render = pd.DataFrame({
+g_render = {
     "Name":  grouped["Category"],
-    "Score": [ _score_cell_html(v) for v in grouped["Score"] ],
-    "Δ Daily": [ _delta_cell_html(v, vmax_cat["ΔDaily"]) for v in grouped["ΔDaily"] ],
-    "Δ WTD":   [ _delta_cell_html(v, vmax_cat["ΔWTD"])   for v in grouped["ΔWTD"]   ],
-    "Δ MTD":   [ _delta_cell_html(v, vmax_cat["ΔMTD"])   for v in grouped["ΔMTD"]   ],
-    "Δ QTD":   [ _delta_cell_html(v, vmax_cat["ΔQTD"])   for v in grouped["ΔQTD"]   ],
-})
-
-html_cat = g_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_cat = html_cat.replace('class="dataframe tbl"', 'class="tbl"')
+    "Score": _score_cells(grouped["Score"]),
+    "Δ Daily": _delta_cells(grouped["ΔDaily"], vmax_cat["ΔDaily"]),
+    "Δ WTD":   _delta_cells(grouped["ΔWTD"], vmax_cat["ΔWTD"]),
+    "Δ MTD":   _delta_cells(grouped["ΔMTD"], vmax_cat["ΔMTD"]),
+    "Δ QTD":   _delta_cells(grouped["ΔQTD"], vmax_cat["ΔQTD"]),
+}
+
 colgroup = """
 <colgroup>
   <col class="col-name-wide">  <!-- Name -->
@@ -476,7 +288,7 @@ colgroup = """
   <col class="col-num">        <!-- QTD -->
 </colgroup>
 """.strip()
-html_cat = html_cat.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+html_cat = render_table(g_render, classes="tbl", colgroup=colgroup)
 
 st.markdown(
     f"""
@@ -496,56 +308,41 @@ st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 
 
 # ===== Category Heatmap — ONE matrix (Score + ΔDaily/ΔWTD/ΔMTD/ΔQTD), all blue↔orange =====
-glong = grouped.melt(
-    id_vars=["Category"],
-    value_vars=["Score", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"],
-    var_name="Timeframe",
-    value_name="Value",
-)
-glong["Category"] = pd.Categorical(glong["Category"], categories=preferred_order, ordered=True)
-
-# Robust |max| per timeframe INCLUDING Score; cap Score's vmax at 105 so extremes don't dominate
-vmax_tf = {}
-for tf, sub in glong.groupby("Timeframe"):
-    vmax = _robust_vmax(sub["Value"], q=0.98, floor=1.0, step=1.0)
-    if tf == "Score":
-        vmax = min(105.0, max(vmax, 1.0))
-    vmax_tf[tf] = vmax
-
-# Normalize each cell by its timeframe-specific vmax → [-1, 1]
-glong["norm"] = glong.apply(
-    lambda r: float(np.clip((r["Value"] or 0.0) / (vmax_tf.get(r["Timeframe"], 1.0) or 1.0), -1, 1)),
-    axis=1
-)
+# Vega-Lite spec of the category averages, built once per data release (cells from heatmap_engine)
+@st.cache_data(show_spinner=False, max_entries=2)
+def category_heatmap_spec(release: tuple) -> dict:
+    glong = heatmap_engine.category_cells("markmentum")
+
+    timeframe_order = ["Score", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]
+
+    cat_hm = (
+        alt.Chart(glong)
+          .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
+          .encode(
+              x=alt.X("Timeframe:N",
+                      sort=timeframe_order,
+                      axis=alt.Axis(orient="top", title=None, labelAngle=0,
+                                    labelColor="#1a1a1a", labelFontSize=12, labelFlush=False)),
+              y=alt.Y("Category:N",
+                      sort=list(glong["Category"].cat.categories),
+                      axis=alt.Axis(title=None, labelColor="#1a1a1a",
+                                    labelFlush=False, labelFontSize=12, labelLimit=240)),
+              color=alt.Color("norm:Q",
+                              scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
+                              legend=alt.Legend(orient="bottom",
+                                                title="Avg Score and Change",
+                                                labelExpr="''")),
+              tooltip=[
+                  alt.Tooltip("Category:N"),
+                  alt.Tooltip("Timeframe:N"),
+                  alt.Tooltip("Value:Q", title="Score / Δ", format=",.0f"),
+              ],
+          )
+          .properties(width=510, height=24 * len(preferred_order))
+          .configure_view(strokeWidth=0)
+    )
+    return vega_specs.to_vega_lite(cat_hm)
 
-timeframe_order = ["Score", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]
-
-cat_hm = (
-    alt.Chart(glong)
-      .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-      .encode(
-          x=alt.X("Timeframe:N",
-                  sort=timeframe_order,
-                  axis=alt.Axis(orient="top", title=None, labelAngle=0,
-                                labelColor="#1a1a1a", labelFontSize=12, labelFlush=False)),
-          y=alt.Y("Category:N",
-                  sort=list(glong["Category"].cat.categories),
-                  axis=alt.Axis(title=None, labelColor="#1a1a1a",
-                                labelFlush=False, labelFontSize=12, labelLimit=240)),
-          color=alt.Color("norm:Q",
-                          scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
-                          legend=alt.Legend(orient="bottom",
-                                            title="Avg Score and Change",
-                                            labelExpr="''")),
-          tooltip=[
-              alt.Tooltip("Category:N"),
-              alt.Tooltip("Timeframe:N"),
-              alt.Tooltip("Value:Q", title="Score / Δ", format=",.0f"),
-          ],
-      )
-      .properties(width=510, height=24 * len(preferred_order))
-      .configure_view(strokeWidth=0)
-)
 
 st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
 st.markdown(
@@ -563,7 +360,7 @@ st.markdown(
 )
 left, center, right = st.columns([1, .8, 1])
 with center:
-    st.altair_chart(cat_hm, use_container_width=False)
+    st.vega_lite_chart(category_heatmap_spec(latest_frames.release("markmentum")), use_container_width=False)
 
 
 # -------------------------
@@ -587,27 +384,20 @@ with col_center:
     )
 
 d = latest.loc[latest["Category"] == sel].copy()
-d["Ticker_link"] = d["Ticker"].map(_mk_ticker_link)
+d["Ticker_link"] = _mk_ticker_links(d["Ticker"])
 
-vmax_sel = {
-    "ΔDaily": _robust_vmax(d["ΔDaily"], q=0.98, floor=1.0, step=1.0),
-    "ΔWTD":   _robust_vmax(d["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔMTD":   _robust_vmax(d["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
-    "ΔQTD":   _robust_vmax(d["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
-}
+vmax_sel = _delta_vmax(d)
 
-d_render = pd.DataFrame({
+d_render = {
     "Name":   d["Name"],
     "Ticker": d["Ticker_link"],
-    "Score":  [ _score_cell_html(v) for v in d["Score"] ],
-    "Δ Daily":  [ _delta_cell_html(v, vmax_sel["ΔDaily"]) for v in d["ΔDaily"] ],
-    "Δ WTD":    [ _delta_cell_html(v, vmax_sel["ΔWTD"])   for v in d["ΔWTD"]   ],
-    "Δ MTD":    [ _delta_cell_html(v, vmax_sel["ΔMTD"])   for v in d["ΔMTD"]   ],
-    "Δ QTD":    [ _delta_cell_html(v, vmax_sel["ΔQTD"])   for v in d["ΔQTD"]   ],
-})
-
-html_detail = d_render.to_html(index=False, classes="tbl", escape=False, border=0)
-html_detail = html_detail.replace('class="dataframe tbl"', 'class="tbl"')
+    "Score":  _score_cells(d["Score"]),
+    "Δ Daily":  _delta_cells(d["ΔDaily"], vmax_sel["ΔDaily"]),
+    "Δ WTD":    _delta_cells(d["ΔWTD"], vmax_sel["ΔWTD"]),
+    "Δ MTD":    _delta_cells(d["ΔMTD"], vmax_sel["ΔMTD"]),
+    "Δ QTD":    _delta_cells(d["ΔQTD"], vmax_sel["ΔQTD"]),
+}
+
 colgroup2 = """
 <colgroup>
   <col class="col-name-wide">  <!-- Name -->
@@ -619,7 +409,7 @@ colgroup2 = """
   <col class="col-num">        <!-- QTD -->
 </colgroup>
 """.strip()
-html_detail = html_detail.replace('<table class="tbl">', f'<table class="tbl">{colgroup2}', 1)
+html_detail = render_table(d_render, classes="tbl", colgroup=colgroup2)
 
 if view_choice in ("Table","Both"):
     st.markdown(
@@ -639,61 +429,40 @@ if view_choice in ("Table","Both"):
 # -------------------------
 # Per-ticker heatmap (Score + Δ columns, independent scale per timeframe, universe-wide)
 # -------------------------
-# Long frame across entire universe, now INCLUDING Score
-tlong_all = latest.melt(
-    id_vars=["Ticker","Name","Category"],          # <- remove Score from id_vars
-    value_vars=["Score","ΔDaily","ΔWTD","ΔMTD","ΔQTD"],
-    var_name="Timeframe",
-    value_name="Value"
-)
-
-# Universe-wide robust vmax per timeframe; cap Score at 105 so extremes don’t dominate
-vmax_univ_tf = {}
-for tf, sub in tlong_all.groupby("Timeframe"):
-    vmax = _robust_vmax(sub["Value"], q=0.98, floor=1.0, step=1.0)
-    if tf == "Score":
-        vmax = min(105.0, max(vmax, 1.0))
-    vmax_univ_tf[tf] = vmax
-
-# Selected category long
-tlong_sel = tlong_all.loc[tlong_all["Category"] == sel].copy()
-tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
-
-# Normalize each cell by the universe max for its timeframe → [-1, 1]
-tlong_sel["norm"] = tlong_sel.apply(
-    lambda r: np.clip(
-        (r["Value"] or 0.0) / (vmax_univ_tf.get(r["Timeframe"], 1.0) or 1.0),
-        -1, 1
-    ),
-    axis=1
-)
+# Vega-Lite spec per category and data release; cells normalised by the robust universe vmax per timeframe → [-1, 1]
+@st.cache_data(show_spinner=False, max_entries=64)
+def ticker_heatmap_spec(category: str, release: tuple) -> dict:
+    tlong_sel = heatmap_engine.ticker_cells("markmentum", category)
+    tickers_order = sorted(tlong_sel["Ticker"].dropna().unique().tolist())
+
+    hm_sel = (
+        alt.Chart(tlong_sel)
+          .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
+          .encode(
+              x=alt.X("Timeframe:N",
+                      sort=["Score","ΔDaily","ΔWTD","ΔMTD","ΔQTD"],
+                      axis=alt.Axis(orient="top", title=None, labelAngle=0,
+                                    labelColor="#1a1a1a", labelFlush=False, labelFontSize=12)),
+              y=alt.Y("Ticker:N",
+                      sort=tickers_order,
+                      axis=alt.Axis(title=None, labelFontSize=12, labelColor="#1a1a1a",
+                                    labelFlush=False, labelLimit=260)),
+              color=alt.Color("norm:Q",
+                              scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
+                              legend=alt.Legend(orient="bottom",
+                                                title="Score and Change",
+                                                labelExpr="''")),
+              tooltip=[
+                  alt.Tooltip("Ticker:N"),
+                  alt.Tooltip("Timeframe:N", title="Timeframe"),
+                  alt.Tooltip("Value:Q", title="Score / Δ", format=",.0f"),
+              ],
+          )
+          .properties(width=400, height=max(360, 22*len(tickers_order)+24))
+          .configure_view(strokeWidth=0)
+    )
+    return vega_specs.to_vega_lite(hm_sel)
 
-hm_sel = (
-    alt.Chart(tlong_sel)
-      .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
-      .encode(
-          x=alt.X("Timeframe:N",
-                  sort=["Score","ΔDaily","ΔWTD","ΔMTD","ΔQTD"],
-                  axis=alt.Axis(orient="top", title=None, labelAngle=0,
-                                labelColor="#1a1a1a", labelFlush=False, labelFontSize=12)),
-          y=alt.Y("Ticker:N",
-                  sort=tickers_order,
-                  axis=alt.Axis(title=None, labelFontSize=12, labelColor="#1a1a1a",
-                                labelFlush=False, labelLimit=260)),
-          color=alt.Color("norm:Q",
-                          scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
-                          legend=alt.Legend(orient="bottom",
-                                            title="Score and Change",
-                                            labelExpr="''")),
-          tooltip=[
-              alt.Tooltip("Ticker:N"),
-              alt.Tooltip("Timeframe:N", title="Timeframe"),
-              alt.Tooltip("Value:Q", title="Score / Δ", format=",.0f"),
-          ],
-      )
-      .properties(width=400, height=max(360, 22*len(tickers_order)+24))
-      .configure_view(strokeWidth=0)
-)
 
 if view_choice in ("Heatmap","Both"):
     st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
@@ -712,7 +481,7 @@ if view_choice in ("Heatmap","Both"):
     )
     left, center, right = st.columns([1.4, .8, 1.4])
     with center:
-        st.altair_chart(hm_sel, use_container_width=False)
+        st.vega_lite_chart(ticker_heatmap_spec(sel, latest_frames.release("markmentum")), use_container_width=False)
 
 
 # =========================
@@ -791,22 +560,19 @@ with mid:
 
 
 
+# =========================
+# History — replay the heatmaps on earlier dates
+# =========================
+heatmap_history.render_playback(
+    "markmentum", sel,
+    title="Markmentum Heatmap",
+    legend="Score and Change",
+    value_title="Score / Δ",
+    value_format=",.0f",
+)
+
+
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
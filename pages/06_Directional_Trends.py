@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum - Directional Trends", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -58,12 +60,13 @@ if not st.session_state.get("authenticated"):
 # Markmentum — Trends & Changes (ST / MT / LT)
 
 from pathlib import Path
-import base64
 import pandas as pd
 import numpy as np
-from urllib.parse import quote_plus
 #import os
 
+from utils import latest_frames
+from utils.html_tables import render_table, span_cells, pill_cells, divergent_bg, fmt_pct, ticker_links, TAPE_BIAS_PALETTE
+
 
 # -------------------------
 # Paths
@@ -75,20 +78,16 @@ DATA_DIR   = APP_DIR / "data"
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
-CSV_PATH = DATA_DIR / "qry_graph_data_88.csv"   # <-- single source file for this page
+CSV_PATH = latest_frames.DT_CSV   # <-- single source file for this page (read via utils/latest_frames.py)
 
 # -------------------------
 # Header: logo centered
 # -------------------------
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -98,30 +97,16 @@ if LOGO_PATH.exists():
 #ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 #INFO_VALUE_KEY = "dd_show_information_charts_value"
 
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-
-    # current toggle states (default False if not set yet)
-    adv_on  = st.session_state.get(ADV_VALUE_KEY, False)
-    info_on = st.session_state.get(INFO_VALUE_KEY, False)
-
-    adv_flag  = "1" if adv_on  else "0"
-    info_flag = "1" if info_on else "0"
-
-    proof = make_proof()
-
-    return (
-        f'<a href="?page=Deep%20Dive'
-        f'&ticker={quote_plus(t)}'
-        f'&adv={adv_flag}'
-        f'&info={info_flag}'
-        f'&proof={proof}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
+def _mk_ticker_links(tickers) -> list[str]:
+    # current toggle states (default False if not set yet); one proof per render
+    return ticker_links(
+        tickers,
+        adv_on=st.session_state.get(ADV_VALUE_KEY, False),
+        info_on=st.session_state.get(INFO_VALUE_KEY, False),
+        proof=make_proof(),
     )
 
+
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 
@@ -155,44 +140,22 @@ def fmt_pct_1(x):
     except Exception:
         return ""
 
-def tint_cell(val, cap=0.03, neutral=0.0005):
+def tint_cells(col, cap=0.03, neutral=0.0005) -> list[str]:
     """
-    val: decimal (e.g., 0.012 = 1.2%)
+    col: decimals (e.g., 0.012 = 1.2%), tinted for the whole column at once
     cap: magnitude where tint reaches full strength (default 3%)
     neutral: +/- band rendered as no tint (default 0.05%)
     """
-    if val is None or pd.isna(val):
-        return ""
-    try:
-        v = float(val)
-    except Exception:
-        return ""
-
-    # Neutral band (very small values look untinted)
-    if -neutral <= v <= neutral:
-        bg = "transparent"
-    else:
-        # Scale opacity by magnitude, capped
-        strength = min(abs(v) / cap, 1.0)     # 0..1
-        alpha = 0.15 + 0.35 * strength        # 0.15..0.50
-        if v > 0:
-            bg = f"rgba(16,185,129,{alpha:.2f})"   # green
-        else:
-            bg = f"rgba(239,68,68,{alpha:.2f})"    # red
-
-    return (
-        f'<span style="display:block; background:{bg}; '
-        f'padding:0 6px; border-radius:3px; text-align:right;">{v*100:,.1f}%</span>'
-    )
+    # opacity scales 0.15..0.50 by magnitude, capped
+    bg = divergent_bg(col, cap, lo=0.15, span=0.35, nd=2, neutral=neutral)
+    return span_cells(fmt_pct(col, 1), bg, pad="0 6px", radius="3px")
 
 # -------------------------
 # Load source
 # -------------------------
-@st.cache_data(show_spinner=False)
-def load_csv(p: Path) -> pd.DataFrame:
-    if not p.exists():
-        return pd.DataFrame()
-    df = pd.read_csv(p)
+def load_csv() -> pd.DataFrame:
+    # latest row per ticker, shared with the Research Pack PDF
+    df, _ = latest_frames.directional_trends()
     required = [
         "Date","Ticker","Ticker_name","Category",
         "st_trend","mt_trend","lt_trend",
@@ -200,14 +163,9 @@ def load_csv(p: Path) -> pd.DataFrame:
     ]
     if not all(c in df.columns for c in required):
         return pd.DataFrame()
-
-    # numeric hygiene
-    for c in ["st_trend","mt_trend","lt_trend",
-              "st_trend_change","mt_trend_change","lt_trend_change"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
     return df
 
-df = load_csv(CSV_PATH)
+df = load_csv()
 
 # ---- Page title (under logo) pulled from source Date ----
 date_str = ""
@@ -335,103 +293,18 @@ def m2_label(st, mt, lt, stc, mtc):
     # Fallback (ties/equalities or anything unexpected)
     return "Neutral"
 
-def trend_tag(label: str) -> str:
+def trend_tags(labels) -> list[str]:
     """
-    Return a *subtle* tinted pill for the Directional Trend category.
+    Return a *subtle* tinted pill per Directional Trend category.
     Tints mirror the cell style (light RGBA), no heavy fills, default dark text.
     """
-    if not isinstance(label, str):
-        return ""
-    l = label.strip()
-
-    # Base style (subtle pill)
-    bg = "transparent"
-    color = "#1a1a1a"     # default dark text
-    pad = "2px 8px"
-    radius = "3px"
-    weight = 500          # lighter than bold to keep it understated
-
-    # Light tints (align with cell vibe; alpha ~0.12–0.20)
-    if l == "Buy":
-        bg = "rgba(16,185,129,0.42)"      # deeper green tint
-    elif l == "Leaning Bullish":
-        bg = "rgba(16,185,129,0.12)"      # lighter green tint
-    elif l in ("Topping", "Bottoming"):
-        bg = "rgba(107,114,128,0.12)"     # light gray tint
-    elif l == "Leaning Bearish":
-        bg = "rgba(239,68,68,0.12)"       # lighter red tint
-    elif l == "Sell":
-        bg = "rgba(239,68,68,0.42)"       # deeper red tint
-    elif l == "Neutral":
-        bg = "transparent"
-
-    return (
-        f'<span style="background:{bg}; color:{color}; '
-        f'padding:{pad}; border-radius:{radius}; font-weight:{weight};">{l}</span>'
-    )
+    return pill_cells(labels, TAPE_BIAS_PALETTE)
 
 
 
 # ---------- Shared CSS (compass-style card) ----------
-st.markdown("""
-<style>
-.card-wrap { display:flex; justify-content:center; }
-.card{
-  border:1px solid #cfcfcf; border-radius:8px; background:#fff;
-  padding:12px; width:100%; max-width:1200px;
-}
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td {
-  border:1px solid #d9d9d9; padding:6px 8px; font-size:13px;
-  overflow:hidden; text-overflow:ellipsis;
-}
-.tbl th { background:#f2f2f2; font-weight:700; color:#1a1a1a; text-align:left; }
-.tbl th:nth-child(n+2) { text-align:center; }
-.tbl td:nth-child(n+2) { text-align:right; white-space:nowrap; }
-
-/* Column width helpers */
-.tbl col.col-name   { width:28ch; min-width:28ch; max-width:28ch; }
-.tbl col.col-ticker { width:8ch; }
-.tbl col.col-num    { width:8ch; }
-            
-/* Center the Ticker column (2nd column) */
-.tbl th:nth-child(2),
-.tbl td:nth-child(2) { text-align: center; }
-
-/* allow wrapping for Name */
-.tbl th:nth-child(1), .tbl td:nth-child(1) { white-space:normal; overflow:visible; text-overflow:clip; }
-
-/* Make the last column (Comment) left-aligned and wider */
-.tbl th:last-child, .tbl td:last-child { text-align:left; }
-.tbl col.col-comment { width:18ch; min-width:18ch;}            
-
-
-.subnote { border-top:1px solid #e5e5e5; margin-top:8px; padding-top:10px; font-size:11px; color:#6c757d; }
-.vspace-16 { height:16px; }
-</style>
-""", unsafe_allow_html=True)
-
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
+apply_theme("directional_trends", "scrollbars")
+
 
 
 # =========================================================
@@ -447,35 +320,28 @@ macro_list = [
 if df.empty:
     st.info("`qry_graph_data_88.csv` missing or columns incomplete.")
 else:
-    # keep only the latest row per ticker (in case CSV has multiple dates)
-    df["_dt"] = pd.to_datetime(df["Date"], errors="coerce")
-    latest = (
-        df.sort_values(["Ticker", "_dt"], ascending=[True, False])
-          .drop_duplicates(subset=["Ticker"], keep="first")
-    )
+    latest = df   # latest_frames already keeps one (latest) row per ticker
 
     m = latest[latest["Ticker"].isin(macro_list)].copy()
     m["__ord__"] = m["Ticker"].map({t:i for i, t in enumerate(macro_list)})
     m = m.sort_values("__ord__", kind="stable")
 
-    m["Ticker_link"] = m["Ticker"].map(_mk_ticker_link)
+    m["Ticker_link"] = _mk_ticker_links(m["Ticker"])
 
-    macro_tbl = pd.DataFrame({
+    macro_tbl = {
         "Name":        m["Ticker_name"],
         "Ticker":      m["Ticker_link"],
-        "ST":          [tint_cell(v) for v in m["st_trend"]],
-        "MT":          [tint_cell(v) for v in m["mt_trend"]],
-        "LT":          [tint_cell(v) for v in m["lt_trend"]],
-        "Δ ST":   [tint_cell(v) for v in m["st_trend_change"]],
-        "Δ MT":   [tint_cell(v) for v in m["mt_trend_change"]],
-        "Δ LT":   [tint_cell(v) for v in m["lt_trend_change"]],
-        "Tape Bias":     [trend_tag(m2_label(st, mt, lt, stc, mtc)) for st, mt, lt, stc, mtc in
+        "ST":          tint_cells(m["st_trend"]),
+        "MT":          tint_cells(m["mt_trend"]),
+        "LT":          tint_cells(m["lt_trend"]),
+        "Δ ST":   tint_cells(m["st_trend_change"]),
+        "Δ MT":   tint_cells(m["mt_trend_change"]),
+        "Δ LT":   tint_cells(m["lt_trend_change"]),
+        "Tape Bias":     trend_tags([m2_label(st, mt, lt, stc, mtc) for st, mt, lt, stc, mtc in
                     zip(m["st_trend"], m["mt_trend"], m["lt_trend"],
-                        m["st_trend_change"], m["mt_trend_change"])],
-    })
+                        m["st_trend_change"], m["mt_trend_change"])]),
+    }
 
-    html_macro = macro_tbl.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_macro = html_macro.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup_macro = """
     <colgroup>
       <col class="col-name">   <!-- Name -->
@@ -489,7 +355,7 @@ else:
       <col class="col-comment"> <!-- Comment -->
     </colgroup>
     """.strip()
-    html_macro = html_macro.replace('<table class="tbl">', f'<table class="tbl">{colgroup_macro}', 1)
+    html_macro = render_table(macro_tbl, classes="tbl", colgroup=colgroup_macro)
 
     st.markdown(
         f"""
@@ -538,30 +404,22 @@ if not df.empty:
         sel = st.selectbox("Category", cats_present, index=(cats_present.index(default_cat) if default_cat else 0))
 
     d = df.loc[df["Category"] == sel].copy()
-    # latest per ticker (if multiple dates)
-    d = (
-        d.sort_values(["Ticker", "_dt"], ascending=[True, False])
-         .drop_duplicates(subset=["Ticker"], keep="first")
-         if "_dt" in d.columns else d
-    )
-    d["Ticker_link"] = d["Ticker"].map(_mk_ticker_link)
+    d["Ticker_link"] = _mk_ticker_links(d["Ticker"])
 
-    per_tbl = pd.DataFrame({
+    per_tbl = {
         "Name":        d["Ticker_name"],
         "Ticker":      d["Ticker_link"],
-        "ST":          [tint_cell(v) for v in d["st_trend"]],
-        "MT":          [tint_cell(v) for v in d["mt_trend"]],
-        "LT":          [tint_cell(v) for v in d["lt_trend"]],
-        "Δ ST":   [tint_cell(v) for v in d["st_trend_change"]],
-        "Δ MT":   [tint_cell(v) for v in d["mt_trend_change"]],
-        "Δ LT":   [tint_cell(v) for v in d["lt_trend_change"]],
-        "Tape Bias":     [trend_tag(m2_label(st, mt, lt, stc, mtc)) for st, mt, lt, stc, mtc in
+        "ST":          tint_cells(d["st_trend"]),
+        "MT":          tint_cells(d["mt_trend"]),
+        "LT":          tint_cells(d["lt_trend"]),
+        "Δ ST":   tint_cells(d["st_trend_change"]),
+        "Δ MT":   tint_cells(d["mt_trend_change"]),
+        "Δ LT":   tint_cells(d["lt_trend_change"]),
+        "Tape Bias":     trend_tags([m2_label(st, mt, lt, stc, mtc) for st, mt, lt, stc, mtc in
                     zip(d["st_trend"], d["mt_trend"], d["lt_trend"],
-                        d["st_trend_change"], d["mt_trend_change"])],
-    })
+                        d["st_trend_change"], d["mt_trend_change"])]),
+    }
 
-    html_per = per_tbl.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_per = html_per.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup_per = """
     <colgroup>
       <col class="col-name">   <!-- Name -->
@@ -575,7 +433,7 @@ if not df.empty:
       <col class="col-comment"> <!-- Comment -->
     </colgroup>
     """.strip()
-    html_per = html_per.replace('<table class="tbl">', f'<table class="tbl">{colgroup_per}', 1)
+    html_per = render_table(per_tbl, classes="tbl", colgroup=colgroup_per)
 
     st.markdown(
         f"""
@@ -630,16 +488,8 @@ with mid:
         unsafe_allow_html=True,
     )
 
-    # -------- dataset (latest row per ticker) --------
-    # reuse if already built; else compute
-    if "latest" not in locals():
-        df["_dt"] = pd.to_datetime(df["Date"], errors="coerce")
-        latest = (
-            df.sort_values(["Ticker", "_dt"], ascending=[True, False])
-              .drop_duplicates(subset=["Ticker"], keep="first")
-        )
-
-    base = latest.copy()
+    # -------- dataset (latest row per ticker, from latest_frames) --------
+    base = df.copy()
 
     # optional quick filter
     flt_col1, flt_col2, flt_col3 = st.columns([1,1,1])
@@ -712,19 +562,4 @@ with mid:
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
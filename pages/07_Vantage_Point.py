@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Vantage Point – Market Orientation", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -55,13 +57,16 @@ if not st.session_state.get("authenticated"):
             
 # 15_Vantage_Point.py — Vantage Point (Market Orientation only)
 from pathlib import Path
-import base64
 import pandas as pd
 import numpy as np
-from urllib.parse import quote_plus
 from html import escape
 #import os
 
+from utils.html_tables import (
+    render_table, span_cells, pill_cells, divergent_bg, rank_bg, score_bg,
+    fmt_pct, fmt_int, ticker_links, TAPE_BIAS_PALETTE,
+)
+
 # ---------- Paths ----------
 _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
@@ -71,15 +76,11 @@ LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 CSV_PATH   = DATA_DIR / "signal_box.csv"      # <- single source file
 
 # ---------- Header (centered logo) ----------
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -90,28 +91,13 @@ if LOGO_PATH.exists():
 #ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 #INFO_VALUE_KEY = "dd_show_information_charts_value"
 
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-
-    # current toggle states (default False if not set yet)
-    adv_on  = st.session_state.get(ADV_VALUE_KEY, False)
-    info_on = st.session_state.get(INFO_VALUE_KEY, False)
-
-    adv_flag  = "1" if adv_on  else "0"
-    info_flag = "1" if info_on else "0"
-
-    proof = make_proof()
-
-    return (
-        f'<a href="?page=Deep%20Dive'
-        f'&ticker={quote_plus(t)}'
-        f'&adv={adv_flag}'
-        f'&info={info_flag}'
-        f'&proof={proof}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
+def _mk_ticker_links(tickers) -> list[str]:
+    # current toggle states (default False if not set yet); one proof per render
+    return ticker_links(
+        tickers,
+        adv_on=st.session_state.get(ADV_VALUE_KEY, False),
+        info_on=st.session_state.get(INFO_VALUE_KEY, False),
+        proof=make_proof(),
     )
 
 qp = st.query_params
@@ -136,18 +122,6 @@ if dest.replace("%20", " ") == "deep dive":
         st.switch_page("pages/08_Deep_Dive_Dashboard.py")
 
 # ---------- Reused formatters & tints ----------
-def _fmt_int(x):
-    try:
-        if pd.isna(x): return ""
-        return f"{int(round(float(x))):,}"
-    except Exception: return ""
-
-def _fmt_pct(x, nd=2):
-    try:
-        if pd.isna(x): return ""
-        return f"{float(x)*100:,.{nd}f}%"
-    except Exception: return ""
-
 def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
     s = pd.to_numeric(series, errors="coerce").abs().dropna()
     if s.empty: return floor
@@ -155,83 +129,26 @@ def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
     return max(floor, float(int(np.ceil(vmax / step) * step)))
 
 # === % Return tint (Performance Heatmap pattern) ===
-def _divergent_pct_cell(val: float, vmax: float) -> str:
-    if val is None or pd.isna(val) or vmax is None or vmax <= 0: return ""
-    s = min(abs(float(val)) / float(vmax), 1.0)
-    alpha = 0.12 + 0.28 * s
-    bg = "transparent"
-    if val > 0:   bg = f"rgba(16,185,129,{alpha:.3f})"  # green
-    elif val < 0: bg = f"rgba(239,68,68,{alpha:.3f})"  # red
-    label = _fmt_pct(val, 2)
-    return f'<span style="display:block; background:{bg}; padding:0 4px; border-radius:1px; text-align:right;">{label}</span>'  # :contentReference[oaicite:4]{index=4}
+def _divergent_pct_cells(col, vmax: float) -> list[str]:
+    return span_cells(fmt_pct(col, 2), divergent_bg(col, vmax), radius="1px")
 
 # === Sharpe Rank cell (Sharpe Heatmap pattern) ===
-def _rank_cell(score: float, cap: float = 100.0) -> str:
-    if score is None or pd.isna(score): return ""
-    s = float(np.clip(score, 0, cap))
-    if s >= 70:   # high -> greener with intensity
-        rel = (s - 70.0) / 30.0
-        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
-        bg, color = f"rgba(16,185,129,{alpha:.3f})", "#0b513a"
-    elif s <= 30: # low -> redder with intensity
-        rel = (30.0 - s) / 30.0
-        alpha = 0.12 + 0.28 * max(0.0, min(rel, 1.0))
-        bg, color = f"rgba(239,68,68,{alpha:.3f})", "#641515"
-    else:
-        bg, color = "rgba(156,163,175,0.18)", "#374151"
-    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{_fmt_int(s)}</span>'  # :contentReference[oaicite:5]{index=5}
+def _rank_cells(col, cap: float = 100.0) -> list[str]:
+    bg, color, s = rank_bg(col, cap)
+    return span_cells(fmt_int(s), bg, color, pad="0 6px")
 
 # === MM Score cell (Markmentum Heatmap pattern) ===
-def _score_cell(score: float, cap: float = 105.0) -> str:
-    if score is None or pd.isna(score): return ""
-    s = float(score)
-    if s >= 25:
-        rel = min(abs(s) / cap, 1.0); alpha = 0.12 + 0.28 * rel
-        bg, color = f"rgba(16,185,129,{alpha:.3f})", "#0b513a"
-    elif s <= -25:
-        rel = min(abs(s) / cap, 1.0); alpha = 0.12 + 0.28 * rel
-        bg, color = f"rgba(239,68,68,{alpha:.3f})", "#641515"
-    else:
-        bg, color = "rgba(156,163,175,0.18)", "#374151"
-    return f'<span style="display:block; background:{bg}; color:{color}; padding:0 6px; border-radius:2px; text-align:right;">{_fmt_int(s)}</span>'  # :contentReference[oaicite:6]{index=6}
+def _score_cells(col, cap: float = 105.0) -> list[str]:
+    bg, color = score_bg(col, cap)
+    return span_cells(fmt_int(col), bg, color, pad="0 6px")
 
 # === Delta tint (Sharpe/MM change columns) ===
-def _delta_cell(val: float, vmax: float) -> str:
-    if val is None or pd.isna(val) or vmax is None or vmax <= 0: return ""
-    s = min(abs(float(val)) / float(vmax), 1.0)
-    alpha = 0.12 + 0.28 * s
-    bg = "transparent"
-    if val > 0:   bg = f"rgba(16,185,129,{alpha:.3f})"
-    elif val < 0: bg = f"rgba(239,68,68,{alpha:.3f})"
-    return f'<span style="display:block; background:{bg}; padding:0 6px; border-radius:2px; text-align:right;">{_fmt_int(val)}</span>'  # 
+def _delta_cells(col, vmax: float) -> list[str]:
+    return span_cells(fmt_int(col), divergent_bg(col, vmax), pad="0 6px")
 
 # === Tape Bias pill (reuse Directional Trends styling) ===
-def _tape_pill(label: str) -> str:
-    if not isinstance(label, str):
-        return ""
-    l = label.strip()
-
-    bg = "transparent"
-    color = "#1a1a1a"
-    pad = "2px 8px"
-    radius = "3px"
-    weight = 500
-
-    if l == "Buy":
-        bg = "rgba(16,185,129,0.42)"
-    elif l == "Leaning Bullish":
-        bg = "rgba(16,185,129,0.12)"
-    elif l in ("Topping", "Bottoming"):
-        bg = "rgba(107,114,128,0.12)"
-    elif l == "Leaning Bearish":
-        bg = "rgba(239,68,68,0.12)"
-    elif l == "Sell":
-        bg = "rgba(239,68,68,0.42)"
-
-    return (
-        f'<span style="background:{bg}; color:{color}; '
-        f'padding:{pad}; border-radius:{radius}; font-weight:{weight};">{l}</span>'
-    )
+def _tape_pills(labels) -> list[str]:
+    return pill_cells(labels, TAPE_BIAS_PALETTE)
 
 # ---------- Timeframe mapping (exact signal_box fields) ----------
 TIMEFRAMES = {
@@ -318,64 +235,7 @@ timeframe = _centered_select("Timeframe", list(TIMEFRAMES.keys()), "Daily")  # :
 tf = TIMEFRAMES[timeframe]
 
 # ---------- Styling (card + table; same class names you already use) ----------
-st.markdown("""
-<style>
-.card-wrap { display:flex; justify-content:center; }
-.card{
-  border:1px solid #cfcfcf; border-radius:8px; background:#fff;
-  padding:12px 12px 10px 12px; width:100%;
-  max-width:1200px;
-}
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td {
-  border:1px solid #d9d9d9; padding:6px 8px; font-size:13px;
-  overflow:hidden; text-overflow:ellipsis;
-}
-.tbl th { background:#f2f2f2; font-weight:700; color:#1a1a1a; text-align:left; }
-.tbl th:nth-child(n+2) { text-align:center; }
-.tbl td:nth-child(n+2) { text-align:right; white-space:nowrap; }
-
-/* columns */
-.tbl col.col-name { width:35ch; min-width:35ch; max-width:35ch; }
-.tbl col.col-ticker { width:7ch; }
-.tbl col.col-spacer { width:8px; background:#f8f8f8; }
-
-/* allow name wrap */
-.tbl th:nth-child(1), .tbl td:nth-child(1) { white-space:normal; overflow:visible; text-overflow:clip; }
-
-/* center the Ticker col */
-.tbl th:nth-child(2), .tbl td:nth-child(2) { text-align:center; }
-
-/* make ticker link fill the cell for perfect centering */
-.tbl td:nth-child(2) a { display:inline-block; width:100%; }
-
-/* Left-align Tape Bias column (5th) */
-.tbl th:nth-child(5), .tbl td:nth-child(5) { text-align:left; }
-            
-
-/* shared typography for all cards */
-.card h3{
-  margin:0 0 -4px 0; font-size:16px; font-weight:700; text-align:center; color:#1a1a1a;
-}
-.card .subtitle{
-  text-align:center; color:#6b7280; font-size:13.5px; margin-bottom:8px;
-}
-
-/* ── Table-specific rules ───────────────────────────────────────── */
-
-/* Macro table (has Tape Bias and spacer at col 6) */
-.tbl-macro th:nth-child(5), .tbl-macro td:nth-child(5){ text-align:left; }  /* Tape Bias */
-.tbl-macro th:nth-child(6), .tbl-macro td:nth-child(6){
-  border:none !important; background:transparent !important; padding:0 !important; /* spacer col */
-}
-
-/* Category table (no Tape Bias; spacer is col 4) */
-.tbl-cat th:nth-child(4), .tbl-cat td:nth-child(4){
-  border:none !important; background:transparent !important; padding:0 !important; /* spacer col */
-}
-            
-</style>
-""", unsafe_allow_html=True)
+apply_theme("vantage_point")
 
 # ---------- Macro list ----------
 macro_list = [
@@ -405,20 +265,18 @@ def _build_macro_card(df: pd.DataFrame):
     vmax_dmm = _robust_vmax(m[tf["d_mm"]], q=0.98, floor=1.0, step=1.0)
 
     # HTML table (Current | spacer | timeframe changes)
-    render = pd.DataFrame({
+    render = {
         "Name":    m["Ticker_name"],
-        "Ticker":  m["Ticker"].map(_mk_ticker_link),
-        "MM Score":      m[CURRENT["mm"]].map(_score_cell),
-        "Sharpe Rank":  m[CURRENT["rank"]].map(_rank_cell),
-        "Tape Bias": m[CURRENT["tape"]].fillna("").map(_tape_pill),
+        "Ticker":  _mk_ticker_links(m["Ticker"]),
+        "MM Score":      _score_cells(m[CURRENT["mm"]]),
+        "Sharpe Rank":  _rank_cells(m[CURRENT["rank"]]),
+        "Tape Bias": _tape_pills(m[CURRENT["tape"]].fillna("")),
         "":        [""] * len(m),  # spacer col
-        "Δ %":   [ _divergent_pct_cell(v, vmax_ret) for v in m[tf["ret"]] ],
-        "Δ MM Score": [ _delta_cell(v, vmax_dmm)         for v in m[tf["d_mm"]] ],
-        "Δ Sharpe Rank":   [ _delta_cell(v, vmax_dsh)         for v in m[tf["d_sh"]] ],
-    })
+        "Δ %":   _divergent_pct_cells(m[tf["ret"]], vmax_ret),
+        "Δ MM Score": _delta_cells(m[tf["d_mm"]], vmax_dmm),
+        "Δ Sharpe Rank":   _delta_cells(m[tf["d_sh"]], vmax_dsh),
+    }
 
-    html = render.to_html(index=False, classes="tbl", escape=False, border=0)
-    html = html.replace('class="dataframe tbl"', 'class="tbl"')
     colgroup = """
     <colgroup>
       <col class="col-name">     <!-- Name -->
@@ -428,7 +286,7 @@ def _build_macro_card(df: pd.DataFrame):
       <col> <col> <col>          <!-- %Ret | Sharpe▲ | MM▲ -->
     </colgroup>
     """.strip()
-    html = html.replace('<table class="tbl">', f'<table class="tbl">{colgroup}', 1)
+    html = render_table(render, classes="tbl", colgroup=colgroup)
 
     # As-of date
     date_str = ""
@@ -463,63 +321,6 @@ _build_macro_card(sb)
 # =========================
 st.markdown("<br>", unsafe_allow_html=True)
 
-st.markdown("""
-<style>
-.card2-wrap { display:flex; justify-content:center; }
-.card2{
-  border:1px solid #cfcfcf; border-radius:8px; background:#fff;
-  padding:12px 12px 10px 12px; width:100%;
-  max-width:950px;
-}
-.tbl2 { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl2 th, .tbl2 td {
-  border:1px solid #d9d9d9; padding:6px 8px; font-size:13px;
-  overflow:hidden; text-overflow:ellipsis;
-}
-.tbl2 th { background:#f2f2f2; font-weight:700; color:#1a1a1a; text-align:left; }
-.tbl2 th:nth-child(n+2) { text-align:center; }
-.tbl2 td:nth-child(n+2) { text-align:right; white-space:nowrap; }
-
-/* columns */
-.tbl2 col.col-name { width:35ch; min-width:35ch; max-width:35ch; }
-.tbl2 col.col-ticker { width:7ch; }
-.tbl2 col.col-spacer { width:8px; background:#f8f8f8; }
-
-/* allow name wrap */
-.tbl2 th:nth-child(1), .tbl2 td:nth-child(1) { white-space:normal; overflow:visible; text-overflow:clip; }
-
-/* center the Ticker col */
-.tbl2 th:nth-child(2), .tbl2 td:nth-child(2) { text-align:center; }
-
-/* make ticker link fill the cell for perfect centering */
-.tbl2 td:nth-child(2) a { display:inline-block; width:100%; }
-
-       
-
-/* shared typography for all card2s */
-.card2 h3{
-  margin:0 0 -4px 0; font-size:16px; font-weight:700; text-align:center; color:#1a1a1a;
-}
-.card2 .subtitle{
-  text-align:center; color:#6b7280; font-size:13.5px; margin-bottom:8px;
-}
-
-/* ── Table-specific rules ───────────────────────────────────────── */
-
-/* Macro table (has Tape Bias and spacer at col 6) */
-.tbl2-macro th:nth-child(5), .tbl2-macro td:nth-child(5){ text-align:left; }  /* Tape Bias */
-.tbl2-macro th:nth-child(6), .tbl2-macro td:nth-child(6){
-  border:none !important; background:transparent !important; padding:0 !important; /* spacer col */
-}
-
-/* Category table (no Tape Bias; spacer is col 4) */
-.tbl2-cat th:nth-child(4), .tbl2-cat td:nth-child(4){
-  border:none !important; background:transparent !important; padding:0 !important; /* spacer col */
-}
-            
-</style>
-""", unsafe_allow_html=True)
-
 
 
 # Use the latest row per ticker (in case the CSV ever has multiple dates)
@@ -559,19 +360,17 @@ vmax_dsh = _robust_vmax(grp["dSharpe"], q=0.98, floor=1.0, step=1.0)
 vmax_dmm = _robust_vmax(grp["dMM"],     q=0.98, floor=1.0, step=1.0)
 
 # Build render frame (keep the blank spacer column)
-cat_render = pd.DataFrame({
+cat_render = {
     "Name":      grp["Category"],
-    "Avg MM Score":  [ _score_cell(v)              for v in grp["MMScore"]  ],
-    "Avg Sharpe Rank":    [ _rank_cell(v)               for v in grp["Sharpe"]   ],
+    "Avg MM Score":  _score_cells(grp["MMScore"]),
+    "Avg Sharpe Rank":    _rank_cells(grp["Sharpe"]),
     "":          [ ""                          for _ in range(len(grp)) ],  # spacer
-    "Δ Avg %":       [ _divergent_pct_cell(v, vmax_ret) for v in grp["Ret"]     ],
-    "Δ Avg MM Score":[ _delta_cell(v, vmax_dmm)         for v in grp["dMM"]     ],
-    "Δ Avg Sharpe Rank":  [ _delta_cell(v, vmax_dsh)         for v in grp["dSharpe"] ],
-})
+    "Δ Avg %":       _divergent_pct_cells(grp["Ret"], vmax_ret),
+    "Δ Avg MM Score":_delta_cells(grp["dMM"], vmax_dmm),
+    "Δ Avg Sharpe Rank":  _delta_cells(grp["dSharpe"], vmax_dsh),
+}
 
 # HTML + colgroup (spacer column uses .col-spacer which you already zero-border in CSS)
-html_cat = cat_render.to_html(index=False, classes="tbl2", escape=False, border=0)
-html_cat = html_cat.replace('class="dataframe tbl2"', 'class="tbl2"')
 
 colgroup_cat = """
 <colgroup>
@@ -585,7 +384,7 @@ colgroup_cat = """
 </colgroup>
 """.strip()
 
-html_cat = html_cat.replace('<table class="tbl2">', f'<table class="tbl2">{colgroup_cat}', 1)
+html_cat = render_table(cat_render, classes="tbl2", colgroup=colgroup_cat)
 
 st.markdown(
     f"""
@@ -648,7 +447,7 @@ tf = TIMEFRAMES[local_tf]
 if not tcat.empty:
     # Alphabetical by ticker
     tcat = tcat.sort_values("Ticker", kind="stable")
-    tcat["Ticker_link"] = tcat["Ticker"].map(_mk_ticker_link)
+    tcat["Ticker_link"] = _mk_ticker_links(tcat["Ticker"])
 
     # Robust per-card scales (use exact schema fields for the selected timeframe)
     vmaxC_ret = _robust_vmax(tcat[tf["ret"]],  q=0.98, floor=1.0, step=1.0)
@@ -656,20 +455,17 @@ if not tcat.empty:
     vmaxC_dmm = _robust_vmax(tcat[tf["d_mm"]], q=0.98, floor=1.0, step=1.0)
 
     # Build render frame (current | spacer | timeframe changes)
-    t_render = pd.DataFrame({
+    t_render = {
         "Name":        tcat["Ticker_name"],                             # <- was "Name"
         "Ticker":      tcat["Ticker_link"],
-        "MM Score":    [ _score_cell(v) for v in tcat[CURRENT["mm"]]   ],
-        "Sharpe Rank": [ _rank_cell(v)  for v in tcat[CURRENT["rank"]] ],
-        "Tape Bias": tcat[CURRENT["tape"]].fillna("").map(_tape_pill),
+        "MM Score":    _score_cells(tcat[CURRENT["mm"]]),
+        "Sharpe Rank": _rank_cells(tcat[CURRENT["rank"]]),
+        "Tape Bias": _tape_pills(tcat[CURRENT["tape"]].fillna("")),
         "":            [ "" for _ in range(len(tcat)) ],               # spacer
-        "Δ %":         [ _divergent_pct_cell(v, vmaxC_ret) for v in tcat[tf["ret"]]  ],
-        "Δ MM Score":  [ _delta_cell(v, vmaxC_dmm)      for v in tcat[tf["d_mm"]]  ],
-        "Δ Sharpe Rank":[ _delta_cell(v, vmaxC_dsh)     for v in tcat[tf["d_sh"]] ],
-    })
-
-    html_t = t_render.to_html(index=False, classes="tbl", escape=False, border=0)
-    html_t = html_t.replace('class="dataframe tbl"', 'class="tbl"')
+        "Δ %":         _divergent_pct_cells(tcat[tf["ret"]], vmaxC_ret),
+        "Δ MM Score":  _delta_cells(tcat[tf["d_mm"]], vmaxC_dmm),
+        "Δ Sharpe Rank":_delta_cells(tcat[tf["d_sh"]], vmaxC_dsh),
+    }
 
     colgroup_t = """
     <colgroup>
@@ -684,7 +480,7 @@ if not tcat.empty:
       <col class="col-num">       <!-- MM Score Δ -->
     </colgroup>
     """.strip()
-    html_t = html_t.replace('<table class="tbl">', f'<table class="tbl">{colgroup_t}', 1)
+    html_t = render_table(t_render, classes="tbl", colgroup=colgroup_t)
 
     st.markdown(
         f"""
@@ -710,19 +506,4 @@ else:
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
@@ -3,6 +3,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – Deep Dive Dashboard", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 # --- Gate Morning Compass ---
 if not st.session_state.get("authenticated"):
@@ -14,7 +16,6 @@ if not st.session_state.get("authenticated"):
     st.stop()
 
 
-import base64
 from pathlib import Path
 import pandas as pd
 
@@ -43,166 +44,8 @@ import numpy as np
 
 #st.cache_data.clear()
 
-st.markdown("""
-<style>
-/* Make the content wider on desktops while keeping nice margins */
-[data-testid="stAppViewContainer"] .main .block-container{
-  max-width: 1900px;   /* was smaller; gives you more width on 27" */
-  padding-left: 1.2rem;
-  padding-right: 1.2rem;
-}
-
-""", unsafe_allow_html=True)
-
-st.markdown(
-    """
-<style>
-div[data-testid="stHorizontalBlock"] { min-width: 1100px; }
-section.main > div { max-width: 1900px; margin-left: auto; margin-right: auto; }
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-.card {
-  border: 1px solid #cfcfcf;
-  border-radius: 8px;
-  background: #fff;
-  padding: 14px 14px 10px 14px;
-}
-.card h3 { margin: 0 0 10px 0; font-size: 16px; font-weight: 700; color:#1a1a1a; }
-.small { font-size:12px; color:#666; }
-
-/* keep the selector compact (≈36 chars) */
-div[data-baseweb="select"] {
-  max-width: 65ch !important;
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
+apply_theme("deep_dive", "scrollbars")
 
-st.markdown("""
-<style>
-/* ===== Scoped centering for Stat Box and Graph 1 only ===== */
-
-/* STAT BOX row (immediately after the #stat-center marker) */
-#stat-center + div[data-testid="stHorizontalBlock"]{
-  display:flex !important; justify-content:center !important; gap:0 !important;
-}
-#stat-center + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(1),
-#stat-center + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(3){
-  flex:1 1 0 !important; min-width:0 !important;      /* symmetric side gutters */
-}
-#stat-center + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(2){
-  flex:0 0 auto !important; min-width:0 !important;   /* middle column = shrink-to-fit */
-}
-
-
-
-/* GRAPH 1 row (immediately after the #g1-center marker) */
-/* GRAPH 1 row (2/3 page wide, centered) */
-#g1-wide + div[data-testid="stHorizontalBlock"]{
-  margin-top: 0px !important;   /* ensure no extra gap above Graph 1 */  
-  display:flex !important; justify-content:center !important; gap:24px !important;
-}
-#g1-wide + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(1),
-#g1-wide + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(3){
-  flex:1 1 0 !important; min-width:0 !important;   /* side gutters */
-}
-#g1-wide + div[data-testid="stHorizontalBlock"] > div[data-testid="column"]:nth-child(2){
-  flex:4 1 0 !important; min-width:0 !important;   /* ~66.7% width for Graph 1 */
-}
-
-/* Make the st.pyplot WRAPPER fill the 2/3 middle column */
-#g1-wide + div[data-testid="stHorizontalBlock"] [data-testid="stImage"]{
-  width: 100% !important;
-  margin-top: 0 !important;
-  max-width: 100% !important;
-  display: block !important;
-}
-
-/* Ensure the figure/img inside also stretches to the wrapper */
-#g1-wide + div[data-testid="stHorizontalBlock"] [data-testid="stImage"] > figure,
-#g1-wide + div[data-testid="stHorizontalBlock"] [data-testid="stImage"] img{
-  width: 100% !important;
-  max-width: 100% !important;
-  height: auto !important;
-}
-
-/* Keep canvas covered too (some themes render via canvas) */
-#g1-wide + div[data-testid="stHorizontalBlock"] [data-testid="stImage"] canvas{
-  width: 100% !important;
-  max-width: 100% !important;
-}
-
-/* Tighten vertical space between Stat Box and Graph 1 */
-#stat-center + div[data-testid="stHorizontalBlock"]{
-  margin-bottom: 2px !important;      /* reduce bottom margin of the Stat Box row */
-}
-#g1-wide + div[data-testid="stHorizontalBlock"]{
-  margin-top: 0px !important;         /* reduce top margin of the Graph 1 row */
-}
-
-/* Ensure pyplot wrapper itself has no extra top margin */
-#g1-wide + div[data-testid="stHorizontalBlock"] [data-testid="stImage"]{
-  margin-top: 0 !important;
-}            
-
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ===== Signal Pack row — centered and tight under the Stat Box ===== */
-/* Target the FIRST HorizontalBlock that appears anywhere after #sp-center */
-#sp-center ~ div[data-testid="stHorizontalBlock"]:first-of-type{
-  display:flex !important;
-  justify-content:center !important;
-  gap:0 !important;
-  margin-top: 0px !important;     /* sits right under the stat box */
-}
-
-/* Symmetric side gutters + shrink-to-fit middle column */
-#sp-center ~ div[data-testid="stHorizontalBlock"]:first-of-type
-  > div[data-testid="column"]:nth-child(1),
-#sp-center ~ div[data-testid="stHorizontalBlock"]:first-of-type
-  > div[data-testid="column"]:nth-child(3){
-  flex:1 1 0 !important;
-  min-width:0 !important;
-}
-
-#sp-center ~ div[data-testid="stHorizontalBlock"]:first-of-type
-  > div[data-testid="column"]:nth-child(2){
-  flex:0 0 auto !important;      /* middle column = content width (like Stat Box) */
-  min-width:0 !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
 
 EXCEL_BLUE   = "#4472C4"
 EXCEL_ORANGE = "#FFC000"
@@ -274,7 +117,7 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -347,10 +190,6 @@ def add_mpl_watermark(
 # ==============================
 # HELPERS
 # ==============================
-def _image_to_base64(path: Path) -> str:
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 def fmt_px(v):
     try: return f"{float(v):,.1f}"
     except: return "—"
@@ -3329,19 +3168,4 @@ if render_info:
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – Signals", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 INFO_VALUE_KEY = "dd_show_information_charts_value"
@@ -56,104 +58,22 @@ if not st.session_state.get("authenticated"):
             
 # filters.py — Markmentum Filters Page (8 cards: 32..39 in 3/3/2 layout)
 from pathlib import Path
-import base64
+import time
+from functools import partial
 import pandas as pd
-import textwrap
 import streamlit.components.v1 as components
-from urllib.parse import quote_plus
+from utils.html_tables import (
+    _text, ticker_link_templates, fill_links,
+    ticker_links, render_table, pill_cells, fmt_int, fmt_num, fmt_pct, TAPE_BIAS_PALETTE,
+)
+from utils.screener import signal_screener, Range, OneOf, NUMERIC, CATEGORICAL, TEXT
 #import os
 
 # -------------------------
 # Responsive, no-wrap render styles (desktop + laptop)
 # -------------------------
 
-st.markdown("""
-<style>
-/* ---------------- Base layout ---------------- */
-div[data-testid="stHorizontalBlock"]{
-  display:flex;
-  flex-wrap: wrap;
-  gap: 28px;
-}
-
-/* Each Streamlit column behaves like a grid item */
-div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-  flex: 1 1 32%;                 /* desktop target ~3-up */
-  min-width: 300px;              /* allow 3-up comfortably */
-}
-
-/* Container width & side margins */
-[data-testid="stAppViewContainer"] .main .block-container,
-section.main > div {
-  width: 95vw;
-  max-width: 2100px;
-  margin-left: auto;
-  margin-right: auto;
-}
-
-/* Base typography + card shell */
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-.card {
-  border: 1px solid #cfcfcf;
-  border-radius: 8px;
-  background: #fff;
-  padding: 12px 12px 8px 12px;
-  box-shadow: 0 0 0 rgba(0,0,0,0);
-  max-width: 720px;            /* standard card width for non-desktop */
-  width: 100%;
-}
-.card h3 { margin: 0 0 8px 0; font-size: 16px; font-weight: 700; color:#1a1a1a; }
-
-/* Table */
-.tbl { border-collapse: collapse; width: 100%; table-layout: fixed; }
-.tbl th, .tbl td { border: 1px solid #d9d9d9; padding: 6px 8px; font-size: 13px; overflow:hidden; text-overflow:ellipsis; }
-.tbl th { background: #f2f2f2; font-weight: 700; text-align: left; }
-.center { text-align: center; }
-.right  { text-align: right; white-space: nowrap; }
-/* Center ONLY the table headers for Ticker and the numeric value column */
-.tbl thead th.col-ticker { text-align: center; }
-.tbl thead th.col-value  { text-align: center; }                
-
-/* --- Column widths (desktop defaults) --- */
-.tbl thead th:nth-child(1), .tbl tbody td:nth-child(1){
-  white-space: nowrap; min-width:11ch !important; width:39ch !important; max-width:39ch !important;
-}
-.tbl thead th:nth-child(2), .tbl tbody td:nth-child(2){ width:74px !important; }
-.tbl thead th:nth-child(3), .tbl tbody td:nth-child(3){
-  white-space: nowrap; min-width:6ch !important; width:22ch !important; max-width:22ch !important;
-}
-.tbl thead th:nth-child(4), .tbl tbody td:nth-child(4){ width:90px; }
-
-/* ---------------- Breakpoints ---------------- */
-
-/* DESKTOP (>=1700px): force 3-up, cards can expand within their column */
-@media (min-width: 1700px){
-  div[data-testid="stHorizontalBlock"] { flex-wrap: nowrap; }
-  div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-    flex: 0 0 32%;
-    min-width: 300px;
-  }
-  .card { max-width: none; }   /* let desktop cards fill their columns */
-}
-
-/* NON-DESKTOP (<1700px): ALWAYS 1-up, centered, fixed standard width */
-@media (max-width: 1699.98px){
-  div[data-testid="stHorizontalBlock"] > div[data-testid="column"]{
-    flex: 0 0 100%;
-  }
-  .card{
-    max-width: 720px;          /* standard width */
-    margin-left: auto;
-    margin-right: auto;
-  }
-  /* Optional: loosen text columns slightly for readability on smaller screens */
-  .tbl thead th:nth-child(1), .tbl tbody td:nth-child(1){ width:36ch !important; max-width:36ch !important; }
-  .tbl thead th:nth-child(3), .tbl tbody td:nth-child(3){ width:22ch !important; max-width:22ch !important; }
-}
-</style>
-""", unsafe_allow_html=True)
+apply_theme("signals", "scrollbars")
 
 
 
@@ -184,30 +104,6 @@ CSV_FILES = [
 #ADV_VALUE_KEY  = "dd_show_advanced_charts_value"
 #INFO_VALUE_KEY = "dd_show_information_charts_value"
 
-def _mk_ticker_link(ticker: str) -> str:
-    t = (ticker or "").strip().upper()
-    if not t:
-        return ""
-
-    # current toggle states (default False if not set yet)
-    adv_on  = st.session_state.get(ADV_VALUE_KEY, False)
-    info_on = st.session_state.get(INFO_VALUE_KEY, False)
-
-    adv_flag  = "1" if adv_on  else "0"
-    info_flag = "1" if info_on else "0"
-
-    proof = make_proof()
-
-    return (
-        f'<a href="?page=Deep%20Dive'
-        f'&ticker={quote_plus(t)}'
-        f'&adv={adv_flag}'
-        f'&info={info_flag}'
-        f'&proof={proof}" '
-        f'target="_self" rel="noopener" '
-        f'style="text-decoration:none; font-weight:600;">{t}</a>'
-    )
-
 qp = st.query_params
 dest = (qp.get("page") or "").strip().lower()
 
@@ -232,135 +128,27 @@ if dest.replace("%20", " ") == "deep dive":
 def row_spacer(height_px: int = 14):
     st.markdown(f"<div style='height:{height_px}px'></div>", unsafe_allow_html=True)
 
-def _card_table_html_three(df: pd.DataFrame):
-    """Render a 3-column table: Company | Ticker | category (no value column)."""
-    if df.empty:
-        return ""
-    cmap = {c.lower(): c for c in df.columns}
-    tcol = cmap.get("ticker") or "Ticker"
-    ncol = cmap.get("ticker_name") or cmap.get("company") or "Company"
-    ccol = cmap.get("category") or cmap.get("category") or "category"
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(f"""
-<tr>
-  <td class="company">{r.get(ncol, "")}</td>
-  <td class="center" style="width:74px">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td style="min-width:25ch">{r.get(ccol, "")}</td>
-</tr>""")
-    return f"""
-<div class="card">
-  <h3>__TITLE__</h3>
-  <table class="tbl">
-    <thead>
-      <tr>
-        <th style="min-width:42ch">Name</th>
-        <th style="width:74px" class="col-ticker">Ticker</th>
-        <th style="min-width:25ch">Category</th>
-      </tr>
-    </thead>
-    <tbody>
-      {''.join(rows)}
-    </tbody>
-  </table>
-</div>
-"""
-
-def _render_card_no_value(slot, title: str, df: pd.DataFrame):
-    with slot:
-        if df.empty:
-            st.info(f"No data for {title}.")
-            return
-        html = _card_table_html_three(df).replace("__TITLE__", title)
-        st.markdown(html, unsafe_allow_html=True)
-
 def _pick_col(df: pd.DataFrame, candidates):
     for c in candidates:
         if c in df.columns:
             return c
     return df.columns[-1] if len(df.columns) else None
 
-def _render_card_custom(slot, title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt):
-    with slot:
-        if df.empty or value_col is None:
-            st.info(f"No data for {title}.")
-            return
-        st.markdown(_card_table_html(title, df, value_col, value_label, value_fmt), unsafe_allow_html=True)
-
-def _image_to_base64(path: Path) -> str:
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-@st.cache_data(show_spinner=False)
 def load_csv(path: Path) -> pd.DataFrame:
     if not path.exists():
         return pd.DataFrame()
     return pd.read_csv(path)
 
-def _fmt_pct(val):
-    try:
-        v = float(val) * 100
-        #if abs(v) <= 1.0:
-        #   v *= 100.0
-        return f"{v:,.2f}%"
-    except:
-        return "—"
-
-def _fmt_millions(val):
-    try:
-        v = float(val)
-        if v > 1000:
-            v = v / 1_000_000.0
-        return f"{v:,.2f} M"
-    except:
-        return "—"
-
-def _fmt_num(val):
-    try:
-        return f"{float(val):,.0f}"
-    except:
-        return "—"
-
-def _guess_value_col(df: pd.DataFrame):
-    if df.empty:
-        return None, "Value", _fmt_num
-    cmap = {c.lower(): c for c in df.columns}
-    for key, label, fmt in [
-        ("daily_return_pct", "Percent", _fmt_pct),
-        ("percent",          "Percent", _fmt_pct),
-        ("volume",           "Shares",  _fmt_millions),
-        ("shares",           "Shares",  _fmt_millions),
-        ("model_score",      "Score",   _fmt_num),
-    ]:
-        if key in cmap:
-            return cmap[key], label, fmt
-    dims = {"ticker","ticker_name","company","category","category","date"}
-    for col in df.columns:
-        if col.lower() in dims:
-            continue
-        s = pd.to_numeric(df[col], errors="coerce")
-        if s.notna().sum() >= max(1, len(s)//4):
-            return col, "Value", _fmt_num
-    return df.columns[-1], "Value", _fmt_num
-
-def _card_table_html(title: str, df: pd.DataFrame, value_col: str, value_label: str, value_fmt):
-    safe = {c.lower(): c for c in df.columns}
-    tcol = safe.get("ticker") or "Ticker"
-    ncol = safe.get("ticker_name") or safe.get("company") or "Company"
-    ccol = safe.get("category") or safe.get("category") or "category"
-
-    rows = []
-    for _, r in df.iterrows():
-        rows.append(f"""
-<tr>
-  <td class="company">{r.get(ncol, '')}</td>
-  <td class="center" style="width:74px">{_mk_ticker_link(r.get(tcol, ""))}</td>
-  <td style="min-width:25ch">{r.get(ccol, '')}</td>
-  <td class="right" style="width:90px">{value_fmt(r.get(value_col))}</td>
-</tr>""")
-
-    html = f"""
+# column formatters (whole column at once; missing / non-numeric -> "—")
+_fmt_pct = partial(fmt_pct, nd=2, na="—")
+_fmt_num = partial(fmt_num, nd=0, na="—")
+
+# -------------------------
+# Card HTML (built once per release, shared by all sessions)
+# -------------------------
+# Deep Dive links carry the session's toggles and proof, so the cached HTML
+# holds a placeholder that fill_links() replaces at render time.
+_CARD = """
 <div class="card">
   <h3>{title}</h3>
   <table class="tbl">
@@ -368,103 +156,129 @@ def _card_table_html(title: str, df: pd.DataFrame, value_col: str, value_label:
       <tr>
         <th style="min-width:42ch">Name</th>
         <th style="width:74px" class="col-ticker">Ticker</th>
-        <th style="min-width:25ch">Category</th>
-        <th style="width:90px" class="right col-value">{value_label}</th>
+        <th style="min-width:25ch">Category</th>{value_th}
       </tr>
     </thead>
     <tbody>
-      {''.join(rows)}
+{rows}
     </tbody>
   </table>
 </div>
 """
-    return textwrap.dedent(html).strip()
-
-def _render_card(slot, title: str, df: pd.DataFrame):
+_VALUE_TH = '\n        <th style="width:90px" class="right col-value">{label}</th>'
+_ROW = """<tr>
+  <td class="company">{}</td>
+  <td class="center" style="width:74px">{}</td>
+  <td style="min-width:25ch">{}</td>{}
+</tr>"""
+_VALUE_TD = '\n  <td class="right" style="width:90px">{}</td>'
+
+def _card_html(title: str, df: pd.DataFrame, value_col=None, value_label: str = "", value_fmt=None) -> str | None:
+    """One list card; None when there is nothing to show.  No value column when value_label is empty."""
+    if df.empty or (value_label and value_col is None):
+        return None
+    cmap = {c.lower(): c for c in df.columns}
+    col = lambda key: df[key] if key in df.columns else [""] * len(df)
+    names = _text(col(cmap.get("ticker_name") or cmap.get("company") or "Company"))
+    links = ticker_link_templates(col(cmap.get("ticker") or "Ticker"))
+    cats  = _text(col(cmap.get("category") or "category"))
+    if value_label:
+        values = [_VALUE_TD.format(v) for v in value_fmt(df[value_col] if value_col in df.columns else [None] * len(df))]
+        value_th = _VALUE_TH.format(label=value_label)
+    else:
+        values, value_th = [""] * len(df), ""
+    rows = "\n".join(_ROW.format(*r) for r in zip(names, links, cats, values))
+    return _CARD.format(title=title, value_th=value_th, rows=rows).strip()
+
+def _render_card(slot, title: str, html: str | None, link_args: dict):
     with slot:
-        if df.empty:
+        if html is None:
             st.info(f"No data for {title}.")
             return
-        vcol, vlabel, vfmt = _guess_value_col(df)
-        st.markdown(_card_table_html(title, df, vcol, vlabel, vfmt), unsafe_allow_html=True)
+        st.markdown(fill_links(html, **link_args), unsafe_allow_html=True)
 
 # ========= HEADER =========
 if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_to_base64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
     )
 
-st.markdown("""
-<style>
-/* …your existing CSS… */
-
-/* Smaller list style for the helper card */
-.card ol.smalllist li { 
-  font-size: 14.5px !important; 
-  line-height: 1.5;
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
-
 # -------------------------
-# Load data (cache-clearable)
+# Load data + view model (cached per data release)
 # -------------------------
-st.cache_data.clear()
-
-@st.cache_data(show_spinner=False)
-def load_all_csvs(csv_files, data_dir: Path):
-    dfs_local = []
+# Keyed on the list files' (name, size, mtime), so a new data drop is picked
+# up on the next visit without clearing other pages' caches.  Column
+# resolution, score scaling, formatting and the card HTML are all done here,
+# once per release; a render only fills in the session's link params.
+SCORE_COLS = ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"]
+
+def _release_key(csv_files, data_dir: Path) -> tuple:
+    key = []
     for num, _ in csv_files:
-        dfs_local.append(load_csv(data_dir / f"qry_graph_data_{num}.csv"))
-    return dfs_local
-
-dfs = load_all_csvs(CSV_FILES, DATA_DIR)
+        p = data_dir / f"qry_graph_data_{num}.csv"
+        s = p.stat() if p.exists() else None
+        key.append((p.name, s.st_size if s else None, s.st_mtime_ns if s else None))
+    return tuple(key)
 
-# === Title under logo (date from csv #32) ===
 def _mdy_no_leading_zeros(dt: pd.Timestamp) -> str:
     dt = pd.to_datetime(dt)
     return f"{dt.month}/{dt.day}/{dt.year}"
 
-@st.cache_data(show_spinner=False)
-def _filters_title_date() -> str:
-    df = load_csv(DATA_DIR / "qry_graph_data_36.csv")  # #32
-    if df.empty:
-        return _mdy_no_leading_zeros(pd.Timestamp.today())
-    dmax = pd.to_datetime(df.get("Date"), errors="coerce").max()
-    if pd.isna(dmax):
-        dmax = pd.Timestamp.today()
-    return _mdy_no_leading_zeros(dmax)
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_signals(release: tuple, csv_files, data_dir: Path):
+    """(card HTML or None per list, title date) for one data release."""
+    dfs = [load_csv(data_dir / f"qry_graph_data_{num}.csv") for num, _ in csv_files]
+    titles = [label for _, label in csv_files]
+
+    # Chase / No Chase: score x100
+    for i in (0, 1):
+        col = _pick_col(dfs[i], SCORE_COLS)
+        if col is not None:
+            dfs[i][col] = pd.to_numeric(dfs[i][col], errors="coerce") * 100
+        dfs[i] = (dfs[i], col)
+
+    # Watch: score x100 as watch_x100
+    col = _pick_col(dfs[2], ["Score", "score"])
+    if col is not None and not dfs[2].empty:
+        dfs[2]["watch_x100"] = pd.to_numeric(dfs[2][col], errors="coerce") * 100.0
+    dfs[2] = (dfs[2], "watch_x100")
+
+    cards = [
+        _card_html(titles[0], *dfs[0], "Chase Score", _fmt_num),
+        _card_html(titles[1], *dfs[1], "Chase Score", _fmt_num),
+        _card_html(titles[2], *dfs[2], "Watch Score", _fmt_num),
+        _card_html(titles[3], dfs[3]),
+        _card_html(titles[4], dfs[4], _pick_col(dfs[4], SCORE_COLS), "Score", _fmt_num),
+        _card_html(titles[5], dfs[5], _pick_col(dfs[5], SCORE_COLS), "Score", _fmt_num),
+        _card_html(titles[6], dfs[6], _pick_col(dfs[6], ["Value", "daily_return_pct", "percent"]), "% Change", _fmt_pct),
+        _card_html(titles[7], dfs[7], _pick_col(dfs[7], ["Value", "daily_return_pct", "percent"]), "% Change", _fmt_pct),
+    ]
+
+    # title date from csv #36
+    chase = dfs[0][0]
+    dmax = pd.to_datetime(chase.get("Date"), errors="coerce").max() if not chase.empty else pd.NaT
+    title_date = _mdy_no_leading_zeros(dmax if pd.notna(dmax) else pd.Timestamp.today())
+    return cards, title_date
+
+cards, title_date = load_signals(_release_key(CSV_FILES, DATA_DIR), CSV_FILES, DATA_DIR)
+
+# one proof per render for every Deep Dive link on the page
+link_args = {
+    "adv_on":  st.session_state.get(ADV_VALUE_KEY, False),
+    "info_on": st.session_state.get(INFO_VALUE_KEY, False),
+    "proof":   make_proof(),
+}
 
+# === Title under logo (date from csv #36) ===
 st.markdown(
     f"""
     <div style="text-align:center; font-size:18px; font-weight:600; margin:-6px 0 10px;">
-        Signals – {_filters_title_date()}
+        Signals – {title_date}
     </div>
     """,
     unsafe_allow_html=True,
@@ -477,55 +291,22 @@ titles = [label for _, label in CSV_FILES]
 
 # Row 1: 0,1,2  (all show % Change)
 r1c1, r1c2, r1c3 = st.columns(3, gap="large")
-score_col = _pick_col(dfs[0], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
-dfs[0][score_col] = dfs[0][score_col] * 100
-_render_card_custom(r1c1, titles[0], dfs[0], score_col, "Chase Score", _fmt_num)
-
-score_col = _pick_col(dfs[1], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
-dfs[1][score_col] = dfs[1][score_col] * 100
-_render_card_custom(r1c2, titles[1], dfs[1], score_col, "Chase Score", _fmt_num)
-
-score_col = _pick_col(dfs[2], ["Score", "score"])
-if score_col is not None and not dfs[2].empty:
-    dfs[2] = dfs[2].copy()
-    dfs[2]["watch_x100"] = pd.to_numeric(dfs[2][score_col], errors="coerce") * 100.0
-_render_card_custom(r1c3, titles[2], dfs[2], "watch_x100", "Watch Score", _fmt_num)
+for slot, k in zip((r1c1, r1c2, r1c3), (0, 1, 2)):
+    _render_card(slot, titles[k], cards[k], link_args)
 
 row_spacer(14)
 
 # Row 2: 3,4,5  (card 4 %Change; cards 5–6 Chase Score)
 r2c1, r2c2, r2c3 = st.columns(3, gap="large")
-df3 = dfs[3].copy()
-keep_cols = ["Company", "Ticker", "Category"]
-df3 = df3[[col for col in keep_cols if col in df3.columns]]
-_render_card_no_value(r2c1, titles[3], dfs[3])
-
-score_col = _pick_col(dfs[4], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
-dfs[4][score_col] = dfs[4][score_col] 
-_render_card_custom(r2c2, titles[4], dfs[4], score_col, "Score", _fmt_num)
-
-score_col = _pick_col(dfs[5], ["ChaseScore", "chasescore", "chase_score", "Chase_Score","Score", "score", "model_score"])
-dfs[5][score_col] = dfs[5][score_col] 
-_render_card_custom(r2c3, titles[5], dfs[5], score_col, "Score", _fmt_num)
-
-
-
-
+for slot, k in zip((r2c1, r2c2, r2c3), (3, 4, 5)):
+    _render_card(slot, titles[k], cards[k], link_args)
 
 row_spacer(8)
 
 # Row 3: 6,7 (use 3 columns so card sizes match row 2; leave last empty)
 r3c1, r3c2, r3c3 = st.columns(3, gap="large")
-
-vcol = _pick_col(dfs[6], ["Value", "daily_return_pct", "percent"])
-_render_card_custom(r3c1, titles[6], dfs[6], vcol, "% Change", _fmt_pct)
-
-vcol = _pick_col(dfs[7], ["Value", "daily_return_pct", "percent"])
-_render_card_custom(r3c2, titles[7], dfs[7], vcol, "% Change", _fmt_pct)
-
-
-
-
+for slot, k in zip((r3c1, r3c2), (6, 7)):
+    _render_card(slot, titles[k], cards[k], link_args)
 
 with r3c3:
     st.markdown(
@@ -551,21 +332,103 @@ with r3c3:
 
 
 # -------------------------
-# Footer disclaimer
+# Signal Screener (signal_box.csv)
 # -------------------------
-st.markdown("---")
+# Compound filters (any-of on the categoricals, ranges on the numbers) and a
+# sort over any column.  The indexes are built once per data release in
+# utils/screener.py, so a query is a few bitmap ops.
+row_spacer(14)
+screener = signal_screener()
+
+SCREEN_LABELS = {**{c: lbl for c, (lbl, _) in NUMERIC.items()}, **CATEGORICAL, **TEXT}
+SCREEN_BASE = ["Sharpe_Rank", "MM_Score"]
+SCREEN_LIMITS = {"25": 25, "50": 50, "100": 100, "250": 250, "All": None}
+
+def _screen_cells(col: str, values) -> list[str]:
+    kind = NUMERIC[col][1]
+    if kind == "pct":
+        return fmt_pct(values, 2)
+    if kind == "int":
+        return fmt_int(values)
+    return fmt_num(values, 2 if col == "Close" else 1)
+
 st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
+    f"""
+    <div style="text-align:center; font-size:18px; font-weight:600; margin:6px 0 10px;">
+        Signal Screener – {screener.asof}
     </div>
     """,
     unsafe_allow_html=True,
-)
\ No newline at end of file
+)
+
+if screener.n == 0:
+    st.info("`signal_box.csv` missing or empty.")
+else:
+    c1, c2, c3 = st.columns(3, gap="large")
+    picked = {}
+    for slot, col in zip((c1, c2, c3), screener.categorical):
+        with slot:
+            picked[col] = st.multiselect(CATEGORICAL[col], screener.values(col), key=f"scr_{col}")
+
+    range_cols = st.multiselect(
+        "Range filters",
+        screener.numeric,
+        format_func=lambda c: SCREEN_LABELS[c] + (" (%)" if NUMERIC[c][1] == "pct" else ""),
+        key="scr_ranges",
+    )
+    ranges = []
+    for col in range_cols:
+        scale = 100.0 if NUMERIC[col][1] == "pct" else 1.0
+        lo_b, hi_b = screener.bounds(col) or (None, None)
+        r1, r2, r3 = st.columns([2, 1, 1], gap="large")
+        with r1:
+            st.markdown(
+                f"<div style='padding-top:30px; font-weight:600;'>{SCREEN_LABELS[col]}"
+                f"<span style='color:gray; font-weight:400;'> &nbsp;range {lo_b * scale:,.2f} to {hi_b * scale:,.2f}</span></div>"
+                if lo_b is not None else f"<div style='padding-top:30px;'>{SCREEN_LABELS[col]}</div>",
+                unsafe_allow_html=True,
+            )
+        with r2:
+            lo = st.number_input("Min", value=None, format="%.2f", key=f"scr_lo_{col}")
+        with r3:
+            hi = st.number_input("Max", value=None, format="%.2f", key=f"scr_hi_{col}")
+        ranges.append(Range(col, None if lo is None else lo / scale, None if hi is None else hi / scale))
+
+    sort_options = screener.numeric + screener.categorical + [c for c in TEXT if c in screener.df.columns]
+    s1, s2, s3 = st.columns(3, gap="large")
+    with s1:
+        sort_by = st.selectbox("Sort by", sort_options, index=sort_options.index("Sharpe_Rank") if "Sharpe_Rank" in sort_options else 0,
+                               format_func=lambda c: SCREEN_LABELS.get(c, c), key="scr_sort")
+    with s2:
+        order = st.radio("Order", ["Descending", "Ascending"], horizontal=True, key="scr_order")
+    with s3:
+        limit = st.selectbox("Show", list(SCREEN_LIMITS), index=1, key="scr_limit")
+
+    filters = [OneOf(col, tuple(vals)) for col, vals in picked.items()] + ranges
+    t0 = time.perf_counter()
+    rows, total = screener.query(filters, sort_by, order == "Descending", SCREEN_LIMITS[limit])
+    query_ms = (time.perf_counter() - t0) * 1000
+
+    shown = list(dict.fromkeys(
+        [c for c in SCREEN_BASE if c in rows.columns] + [r.column for r in ranges]
+        + ([sort_by] if sort_by in NUMERIC else [])
+    ))
+    render = {
+        "Name":     _text(rows["Ticker_name"]) if "Ticker_name" in rows.columns else [""] * len(rows),
+        "Ticker":   ticker_links(rows["Ticker"], **link_args),
+        "Category": _text(rows["Category"]) if "Category" in rows.columns else [""] * len(rows),
+        "Tape Bias": pill_cells(rows["Tape_Bias"].fillna(""), TAPE_BIAS_PALETTE) if "Tape_Bias" in rows.columns else [""] * len(rows),
+        "Volatility Spread Quadrant": _text(rows.get("Volatility_Spread_Quadrant", pd.Series([""] * len(rows)))),
+        **{SCREEN_LABELS[c]: _screen_cells(c, rows[c]) for c in shown},
+    }
+    st.markdown(
+        f'<div class="card screener">\n<h3>{total:,} of {screener.n:,} tickers match</h3>\n'
+        f'{render_table(render, classes="tbl tbl-screener")}\n</div>',
+        unsafe_allow_html=True,
+    )
+    st.caption(f"Showing {len(rows):,} · query {query_ms:.1f} ms")
+
+# -------------------------
+# Footer disclaimer
+# -------------------------
+render_footer()
\ No newline at end of file
@@ -2,6 +2,9 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum - Universe", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
+from utils.universe import COLUMNS, TICKER_DATA, universe
 
 # --- Gate Morning Compass ---
 if not st.session_state.get("authenticated"):
@@ -14,8 +17,6 @@ if not st.session_state.get("authenticated"):
 
 
 from pathlib import Path
-import base64
-import pandas as pd
 import altair as alt
 import sys
 import numpy as np
@@ -27,35 +28,7 @@ import os
 # Page & shared style
 # -------------------------
 
-st.markdown(
-    """
-<style>
-div[data-testid="stHorizontalBlock"] { min-width: 1100px; }
-section.main > div { max-width: 1700px; margin-left: auto; margin-right: auto; }
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-.card {
-  border: 1px solid #cfcfcf;
-  border-radius: 8px;
-  background: #fff;
-  padding: 14px 14px 10px 14px;
-}
-.card h3 { margin: 0 0 10px 0; font-size: 16px; font-weight: 700; color:#1a1a1a; }
-.small { font-size:12px; color:#666; }
-
-/* keep the selector compact (≈36 chars) */
-div[data-baseweb="select"] {
-  max-width: 36ch !important;
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
-
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
+apply_theme("card_page")
 
 # -------------------------
 # Paths
@@ -67,7 +40,6 @@ DATA_DIR  = APP_DIR / "data"
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
 
-CSV_PATH  = DATA_DIR / "ticker_data.csv"   # model_score
 
 
 # -------------------------
@@ -77,7 +49,7 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -85,45 +57,19 @@ if LOGO_PATH.exists():
 
 
 # === Universe – All Instruments (index hidden + fixed % formatting) ===
+# Search, sort and paging run server-side on utils/universe.py's indexes
+# (built once per data release); only the current page goes to the browser.
 
-@st.cache_data(ttl=600)
-def load_universe(csv_path: Path) -> pd.DataFrame:
-    if not csv_path.exists():
-        st.error("Could not find ticker_data.csv. Place it in ./data or the working directory.")
-        st.stop()
-
-    df = pd.read_csv(csv_path)
-
-    expected = [
-        "Ticker", "Ticker_name", "Category", "Date", "Close",
-        "day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change",
-    ]
-    missing = [c for c in expected if c not in df.columns]
-    if missing:
-        st.error(f"CSV is missing required columns: {missing}")
-        st.stop()
-
-    # types
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df["Close"] = pd.to_numeric(df["Close"], errors="coerce")
-    for c in ["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    # friendly headers
-    df = df.rename(
-        columns={
-            "Ticker_name": "Name",
-            "day_pct_change": "Day %",
-            "week_pct_change": "Week %",
-            "month_pct_change": "Month %",
-            "quarter_pct_change": "Quarter %",
-        }
-    )
-
-    # stable ordering
-    return df.sort_values(["Category", "Ticker"], kind="mergesort").reset_index(drop=True)
+PAGE_SIZE = 50
+SORT_LABELS = {None: "Category, Ticker", **{c: c for c in COLUMNS.values()}}
 
-df = load_universe(CSV_PATH)
+uni = universe()
+if uni is None:
+    st.error("Could not find ticker_data.csv. Place it in ./data or the working directory.")
+    st.stop()
+if uni.missing:
+    st.error(f"CSV is missing required columns: {uni.missing}")
+    st.stop()
 
 st.markdown(
     '<h2 style="text-align:center; margin:0.25rem 0 0.5rem;">Universe – All Instruments</h2>',
@@ -134,29 +80,41 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+
+def _first_page():
+    st.session_state["uni_page"] = 0
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _view_csv(_uni, release: int, q: str, sort_by: str | None, descending: bool) -> bytes:
+    """CSV of a whole view, per data release (the engine itself is not hashed)."""
+    return _uni.csv(q, sort_by, descending)
+
+
 # A narrow center column with equal side gutters to visually center everything
 pad_l, center, pad_r = st.columns([1, 4, 1], gap="small")
 
 with center:
-    # Top row inside the centered column: search on the left, last-updated on the right
-    tleft, tright = st.columns([3, 1])
+    # Top row inside the centered column: search, sort and order on the left, last-updated on the right
+    tleft, tsort, torder, tright = st.columns([3, 1.6, 1.4, 1])
     with tleft:
-        q = st.text_input("Search (ticker or name)", placeholder="Type to filter…")
+        q = st.text_input("Search (ticker or name)", placeholder="Type to filter…", key="uni_q", on_change=_first_page)
+    with tsort:
+        sort_by = st.selectbox("Sort by", list(SORT_LABELS), format_func=SORT_LABELS.get,
+                               key="uni_sort", on_change=_first_page)
+    with torder:
+        order = st.radio("Order", ["Ascending", "Descending"], horizontal=True, key="uni_order",
+                         on_change=_first_page, disabled=sort_by is None)
     with tright:
-        if df["Date"].notna().any():
-            st.caption(f"Last updated: {pd.to_datetime(df['Date']).max().date():%Y-%m-%d}")
-        else:
-            st.caption("Last updated: —")
-
-    # Filter the view based on the query
-    if q:
-        ql = q.strip().lower()
-        view = df[
-            df["Ticker"].str.lower().str.contains(ql, na=False)
-            | df["Name"].str.lower().str.contains(ql, na=False)
-        ].copy()
-    else:
-        view = df.copy()
+        st.caption(f"Last updated: {uni.updated:%Y-%m-%d}" if uni.updated else "Last updated: —")
+
+    descending = sort_by is not None and order == "Descending"
+    page = st.session_state.get("uni_page", 0)
+    view, total = uni.page(q, sort_by, descending, page, PAGE_SIZE)
+    pages = max(1, -(-total // PAGE_SIZE))
+    if page >= pages:   # data release shrank the result
+        page = st.session_state["uni_page"] = pages - 1
+        view, total = uni.page(q, sort_by, descending, page, PAGE_SIZE)
 
     # Compact column widths + correct percent formatting
     cc = st.column_config
@@ -174,37 +132,43 @@ with center:
 
     # Render the table centered (because it's inside the center column)
     st.dataframe(
-        view[["Ticker", "Name", "Category", "Date", "Close", "Day %", "Week %", "Month %", "Quarter %"]],
+        view,
         hide_index=True,
         use_container_width=True,  # fills the center column width
         height=560,
         column_config=table_config,
     )
 
-    # Download button centered with the table (same column)
-    st.download_button(
-        "Download current view (CSV)",
-        view.to_csv(index=False).encode("utf-8"),
-        file_name="universe_view.csv",
-        type="secondary",
+    # Pager: previous / position / next
+    p_prev, p_info, p_next = st.columns([1, 3, 1])
+    if p_prev.button("◀ Previous", disabled=page == 0, use_container_width=True):
+        st.session_state["uni_page"] = page - 1
+        st.rerun()
+    if p_next.button("Next ▶", disabled=page >= pages - 1, use_container_width=True):
+        st.session_state["uni_page"] = page + 1
+        st.rerun()
+    first = page * PAGE_SIZE + 1 if total else 0
+    p_info.markdown(
+        f'<div style="text-align:center; padding-top:0.5rem;">'
+        f"{first:,}–{page * PAGE_SIZE + len(view):,} of {total:,} instruments · page {page + 1} of {pages}</div>",
+        unsafe_allow_html=True,
     )
 
+    # Download button centered with the table (same column); the CSV is only
+    # built once asked for, via a Prepare button for the current view
+    view_key = (TICKER_DATA.stat().st_mtime_ns, q.strip().lower(), sort_by, descending)
+    if st.session_state.get("uni_csv") == view_key:
+        st.download_button(
+            "Download current view (CSV)",
+            _view_csv(uni, *view_key),
+            file_name="universe_view.csv",
+            type="secondary",
+        )
+    else:
+        st.button("Prepare current view (CSV)", type="secondary",
+                  on_click=st.session_state.__setitem__, args=("uni_csv", view_key))
+
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – About", layout="wide", initial_sidebar_state="expanded")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 # --- Gate Morning Compass ---
 if not st.session_state.get("authenticated"):
@@ -13,7 +15,6 @@ if not st.session_state.get("authenticated"):
     st.stop()
 
 
-import base64
 from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -69,35 +70,7 @@ components.html("""
 """, height=0, width=0)
 
 
-st.markdown(
-    """
-<style>
-div[data-testid="stHorizontalBlock"] { min-width: 1100px; }
-section.main > div { max-width: 1700px; margin-left: auto; margin-right: auto; }
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-.card {
-  border: 1px solid #cfcfcf;
-  border-radius: 8px;
-  background: #fff;
-  padding: 14px 14px 10px 14px;
-}
-.card h3 { margin: 0 0 10px 0; font-size: 16px; font-weight: 700; color:#1a1a1a; }
-.small { font-size:12px; color:#666; }
-
-/* keep the selector compact (≈36 chars) */
-div[data-baseweb="select"] {
-  max-width: 36ch !important;
-}
-</style>
-""",
-    unsafe_allow_html=True,
-)
-
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
+apply_theme("card_page", "scrollbars")
 
 EXCEL_BLUE   = "#4472C4"
 EXCEL_ORANGE = "#FFC000"
@@ -123,7 +96,7 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -234,43 +207,7 @@ We deliver volatility-adjusted probable ranges, proprietary scoring, and AI-gene
     unsafe_allow_html=True,
 )
 
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
-
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
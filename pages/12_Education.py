@@ -2,6 +2,8 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – Education", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils.static_assets import asset_url, static_url
+from utils.theme import apply_theme, render_footer
 
 # --- Gate Morning Compass ---
 if not st.session_state.get("authenticated"):
@@ -13,7 +15,6 @@ if not st.session_state.get("authenticated"):
     st.stop()
 
 
-import base64
 from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -26,61 +27,9 @@ import os
 # Page & shared style
 # -------------------------
 # --- Typography + image scaling to match About page ---
-st.markdown("""
-<style>
-/* Mirror About page font stack */
-html, body, [class^="css"], .stMarkdown, .stDataFrame, .stTable, .stText, .stButton {
-  font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-}
-
-/* Education content container + default sizing */
-.edu-wrapper {
-  max-width: 900px;          /* same visual width as About’s main column */
-  margin: 0 auto;
-  padding: 0 6px;
-  line-height: 1.5;
-}
-.edu-wrapper p, .edu-wrapper li { font-size: 16px; }
-.edu-wrapper h1 { font-size: 28px; font-weight: 700; margin: 16px 0 8px; }
-.edu-wrapper h2 { font-size: 24px; font-weight: 700; margin: 16px 0 8px; }
-.edu-wrapper h3 { font-size: 21px; font-weight: 600; margin: 14px 0 8px; }
-
-/* Make screenshots fit nicely on Cloud */
-.edu-wrapper img {
-  max-width: 100% !important;
-  height: auto !important;
-  display: block;
-  margin: 8px auto;
-}
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown("""
-<style>
-/* ========== Bigger, easier-to-grab scrollbars (light theme) ========== */
-
-/* Global page scrollbar — Chromium/WebKit */
-:root::-webkit-scrollbar        { width: 16px; height: 16px; }
-:root::-webkit-scrollbar-track  { background: #f2f2f2; }
-:root::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-:root::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Inner scrollables (tables/dataframes/expander bodies) — Chromium/WebKit */
-div[tabindex="0"]::-webkit-scrollbar        { width: 14px; height: 14px; }
-div[tabindex="0"]::-webkit-scrollbar-track  { background: #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb  { background: #bdbdbd; border-radius: 8px; border: 3px solid #f2f2f2; }
-div[tabindex="0"]::-webkit-scrollbar-thumb:hover { background: #9a9a9a; }
-
-/* Firefox */
-html { scrollbar-width: thick; scrollbar-color: #bdbdbd #f2f2f2; }
-</style>
-""", unsafe_allow_html=True)
+apply_theme("education", "scrollbars")
 
 
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
 EXCEL_BLUE   = "#4472C4"
 EXCEL_ORANGE = "#FFC000"
 EXCEL_GRAY   = "#A6A6A6"
@@ -103,7 +52,7 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
@@ -123,20 +72,83 @@ st.markdown(
         unsafe_allow_html=True,
     )
 
-st.cache_data.clear()
-
-# ---------- Render the Education .docx as-is ----------
-import io
-import os
-from pathlib import Path
-import streamlit as st
+# ---------- Render the Education .docx, one section at a time ----------
+import mimetypes
+import re
+from html import escape
 
 DOCX_PATH = DATA_DIR / "Educational Page.docx"
+PDF_PATH  = DATA_DIR / "Educational Page.pdf"
+
+# Section titles in the doc are bold-only paragraphs (no Word heading styles);
+# these bold lines sit inside "Markmentum Score" and are not sections.
+_TITLE_RE = re.compile(r"<p><strong>([^<*][^<]{0,79})</strong></p>")
+_SUBHEADINGS = {"How it works", "How to use", "Important Guardrail Rules to Note"}
+
+# Scoped styles so this block matches About page typography and scales screenshots
+SCOPED_CSS = """
+<style>
+  .edu-wrapper {
+    max-width: 900px;
+    margin: 0 auto;
+    padding: 0 6px;
+    line-height: 1.5;
+    font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+  }
+  .edu-wrapper p, .edu-wrapper li { font-size: 16px; }
+  .edu-wrapper h1 { font-size: 28px; font-weight: 700; margin: 16px 0 8px; }
+  .edu-wrapper h2 { font-size: 24px; font-weight: 700; margin: 16px 0 8px; }
+  .edu-wrapper h3 { font-size: 21px; font-weight: 600; margin: 14px 0 8px; }
+  .edu-wrapper img {
+    max-width: 100% !important;
+    height: auto !important;
+    display: block;
+    margin: 8px auto;
+  }
+</style>
+"""
+
+
+def _split_sections(html_body: str) -> list[tuple[str, str]]:
+    """[(title, html)] split at the doc's section titles; any preamble joins the first section."""
+    cuts = [
+        (m.start(), m.group(1).strip().rstrip(":"))
+        for m in _TITLE_RE.finditer(html_body)
+        if m.group(1).strip().rstrip(":") not in _SUBHEADINGS
+    ]
+    if not cuts:
+        return [("Education", html_body)]
+    bounds = [0] + [pos for pos, _ in cuts[1:]] + [len(html_body)]
+    return [(title, html_body[bounds[i]:bounds[i + 1]]) for i, (_, title) in enumerate(cuts)]
+
+
+@st.cache_data(show_spinner="Loading the Education guide…")
+def load_education_sections(docx_path: str, mtime_ns: int) -> list[tuple[str, str]]:
+    """
+    Convert the .docx once per file version (mtime_ns is the cache key).
+    Screenshots are published as static files and lazy-loaded instead of
+    being inlined as ~3 MB of data: URIs.
+    """
+    import mammoth
+    from utils.static_assets import bytes_url
+
+    def _image(image):
+        with image.open() as f:
+            data = f.read()
+        ext = mimetypes.guess_extension(image.content_type or "") or ".png"
+        return {"src": bytes_url(data, f"edu{ext}"), "loading": "lazy"}
+
+    with open(docx_path, "rb") as f:
+        html_body = mammoth.convert_to_html(
+            f, convert_image=mammoth.images.img_element(_image)
+        ).value
+    return _split_sections(html_body)
+
 
 def render_docx_as_html(docx_path: Path):
-    """Render a .docx (with screenshots) as HTML inside a 900px column."""
+    """Render the selected section of a .docx (with screenshots) as HTML inside a 900px column."""
     try:
-        import mammoth  # ensure mammoth is in requirements.txt (e.g., mammoth==1.11.0)
+        import mammoth  # noqa: F401  ensure mammoth is in requirements.txt (e.g., mammoth==1.11.0)
     except Exception:
         st.error('Missing dependency: **mammoth**. Add `mammoth==1.11.0` to requirements.txt and redeploy.')
         if Path(docx_path).exists():
@@ -148,57 +160,50 @@ def render_docx_as_html(docx_path: Path):
         st.error(f"Couldn't find: `{docx_path}`")
         return
 
-    with open(docx_path, "rb") as f:
-        html_body = mammoth.convert_to_html(f).value  # images are inlined as data URIs by default
-
-    # Scoped styles so this block matches About page typography and scales screenshots
-    scoped_css = """
-    <style>
-      .edu-wrapper {
-        max-width: 900px;
-        margin: 0 auto;
-        padding: 0 6px;
-        line-height: 1.5;
-        font-family: system-ui, -apple-system, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-      }
-      .edu-wrapper p, .edu-wrapper li { font-size: 16px; }
-      .edu-wrapper h1 { font-size: 28px; font-weight: 700; margin: 16px 0 8px; }
-      .edu-wrapper h2 { font-size: 24px; font-weight: 700; margin: 16px 0 8px; }
-      .edu-wrapper h3 { font-size: 21px; font-weight: 600; margin: 14px 0 8px; }
-      .edu-wrapper img {
-        max-width: 100% !important;
-        height: auto !important;
-        display: block;
-        margin: 8px auto;
-      }
-    </style>
-    """
+    sections = load_education_sections(str(docx_path), Path(docx_path).stat().st_mtime_ns)
+    titles = [t for t, _ in sections]
 
-    wrapped = f'{scoped_css}<div class="edu-wrapper">{html_body}</div>'
-    st.components.v1.html(wrapped, height=1200, scrolling=True)
+    left, mid, right = st.columns([1, 2, 1])
+    with mid:
+        idx = st.selectbox(
+            "Section",
+            range(len(titles)),
+            format_func=titles.__getitem__,
+            key="edu_section",
+        )
+
+    wrapped = f'{SCOPED_CSS}<div class="edu-wrapper">{sections[idx][1]}</div>'
+    components.html(wrapped, height=1200, scrolling=True)
 # Call it
 #st.markdown("### Education")
 render_docx_as_html(DOCX_PATH)
 
 
-PDF_PATH = Path("data/Educational Page.pdf")   # adjust name if different
-
 def render_education_download():
-    if PDF_PATH.exists():
-        # read once so Streamlit can serve bytes
-        pdf_bytes = PDF_PATH.read_bytes()
-        # center the button (optional)
-        left, mid, right = st.columns([1, 2, 1])
-        with mid:
-            st.download_button(
-                "📄 Download Education (PDF)",
-                data=pdf_bytes,
-                file_name="Markmentum_Education.pdf",
-                mime="application/pdf",
-                type="secondary",
-            )
-    else:
+    if not PDF_PATH.exists():
         st.info(f"Education PDF not found at: `{PDF_PATH}`")
+        return
+
+    left, mid, right = st.columns([1, 2, 1])
+    with mid:
+        url = static_url(PDF_PATH)
+        if url:
+            # served straight off disk by the static file handler (cacheable,
+            # no copy held in the session or re-sent over the websocket)
+            st.markdown(
+                f'<div class="edu-download"><a href="{escape(url, quote=True)}" '
+                f'download="Markmentum_Education.pdf">📄 Download Education (PDF)</a></div>',
+                unsafe_allow_html=True,
+            )
+        else:
+            with open(PDF_PATH, "rb") as f:
+                st.download_button(
+                    "📄 Download Education (PDF)",
+                    data=f,
+                    file_name="Markmentum_Education.pdf",
+                    mime="application/pdf",
+                    type="secondary",
+                )
 
 # call this after rendering the page content
 render_education_download()
@@ -207,19 +212,4 @@ render_education_download()
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
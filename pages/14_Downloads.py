@@ -2,6 +2,10 @@ import streamlit as st
 st.set_page_config(page_title="Markmentum – Downloads", layout="wide")
 
 from utils.auth import verify_proof, make_proof, restore_session_from_cookie2
+from utils import export_archive, export_catalog, export_store
+from utils.export_catalog import CATALOG, EXPORT_DIR
+from utils.static_assets import asset_url
+from utils.theme import apply_theme, render_footer
 
 # --- Gate Morning Compass ---
 if not st.session_state.get("authenticated"):
@@ -14,11 +18,8 @@ if not st.session_state.get("authenticated"):
 
             
 from pathlib import Path
-from datetime import datetime
-from io import BytesIO
-import zipfile
+from datetime import date, datetime
 import os
-import base64
 from zoneinfo import ZoneInfo
 
 # ---------- Paths / assets ----------
@@ -26,11 +27,7 @@ _here = Path(__file__).resolve().parent
 APP_DIR = _here if _here.name != "pages" else _here.parent
 ASSETS_DIR = APP_DIR / "assets"
 LOGO_PATH = ASSETS_DIR / "markmentum_logo.png"
-EXPORT_DIR = Path(os.getenv("MARKMENTUM_EXPORT_DIR", APP_DIR / "data")).resolve()
 
-def _image_b64(p: Path) -> str:
-    with open(p, "rb") as f:
-        return base64.b64encode(f.read()).decode()
 # -------------------------
 # Header: logo centered
 # -------------------------
@@ -38,11 +35,13 @@ if LOGO_PATH.exists():
     st.markdown(
         f"""
         <div style="text-align:center; margin: 8px 0 16px;">
-            <img src="data:image/png;base64,{_image_b64(LOGO_PATH)}" width="440">
+            <img src="{asset_url(LOGO_PATH)}" width="440">
         </div>
         """,
         unsafe_allow_html=True,
     )
+
+apply_theme()   # no page CSS; switches off sheets left active by the previous page
 #st.markdown("## Downloads")
 
 
@@ -59,36 +58,6 @@ with narrow_container(3):
 
     st.markdown("## Downloads")
 
-    # ---------------- Catalog ----------------
-    CATALOG = {
-        "stat_box.csv":                    ("Stat Box",                          "stat_box.csv"),
-        "signal_box.csv":                  ("Signal Box",                        "signal_box.csv"),
-        "qry_graph_data_01.csv":           ("Probable Ranges",                   "Probable Ranges.csv"),
-        "qry_graph_data_02.csv":           ("Trend Lines",                       "Trend Lines.csv"),
-        "qry_graph_data_03.csv":           ("Probable Anchors",                  "Probable Anchors.csv"),
-        "qry_graph_data_04.csv":           ("Price to LT Probable Anchor",       "Price to LT Probable Anchor.csv"),
-        "qry_graph_data_05.csv":           ("30-Day Rvol Z-Score",               "30-Day Rvol Z-Score.csv"),
-        "qry_graph_data_06.csv":           ("Z-Score Percentile Rank",           "Z-Score Percentile Rank.csv"),
-        "qry_graph_data_07.csv":           ("Rvol 30-Day",                       "Rvol 30-Day.csv"),
-        "qry_graph_data_08.csv":           ("30-Day Sharpe Ratio",               "30-Day Sharpe Ratio.csv"),
-        "qry_graph_data_09.csv":           ("Sharpe Ratio Percentile Rank",      "Sharpe Ratio Percentile Rank.csv"),
-        "qry_graph_data_10.csv":           ("IVol Prem/Disc",                    "IVol Prem/Disc.csv"),
-        "qry_graph_data_11.csv":           ("MM Score",                          "MM Score.csv"),
-        "qry_graph_data_12.csv":           ("IVol/RVol % Spreads",               "IVol-RVol % Spreads.csv"),
-        "qry_graph_data_13.csv":           ("Daily Returns",                     "Daily Returns.csv"),
-        "qry_graph_data_14.csv":           ("Daily Range",                       "Daily Range.csv"),
-        "qry_graph_data_15.csv":           ("Daily Volume",                      "Daily Volume.csv"),
-        "qry_graph_data_16.csv":           ("Weekly Returns",                    "Weekly Returns.csv"),
-        "qry_graph_data_17.csv":           ("Weekly Range",                      "Weekly Range.csv"),
-        "qry_graph_data_18.csv":           ("Weekly Volume",                     "Weekly Volume.csv"),
-        "qry_graph_data_19.csv":           ("Monthly Returns",                   "Monthly Returns.csv"),
-        "qry_graph_data_20.csv":           ("Monthly Range",                     "Monthly Range.csv"),
-        "qry_graph_data_21.csv":           ("Monthly Volume",                    "Monthly Volume.csv"),
-        "qry_graph_data_22.csv":           ("Short-Term Trend Line",             "Short-Term Trend Line.csv"),
-        "qry_graph_data_23.csv":           ("Mid-Term Trend Line",               "Mid-Term Trend Line.csv"),
-        "qry_graph_data_24.csv":           ("Long-Term Trend Line",              "Long-Term Trend Line.csv"),
-    }
-
     # ---------------- Helpers ----------------
     def _human_size(n: int | None) -> str:
         if n is None: return "—"
@@ -117,23 +86,38 @@ with narrow_container(3):
         # ✅ return the tuple (size, updated_date_str, mtime_epoch)
         return s.st_size, updated_date_str, int(s.st_mtime)
 
-    @st.cache_data(show_spinner=False)
-    def _read_bytes_cached(path_str: str, mtime_epoch: int):
-        """Read bytes; cache by mtime so we only re-read when a file changes."""
-        with open(path_str, "rb") as f:
-            return f.read()
-
-    def _build_zip(files):
-        """Build zip NOW (called only when user clicks)."""
-        buf = BytesIO()
-        with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for path_str, outname in files:
-                with open(path_str, "rb") as f:
-                    zf.writestr(outname, f.read())
-        buf.seek(0)
-        return buf.getvalue()
+    def _lazy_download(slot, label: str, prepare: str, path_str: str, file_name: str, mime: str, key: str, **kw):
+        """
+        Exports only go out behind the page's session gate: a Prepare button
+        first, so a file is only read (into this session) once the user asks
+        for it, then the download button.
+        """
+        ready = st.session_state.setdefault("dl_ready", set())
+        if path_str in ready:
+            with open(path_str, "rb") as f:
+                slot.download_button(label, data=f, file_name=file_name, mime=mime, key=key,
+                                     use_container_width=True, **kw)
+        else:
+            slot.button(prepare, key=f"prep-{key}", on_click=ready.add, args=(path_str,),
+                        use_container_width=True, **kw)
+
+    @st.fragment(run_every=2)
+    def _archive_pending(files):
+        """Shown while the release's archive is built; reruns the page once it exists."""
+        if export_archive.archive(files) is not None or export_archive.failed(files):
+            st.rerun()
+        st.caption("Preparing Download ALL for the latest data…")
+
+    @st.fragment(run_every=2)
+    def _store_pending(files):
+        """Shown while the release's Parquet / Feather / delta files are built."""
+        if export_store.ready(files) is not None or export_store.failed(files):
+            st.rerun()
+        st.caption("Preparing these files for the latest data…")
 
     # ---------------- Rows --------------------
+    export_catalog.withdraw_published()   # older versions linked exports via ./static
+
     rows = []
     for fname, (title, outname) in CATALOG.items():
         fpath = (EXPORT_DIR / fname).resolve()
@@ -144,8 +128,53 @@ with narrow_container(3):
             "size": size, "updated": updated_str, "mtime": mtime_epoch
         })
 
-    # ---------------- Table (no File col) -----
+    existing = [(r["path"], r["outname"]) for r in rows if r["path"]]
+
+    # ---------------- Variant: format / rows after an as-of date -----
     st.divider()
+    FORMAT_LABELS = {label: key for key, (_, label) in export_store.FORMATS.items()}
+    v1, v2 = st.columns([1.6, 2])
+    kind = FORMAT_LABELS[v1.radio("Format", list(FORMAT_LABELS), horizontal=True, key="dl_format")]
+    since = v2.toggle("Only rows dated after an as-of date (daily sync)", key="dl_since")
+
+    store, as_of = None, None
+    if (kind != "csv" or since) and existing:
+        store = export_store.ready(existing)
+        if store is None and (why := export_store.failed(existing)):
+            st.warning(f"Parquet / Feather and as-of files are not available for this data release ({why}). "
+                       "Showing the full CSV files instead.")
+            kind, since = "csv", False
+        elif store is None:
+            _store_pending(existing)
+        elif skipped := export_store.skipped(store):
+            titles = [r["title"] for r in rows if r["path"] and Path(r["path"]).stem in skipped]
+            st.caption("Not available in this format for the latest data: " + ", ".join(titles)
+                       + ". The full CSV can still be downloaded.")
+    days = [d for p, _ in existing if (d := export_store.dates(store, p)) is not None and len(d)] if store and since else []
+    if days:
+        latest = max(d[-1] for d in days)
+        previous = max((d[-2] for d in days if len(d) > 1), default=latest)
+        as_of = v2.date_input(
+            "As of",
+            value=date.fromisoformat(previous),
+            min_value=date.fromisoformat(min(d[0] for d in days)),
+            max_value=date.fromisoformat(latest),
+            key="dl_as_of",
+        ).isoformat()
+
+    def _variant(r) -> tuple[Path | None, str]:
+        """(file, download name) for a row in the chosen format / rows."""
+        base = r["outname"].removesuffix(".csv")
+        ext = export_store.FORMATS[kind][0]
+        if kind == "csv" and not since:
+            return Path(r["path"]), r["outname"]
+        if store is None or (since and as_of is None):
+            return None, ""
+        if since:
+            return export_store.delta(store, r["path"], as_of, kind), f"{base} since {as_of}{ext}"
+        return export_store.full(store, r["path"], kind), base + ext
+
+    # ---------------- Table (no File col) -----
     st.markdown("#### Files")
 
     h1, h3, h4 = st.columns([2, 1.2, 1.4])
@@ -158,35 +187,33 @@ with narrow_container(3):
         c1, c3, c4 = st.columns([2, 1.2, 1.4])
         c1.write(r["title"])
         #c2.write(r["updated"] or "—")
-        c3.write(_human_size(r["size"]))
-        if not r["path"]:
-            c4.button("Not Available", disabled=True, use_container_width=True, key=f"na-{r['title']}")
+        path, name = _variant(r) if r["path"] else (None, "")
+        c3.write(_human_size(path.stat().st_size if path else None))
+        if not path:
+            label = "Preparing…" if r["path"] and store is None else "Not Available"
+            c4.button(label, disabled=True, use_container_width=True, key=f"na-{r['title']}")
         else:
-            data = _read_bytes_cached(r["path"], r["mtime"])
-            c4.download_button(
-                "Download",
-                data=data,
-                file_name=r["outname"],
-                mime="text/csv",
+            _lazy_download(
+                c4, "Download", "Prepare", str(path), name,
+                "text/csv" if kind == "csv" else "application/octet-stream",
                 key=f"dl-{r['outname']}",
-                use_container_width=True,
             )
 
-    # ---------------- Download ALL (at bottom; build on click) -----
+    # ---------------- Download ALL (at bottom; one archive per release) -----
     st.divider()
-    existing = [(r["path"], r["outname"]) for r in rows if r["path"]]
     if existing:
-        build = st.button("Prepare Download ALL (.zip)", type="primary", use_container_width=True)
-        if build:
-            st.session_state["zip_bytes"] = _build_zip(existing)
-            st.success("ZIP ready.")
-        if "zip_bytes" in st.session_state:
-            st.download_button(
-                "Download ALL (.zip)",
-                data=st.session_state["zip_bytes"],
-                file_name="markmentum_downloads.zip",
-                mime="application/zip",
-                use_container_width=True,
+        fmt, _ = export_archive.settings()
+        label = f"Download ALL (.{fmt})"
+        bundle = export_archive.archive(existing)
+        if bundle is None and (why := export_archive.failed(existing)):
+            st.warning(f"Download ALL is not available for this data release ({why}). "
+                       "The files above can still be downloaded one by one.")
+        elif bundle is None:
+            _archive_pending(existing)
+        else:
+            _lazy_download(
+                st, label, f"Prepare {label}", str(bundle), export_archive.file_name(fmt),
+                export_archive.mime(fmt), key="dl-all", type="primary",
             )
     else:
         st.info("No exports found yet. When the nightly job runs, files will appear here.")
@@ -195,19 +222,4 @@ with narrow_container(3):
 # -------------------------
 # Footer disclaimer
 # -------------------------
-st.markdown("---")
-st.markdown(
-    """
-    <div style="font-size: 12px; color: gray;">
-    © 2026 Markmentum Research. <b>Disclaimer</b>: This content is for informational purposes only. 
-    Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, 
-    investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC 
-    or its employees. The information is provided without regard to individual objectives or risk parameters and is general, 
-    non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. 
-    Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. 
-    Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before 
-    making investment decisions.
-    </div>
-    """,
-    unsafe_allow_html=True,
-)
\ No newline at end of file
+render_footer()
\ No newline at end of file
@@ -0,0 +1,163 @@
+# utils/export_archive.py
+#
+# The Downloads page's "Download ALL" archive, built once per data release
+# and shared by every session.
+#
+# The page used to compress every export on each click and keep the result
+# in st.session_state, i.e. one full archive per session that asked for it,
+# held until the session ended.  Here the archive for a release (the set of
+# export files with their sizes and mtimes) is written once, in a background
+# thread, to
+#
+#   <archive dir>/<release hash>/markmentum_downloads.<zip | tar.zst>
+#
+# and moved into place atomically; older releases' archives are removed.
+# A build that fails is recorded for its release and not retried until the
+# exports change; failed() reports it to the page.
+# The page offers the file through its gated download button (read only for
+# a session that asks for it); it is never published on the static route,
+# which has no session check.
+#
+# Format and level come from the environment:
+#   MARKMENTUM_ARCHIVE_FORMAT  zip (default) | tar.zst (needs `zstandard`)
+#   MARKMENTUM_ARCHIVE_LEVEL   zip: deflate 0-9 (default 6), tar.zst: zstd 1-22 (default 10)
+
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+from utils import export_catalog
+
+APP_DIR     = Path(__file__).resolve().parent.parent
+ARCHIVE_DIR = Path(os.getenv("MARKMENTUM_ARCHIVE_DIR", APP_DIR / ".cache" / "downloads"))
+STEM        = "markmentum_downloads"
+
+# format -> (suffix, mime, default level, valid levels)
+FORMATS = {
+    "zip":     (".zip",     "application/zip",  6,  range(0, 10)),
+    "tar.zst": (".tar.zst", "application/zstd", 10, range(1, 23)),
+}
+
+_lock = threading.Lock()
+_builds: dict[str, threading.Thread] = {}
+_failed: dict[str, str] = {}     # archive path -> error; not retried until the release changes
+
+
+def settings() -> tuple[str, int]:
+    """
+    (format, level) from the environment; tar.zst falls back to zip without
+    `zstandard`, and a missing or out-of-range level to the format's default.
+    """
+    fmt = os.getenv("MARKMENTUM_ARCHIVE_FORMAT", "zip").lower().lstrip(".")
+    if fmt not in FORMATS:
+        fmt = "zip"
+    if fmt == "tar.zst":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            fmt = "zip"
+    _, _, default, valid = FORMATS[fmt]
+    level = os.getenv("MARKMENTUM_ARCHIVE_LEVEL", "").strip()
+    return fmt, int(level) if level.lstrip("-").isdigit() and int(level) in valid else default
+
+
+def file_name(fmt: str) -> str:
+    """Name offered to the browser, e.g. markmentum_downloads.zip."""
+    return STEM + FORMATS[fmt][0]
+
+
+def mime(fmt: str) -> str:
+    return FORMATS[fmt][1]
+
+
+def _path(files: list[tuple[str, str]], fmt: str, level: int) -> Path:
+    """Archive path for this release (export_catalog.release of the members) and settings."""
+    key = f"{export_catalog.release(files)}:{fmt}:{level}"
+    return ARCHIVE_DIR / hashlib.sha256(key.encode()).hexdigest()[:10] / file_name(fmt)
+
+
+def _write_zip(fh, files, level: int) -> None:
+    with zipfile.ZipFile(fh, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+        for path_str, outname in files:
+            zf.write(path_str, arcname=outname)
+
+
+def _write_tar_zst(fh, files, level: int) -> None:
+    import zstandard
+
+    with zstandard.ZstdCompressor(level=level, threads=-1).stream_writer(fh, closefd=False) as zw:
+        with tarfile.open(fileobj=zw, mode="w|") as tar:
+            for path_str, outname in files:
+                tar.add(path_str, arcname=outname)
+
+
+def write(fh, files: list[tuple[str, str]], fmt: str, level: int) -> None:
+    """Stream the archive of `files` ([(path, name in archive)]) into a binary file object."""
+    (_write_zip if fmt == "zip" else _write_tar_zst)(fh, files, level)
+
+
+def _build(files: list[tuple[str, str]], fmt: str, level: int, dst: Path) -> None:
+    """Write the archive next to dst and move it into place; drop older archives."""
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{STEM}.", suffix=".tmp", dir=dst.parent)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                write(fh, files, fmt, level)
+            os.replace(tmp, dst)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception as e:       # disk full, unreadable export, bad level, codec error, ...
+        _failed[str(dst)] = f"{type(e).__name__}: {e}"
+        return
+    try:
+        for old in ARCHIVE_DIR.iterdir():
+            if old.is_dir() and old != dst.parent and len(old.name) == 10:
+                shutil.rmtree(old, ignore_errors=True)
+    except OSError:
+        pass   # stale archives are only disk space
+
+
+def archive(files: list[tuple[str, str]]) -> Path | None:
+    """
+    The archive of `files` ([(path, name in archive)]) for the current
+    release, or None while it is being built (or if the build failed, see
+    failed()).  The first call for a release starts the build in a
+    background thread; later calls (any session) just check for the file.
+    """
+    fmt, level = settings()
+    try:
+        dst = _path(files, fmt, level)
+    except OSError:
+        return None   # a file vanished mid-release; the next run sees the new set
+    if dst.exists():
+        return dst
+    with _lock:
+        key = str(dst)
+        build = _builds.get(key)
+        if build is None or not build.is_alive():
+            if dst.exists():
+                return dst
+            if key in _failed:
+                return None
+            build = threading.Thread(
+                target=_build, args=(list(files), fmt, level, dst), name=f"archive-{dst.parent.name}", daemon=True
+            )
+            _builds[key] = build
+            build.start()
+    return None
+
+
+def failed(files: list[tuple[str, str]]) -> str | None:
+    """Why the archive for the current release of `files` could not be built, or None."""
+    fmt, level = settings()
+    try:
+        return _failed.get(str(_path(files, fmt, level)))
+    except OSError:
+        return None
@@ -0,0 +1,77 @@
+# utils/export_catalog.py
+#
+# The exports offered on the Downloads page (pages/14): data file ->
+# (title, name the member downloads it as).  Entries not present in
+# EXPORT_DIR (env MARKMENTUM_EXPORT_DIR, default ./data) are shown as not
+# available.
+
+import hashlib
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+from utils import static_assets
+
+APP_DIR    = Path(__file__).resolve().parent.parent
+EXPORT_DIR = Path(os.getenv("MARKMENTUM_EXPORT_DIR", APP_DIR / "data")).resolve()
+
+CATALOG = {
+    "stat_box.csv":                    ("Stat Box",                          "stat_box.csv"),
+    "signal_box.csv":                  ("Signal Box",                        "signal_box.csv"),
+    "qry_graph_data_01.csv":           ("Probable Ranges",                   "Probable Ranges.csv"),
+    "qry_graph_data_02.csv":           ("Trend Lines",                       "Trend Lines.csv"),
+    "qry_graph_data_03.csv":           ("Probable Anchors",                  "Probable Anchors.csv"),
+    "qry_graph_data_04.csv":           ("Price to LT Probable Anchor",       "Price to LT Probable Anchor.csv"),
+    "qry_graph_data_05.csv":           ("30-Day Rvol Z-Score",               "30-Day Rvol Z-Score.csv"),
+    "qry_graph_data_06.csv":           ("Z-Score Percentile Rank",           "Z-Score Percentile Rank.csv"),
+    "qry_graph_data_07.csv":           ("Rvol 30-Day",                       "Rvol 30-Day.csv"),
+    "qry_graph_data_08.csv":           ("30-Day Sharpe Ratio",               "30-Day Sharpe Ratio.csv"),
+    "qry_graph_data_09.csv":           ("Sharpe Ratio Percentile Rank",      "Sharpe Ratio Percentile Rank.csv"),
+    "qry_graph_data_10.csv":           ("IVol Prem/Disc",                    "IVol Prem/Disc.csv"),
+    "qry_graph_data_11.csv":           ("MM Score",                          "MM Score.csv"),
+    "qry_graph_data_12.csv":           ("IVol/RVol % Spreads",               "IVol-RVol % Spreads.csv"),
+    "qry_graph_data_13.csv":           ("Daily Returns",                     "Daily Returns.csv"),
+    "qry_graph_data_14.csv":           ("Daily Range",                       "Daily Range.csv"),
+    "qry_graph_data_15.csv":           ("Daily Volume",                      "Daily Volume.csv"),
+    "qry_graph_data_16.csv":           ("Weekly Returns",                    "Weekly Returns.csv"),
+    "qry_graph_data_17.csv":           ("Weekly Range",                      "Weekly Range.csv"),
+    "qry_graph_data_18.csv":           ("Weekly Volume",                     "Weekly Volume.csv"),
+    "qry_graph_data_19.csv":           ("Monthly Returns",                   "Monthly Returns.csv"),
+    "qry_graph_data_20.csv":           ("Monthly Range",                     "Monthly Range.csv"),
+    "qry_graph_data_21.csv":           ("Monthly Volume",                    "Monthly Volume.csv"),
+    "qry_graph_data_22.csv":           ("Short-Term Trend Line",             "Short-Term Trend Line.csv"),
+    "qry_graph_data_23.csv":           ("Mid-Term Trend Line",               "Mid-Term Trend Line.csv"),
+    "qry_graph_data_24.csv":           ("Long-Term Trend Line",              "Long-Term Trend Line.csv"),
+}
+
+
+def available() -> list[tuple[str, str]]:
+    """[(path, download name)] for the catalog entries present in EXPORT_DIR, in catalog order."""
+    out = []
+    for fname, (_, outname) in CATALOG.items():
+        path = EXPORT_DIR / fname
+        if path.exists():
+            out.append((str(path), outname))
+    return out
+
+
+@lru_cache(maxsize=1)
+def withdraw_published() -> None:
+    """
+    Remove the export and Download ALL copies earlier versions published
+    under ./static, where they were served without a session check.  Once
+    per process.
+    """
+    for name in [*CATALOG, "markmentum_downloads.zip", "markmentum_downloads.tar.zst"]:
+        static_assets.unpublish(name)
+    shutil.rmtree(static_assets.STATIC_DIR / "exports", ignore_errors=True)
+
+
+def release(files: list[tuple[str, str]]) -> str:
+    """Short hash of the exports' names, sizes and mtimes; changes with every data release."""
+    h = hashlib.sha256()
+    for path_str, outname in files:
+        s = os.stat(path_str)
+        h.update(f"\0{outname}\0{s.st_size}\0{s.st_mtime_ns}".encode())
+    return h.hexdigest()[:10]
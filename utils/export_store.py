@@ -0,0 +1,246 @@
+# utils/export_store.py
+#
+# Columnar and incremental variants of the Downloads exports, built once
+# per data release.
+#
+# Members who sync nightly used to re-download every CSV in full.  For each
+# export with a Date column the release build writes, under
+#
+#   <store dir>/<release>/
+#       <stem>.csv          the CSV's own lines, stably re-ordered by Date
+#       <stem>.parquet      the same rows, typed (zstd)
+#       <stem>.feather      the same rows as an Arrow IPC file (lz4)
+#       <stem>.index.npz    dates (D,) ascending; rows / bytes (D+1,): where
+#                           each date starts in the table / in <stem>.csv
+#
+# so "rows after <as of>" is a contiguous tail: one searchsorted on the
+# dates gives the row offset (Parquet / Feather slice) and the byte offset
+# (the CSV delta is the header plus a byte range, no parsing and the exact
+# text of the source).  Delta files are cut on first request into
+# <release>/delta/ and reused.  Exports without a Date column get the
+# columnar variants only.
+#
+# Building runs in a background thread on the first request for a release
+# (like utils/export_archive.py); older releases' directories are removed
+# once the new one is complete.  An export that fails to convert is skipped
+# (the others are still built); a release that fails as a whole is recorded
+# and not retried until the exports change.  The store lives outside
+# ./static (env MARKMENTUM_EXPORT_STORE_DIR, default .cache/exports): the
+# files are member data and go out through the Downloads page's gated
+# download button, never the unauthenticated static route.
+
+import glob
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from utils import export_catalog
+
+APP_DIR   = Path(__file__).resolve().parent.parent
+STORE_DIR = Path(os.getenv("MARKMENTUM_EXPORT_STORE_DIR", APP_DIR / ".cache" / "exports"))
+DATE_COL  = "Date"
+SKIPPED   = "skipped.json"   # per release: {stem: error} for exports the build could not convert
+
+# format -> (suffix, label)
+FORMATS = {
+    "csv":     (".csv",     "CSV"),
+    "parquet": (".parquet", "Parquet"),
+    "feather": (".feather", "Feather"),
+}
+
+_lock = threading.Lock()
+_builds: dict[str, threading.Thread] = {}
+_failed: dict[str, str] = {}     # release -> error; not retried until the release changes
+
+
+# -------------------------
+# Release build
+# -------------------------
+def _stem(path_str: str) -> str:
+    return Path(path_str).stem
+
+
+def _write(dst: Path, write) -> None:
+    """Write via a temp file in dst's directory and move it into place."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _build_one(path_str: str, out: Path) -> None:
+    raw = Path(path_str).read_bytes()
+    table = pacsv.read_csv(io.BytesIO(raw))
+    stem = _stem(path_str)
+
+    header, _, body = raw.partition(b"\n")
+    lines = body.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    dated = DATE_COL in table.column_names and len(lines) == table.num_rows   # no multi-line fields
+
+    if dated:
+        dates = table[DATE_COL].cast(pa.string()).to_numpy(zero_copy_only=False).astype(str)
+        order = np.argsort(dates, kind="stable")
+        dates, table = dates[order], table.take(order)
+        lines = [lines[i].rstrip(b"\r") + b"\n" for i in order]
+
+        uniq, starts = np.unique(dates, return_index=True)
+        ends = np.cumsum([len(line) for line in lines])
+        head = len(header.rstrip(b"\r")) + 1
+        rows = np.append(starts, len(lines)).astype(np.int64)
+        offsets = head + np.concatenate([[0], ends])[rows]
+        _write(out / f"{stem}.csv", lambda fh: (fh.write(header.rstrip(b"\r") + b"\n"), fh.writelines(lines)))
+        _write(out / f"{stem}.index.npz", lambda fh: np.savez(fh, dates=uniq, rows=rows, bytes=offsets))
+
+    _write(out / f"{stem}.parquet", lambda fh: pq.write_table(table, fh, compression="zstd"))
+    _write(out / f"{stem}.feather", lambda fh: feather.write_feather(table, fh))
+
+
+def _build(files: list[tuple[str, str]], out: Path) -> None:
+    """
+    Build every variant into a temp directory, then rename it to <release>.
+    An export that cannot be converted is skipped (listed in skipped.json);
+    if the release as a whole cannot be built, that is recorded in _failed.
+    """
+    try:
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{out.name}.", dir=STORE_DIR))
+        try:
+            skipped = {}
+            for path_str, _ in files:
+                stem = _stem(path_str)
+                try:
+                    _build_one(path_str, tmp)
+                except Exception as e:     # malformed CSV, ...: the other exports still get built
+                    for part in tmp.glob(f"{glob.escape(stem)}.*"):
+                        part.unlink()
+                    skipped[stem] = f"{type(e).__name__}: {e}"
+            (tmp / SKIPPED).write_text(json.dumps(skipped), encoding="utf-8")
+            (tmp / "delta").mkdir()
+            os.replace(tmp, out)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+    except Exception as e:
+        _failed[out.name] = f"{type(e).__name__}: {e}"
+        return
+    try:
+        for old in STORE_DIR.iterdir():
+            if old.is_dir() and old != out and len(old.name) == 10:
+                shutil.rmtree(old, ignore_errors=True)
+    except OSError:
+        pass   # stale releases are only disk space
+
+
+def ready(files: list[tuple[str, str]]) -> Path | None:
+    """
+    The store directory for the current release of `files`, or None while
+    it is being built or if building it failed (see failed()).  The first
+    call for a release starts the build; a failed one is not retried until
+    the release changes.
+    """
+    try:
+        out = STORE_DIR / export_catalog.release(files)
+    except OSError:
+        return None
+    if out.is_dir():
+        return out
+    with _lock:
+        build = _builds.get(out.name)
+        if build is None or not build.is_alive():
+            if out.is_dir():
+                return out
+            if out.name in _failed:
+                return None
+            build = threading.Thread(target=_build, args=(list(files), out), name=f"exports-{out.name}", daemon=True)
+            _builds[out.name] = build
+            build.start()
+    return None
+
+
+def failed(files: list[tuple[str, str]]) -> str | None:
+    """Why the store for the current release of `files` could not be built, or None."""
+    try:
+        return _failed.get(export_catalog.release(files))
+    except OSError:
+        return None
+
+
+def skipped(store: Path) -> dict[str, str]:
+    """Exports (by file stem) the release build could not convert, with the reason."""
+    try:
+        return json.loads((store / SKIPPED).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+# -------------------------
+# Variants
+# -------------------------
+@lru_cache(maxsize=64)
+def _index(path: str, mtime_ns: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    with np.load(path, allow_pickle=False) as z:
+        return z["dates"], z["rows"], z["bytes"]
+
+
+def dates(store: Path, path_str: str) -> np.ndarray | None:
+    """Ascending ISO dates of an export in the store, or None if it has no Date column."""
+    idx = store / f"{_stem(path_str)}.index.npz"
+    if not idx.exists():
+        return None
+    return _index(str(idx), idx.stat().st_mtime_ns)[0]
+
+
+def full(store: Path, path_str: str, fmt: str) -> Path | None:
+    """The whole export in `fmt` ("csv" is the original file)."""
+    if fmt == "csv":
+        return Path(path_str)
+    p = store / f"{_stem(path_str)}{FORMATS[fmt][0]}"
+    return p if p.exists() else None
+
+
+def delta(store: Path, path_str: str, as_of: str, fmt: str) -> Path | None:
+    """
+    Rows with Date after `as_of` (ISO date) in `fmt`, cut from the release's
+    date-ordered files at the offsets in the index; None without a Date column.
+    """
+    stem = _stem(path_str)
+    idx = store / f"{stem}.index.npz"
+    if not idx.exists():
+        return None
+    days, rows, offsets = _index(str(idx), idx.stat().st_mtime_ns)
+    i = int(np.searchsorted(days, as_of, side="right"))
+    dst = store / "delta" / f"{stem}.since-{as_of}{FORMATS[fmt][0]}"
+    if dst.exists():
+        return dst
+    try:
+        if fmt == "csv":
+            with open(store / f"{stem}.csv", "rb") as src:
+                header = src.readline()
+                src.seek(int(offsets[i]))
+                _write(dst, lambda fh: (fh.write(header), shutil.copyfileobj(src, fh)))
+        else:
+            table = feather.read_table(store / f"{stem}.feather", memory_map=True).slice(int(rows[i]))
+            if fmt == "parquet":
+                _write(dst, lambda fh: pq.write_table(table, fh, compression="zstd"))
+            else:
+                _write(dst, lambda fh: feather.write_feather(table, fh))
+    except OSError:
+        return None
+    return dst
@@ -0,0 +1,163 @@
+# utils/heatmap_engine.py
+#
+# Heatmap cells for the Performance, Sharpe Rank and Markmentum heatmaps
+# (pages 03-05): long frames of (row, Timeframe, value, norm), where norm is
+# the cell scaled to [-1, 1] for the blue/orange colour scale.
+#
+# The pages used to melt their frames on every rerun, find each timeframe's
+# robust |max| with a groupby-apply and normalise cell by cell with
+# DataFrame.apply(axis=1).  Here a grid's value columns are taken as one
+# (rows x timeframes) array: the robust vmax is a single nanquantile down
+# the columns, normalisation one broadcast subtract / divide / clip, and the
+# long frame is built by tiling and raveling those arrays.  Both grids (the
+# category averages and the universe-wide per-ticker cells) are built once
+# per (metric, data release) on top of utils/latest_frames.py.
+
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils import latest_frames
+
+CATEGORY_ORDER = [
+    "Sector & Style ETFs","Indices","Futures","Currencies","Commodities",
+    "Bonds","Yields","Volatility","Foreign",
+    "Communication Services","Consumer Discretionary","Consumer Staples",
+    "Energy","Financials","Health Care","Industrials","Information Technology",
+    "Materials","Real Estate","Utilities","MR Discretion"
+]
+
+
+@dataclass(frozen=True)
+class HeatmapMetric:
+    """How one page's frame becomes heatmap cells."""
+    frame: str                        # latest_frames function (and SOURCES key)
+    ids: tuple[str, ...]              # per-ticker id columns kept on each cell
+    columns: dict[str, str]           # source column -> Timeframe label, in display order
+    value: str = "Value"              # name of the cell value column
+    scale: float = 1.0                # applied to the source columns first
+    centered: dict[str, tuple[float, float]] = field(default_factory=dict)  # tf -> (center, width)
+    vmax_cap: dict[str, float] = field(default_factory=dict)                # tf -> cap on robust vmax
+
+
+METRICS = {
+    "performance": HeatmapMetric(
+        frame="performance",
+        ids=("Ticker", "Ticker_name", "Category"),
+        columns={
+            "day_pct_change": "Daily",
+            "week_pct_change": "WTD",
+            "month_pct_change": "MTD",
+            "quarter_pct_change": "QTD",
+        },
+        value="Pct",
+        scale=100.0,                  # fractions -> percent, as the page shows them
+    ),
+    "sharpe_rank": HeatmapMetric(
+        frame="sharpe_rank",
+        ids=("Ticker", "Name", "Category"),
+        columns={c: c for c in ["Rank", *latest_frames.DELTA_COLS]},
+        centered={"Rank": (50.0, 60.0)},   # Rank is centred on 50, not robust-scaled
+    ),
+    "markmentum": HeatmapMetric(
+        frame="markmentum",
+        ids=("Ticker", "Name", "Category"),
+        columns={c: c for c in ["Score", *latest_frames.DELTA_COLS]},
+        vmax_cap={"Score": 105.0},         # so extreme scores don't wash out the column
+    ),
+}
+
+
+# -------------------------
+# Whole-array scaling
+# -------------------------
+def robust_vmax(values: np.ndarray, q: float = 0.98, floor: float = 1.0, step: float = 1.0) -> np.ndarray:
+    """
+    Per timeframe of a (... x rows x timeframes) array: the q-quantile of
+    |value| over the rows (NaN ignored) rounded up to a multiple of `step`,
+    and at least `floor`.  A timeframe with no values gets `floor`.
+    """
+    a = np.abs(np.asarray(values, dtype=float))
+    if a.shape[-2] == 0:
+        return np.full(a.shape[:-2] + a.shape[-1:], floor)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)    # all-NaN columns
+        vmax = np.nanquantile(a, q, axis=-2)
+    vmax = np.maximum(floor, np.ceil(vmax / step) * step)
+    return np.where(np.isnan(vmax), floor, vmax)
+
+
+def normalize(values: np.ndarray, metric: HeatmapMetric) -> np.ndarray:
+    """
+    Cells of a (... x rows x timeframes) array scaled to [-1, 1] per
+    timeframe (NaN stays NaN); leading axes (e.g. dates) are scaled apart.
+    """
+    tfs = list(metric.columns.values())
+    vmax = robust_vmax(values)
+    center = np.zeros(len(tfs))
+    for j, tf in enumerate(tfs):
+        if tf in metric.vmax_cap:
+            vmax[..., j] = np.minimum(metric.vmax_cap[tf], np.maximum(vmax[..., j], 1.0))
+        if tf in metric.centered:
+            center[j], vmax[..., j] = metric.centered[tf]
+    return np.clip((values - center) / vmax[..., None, :], -1, 1)
+
+
+def long_cells(wide: pd.DataFrame, ids: list[str], metric: HeatmapMetric) -> pd.DataFrame:
+    """
+    wide.melt(ids, metric.columns) with Timeframe labels and a norm column,
+    in melt's row order (timeframe by timeframe).
+    """
+    values = wide[list(metric.columns)].to_numpy(dtype=float)
+    n, k = values.shape
+    out = {c: np.tile(wide[c].to_numpy(), k) for c in ids}
+    out["Timeframe"] = np.repeat(np.array(list(metric.columns.values()), dtype=object), n)
+    out[metric.value] = values.T.ravel()
+    out["norm"] = normalize(values, metric).T.ravel()
+    return pd.DataFrame(out)
+
+
+# -------------------------
+# Grids per (metric, data release)
+# -------------------------
+@lru_cache(maxsize=6)
+def _grids(metric: str, release: tuple) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
+    spec = METRICS[metric]
+    cols = list(spec.columns)
+    df, _ = getattr(latest_frames, spec.frame)()
+    if df.empty or not all(c in df.columns for c in [*spec.ids, *cols]):
+        empty = pd.DataFrame(columns=["Category", "Timeframe", spec.value, "norm"])
+        return empty, {}
+    for c in cols:
+        df[c] = pd.to_numeric(df[c], errors="coerce") * spec.scale
+
+    # category averages, in the pages' category order
+    grouped = df.groupby("Category", dropna=True, as_index=False)[cols].mean()
+    grouped["__ord__"] = grouped["Category"].map({name: i for i, name in enumerate(CATEGORY_ORDER)})
+    grouped = grouped.sort_values(["__ord__", "Category"], kind="stable").drop(columns="__ord__")
+    categories = long_cells(grouped, ["Category"], spec)
+    categories["Category"] = pd.Categorical(categories["Category"], categories=CATEGORY_ORDER, ordered=True)
+
+    # every ticker, scaled against the whole universe, split by category
+    tickers = long_cells(df, list(spec.ids), spec)
+    by_category = {str(cat): part for cat, part in tickers.groupby("Category", sort=False)}
+    return categories, by_category
+
+
+def category_cells(metric: str) -> pd.DataFrame:
+    """Category-average cells: Category (ordered categorical), Timeframe, value, norm."""
+    categories, _ = _grids(metric, latest_frames.release(METRICS[metric].frame))
+    return categories.copy()
+
+
+def ticker_cells(metric: str, category: str) -> pd.DataFrame:
+    """Cells for the tickers in one category, normalised against the whole universe."""
+    spec = METRICS[metric]
+    _, by_category = _grids(metric, latest_frames.release(spec.frame))
+    part = by_category.get(str(category))
+    if part is None:
+        return pd.DataFrame(columns=[*spec.ids, "Timeframe", spec.value, "norm"])
+    return part.copy()
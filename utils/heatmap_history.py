@@ -0,0 +1,379 @@
+# utils/heatmap_history.py
+#
+# History playback for the Performance, Sharpe Rank and Markmentum heatmaps
+# (pages 03-05).
+#
+# Each metric keeps a date x ticker x timeframe cube of cell values on disk
+#
+#   <history dir>/<metric>.npz
+#       timeframes  (K,)      Timeframe labels, as in heatmap_engine.METRICS
+#       dates       (D,)      ISO dates, ascending
+#       tickers     (T,)      sorted; names / categories (T,) from the latest release seen
+#       values      (D, T, K) float32, NaN where a ticker had no value
+#
+# The data files only hold the latest snapshot, so the cube is extended
+# incrementally: the first time a process sees a data release, that
+# release's snapshot (from utils/latest_frames.py) is written into its date
+# slice and the file replaced atomically.  Sharpe Rank is also seeded from
+# the daily rank history in qry_graph_data_09.csv (ΔDaily / ΔWTD / ΔMTD / ΔQTD
+# are the rank less the rank at the previous day / week / month / quarter
+# end, which reproduces qry_graph_data_48-51 exactly); only dates missing
+# from the cube are filled in.
+#
+# On load, the category averages (D x C x K) and the [-1, 1] norms of both
+# grids are computed for every date at once with heatmap_engine's
+# whole-array scaling, so moving the date slider is an array slice.  Charts
+# ship a block of PREFETCH neighbouring dates and filter to the selected
+# one, so scrubbing within a block keeps the same named dataset.
+
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils import latest_frames, vega_specs
+from utils.heatmap_engine import CATEGORY_ORDER, METRICS, normalize
+
+APP_DIR     = Path(__file__).resolve().parent.parent
+DATA_DIR    = APP_DIR / "data"
+HISTORY_DIR = Path(os.environ.get("MM_HISTORY_DIR", APP_DIR / ".cache" / "heatmap_history"))
+
+SR_HISTORY_CSV = DATA_DIR / "qry_graph_data_09.csv"   # Date, Ticker, Sharpe_Rank (daily)
+
+PREFETCH = 10    # dates per chart dataset
+
+
+# -------------------------
+# Snapshots and seeds
+# -------------------------
+def _snapshot(metric: str) -> tuple[str, pd.DataFrame] | None:
+    """(ISO date, frame with Ticker, Name, Category and the value columns) for the current release."""
+    spec = METRICS[metric]
+    df, _ = getattr(latest_frames, spec.frame)()
+    cols = list(spec.columns)
+    if df.empty or "_dt" not in df.columns or not all(c in df.columns for c in [*spec.ids, *cols]):
+        return None
+    d = df["_dt"].max()
+    if pd.isna(d):
+        return None
+    out = pd.DataFrame({
+        "Ticker": df["Ticker"].astype(str).str.strip(),
+        "Name": df[spec.ids[1]].fillna("").astype(str),
+        "Category": df["Category"].fillna("").astype(str),
+    })
+    for c in cols:
+        out[c] = pd.to_numeric(df[c], errors="coerce") * spec.scale
+    return d.strftime("%Y-%m-%d"), out.drop_duplicates("Ticker")
+
+
+def _period_change(dates: pd.DatetimeIndex, values: np.ndarray, freq: str | None) -> np.ndarray:
+    """values less their value on the last date of the previous period (previous row if freq is None)."""
+    out = np.full_like(values, np.nan)
+    if freq is None:
+        out[1:] = values[1:] - values[:-1]
+        return out
+    periods = dates.to_period(freq).asi8
+    ref = np.searchsorted(periods, periods, side="left") - 1    # last row of the previous period
+    ok = ref >= 0
+    out[ok] = values[ok] - values[ref[ok]]
+    return out
+
+
+def _sharpe_rank_seed() -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """(ISO dates, tickers, values D x T x K) from the daily Sharpe Rank history."""
+    if not SR_HISTORY_CSV.exists():
+        return None
+    h = pd.read_csv(SR_HISTORY_CSV)
+    if not {"Date", "Ticker", "Sharpe_Rank"} <= set(h.columns):
+        return None
+    h["Date"] = pd.to_datetime(h["Date"], errors="coerce")
+    h["Sharpe_Rank"] = pd.to_numeric(h["Sharpe_Rank"], errors="coerce")
+    wide = (h.dropna(subset=["Date"])
+              .pivot_table(index="Date", columns="Ticker", values="Sharpe_Rank", aggfunc="last")
+              .sort_index())
+    rank = wide.to_numpy(dtype=float)
+    values = np.stack([
+        rank,
+        _period_change(wide.index, rank, None),
+        _period_change(wide.index, rank, "W-FRI"),
+        _period_change(wide.index, rank, "M"),
+        _period_change(wide.index, rank, "Q"),
+    ], axis=-1)
+    return wide.index.strftime("%Y-%m-%d").to_numpy(dtype=str), wide.columns.to_numpy(dtype=str), values
+
+
+SEEDS = {"sharpe_rank": (_sharpe_rank_seed, SR_HISTORY_CSV)}
+
+
+# -------------------------
+# Store
+# -------------------------
+def _path(metric: str) -> Path:
+    return HISTORY_DIR / f"{metric}.npz"
+
+
+def _load(metric: str) -> dict | None:
+    try:
+        with np.load(_path(metric), allow_pickle=False) as z:
+            store = {k: z[k] for k in z.files}
+    except (OSError, ValueError):
+        return None
+    if list(store.get("timeframes", [])) != list(METRICS[metric].columns.values()):
+        return None    # metric definition changed: start over
+    return store
+
+
+def _save(metric: str, store: dict) -> None:
+    """Write atomically; failures (read-only disk, races) are ignored, the history is best-effort."""
+    path = _path(metric)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".npz", dir=path.parent)
+        with os.fdopen(fd, "wb") as fh:
+            np.savez_compressed(fh, **store)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _merge(store: dict, dates, tickers, values) -> dict:
+    """store with `values` (len(dates) x len(tickers) x K) written into those date / ticker slots."""
+    dates, tickers = np.asarray(dates, dtype=str), np.asarray(tickers, dtype=str)
+    all_dates = np.union1d(store["dates"], dates)
+    all_tickers = np.union1d(store["tickers"], tickers)
+    k = store["values"].shape[-1]
+    if len(all_dates) != len(store["dates"]) or len(all_tickers) != len(store["tickers"]):
+        grown = np.full((len(all_dates), len(all_tickers), k), np.nan, dtype=np.float32)
+        grown[np.ix_(np.searchsorted(all_dates, store["dates"]),
+                     np.searchsorted(all_tickers, store["tickers"]))] = store["values"]
+        labels = {}
+        for key in ("names", "categories"):
+            col = np.full(len(all_tickers), "", dtype=object)
+            col[np.searchsorted(all_tickers, store["tickers"])] = store[key]
+            labels[key] = col.astype(str)
+        store = {**store, **labels, "dates": all_dates, "tickers": all_tickers, "values": grown}
+    store["values"][np.ix_(np.searchsorted(all_dates, dates),
+                           np.searchsorted(all_tickers, tickers))] = values
+    return store
+
+
+def _update(metric: str) -> dict | None:
+    """The stored cube with the current release (and any new seed dates) merged in."""
+    spec = METRICS[metric]
+    k = len(spec.columns)
+    store = _load(metric) or {
+        "timeframes": np.array(list(spec.columns.values())),
+        "dates": np.array([], dtype=str), "tickers": np.array([], dtype=str),
+        "names": np.array([], dtype=str), "categories": np.array([], dtype=str),
+        "values": np.empty((0, 0, k), dtype=np.float32),
+    }
+    changed = False
+
+    seed = SEEDS.get(metric)
+    if seed:
+        seeded = seed[0]()
+        if seeded is not None:
+            dates, tickers, values = seeded
+            new = ~np.isin(dates, store["dates"])
+            if new.any():
+                store = _merge(store, dates[new], tickers, values[new])
+                changed = True
+
+    snap = _snapshot(metric)
+    if snap is not None:
+        date, df = snap
+        tickers = df["Ticker"].to_numpy(dtype=str)
+        values = df[list(spec.columns)].to_numpy(dtype=np.float32)[None]
+        i = np.searchsorted(store["dates"], date)
+        cur = None
+        if i < len(store["dates"]) and store["dates"][i] == date:
+            cur = store["values"][i, np.searchsorted(store["tickers"], tickers)] \
+                if np.isin(tickers, store["tickers"]).all() else None
+        if cur is None or not np.array_equal(cur, values[0], equal_nan=True):
+            store = _merge(store, [date], tickers, values)
+            changed = True
+        rows = np.searchsorted(store["tickers"], tickers)
+        names, cats = store["names"].astype(object), store["categories"].astype(object)
+        names[rows], cats[rows] = df["Name"].to_numpy(), df["Category"].to_numpy()
+        if not (np.array_equal(names, store["names"]) and np.array_equal(cats, store["categories"])):
+            store["names"], store["categories"] = names.astype(str), cats.astype(str)
+            changed = True
+
+    if not len(store["dates"]):
+        return None
+    if changed:
+        _save(metric, store)
+    return store
+
+
+# -------------------------
+# Cube: every date's grids, precomputed
+# -------------------------
+class HeatmapHistory:
+    """One metric's history with category averages and norms for every date."""
+
+    def __init__(self, metric: str, store: dict):
+        spec = METRICS[metric]
+        self.metric = metric
+        self.value = spec.value
+        self.timeframes = list(spec.columns.values())
+        self.dates = store["dates"]
+        self.tickers = store["tickers"]
+        self.names = store["names"]
+        self.date_labels = [f"{d.month}/{d.day}/{d.year}" for d in pd.to_datetime(self.dates)]
+        self.values = store["values"].astype(np.float32)
+        self.norm = normalize(self.values, spec).astype(np.float32)
+
+        # category averages per date (tickers grouped by their latest category)
+        cats = store["categories"]
+        present = set(cats) - {""}
+        self.categories = [c for c in CATEGORY_ORDER if c in present] + sorted(present - set(CATEGORY_ORDER))
+        member = (cats[None, :] == np.array(self.categories, dtype=str)[:, None]).astype(np.float32)
+        finite = np.isfinite(self.values)
+        sums = np.einsum("ct,dtk->dck", member, np.where(finite, self.values, 0.0))
+        counts = np.einsum("ct,dtk->dck", member, finite.astype(np.float32))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.cat_values = np.where(counts > 0, sums / counts, np.nan).astype(np.float32)
+        self.cat_norm = normalize(self.cat_values, spec).astype(np.float32)
+        self._rows = {c: np.flatnonzero(cats == c) for c in self.categories}
+
+    def block(self, i: int, size: int = PREFETCH) -> slice:
+        """The block of `size` dates containing date i."""
+        start = (i // size) * size
+        return slice(start, min(start + size, len(self.dates)))
+
+    def _long(self, dates: slice, rows: np.ndarray, row_cols: dict[str, np.ndarray],
+              values: np.ndarray, norm: np.ndarray) -> pd.DataFrame:
+        labels = np.array(self.date_labels[dates], dtype=object)
+        d, r, k = values.shape
+        out = {"Date": pd.Categorical(np.repeat(labels, r * k), categories=labels)}
+        for name, col in row_cols.items():
+            out[name] = pd.Categorical(np.tile(np.repeat(col[rows], k), d))
+        out["Timeframe"] = pd.Categorical(np.tile(self.timeframes, d * r), categories=self.timeframes)
+        out[self.value] = values.ravel()
+        out["norm"] = np.round(norm.ravel(), 3)
+        df = pd.DataFrame(out)
+        return df[df[self.value].notna()].reset_index(drop=True)
+
+    def category_frame(self, dates: slice) -> pd.DataFrame:
+        """Long category-average cells for a range of dates: Date, Category, Timeframe, value, norm."""
+        rows = np.arange(len(self.categories))
+        return self._long(dates, rows, {"Category": np.array(self.categories, dtype=object)},
+                          self.cat_values[dates], self.cat_norm[dates])
+
+    def ticker_frame(self, dates: slice, category: str) -> pd.DataFrame:
+        """Long per-ticker cells of one category for a range of dates: Date, Ticker, Name, Timeframe, value, norm."""
+        rows = self._rows.get(category, np.array([], dtype=int))
+        return self._long(dates, rows, {"Ticker": self.tickers, "Name": self.names},
+                          self.values[dates][:, rows], self.norm[dates][:, rows])
+
+
+@lru_cache(maxsize=6)
+def _history(metric: str, release: tuple) -> HeatmapHistory | None:
+    store = _update(metric)
+    return HeatmapHistory(metric, store) if store is not None else None
+
+
+def release(metric: str) -> tuple:
+    """Cache key for the metric's sources (and its seed file, if any)."""
+    key = latest_frames.release(METRICS[metric].frame)
+    seed = SEEDS.get(metric)
+    if seed:
+        key += (seed[1].stat().st_mtime_ns if seed[1].exists() else None,)
+    return key
+
+
+def history(metric: str) -> HeatmapHistory | None:
+    """The history cube for a metric, extended with the current release the first time it is seen."""
+    return _history(metric, release(metric))
+
+
+# -------------------------
+# Page section
+# -------------------------
+def render_playback(metric: str, category: str, *, title: str, legend: str,
+                    value_title: str, value_format: str) -> None:
+    """Date slider + the category or per-ticker heatmap on that date (same look as the page's heatmaps)."""
+    hist = history(metric)
+    if hist is None:
+        return
+    labels = hist.date_labels    # m/d/yyyy, like the page titles
+
+    st.markdown('<div class="vspace-16"></div>', unsafe_allow_html=True)
+    st.markdown(
+        f"""
+        <div style="text-align:center; margin:0 0 8px;
+                    font-size:16px; font-weight:700; color:#1a1a1a;">
+            {title} – History
+        </div>
+        <div style="text-align:center; margin:-6px 0 14px;
+                font-size:14px; font-weight:500; color:#6b7280;">
+                {len(labels)} dates since {labels[0]}; history grows with each data release
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    if len(labels) < 2:
+        return
+
+    _, mid, _ = st.columns([1, 2, 1])
+    with mid:
+        when = st.select_slider("Date", options=labels, value=labels[-1], key=f"hist_date_{metric}")
+        grid = st.radio("Grid", ["Categories", f"{category} — Per Ticker"], horizontal=True,
+                        key=f"hist_grid_{metric}")
+    spec = _playback_spec(metric, category, grid == "Categories", when, release(metric),
+                          legend, value_title, value_format)
+    if spec is None:
+        st.info(f"No history for {category}.")
+        return
+    _, center, _ = st.columns([1, .8, 1])
+    with center:
+        st.vega_lite_chart(spec, use_container_width=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _playback_spec(metric: str, category: str, categories: bool, when: str, release: tuple,
+                   legend: str, value_title: str, value_format: str) -> dict | None:
+    """Vega-Lite spec for one date's grid; the dataset is the whole block around it."""
+    hist = history(metric)
+    dates = hist.block(hist.date_labels.index(when))
+    if categories:
+        data, row, rows = hist.category_frame(dates), "Category", hist.categories
+        height, width, limit = 24 * len(rows), 450, 240
+    else:
+        data, row = hist.ticker_frame(dates, category), "Ticker"
+        rows = sorted(data["Ticker"].astype(str).unique().tolist())
+        height, width, limit = max(360, 22 * len(rows) + 24), 420, 260
+    if data.empty:
+        return None
+
+    chart = (
+        alt.Chart(data)
+        .transform_filter(alt.datum.Date == when)
+        .mark_rect(stroke="#2b2f36", strokeWidth=0.6, strokeOpacity=0.95)
+        .encode(
+            x=alt.X("Timeframe:N", sort=hist.timeframes,
+                    axis=alt.Axis(orient="top", title=None, labelAngle=0, labelColor="#1a1a1a",
+                                  labelFlush=False, labelFontSize=12)),
+            y=alt.Y(f"{row}:N", sort=rows,
+                    axis=alt.Axis(title=None, labelColor="#1a1a1a", labelFlush=False,
+                                  labelFontSize=12, labelLimit=limit)),
+            color=alt.Color("norm:Q",
+                            scale=alt.Scale(scheme="blueorange", domain=[-1, 0, 1]),
+                            legend=alt.Legend(orient="bottom", title=legend, labelExpr="''")),
+            tooltip=[
+                alt.Tooltip("Date:N"),
+                alt.Tooltip(f"{row}:N"),
+                alt.Tooltip("Timeframe:N"),
+                alt.Tooltip(f"{hist.value}:Q", title=value_title, format=value_format),
+            ],
+        )
+        .properties(width=width, height=height)
+        .configure_view(strokeWidth=0)
+    )
+    return vega_specs.to_vega_lite(chart)
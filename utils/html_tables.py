@@ -0,0 +1,247 @@
+# utils/html_tables.py
+#
+# Shared tinted-table renderer for the card tables (Heatmaps, Vantage Point,
+# Directional Trends, Morning Compass).  Colors and labels are computed for a
+# whole column at once with NumPy and rows are assembled with a string join,
+# so we never go through per-cell callbacks or DataFrame.to_html.
+
+from urllib.parse import quote_plus
+
+import numpy as np
+import pandas as pd
+
+GREEN = "16,185,129"
+RED   = "239,68,68"
+GRAY_BG = "rgba(156,163,175,0.18)"
+
+GREEN_TEXT   = "#0b513a"
+RED_TEXT     = "#641515"
+NEUTRAL_TEXT = "#374151"
+
+
+# -------------------------
+# Column helpers
+# -------------------------
+def _values(col) -> np.ndarray:
+    """Column -> float ndarray (non-numeric -> NaN)."""
+    if isinstance(col, np.ndarray) and col.dtype.kind == "f":
+        return col
+    return pd.to_numeric(pd.Series(col, copy=False), errors="coerce").to_numpy(dtype=float)
+
+
+def _text(col) -> list[str]:
+    """Column -> list of display strings (missing -> "")."""
+    return [x if isinstance(x, str) else ("" if x is None or x != x else str(x))
+            for x in pd.Series(col, copy=False).tolist()]
+
+
+def fmt_num(col, nd: int = 2, scale: float = 1.0, suffix: str = "", na: str = "") -> list[str]:
+    """Thousands-separated numbers with `nd` decimals; NaN -> `na`."""
+    v = _values(col) * scale
+    spec = f",.{nd}f"
+    return [na if x != x else f"{x:{spec}}{suffix}" for x in v.tolist()]
+
+
+def fmt_pct(col, nd: int = 2, na: str = "") -> list[str]:
+    """Decimal returns -> percent labels (0.012 -> '1.20%'); NaN -> `na`."""
+    return fmt_num(col, nd=nd, scale=100.0, suffix="%", na=na)
+
+
+def fmt_int(col) -> list[str]:
+    """Rounded integers with separators (no '-0')."""
+    v = np.rint(_values(col)) + 0.0
+    return ["" if x != x else f"{x:,.0f}" for x in v.tolist()]
+
+
+def _rgba(rgb: str, alpha: np.ndarray, nd: int) -> list[str]:
+    spec = f".{nd}f"
+    return [f"rgba({rgb},{a:{spec}})" for a in alpha.tolist()]
+
+
+# -------------------------
+# Background color schemes (vectorized)
+# -------------------------
+def divergent_bg(col, vmax, lo: float = 0.12, span: float = 0.28,
+                 nd: int = 3, neutral: float = 0.0) -> np.ndarray:
+    """
+    Green/red tint whose opacity grows with |value| / vmax (capped at 1).
+    Values inside ±neutral render transparent.  Returns "" for NaN cells,
+    or for every cell when vmax is missing / non-positive.
+    """
+    v = _values(col)
+    out = np.full(v.shape, "", dtype=object)
+    if vmax is None or pd.isna(vmax) or float(vmax) <= 0:
+        return out
+
+    alpha = lo + span * np.minimum(np.abs(v) / float(vmax), 1.0)
+    pos = v > neutral
+    neg = v < -neutral
+    out[~np.isnan(v)] = "transparent"
+    out[pos] = _rgba(GREEN, alpha[pos], nd)
+    out[neg] = _rgba(RED, alpha[neg], nd)
+    return out
+
+
+def _banded(s: np.ndarray, up: np.ndarray, down: np.ndarray,
+            alpha_up: np.ndarray, alpha_down: np.ndarray):
+    bg = np.full(s.shape, GRAY_BG, dtype=object)
+    color = np.full(s.shape, NEUTRAL_TEXT, dtype=object)
+    bg[up] = _rgba(GREEN, alpha_up[up], 3)
+    color[up] = GREEN_TEXT
+    bg[down] = _rgba(RED, alpha_down[down], 3)
+    color[down] = RED_TEXT
+    missing = np.isnan(s)
+    bg[missing] = ""
+    color[missing] = ""
+    return bg, color
+
+
+def rank_bg(col, cap: float = 100.0):
+    """
+    Sharpe Rank bands: >=70 green, <=30 red, gray in between.  Values are
+    clipped to 0..cap first; the clipped array is returned for labelling.
+    """
+    s = np.clip(_values(col), 0, cap)
+    bg, color = _banded(
+        s, s >= 70, s <= 30,
+        0.12 + 0.28 * np.clip((s - 70.0) / 30.0, 0.0, 1.0),
+        0.12 + 0.28 * np.clip((30.0 - s) / 30.0, 0.0, 1.0),
+    )
+    return bg, color, s
+
+
+def score_bg(col, cap: float = 105.0):
+    """MM Score bands: >=25 green, <=-25 red, gray in between."""
+    s = _values(col)
+    alpha = 0.12 + 0.28 * np.minimum(np.abs(s) / cap, 1.0)
+    return _banded(s, s >= 25, s <= -25, alpha, alpha)
+
+
+def badge_bg(col) -> np.ndarray:
+    """Morning Compass MM Score badge: stepped bins instead of a gradient."""
+    v = _values(col)
+    out = np.select(
+        [v <= -100, v < -25, v <= 25, v < 100],
+        ["rgba(185,28,28,0.35)", "rgba(239,68,68,0.28)",
+         "rgba(229,231,235,1.00)", "rgba(16,185,129,0.28)"],
+        default="rgba(6,95,70,0.35)",
+    ).astype(object)
+    out[np.isnan(v)] = ""
+    return out
+
+
+# -------------------------
+# Cell assembly
+# -------------------------
+def span_cells(labels, bgs, colors=None, pad: str = "0 4px",
+               radius: str = "2px", align: str | None = "right") -> list[str]:
+    """
+    Wrap labels in the tinted block span used across the card tables.
+    Cells whose background is "" render empty (missing value / no scale).
+    """
+    head = '<span style="display:block; background:'
+    tail = f"padding:{pad}; border-radius:{radius};"
+    if align:
+        tail += f" text-align:{align};"
+    tail += '">'
+
+    if colors is None:
+        return [
+            f"{head}{bg}; {tail}{lab}</span>" if bg else ""
+            for lab, bg in zip(labels, bgs)
+        ]
+    return [
+        f"{head}{bg}; color:{c}; {tail}{lab}</span>" if bg else ""
+        for lab, bg, c in zip(labels, bgs, colors)
+    ]
+
+
+def pill_cells(labels, palette: dict[str, str]) -> list[str]:
+    """Subtle tinted pill per label (Tape Bias / Directional Trend taxonomy)."""
+    out = []
+    for l in _text(labels):
+        l = l.strip()
+        bg = palette.get(l, "transparent")
+        out.append(
+            f'<span style="background:{bg}; color:#1a1a1a; '
+            f'padding:2px 8px; border-radius:3px; font-weight:500;">{l}</span>'
+        )
+    return out
+
+
+TAPE_BIAS_PALETTE = {
+    "Buy":             "rgba(16,185,129,0.42)",
+    "Leaning Bullish": "rgba(16,185,129,0.12)",
+    "Topping":         "rgba(107,114,128,0.12)",
+    "Bottoming":       "rgba(107,114,128,0.12)",
+    "Leaning Bearish": "rgba(239,68,68,0.12)",
+    "Sell":            "rgba(239,68,68,0.42)",
+}
+
+
+LINK_PARAMS = "__LINK_PARAMS__"
+
+
+def link_params(adv_on: bool = False, info_on: bool = False, proof: str = "") -> str:
+    """The per-session part of a Deep Dive link (toggle flags + signed proof)."""
+    return f'&adv={"1" if adv_on else "0"}&info={"1" if info_on else "0"}&proof={proof}'
+
+
+def _ticker_links(tickers, params: str) -> list[str]:
+    prefix = '<a href="?page=Deep%20Dive&ticker='
+    suffix = (
+        f'{params}" '
+        'target="_self" rel="noopener" '
+        'style="text-decoration:none; font-weight:600;">'
+    )
+    out = []
+    for t in _text(tickers):
+        t = t.strip().upper()
+        out.append(f"{prefix}{quote_plus(t)}{suffix}{t}</a>" if t else "")
+    return out
+
+
+def ticker_links(tickers, adv_on: bool = False, info_on: bool = False, proof: str = "") -> list[str]:
+    """
+    Deep Dive links for a whole column.  The toggle flags and the signed
+    proof are resolved once by the caller instead of once per ticker.
+    """
+    return _ticker_links(tickers, link_params(adv_on, info_on, proof))
+
+
+def ticker_link_templates(tickers) -> list[str]:
+    """
+    ticker_links() with a LINK_PARAMS placeholder instead of the session's
+    flags and proof, for HTML that is cached across sessions; fill it per
+    render with fill_links().
+    """
+    return _ticker_links(tickers, LINK_PARAMS)
+
+
+def fill_links(html: str, adv_on: bool = False, info_on: bool = False, proof: str = "") -> str:
+    """Put this session's link_params() into HTML built from ticker_link_templates()."""
+    return html.replace(LINK_PARAMS, link_params(adv_on, info_on, proof))
+
+
+# -------------------------
+# Table assembly
+# -------------------------
+def render_table(columns: dict, classes: str = "tbl", colgroup: str = "") -> str:
+    """
+    Render {header: cells} as the same markup DataFrame.to_html(escape=False)
+    produced for our cards (minus the 'dataframe' class), with an optional
+    <colgroup> injected after the opening tag.  Cells are inserted verbatim.
+    """
+    headers = list(columns.keys())
+    cols = [c if isinstance(c, list) else _text(c) for c in columns.values()]
+
+    thead = "".join(f"<th>{h}</th>" for h in headers)
+    rows = "\n".join(
+        "<tr><td>" + "</td><td>".join(cells) + "</td></tr>"
+        for cells in zip(*cols)
+    )
+    return (
+        f'<table class="{classes}">{colgroup}\n'
+        f'<thead>\n<tr style="text-align: right;">{thead}</tr>\n</thead>\n'
+        f"<tbody>\n{rows}\n</tbody>\n</table>"
+    )
@@ -0,0 +1,251 @@
+# utils/latest_frames.py
+#
+# "Latest row per ticker" frames for the Performance, Sharpe Rank and
+# Markmentum heatmaps and Directional Trends.
+#
+# Pages 03-06 and their Research Pack modules used to assemble these frames
+# separately: each read the CSVs, sorted and dropped duplicates to get the
+# latest row per ticker, and merged in the WTD / MTD / QTD delta files, with
+# slightly different tolerance rules.  Here each frame is assembled once per
+# data release (keyed on the source files' mtimes) and both the pages and
+# the PDF builders consume it, so the numbers are the same in both places.
+#
+# Every function returns (frame, as-of "m/d/yyyy"); the frame is a copy, so
+# callers may add or scale columns.  Values are kept as in the source files
+# (the performance changes stay fractions); scaling for display is left to
+# the caller.
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR  = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+
+PERF_CSV = DATA_DIR / "ticker_data.csv"
+
+SR_CSV_BASE = DATA_DIR / "qry_graph_data_48.csv"  # Sharpe_Rank + daily change (and/or previous)
+SR_CSV_WTD  = DATA_DIR / "qry_graph_data_49.csv"  # Sharpe_Rank_wtd_change
+SR_CSV_MTD  = DATA_DIR / "qry_graph_data_50.csv"  # Sharpe_Rank_mtd_change
+SR_CSV_QTD  = DATA_DIR / "qry_graph_data_51.csv"  # Sharpe_Rank_qtd_change
+
+MM_CSV_BASE = DATA_DIR / "model_score_day_change.csv"
+MM_CSV_WTD  = DATA_DIR / "model_score_wtd_change.csv"
+MM_CSV_MTD  = DATA_DIR / "model_score_mtd_change.csv"
+MM_CSV_QTD  = DATA_DIR / "model_score_qtd_change.csv"
+
+DT_CSV = DATA_DIR / "qry_graph_data_88.csv"
+
+PERF_COLS  = ["day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]
+TREND_COLS = ["st_trend", "mt_trend", "lt_trend", "st_trend_change", "mt_trend_change", "lt_trend_change"]
+DELTA_COLS = ["ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]
+
+# source files per frame; their mtimes identify a data release
+SOURCES = {
+    "performance":        (PERF_CSV,),
+    "sharpe_rank":        (SR_CSV_BASE, SR_CSV_WTD, SR_CSV_MTD, SR_CSV_QTD),
+    "markmentum":         (MM_CSV_BASE, MM_CSV_WTD, MM_CSV_MTD, MM_CSV_QTD),
+    "directional_trends": (DT_CSV,),
+}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def _signature(*paths: Path) -> tuple:
+    """mtime per source file (None if missing): the cache key for one release."""
+    return tuple(p.stat().st_mtime_ns if p.exists() else None for p in paths)
+
+
+def release(frame: str) -> tuple:
+    """Cache key for the current data release of one frame (see SOURCES)."""
+    return _signature(*SOURCES[frame])
+
+
+def _asof(dt: pd.Series) -> str:
+    d = dt.max() if len(dt) else pd.NaT
+    return f"{d.month}/{d.day}/{d.year}" if pd.notna(d) else ""
+
+
+def _latest(df: pd.DataFrame) -> pd.DataFrame:
+    """Latest row per ticker (by Date when present), adding the parsed date as _dt."""
+    if "Date" not in df.columns:
+        return df.drop_duplicates("Ticker", keep="first")
+    df = df.copy()
+    df["_dt"] = pd.to_datetime(df["Date"], errors="coerce")
+    return (
+        df.sort_values(["Ticker", "_dt"], ascending=[True, False])
+          .drop_duplicates(subset=["Ticker"], keep="first")
+    )
+
+
+def _read(p: Path) -> pd.DataFrame:
+    if not p.exists():
+        return pd.DataFrame()
+    df = pd.read_csv(p)
+    if "Ticker" not in df.columns:
+        return pd.DataFrame()
+    return df
+
+
+def _delta(p: Path, names: tuple[str, ...], out_col: str) -> pd.DataFrame:
+    """
+    Ticker + one delta column (latest per ticker) from a WTD / MTD / QTD file.
+    Uses the first of `names` present, else the first "...change" column that
+    is not a "previous..." one.
+    """
+    d = _read(p)
+    col = next((c for c in names if c in d.columns), None)
+    if col is None:
+        col = next((c for c in d.columns
+                    if "change" in str(c).lower() and "previous" not in str(c).lower()), None)
+    if d.empty or col is None:
+        return pd.DataFrame(columns=["Ticker", out_col])
+    d = _latest(d)
+    d = pd.DataFrame({
+        "Ticker": d["Ticker"].astype(str).str.strip(),
+        out_col: pd.to_numeric(d[col], errors="coerce"),
+    })
+    return d.drop_duplicates("Ticker", keep="first")
+
+
+def _with_deltas(base: pd.DataFrame, *deltas: pd.DataFrame) -> pd.DataFrame:
+    for add in deltas:
+        base = base.merge(add, on="Ticker", how="left")
+    return base.reset_index(drop=True)
+
+
+# -------------------------
+# Performance (ticker_data.csv)
+# -------------------------
+@lru_cache(maxsize=2)
+def _performance(sig: tuple) -> tuple[pd.DataFrame, str]:
+    df = _read(PERF_CSV)
+    if df.empty or "Date" not in df.columns:
+        return pd.DataFrame(), ""
+    for c in PERF_COLS + ["Close"]:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = _latest(df).reset_index(drop=True)
+    return df, _asof(df["_dt"])
+
+
+def performance() -> tuple[pd.DataFrame, str]:
+    """ticker_data.csv, latest row per ticker; *_pct_change as fractions."""
+    df, asof = _performance(release("performance"))
+    return df.copy(), asof
+
+
+# -------------------------
+# Sharpe Rank (qry_graph_data_48 + 49/50/51)
+# -------------------------
+@lru_cache(maxsize=2)
+def _sharpe_rank(sig: tuple) -> tuple[pd.DataFrame, str]:
+    base = _read(SR_CSV_BASE)
+    if base.empty:
+        return pd.DataFrame(), ""
+    base = _latest(base)
+
+    for c in ["Sharpe_Rank", "previous_Sharpe_Rank", "Sharpe_Rank_daily_change"]:
+        if c in base.columns:
+            base[c] = pd.to_numeric(base[c], errors="coerce")
+    if "Sharpe_Rank_daily_change" not in base.columns or base["Sharpe_Rank_daily_change"].isna().all():
+        if "Sharpe_Rank" in base.columns and "previous_Sharpe_Rank" in base.columns:
+            base["Sharpe_Rank_daily_change"] = base["Sharpe_Rank"] - base["previous_Sharpe_Rank"]
+
+    df = _with_deltas(
+        base,
+        _delta(SR_CSV_WTD, ("Sharpe_Rank_wtd_change",), "ΔWTD"),
+        _delta(SR_CSV_MTD, ("Sharpe_Rank_mtd_change",), "ΔMTD"),
+        _delta(SR_CSV_QTD, ("Sharpe_Rank_qtd_change",), "ΔQTD"),
+    ).rename(columns={
+        "Ticker_name": "Name",
+        "Sharpe_Rank": "Rank",
+        "Sharpe_Rank_daily_change": "ΔDaily",
+    })
+    for c in ["Rank"] + DELTA_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df, _asof(df["_dt"]) if "_dt" in df.columns else ""
+
+
+def sharpe_rank() -> tuple[pd.DataFrame, str]:
+    """Sharpe Rank, latest row per ticker: base columns with Name, Rank, ΔDaily, ΔWTD, ΔMTD, ΔQTD."""
+    df, asof = _sharpe_rank(release("sharpe_rank"))
+    return df.copy(), asof
+
+
+# -------------------------
+# Markmentum score (model_score_*_change.csv)
+# -------------------------
+@lru_cache(maxsize=2)
+def _markmentum(sig: tuple) -> tuple[pd.DataFrame, str]:
+    base = _read(MM_CSV_BASE)
+    if base.empty:
+        return pd.DataFrame(), ""
+    base = _latest(base)
+
+    # tolerant column names (older exports)
+    cols_lower = {str(c).lower(): c for c in base.columns}
+    name_col  = cols_lower.get("ticker_name") or cols_lower.get("name") or cols_lower.get("company")
+    cat_col   = cols_lower.get("category")
+    score_col = cols_lower.get("model_score") or cols_lower.get("current_model_score") or cols_lower.get("score")
+    prev_col  = cols_lower.get("previous_model_score")
+    dd_col = (
+        cols_lower.get("model_score_daily_change")
+        or cols_lower.get("daily_change")
+        or cols_lower.get("score_daily_change")
+    )
+
+    score = pd.to_numeric(base[score_col], errors="coerce") if score_col else pd.Series(np.nan, index=base.index)
+    daily = pd.to_numeric(base[dd_col], errors="coerce") if dd_col else pd.Series(np.nan, index=base.index)
+    if daily.isna().all() and score_col and prev_col:
+        daily = score - pd.to_numeric(base[prev_col], errors="coerce")
+
+    out = pd.DataFrame({
+        "Ticker": base["Ticker"].astype(str).str.strip(),
+        "Name": base[name_col] if name_col else base["Ticker"].astype(str),
+        "Category": base[cat_col] if cat_col else "",
+        "Date": base["Date"] if "Date" in base.columns else "",
+        "Score": score,
+        "ΔDaily": daily,
+    })
+    if "_dt" in base.columns:
+        out["_dt"] = base["_dt"]
+
+    df = _with_deltas(
+        out,
+        _delta(MM_CSV_WTD, ("model_score_wtd_change",), "ΔWTD"),
+        _delta(MM_CSV_MTD, ("model_score_mtd_change",), "ΔMTD"),
+        _delta(MM_CSV_QTD, ("model_score_qtd_change",), "ΔQTD"),
+    )
+    return df, _asof(df["_dt"]) if "_dt" in df.columns else ""
+
+
+def markmentum() -> tuple[pd.DataFrame, str]:
+    """Markmentum score, latest row per ticker: Ticker, Name, Category, Date, Score, ΔDaily, ΔWTD, ΔMTD, ΔQTD."""
+    df, asof = _markmentum(release("markmentum"))
+    return df.copy(), asof
+
+
+# -------------------------
+# Directional Trends (qry_graph_data_88.csv)
+# -------------------------
+@lru_cache(maxsize=2)
+def _directional_trends(sig: tuple) -> tuple[pd.DataFrame, str]:
+    df = _read(DT_CSV)
+    if df.empty or "Date" not in df.columns:
+        return pd.DataFrame(), ""
+    for c in TREND_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = _latest(df).reset_index(drop=True)
+    return df, _asof(df["_dt"])
+
+
+def directional_trends() -> tuple[pd.DataFrame, str]:
+    """qry_graph_data_88.csv, latest row per ticker; trend columns numeric."""
+    df, asof = _directional_trends(release("directional_trends"))
+    return df.copy(), asof
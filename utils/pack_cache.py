@@ -0,0 +1,117 @@
+# utils/pack_cache.py
+#
+# Disk cache of Research Pack module PDFs.
+#
+# For a given data release and option set a module's PDF is byte-identical
+# for every member, so each build is stored under
+#
+#   <cache root>/<release id>/<module key>-<options hash>/
+#       meta.json   {"stub": ..., "parts": n}
+#       00.pdf, 01.pdf, ...
+#
+# and a pack becomes a lookup per module plus the merge.  The release id is
+# a fingerprint of data/ (name, size, mtime of every file) plus the builder
+# source, so a new data drop or a code change starts a fresh directory;
+# older release directories are pruned when a new one is first written.
+# Entries are written to a temp dir and renamed into place, so concurrent
+# sessions building the same entry never read a partial one.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+APP_DIR   = Path(__file__).resolve().parent.parent
+DATA_DIR  = APP_DIR / "data"
+CACHE_DIR = Path(os.environ.get("MM_PACK_CACHE_DIR", APP_DIR / ".cache" / "research_pack"))
+
+KEEP_RELEASES = 2
+
+
+def release_id(data_dir: Path = DATA_DIR, *code_files: Path) -> str:
+    """Fingerprint of the data release (and of the builder code that renders it)."""
+    h = hashlib.sha256()
+    for p in sorted(Path(data_dir).iterdir()):
+        if p.is_file():
+            s = p.stat()
+            h.update(f"{p.name}\0{s.st_size}\0{s.st_mtime_ns}\n".encode())
+    for p in code_files:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def normalize_options(options: dict | None) -> str:
+    """Canonical JSON for an options dict (key order and tuple/list spelling don't matter)."""
+    return json.dumps(options or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _entry_dir(release: str, module_key: str, options: dict | None) -> Path:
+    opt_hash = hashlib.sha256(normalize_options(options).encode()).hexdigest()[:16]
+    return CACHE_DIR / release / f"{module_key}-{opt_hash}"
+
+
+def get(release: str, module_key: str, options: dict | None) -> tuple[list[bytes], str] | None:
+    """(pdfs_in_order, filename_stub) for a cached build, or None on a miss."""
+    d = _entry_dir(release, module_key, options)
+    try:
+        meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+        blobs = [(d / f"{i:02d}.pdf").read_bytes() for i in range(meta["parts"])]
+    except (OSError, ValueError, KeyError):
+        return None
+    return blobs, meta["stub"]
+
+
+def put(release: str, module_key: str, options: dict | None,
+        blobs: list[bytes], stub: str) -> None:
+    """Store a build.  Failures (read-only disk, races) are ignored; the cache is best-effort."""
+    d = _entry_dir(release, module_key, options)
+    if d.exists():
+        return
+    try:
+        d.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{d.name}.", dir=d.parent))
+        for i, blob in enumerate(blobs):
+            (tmp / f"{i:02d}.pdf").write_bytes(blob)
+        (tmp / "meta.json").write_text(
+            json.dumps({"stub": stub, "parts": len(blobs), "options": normalize_options(options)}),
+            encoding="utf-8",
+        )
+        try:
+            os.rename(tmp, d)            # atomic; loses cleanly if another session got there first
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+    except OSError:
+        return
+    _prune(release)
+
+
+def get_or_build(release: str, module_key: str, options: dict | None,
+                 build) -> tuple[list[bytes], str]:
+    """Cached `build(options) -> (pdfs_in_order, filename_stub)`."""
+    hit = get(release, module_key, options)
+    if hit is not None:
+        return hit
+    blobs, stub = build(options)
+    if blobs:
+        put(release, module_key, options, blobs, stub)
+    return blobs, stub
+
+
+def _prune(current: str) -> None:
+    """Keep the current release plus the most recent KEEP_RELEASES - 1 others."""
+    try:
+        others = sorted(
+            (p for p in CACHE_DIR.iterdir() if p.is_dir() and p.name != current),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+    except OSError:
+        return
+    from utils.static_assets import unpublish   # page links to finished packs (pages/15)
+
+    for p in others[KEEP_RELEASES - 1:]:
+        for pdf in p.glob("packs/*.pdf"):
+            unpublish(pdf.name)
+        shutil.rmtree(p, ignore_errors=True)
@@ -0,0 +1,153 @@
+# utils/pack_jobs.py
+#
+# Research Pack generation as background jobs.
+#
+# Building a pack used to run inside the member's script run, so the page
+# was blocked until it finished and any widget touch (a rerun) threw the
+# work away.  submit() now returns a job straight away and the build runs on
+# a small server-wide thread pool (MM_PACK_JOBS concurrent packs, default 1;
+# module builds inside a job still fan out over the research_pack process
+# pool), so pack builds can't starve the interactive pages.
+#
+# Job ids are a hash of (release, parts): identical requests - two members
+# asking for the same pack, or one member clicking twice - share one job,
+# and a finished pack is kept on disk next to the module cache for later
+# download until the release is pruned.  A job can outlive its PDF (jobs are
+# kept JOB_TTL_S, releases only KEEP_RELEASES); it then reports `expired`
+# and an identical submit() builds it again.
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils import pack_cache
+from utils.research_pack import build_pack, module_label, pack_filename, pack_release_id
+
+MAX_CONCURRENT_PACKS = max(1, int(os.environ.get("MM_PACK_JOBS", 1)))
+JOB_TTL_S = 6 * 3600      # forget finished jobs after this long (their PDFs stay on disk)
+
+QUEUED, RUNNING, DONE, EMPTY, FAILED = "queued", "running", "done", "empty", "failed"
+
+
+@dataclass
+class PackJob:
+    id: str
+    release: str
+    parts: list
+    filename: str
+    status: str = QUEUED
+    done: int = 0
+    total: int = 0
+    current: str = ""
+    error: str = ""
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+    size: int = 0              # bytes of the finished PDF
+    build_s: float = 0.0       # wall time of the build (0 when it was already on disk)
+
+    @property
+    def path(self) -> Path:
+        return pack_cache.CACHE_DIR / self.release / "packs" / f"{self.id}.pdf"
+
+    @property
+    def pending(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def expired(self) -> bool:
+        """Finished, but its PDF has since been pruned with the release."""
+        return self.status == DONE and not self.path.exists()
+
+
+_jobs: dict[str, PackJob] = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PACKS, thread_name_prefix="research-pack")
+
+
+def job_id(release: str, parts: list) -> str:
+    key = release + "\0" + "\0".join(f"{k}:{pack_cache.normalize_options(o)}" for k, o in parts)
+    return hashlib.sha256(key.encode()).hexdigest()[:20]
+
+
+def submit(parts: list, release: str | None = None) -> PackJob:
+    """Queue a pack build (research_pack.pack_parts() output); returns the existing job if identical."""
+    release = release or pack_release_id()
+    jid = job_id(release, parts)
+    with _lock:
+        _expire()
+        job = _jobs.get(jid)
+        if job is not None and job.status != FAILED and not job.expired:
+            return job
+        job = PackJob(id=jid, release=release, parts=parts,
+                      filename=pack_filename(parts), total=len(parts))
+        if job.path.exists():           # built earlier (this process or a previous one)
+            job.status, job.done, job.finished = DONE, job.total, time.time()
+            job.size = job.path.stat().st_size
+        else:
+            _executor.submit(_run, job)
+        _jobs[jid] = job
+        return job
+
+
+def build_now(parts: list, release: str | None = None, force: bool = False,
+              parallel: bool = True) -> PackJob:
+    """Build (or find) a pack synchronously in the calling thread; for the headless prebuilder."""
+    release = release or pack_release_id()
+    job = PackJob(id=job_id(release, parts), release=release, parts=parts,
+                  filename=pack_filename(parts), total=len(parts))
+    if force or not job.path.exists():
+        _run(job, parallel=parallel)
+    else:
+        job.status, job.done, job.finished = DONE, job.total, time.time()
+        job.size = job.path.stat().st_size
+    if job.status != FAILED:
+        with _lock:
+            _jobs.setdefault(job.id, job)
+    return job
+
+
+def get(jid: str | None) -> PackJob | None:
+    with _lock:
+        return _jobs.get(jid) if jid else None
+
+
+def _run(job: PackJob, parallel: bool = True) -> None:
+    job.status = RUNNING
+    started = time.perf_counter()
+
+    def _on_done(key: str, n_done: int, n_total: int) -> None:
+        job.done, job.total, job.current = n_done, n_total, module_label(key)
+
+    try:
+        job.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{job.id}.", dir=job.path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:     # merged pack is streamed to disk, not held in memory
+                wrote = build_pack(job.parts, f, release=job.release, on_done=_on_done, parallel=parallel)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if wrote:
+            os.replace(tmp, job.path)
+            job.size = job.path.stat().st_size
+            job.status = DONE
+        else:
+            os.unlink(tmp)
+            job.status = EMPTY
+    except Exception as exc:           # surfaced to the page; the job can be resubmitted
+        job.error = f"{type(exc).__name__}: {exc}"
+        job.status = FAILED
+    finally:
+        job.build_s = time.perf_counter() - started
+        job.finished = time.time()
+
+
+def _expire() -> None:
+    now = time.time()
+    for jid in [j.id for j in _jobs.values() if j.finished and now - j.finished > JOB_TTL_S]:
+        del _jobs[jid]
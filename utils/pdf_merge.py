@@ -0,0 +1,192 @@
+# utils/pdf_merge.py
+#
+# Page-stream merge for ReportLab output, without re-parsing it.
+#
+# merge_pdf_bytes_in_order() used pypdf: every module PDF was parsed into an
+# object tree, its pages copied into a PdfWriter and the whole thing
+# re-serialized in memory.  The parts are all ReportLab documents with a
+# plain layout (one classic xref table, a Catalog -> Pages -> Page tree, no
+# encryption or incremental updates), so the merge can work on raw bytes:
+#
+#   - the xref table gives each object's byte range; objects are copied as
+#     is, with only their "N 0 R" references renumbered (stream data is
+#     never touched - only the dict in front of it)
+#   - each part's Catalog / Pages nodes / Info are dropped and its pages are
+#     re-parented under one new Pages node
+#   - with dedupe=True, an object whose renumbered bytes match one already
+#     written (the same font, footer form or image in every module) is not
+#     written again; references to it point at the first copy
+#   - output is written straight to a file object, with a fresh xref table
+#
+# Anything that doesn't look like that (xref streams, /Prev, inherited page
+# attributes, ...) raises UnsupportedPDF so the caller can fall back to pypdf.
+
+import hashlib
+import re
+from typing import BinaryIO
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+_REF_RE       = re.compile(rb"(\d+) 0 R\b")
+_OBJ_HEAD_RE  = re.compile(rb"\s*\d+ 0 obj\s*")
+_STREAM_RE    = re.compile(rb">>\s*stream\r?\n")
+_INHERITABLE  = (b"/MediaBox", b"/CropBox", b"/Resources", b"/Rotate")
+
+
+class UnsupportedPDF(ValueError):
+    """The input isn't a simple single-revision PDF this merger understands."""
+
+
+def _ref(body: bytes, key: bytes) -> int | None:
+    m = re.search(re.escape(key) + rb"\s+(\d+) 0 R", body)
+    return int(m.group(1)) if m else None
+
+
+class _Part:
+    """Object bodies of one PDF, keyed by object number, plus its page order."""
+
+    def __init__(self, blob: bytes):
+        m = _STARTXREF_RE.search(blob, max(0, len(blob) - 64))
+        if not m:
+            raise UnsupportedPDF("no startxref")
+        xref_at = int(m.group(1))
+        if not blob.startswith(b"xref", xref_at):
+            raise UnsupportedPDF("xref stream")
+        trailer_at = blob.find(b"trailer", xref_at)
+        if trailer_at < 0:
+            raise UnsupportedPDF("no trailer")
+        trailer = blob[trailer_at:m.start()]
+        if b"/Prev" in trailer or b"/Encrypt" in trailer:
+            raise UnsupportedPDF("incremental update or encrypted")
+
+        offsets: list[tuple[int, int]] = []
+        lines = blob[xref_at + 4:trailer_at].split()
+        i = 0
+        while i < len(lines):
+            start, count = int(lines[i]), int(lines[i + 1])
+            i += 2
+            for n in range(start, start + count):
+                off, kind = lines[i], lines[i + 2]   # lines[i + 1] is the generation
+                i += 3
+                if kind == b"n":
+                    offsets.append((int(off), n))
+
+        offsets.sort()
+        ends = [off for off, _ in offsets[1:]] + [xref_at]
+        self.objects: dict[int, bytes] = {}
+        for (off, n), end in zip(offsets, ends):
+            body = blob[off:end]
+            head = _OBJ_HEAD_RE.match(body)
+            tail = body.rfind(b"endobj")
+            if not head or tail < 0:
+                raise UnsupportedPDF(f"object {n} malformed")
+            self.objects[n] = body[head.end():tail].rstrip()
+
+        root = _ref(trailer, b"/Root")
+        self.info = _ref(trailer, b"/Info")
+        pages = _ref(self.objects.get(root, b""), b"/Pages")
+        if root is None or pages is None:
+            raise UnsupportedPDF("no catalog / page tree")
+        self.dropped = {root, self.info}
+        self.pages: list[int] = []
+        self._walk(pages)
+
+    def _walk(self, node: int) -> None:
+        body = self.objects[node]
+        if b"/Type /Pages" not in body:
+            self.pages.append(node)
+            return
+        if any(k in body for k in _INHERITABLE):
+            raise UnsupportedPDF("inherited page attributes")
+        self.dropped.add(node)
+        kids = re.search(rb"/Kids\s*\[(.*?)\]", body, re.S)
+        for kid in _REF_RE.findall(kids.group(1) if kids else b""):
+            self._walk(int(kid))
+
+
+def _split_stream(body: bytes) -> int:
+    """Offset where stream data starts (len(body) for non-stream objects)."""
+    s = _STREAM_RE.search(body) if body.startswith(b"<<") else None
+    return s.start() if s else len(body)
+
+
+def write_merged_pdf(pdf_blobs: list[bytes], out: BinaryIO, dedupe: bool = True) -> None:
+    """Merge ReportLab PDFs (in order) into `out`.  Raises UnsupportedPDF."""
+    parts = [_Part(b) for b in pdf_blobs]
+
+    # new numbering: 1 = Catalog, 2 = Pages, 3 = Info (from the first part), then everything else
+    next_num = 4
+    offsets: dict[int, int] = {}
+    seen: dict[bytes, int] = {}       # digest of renumbered object -> number it was written as
+    pos = 0
+
+    def emit(num: int, body: bytes) -> None:
+        nonlocal pos
+        chunk = b"%d 0 obj\n" % num + body + b"\nendobj\n"
+        offsets[num] = pos
+        out.write(chunk)
+        pos += len(chunk)
+
+    header = b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n"
+    out.write(header)
+    pos = len(header)
+
+    maps: list[dict[int, int]] = []
+    for part in parts:
+        mapping = {n: 2 for n in part.dropped}    # dangling refs to dropped nodes (e.g. /Parent) -> new Pages
+        pages = set(part.pages)
+        renum = lambda m, mapping=mapping: b"%d 0 R" % mapping.get(int(m.group(1)), 0)  # noqa: E731
+
+        def write(n: int, share: bool) -> None:
+            nonlocal next_num
+            body = part.objects[n]
+            cut = _split_stream(body)   # renumber the dict only; stream data is copied verbatim
+            body = _REF_RE.sub(renum, body[:cut]) + body[cut:]
+            if share:
+                digest = hashlib.sha256(body).digest()
+                if digest in seen:
+                    mapping[n] = seen[digest]
+                    return
+            num = mapping.get(n) or next_num
+            if num == next_num:
+                next_num += 1
+            mapping[n] = num
+            if share:
+                seen[digest] = num
+            emit(num, body)
+
+        # Objects are written once everything they reference has its final
+        # number, so identical resources compare equal after renumbering.
+        # Pages are never shared; reference cycles are numbered up front and
+        # written as is.
+        refs = {}
+        for n, body in part.objects.items():
+            if n not in part.dropped:
+                refs[n] = {int(r) for r in _REF_RE.findall(body[:_split_stream(body)])
+                           if int(r) in part.objects}
+        pending = list(refs)
+        while pending:
+            ready = [n for n in pending if all(r in mapping for r in refs[n])] if dedupe else []
+            share = bool(ready)
+            if not share:
+                for n in pending:
+                    mapping[n] = next_num
+                    next_num += 1
+                ready = pending
+            for n in ready:
+                write(n, share and n not in pages)
+            done = set(ready)
+            pending = [n for n in pending if n not in done]
+        maps.append(mapping)
+
+    kids = b" ".join(b"%d 0 R" % maps[i][n] for i, part in enumerate(parts) for n in part.pages)
+    n_pages = sum(len(part.pages) for part in parts)
+    emit(1, b"<< /PageMode /UseNone /Pages 2 0 R /Type /Catalog >>")
+    emit(2, b"<< /Count %d /Kids [ %s ] /Type /Pages >>" % (n_pages, kids))
+    first_info = parts[0].objects.get(parts[0].info) if parts and parts[0].info else None
+    emit(3, first_info or b"<< /Producer (Markmentum Research) >>")
+
+    xref_at = pos
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % next_num)
+    out.write(b"".join(b"%010d 00000 n \n" % offsets[n] for n in range(1, next_num)))
+    out.write(b"trailer\n<< /Info 3 0 R /Root 1 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n"
+              % (next_num, xref_at))
@@ -0,0 +1,24 @@
+# utils/redirect.py
+#
+# Redirects timed by the browser, not the server.  The page emits a meta
+# refresh carrying the delay and its script run ends right away, instead of
+# holding a script-runner thread in time.sleep() until it's time to leave.
+
+from html import escape
+
+import streamlit as st
+
+
+def client_redirect(url: str, delay_s: int = 0,
+                    fallback_text: str | None = "Click here if you are not redirected") -> None:
+    """Send the browser to `url` after `delay_s` seconds (plus an optional manual link)."""
+    href = escape(url, quote=True)
+    if fallback_text:
+        st.markdown(
+            f'<a href="{href}" target="_self" rel="noopener noreferrer">{escape(fallback_text)}</a>',
+            unsafe_allow_html=True,
+        )
+    st.markdown(
+        f'<meta http-equiv="refresh" content="{int(delay_s)}; url={href}">',
+        unsafe_allow_html=True,
+    )
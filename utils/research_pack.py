@@ -0,0 +1,2986 @@
+# utils/research_pack.py
+#
+# Research Pack PDF builders and report modules (moved out of
+# pages/15_Research_Pack.py so they can be imported by pool workers and
+# outside Streamlit).  Each ReportModuleBase has a ui() used by the page and
+# a build() that only needs its options dict, which is what runs in the
+# worker processes.
+
+import streamlit as st
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+import io
+import os
+import pandas as pd
+import numpy as np
+# PDF (ReportLab)
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Image as RLImage, PageBreak, KeepInFrame, KeepTogether
+)
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.utils import simpleSplit
+from reportlab.platypus import ListFlowable, ListItem
+from reportlab import rl_config
+
+# Merge PDFs (pypdf only as the fallback for non-ReportLab input)
+from pypdf import PdfReader, PdfWriter
+from utils.pdf_merge import UnsupportedPDF, write_merged_pdf
+from utils import latest_frames
+from utils import rl_tables as rlt
+from utils import html_tables as ht
+from utils import tear_sheet as ts
+
+try:
+    from docx import Document
+except Exception:
+    Document = None
+
+# -------------------------
+# Paths (match Morning Compass style)
+# -------------------------
+APP_DIR = Path(__file__).resolve().parent.parent
+
+DATA_DIR   = APP_DIR / "data"
+ASSETS_DIR = APP_DIR / "assets"
+LOGO_PATH  = ASSETS_DIR / "markmentum_logo.png"
+
+# -------------------------
+# Pack optimizer (MM_PACK_OPTIMIZE=0 turns it off, e.g. to compare output)
+# -------------------------
+# - streams are written as binary Flate instead of ASCII85 text (~20% of every
+#   content stream and image)
+# - the page footer is drawn once per document as a form XObject and placed
+#   on each page, instead of re-emitting the disclaimer text on every page
+# - identical objects (fonts, footer forms, images) are written once when the
+#   module PDFs are merged (pdf_merge dedupe)
+PACK_OPTIMIZE = os.environ.get("MM_PACK_OPTIMIZE", "1") != "0"
+if PACK_OPTIMIZE:
+    rl_config.useA85 = 0
+
+
+# -------------------------
+# Shared helpers (unchanged)
+# -------------------------
+def fmt_num(x, nd=2):
+    try:
+        if pd.isna(x):
+            return ""
+        return f"{float(x):,.{nd}f}"
+    except Exception:
+        return ""
+
+def fmt_pct(x, nd=2):
+    try:
+        if pd.isna(x):
+            return ""
+        return f"{float(x)*100:,.{nd}f}%"
+    except Exception:
+        return ""
+
+def fmt_int(x):
+    try:
+        if pd.isna(x):
+            return ""
+        return f"{int(round(float(x))):,}"
+    except Exception:
+        return ""
+
+@lru_cache(maxsize=128)
+def _read_csv_cached(path: str, mtime_ns: int) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+def load_csv_by_id(n: int, base_dir: Path) -> pd.DataFrame:
+    # process-level cache keyed on mtime (works in pool workers and the CLI,
+    # where there is no Streamlit runtime for st.cache_data)
+    p = base_dir / f"qry_graph_data_{n}.csv"
+    if not p.exists():
+        return pd.DataFrame()
+    return _read_csv_cached(str(p), p.stat().st_mtime_ns).copy()
+
+def mo_load_for_timeframe(tf_key: str) -> list[pd.DataFrame]:
+    nums = MO_CSV_MAP[tf_key]
+    dfs: list[pd.DataFrame] = []
+    for n in nums:
+        if n is None:
+            dfs.append(pd.DataFrame())
+        else:
+            dfs.append(load_csv_by_id(n, DATA_DIR))
+    return dfs
+
+def _mo_asof_from_df(df: pd.DataFrame) -> str:
+    if df.empty:
+        return ""
+    date_col = None
+    for c in df.columns:
+        if str(c).strip().lower() in ("date", "as_of_date", "trade_date"):
+            date_col = c
+            break
+    if not date_col:
+        return ""
+    asof = pd.to_datetime(df[date_col], errors="coerce").max()
+    if pd.isna(asof):
+        return ""
+    return f"{asof.month}/{asof.day}/{asof.year}"
+
+
+def clean_text(s: str) -> str:
+    """Normalize common unicode punctuation so Helvetica can render it (prevents ■■)."""
+    if s is None:
+        return ""
+    s = str(s)
+
+    # dashes/hyphens
+    s = s.replace("\u2011", "-")  # non-breaking hyphen
+    s = s.replace("\u2013", "-")  # en dash
+    s = s.replace("\u2014", "-")  # em dash
+
+    # quotes/apostrophes
+    s = s.replace("\u2018", "'").replace("\u2019", "'")
+    s = s.replace("\u201C", '"').replace("\u201D", '"')
+
+    # misc invisible/soft
+    s = s.replace("\u00ad", "")   # soft hyphen
+    s = s.replace("\u200b", "")   # zero-width space
+
+    return s
+
+from xml.sax.saxutils import escape as _xml_escape
+
+def pdf_safe_text(s: str) -> str:
+    """
+    Make text safe for ReportLab Paragraph (XML-based).
+    Escapes &, <, > but leaves quotes alone.
+    """
+    if s is None:
+        return ""
+    return _xml_escape(str(s), {"'": "'", '"': '"'})
+
+
+def _read_docx_plain_text(doc_path: Path) -> str:
+    """Return docx text, or empty string if missing/unreadable (never print errors into PDF)."""
+    if Document is None:
+        return ""
+
+    if not doc_path.exists():
+        return ""
+
+    try:
+        doc = Document(str(doc_path))
+        lines = []
+        for p in doc.paragraphs:
+            t = (p.text or "").strip()
+            if t:
+                lines.append(t)
+        return clean_text("\n".join(lines).strip())
+    except Exception:
+        return ""
+import re
+
+def _read_txt_plain_text(p: Path) -> str:
+    """Return txt content, or empty string if missing/unreadable."""
+    try:
+        if not p.exists():
+            return ""
+        return clean_text(p.read_text(encoding="utf-8", errors="ignore").strip())
+    except Exception:
+        return ""
+
+def _read_html_plain_text(p: Path) -> str:
+    """
+    HTML -> plain text for your generated Market Read HTML.
+    - removes <style>/<script> blocks completely (prevents CSS showing in PDF)
+    - preserves bullets from <li>
+    - turns <br> and </p> into newlines
+    - strips remaining tags
+    - normalizes 'Daily/Weekly/Monthly/Quarterly Market Read:' -> 'Market Read:'
+    - drops standalone 'Market Read' line (the big centered H2 in HTML)
+    """
+    try:
+        if not p.exists():
+            return ""
+        html = p.read_text(encoding="utf-8", errors="ignore")
+
+        # 1) REMOVE style/script blocks (this is the key fix)
+        html = re.sub(r"(?is)<style[^>]*>.*?</style>", "", html)
+        html = re.sub(r"(?is)<script[^>]*>.*?</script>", "", html)
+
+        # 2) normalize breaks
+        html = re.sub(r"(?i)<br\s*/?>", "\n", html)
+        html = re.sub(r"(?i)</p\s*>", "\n", html)
+
+        # 3) list items -> "- ..."
+        html = re.sub(r"(?is)<li[^>]*>\s*", "- ", html)
+        html = re.sub(r"(?is)</li\s*>", "\n", html)
+
+        # 4) strip remaining tags
+        html = re.sub(r"(?is)<[^>]+>", "", html)
+
+        # 5) decode a couple entities (minimal)
+        html = html.replace("&nbsp;", " ").replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
+
+        # 6) cleanup whitespace
+        lines = [ln.strip() for ln in html.splitlines()]
+        lines = [ln for ln in lines if ln]
+
+        # 7) normalize header line to match PDF expectation
+        #    "Daily Market Read: January 23, 2026" -> "Market Read: January 23, 2026"
+        normed = []
+        for ln in lines:
+            if ln.strip().lower() == "market read":
+                continue  # drop the big centered title from HTML
+            # Only normalize DAILY -> Market Read. Keep Weekly/Monthly/Quarterly as-is.
+            ln = re.sub(r"(?i)^daily\s+market read:\s*", "Market Read: ", ln)
+            normed.append(ln)
+
+        return clean_text("\n".join(normed).strip())
+    except Exception:
+        return ""
+
+def _read_plain_text_any(p: Path) -> str:
+    """
+    Unified reader:
+    - .txt  -> txt
+    - .html -> html->text
+    - .docx -> docx (existing)
+    """
+    suf = p.suffix.lower()
+    if suf == ".txt":
+        return _read_txt_plain_text(p)
+    if suf in (".html", ".htm"):
+        return _read_html_plain_text(p)
+    if suf == ".docx":
+        return _read_docx_plain_text(p)
+    return ""
+
+def _market_read_to_flowables(mr_text: str) -> list:
+    """
+    Converts Market Read plain text into PDF flowables with bullets for key lines.
+    """
+    out = []
+    lines = [ln.strip() for ln in (mr_text or "").splitlines()]
+    lines = [ln for ln in lines if ln]  # drop blanks
+
+    bullets = []
+    in_bullets = False
+
+    for ln in lines:
+        low = ln.lower()
+
+        # section headers / labels
+        if low.startswith("market read:") or low.startswith("weekly market read:") or low.startswith("monthly market read:") or low.startswith("quarterly market read:"):
+            out.append(Spacer(1, 6))
+            out.append(Paragraph(clean_text(ln), H2))
+            in_bullets = False
+            continue
+
+        if low in ("the market is saying:", "the market is saying (all numbers are wtd % returns):", 
+                   "the market is saying (all numbers are mtd % returns):","the market is saying (all numbers are qtd % returns):","macro levers:", "macro levers (wtd % returns):", 
+                   "macro levers (mtd % returns):", "macro levers (qtd % returns):"):
+            # flush existing bullets
+            if bullets:
+                out.append(ListFlowable(bullets, bulletType="bullet", leftIndent=18))
+                bullets = []
+            out.append(Spacer(1, 6))
+            out.append(Paragraph(clean_text(ln), H2))
+            in_bullets = True
+            continue
+
+        if low.startswith("bottom line:"):
+            if bullets:
+                out.append(ListFlowable(bullets, bulletType="bullet", leftIndent=18))
+                bullets = []
+            out.append(Spacer(1, 10))
+            out.append(Paragraph(clean_text(ln), P))
+            in_bullets = False
+            continue
+
+        # normal lines
+        if in_bullets:
+            ln2 = ln
+            if ln2.startswith("- "):
+                ln2 = ln2[2:].lstrip()
+            bullets.append(ListItem(Paragraph(clean_text(ln2), P)))
+        else:
+            out.append(Paragraph(clean_text(ln), P))
+
+    if bullets:
+        out.append(ListFlowable(bullets, bulletType="bullet", leftIndent=18))
+
+    return out
+
+def get_last_trading_date() -> str:
+    """
+    Single source of truth for Research Pack 'Data as of'.
+    Uses Daily Macro Orientation CSV.
+    """
+    df = load_csv_by_id(29, DATA_DIR)  # Daily Macro Orientation
+    if df.empty or "Date" not in df.columns:
+        return ""
+    asof = pd.to_datetime(df["Date"], errors="coerce").max()
+    if pd.isna(asof):
+        return ""
+    return f"{asof.month}/{asof.day}/{asof.year}"
+
+
+
+DISCLAIMER_TEXT = (
+    "© 2026 Markmentum Research LLC. Disclaimer: This content is for informational purposes only. "
+    "Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation "
+    "regarding any security, investment vehicle, or strategy. It does not represent legal, tax, accounting, "
+    "or investment advice by Markmentum Research LLC or its employees. The information is provided without "
+    "regard to individual objectives or risk parameters and is general, non-tailored, and non-specific. "
+    "Sources are believed to be reliable, but accuracy and completeness are not guaranteed. "
+    "Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. "
+    "Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional "
+    "before making investment decisions."
+)
+
+# Timeframe config (aligned with Morning Compass)
+TIMEFRAMES = {
+    "Daily": {
+        "ids": {"main": 73, "leaders": 74, "mm": 75, "delta": 77},
+        "cols": {"ret": "daily_Return", "pr_low": "day_pr_low", "pr_high": "day_pr_high", "rr": "day_rr_ratio"},
+        "docx_macro": "bottom_line_daily.txt",
+        "title_macro": "Daily Macro Orientation",
+        "title_leaders": "Daily Top Five Leaders/Laggards by % Change",
+        "title_mm": "Daily Top Five Leaders/Laggards by MM Score",
+        "title_delta": "Daily Top Five Leaders/Laggards by MM Score Change",
+    },
+    "Weekly": {
+        "ids": {"main": 78, "leaders": 79, "mm": 80, "delta": 82},
+        "cols": {"ret": "weekly_Return", "pr_low": "week_pr_low", "pr_high": "week_pr_high", "rr": "week_rr_ratio"},
+        "docx_macro": "bottom_line_weekly.txt",
+        "title_macro": "Weekly Macro Orientation",
+        "title_leaders": "Weekly Top Five Leaders/Laggards by % Change",
+        "title_mm": "Weekly Top Five Leaders/Laggards by MM Score",
+        "title_delta": "Weekly Top Five Leaders/Laggards by MM Score Change",
+    },
+    "Monthly": {
+        "ids": {"main": 83, "leaders": 84, "mm": 85, "delta": 87},
+        "cols": {"ret": "monthly_Return", "pr_low": "month_pr_low", "pr_high": "month_pr_high", "rr": "month_rr_ratio"},
+        "docx_macro": "bottom_line_monthly.txt",
+        "title_macro": "Monthly Macro Orientation",
+        "title_leaders": "Monthly Top Five Leaders/Laggards by % Change",
+        "title_mm": "Monthly Top Five Leaders/Laggards by MM Score",
+        "title_delta": "Monthly Top Five Leaders/Laggards by MM Score Change",
+    },
+}
+
+# =========================
+# Market Overview config (from 03_Market_Overview.py)
+# =========================
+MO_TF_LABELS = ["Daily", "Weekly", "Monthly", "Quarterly"]
+
+MO_CSV_MAP = {
+    "Daily":     [26, 27, 28, 70, 71, 72, 29, 30, 31],
+    "Weekly":    [52, 53, 54, 55, 56, 57, None, None, None],
+    "Monthly":   [58, 59, 60, 61, 62, 63, None, None, None],
+    "Quarterly": [64, 65, 66, 67, 68, 69, None, None, None],
+}
+
+# Market Read docx (same filenames as Market Overview page)
+MO_MARKET_READ_DOCX = {
+    "Daily":     "Market_Read_daily.html",
+    "Weekly":    "Market_Read_weekly.html",
+    "Monthly":   "Market_Read_monthly.html",
+    "Quarterly": "Market_Read_quarterly.html",
+}
+
+# Opportunity Density (daily only in your page)
+MO_OPPORTUNITY_DENSITY_CSV_ID = 92
+
+
+# -------------------------
+# PDF styling + builders (unchanged)
+# -------------------------
+styles = getSampleStyleSheet()
+STYLES = {
+    "Title": styles["Title"],
+    "Heading2": styles["Heading2"],
+    "Heading3": styles["Heading3"],
+    "Normal": styles["BodyText"],
+}
+H1 = ParagraphStyle("H1", parent=styles["Heading1"], alignment=TA_CENTER, fontSize=16, spaceAfter=10)
+H2 = ParagraphStyle("H2", parent=styles["Heading2"], alignment=TA_LEFT, fontSize=12, spaceBefore=10, spaceAfter=6)
+P  = ParagraphStyle("P", parent=styles["BodyText"], fontSize=9, leading=12)
+NOTE = ParagraphStyle("NOTE", parent=styles["BodyText"], fontSize=8, leading=11, textColor=colors.grey)
+TH = ParagraphStyle(
+    "TH",
+    parent=styles["BodyText"],
+    fontName="Helvetica-Bold",
+    fontSize=8,
+    leading=9,
+    alignment=TA_CENTER,
+)
+
+def th(text: str) -> Paragraph:
+    return Paragraph(clean_text(text), TH)
+
+@lru_cache(maxsize=8)
+def _footer_lines(available_width: float) -> tuple[str, ...]:
+    """DISCLAIMER_TEXT wrapped for a frame width (once per process, not once per page)."""
+    return tuple(simpleSplit(DISCLAIMER_TEXT.strip(), "Helvetica", 7, available_width))
+
+def _draw_footer(canvas, x: float, lines: tuple[str, ...]):
+    canvas.saveState()
+    canvas.setFont("Helvetica", 7)
+    canvas.setFillGray(0.45)
+
+    y = 0.25 * inch
+    max_lines = 6
+
+    for i, line in enumerate(lines[:max_lines]):
+        canvas.drawString(x, y + (max_lines - 1 - i) * 9, line)
+
+    canvas.restoreState()
+
+def _footer(canvas, doc):
+    lines = _footer_lines(doc.width)
+    x = doc.leftMargin
+    if not PACK_OPTIMIZE:
+        _draw_footer(canvas, x, lines)
+        return
+
+    # one form XObject per document (per layout), referenced from every page
+    name = f"mmFooter_{x:.0f}_{doc.width:.0f}"
+    if not canvas.hasForm(name):
+        canvas.beginForm(name)
+        _draw_footer(canvas, x, lines)
+        canvas.endForm()
+    canvas.doForm(name)
+
+def _rr_bg_color(v: float, cap: float = 3.0):
+    """
+    PDF-friendly shading for Risk/Reward:
+    - uses the same green/red family as Sharpe Rank
+    - blends into white so it prints cleaner (esp. B/W)
+    - intensity scales with |v| up to cap
+    """
+    try:
+        v = float(v)
+    except Exception:
+        return colors.white
+
+    # Normalize magnitude
+    s = min(abs(v) / float(cap), 1.0)
+
+    # lighter overall (Sharpe-style, but restrained for print)
+    alpha = 0.05 + 0.14 * s  # 0.06 .. 0.22
+
+    def _blend(rgb_255, a):
+        r, g, b = [c / 255.0 for c in rgb_255]
+        return colors.Color(
+            1.0 * (1.0 - a) + r * a,
+            1.0 * (1.0 - a) + g * a,
+            1.0 * (1.0 - a) + b * a,
+        )
+
+    if v > 0:
+        return _blend((16, 185, 129), alpha)   # green
+    if v < 0:
+        return _blend((239, 68, 68), alpha)    # red
+
+    return colors.white
+
+def _mm_bg_color(v: float, cap: float = 150.0):
+    """
+    PDF-friendly shading for MM Score:
+    - consistent with Sharpe Rank palette (green/red/neutral gray)
+    - blends into white (less bold, prints better)
+    - intensity scales with |score| beyond a neutral band
+    """
+    try:
+        score = float(v)
+    except Exception:
+        return colors.white
+
+    # Clamp for stability
+    score = max(-float(cap), min(float(cap), score))
+
+    def _blend(rgb_255, a):
+        r, g, b = [c / 255.0 for c in rgb_255]
+        return colors.Color(
+            1.0 * (1.0 - a) + r * a,
+            1.0 * (1.0 - a) + g * a,
+            1.0 * (1.0 - a) + b * a,
+        )
+
+    # Neutral band around 0: very light gray tint
+    neutral_band = 25.0
+    if -neutral_band <= score <= neutral_band:
+        return _blend((156, 163, 175), 0.10)
+
+    # Scale intensity outside neutral band
+    s = (abs(score) - neutral_band) / (float(cap) - neutral_band)
+    s = max(0.0, min(s, 1.0))
+
+    alpha = 0.08 + 0.18 * s  # 0.08 .. 0.26
+
+    if score > 0:
+        return _blend((16, 185, 129), alpha)   # green
+    else:
+        return _blend((239, 68, 68), alpha)    # red
+
+def _build_table(data_rows, col_widths, shade_rr=False, shade_mm=False, rr_col=None, mm_col=None):
+    tbl = Table(data_rows, colWidths=col_widths, repeatRows=1)
+
+    base = TableStyle([
+        ("FONT", (0,0), (-1,0), "Helvetica-Bold", 9),
+        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f2f2f2")),
+        ("TEXTCOLOR", (0,0), (-1,0), colors.HexColor("#1a1a1a")),
+        ("GRID", (0,0), (-1,-1), 0.5, colors.HexColor("#d9d9d9")),
+        ("FONT", (0,1), (-1,-1), "Helvetica", 8),
+        ("ALIGN", (0,0), (0,-1), "LEFT"),
+        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+        ("ALIGN", (1,0), (-1,0), "CENTER"),
+        ("ALIGN", (1,1), (1,-1), "CENTER"),
+        ("ALIGN", (2,1), (-1,-1), "RIGHT"),
+        ("LEFTPADDING", (0,0), (-1,-1), 6),
+        ("RIGHTPADDING", (0,0), (-1,-1), 6),
+        ("TOPPADDING", (0,0), (-1,0), 6),
+        ("BOTTOMPADDING", (0,0), (-1,0), 6),
+        ("TOPPADDING", (0,1), (-1,-1), 4),
+        ("BOTTOMPADDING", (0,1), (-1,-1), 4),
+    ])
+    tbl.setStyle(base)
+
+    # shading is computed from the displayed (rounded) labels, one command per run of equal colors
+    shading = []
+    if shade_rr and rr_col is not None:
+        v = rlt.parse_display([row[rr_col] for row in data_rows[1:]])
+        shading += rlt.background_runs(rr_col, rlt.rr_rgb(v))
+    if shade_mm and mm_col is not None:
+        v = rlt.parse_display([row[mm_col] for row in data_rows[1:]])
+        shading += rlt.background_runs(mm_col, rlt.mm_rgb(v))
+    if shading:
+        tbl.setStyle(TableStyle(shading))
+
+    return tbl
+
+def _asof_date_from_main(tf_key: str) -> str:
+    cfg = TIMEFRAMES[tf_key]
+    df = load_csv_by_id(cfg["ids"]["main"], DATA_DIR)
+    if df.empty or "Date" not in df.columns:
+        return ""
+    asof = pd.to_datetime(df["Date"], errors="coerce").max()
+    if pd.isna(asof):
+        return ""
+    return f"{asof.month}/{asof.day}/{asof.year}"
+
+def _section_correlations(flowables):
+    df_usd = load_csv_by_id(93, DATA_DIR)
+    df_tnx = load_csv_by_id(94, DATA_DIR)
+
+    if df_usd.empty:
+        flowables.append(Paragraph("USD Correlations (missing qry_graph_data_93.csv)", NOTE))
+        return
+    if df_tnx.empty:
+        flowables.append(Paragraph("Rates Correlations (missing qry_graph_data_94.csv)", NOTE))
+        return
+
+    def corr_table(df, title, bottom_docx, note_text):
+        flowables.append(Paragraph(title, H2))
+
+        cols = [c for c in ["Metric", "15D", "30D", "90D"] if c in df.columns]
+        d = df[cols].copy()
+        for c in ["15D", "30D", "90D"]:
+            if c in d.columns:
+                d[c] = d[c].map(lambda v: fmt_num(v, 2))
+
+        data_rows = [cols] + d.values.tolist()
+
+        w_metric = 3.6 * inch
+        w_num = 1.1 * inch
+        col_widths = [w_metric] + [w_num]*(len(cols)-1)
+
+        t = _build_table(data_rows, col_widths)
+        flowables.append(t)
+
+        bl = _read_plain_text_any(DATA_DIR / bottom_docx)
+        if bl:
+            flowables.append(Spacer(1, 6))
+            flowables.append(Paragraph(pdf_safe_text(clean_text(bl)).replace("\n", "<br/>"), P))
+
+        flowables.append(Spacer(1, 4))
+        flowables.append(Paragraph(note_text, NOTE))
+        flowables.append(Spacer(1, 10))
+
+    corr_table(
+        df_usd,
+        "USD Correlations",
+        "usd_correlation_bottom_line.docx",
+        "Note: USD correlations use the U.S. Dollar Index (DXY), a trade-weighted FX index. 15D/30D/90D are trading-day windows. "
+        "Correlation ranges from -1 to +1. Negative = tends to move opposite. Positive = tends to move together."
+    )
+
+    flowables.append(PageBreak())
+
+    corr_table(
+        df_tnx,
+        "Rates Correlations",
+        "tnx_correlation_bottom_line.docx",
+        "Note: Rate correlations use the 10-Year U.S. Treasury yield (TNX) as the rates proxy. 15D/30D/90D are trading-day windows. "
+        "Correlation ranges from -1 to +1. Negative = tends to move opposite. Positive = tends to move together."
+    )
+
+def _section_macro_table(flowables, tf_key: str, title: str, csv_id: int, bottom_docx: str):
+    cfg = TIMEFRAMES[tf_key]
+    cols = cfg["cols"]
+
+    df = load_csv_by_id(csv_id, DATA_DIR)
+    req = ["Ticker_name", "Ticker", "Close", cols["ret"], cols["pr_low"], cols["pr_high"], cols["rr"], "model_score", "model_score_delta"]
+    if df.empty or not all(c in df.columns for c in req):
+        flowables.append(Paragraph(f"{title} (missing or incomplete qry_graph_data_{csv_id}.csv)", NOTE))
+        flowables.append(Spacer(1, 8))
+        return
+
+    #flowables.append(Paragraph(title, H2))
+
+    d = df.copy()
+
+    out = pd.DataFrame({
+        "Name": d["Ticker_name"],
+        "Ticker": d["Ticker"],
+        "Close": d["Close"].map(lambda v: fmt_num(v, 2)),
+        "% Change": d[cols["ret"]].map(lambda v: fmt_pct(v, 2)),
+        "Probable Low": d[cols["pr_low"]].map(lambda v: fmt_num(v, 2)),
+        "Probable High": d[cols["pr_high"]].map(lambda v: fmt_num(v, 2)),
+        "Risk / Reward": d[cols["rr"]].map(lambda v: fmt_num(v, 1)),
+        "MM Score": d["model_score"].map(lambda v: fmt_int(v)),
+        "Δ MM Score": d["model_score_delta"].map(lambda v: fmt_int(v)),
+    })
+
+    header = [
+        th("Name"),
+        th("Ticker"),
+        th("Close"),
+        th("% Change"),
+        th("Probable<br/>Low"),
+        th("Probable<br/>High"),
+        th("Risk /<br/>Reward"),
+        th("MM<br/>Score"),
+        th("Δ MM<br/>Score"),
+    ]
+    data_rows = [header] + out.values.tolist()
+
+    col_widths = [
+        2.35*inch,
+        0.70*inch,
+        0.75*inch,
+        0.80*inch,
+        0.85*inch,
+        0.85*inch,
+        0.75*inch,
+        0.70*inch,
+        0.85*inch,
+    ]
+
+    rr_col = 6
+    mm_col = 7
+
+    t = _build_table(
+        data_rows=data_rows,
+        col_widths=col_widths,
+        shade_rr=True, shade_mm=True,
+        rr_col=rr_col, mm_col=mm_col
+    )
+    block = []
+    block.append(Paragraph(title, H2))
+    block.append(t)
+    flowables.append(KeepTogether(block))
+
+    bl = _read_plain_text_any(DATA_DIR / bottom_docx) if bottom_docx else ""
+    if bl:
+        flowables.append(Spacer(1, 6))
+        flowables.append(Paragraph(clean_text(bl).replace("\n", "<br/>"), P))
+
+    flowables.append(Spacer(1, 4))
+    flowables.append(Paragraph(
+        "Note: MM Score → Rules-based contrarian score designed to avoid chasing stretch, identify crowding, and size conviction sensibly.",
+        NOTE
+    ))
+    flowables.append(Spacer(1, 10))
+
+import numpy as np
+from reportlab.lib import colors
+
+def _robust_vmax(series, q=0.98, floor=1.0, step=1.0):
+    s = pd.to_numeric(pd.Series(series), errors="coerce").abs().dropna()
+    if s.empty:
+        return float(floor)
+    vmax = float(np.quantile(s, q))
+    return max(float(floor), float(np.ceil(vmax / step) * step))
+
+def _blend_with_white(rgb_255, alpha):
+    """
+    Simulate CSS rgba(rgb, alpha) on white background.
+    rgb_255: (R,G,B) 0-255
+    alpha: 0..1
+    """
+    a = float(max(0.0, min(alpha, 1.0)))
+    r, g, b = [c / 255.0 for c in rgb_255]
+    # white is (1,1,1)
+    rr = 1.0 * (1.0 - a) + r * a
+    gg = 1.0 * (1.0 - a) + g * a
+    bb = 1.0 * (1.0 - a) + b * a
+    return colors.Color(rr, gg, bb)
+
+def _sr_rank_bg(score, cap=100.0):
+    """
+    Match portal Rank shading:
+    - >=70 green (stronger as approaches 100)
+    - <=30 red (stronger as approaches 0)
+    - else neutral gray tint
+    """
+    if score is None or pd.isna(score):
+        return None
+
+    s = float(np.clip(float(score), 0.0, float(cap)))
+
+    if s >= 70.0:
+        rel = (s - 70.0) / 30.0
+        alpha = 0.05 + 0.14 * max(0.0, min(rel, 1.0))
+        return _blend_with_white((16, 185, 129), alpha)   # green
+    elif s <= 30.0:
+        rel = (30.0 - s) / 30.0
+        alpha = 0.05 + 0.14 * max(0.0, min(rel, 1.0))
+        return _blend_with_white((239, 68, 68), alpha)    # red
+    else:
+        return _blend_with_white((156, 163, 175), 0.08)   # neutral gray
+
+def _sr_delta_bg(val, vmax):
+    """
+    Match portal delta shading:
+    alpha = 0.05 + 0.14 * min(abs(val)/vmax, 1)
+    green if val>0, red if val<0, transparent if 0
+    """
+    if val is None or pd.isna(val) or vmax is None or float(vmax) <= 0:
+        return None
+
+    v = float(val)
+    s = min(abs(v) / float(vmax), 1.0)
+    alpha = 0.05 + 0.14 * s
+
+    if v > 0:
+        return _blend_with_white((16, 185, 129), alpha)
+    elif v < 0:
+        return _blend_with_white((239, 68, 68), alpha)
+    else:
+        return None
+
+# -------------------------
+# !!! DO NOT CHANGE OUTPUT LOGIC !!!
+# Morning Compass PDF builder stays intact; we wrap it as a module.
+# -------------------------
+def build_title_page_pdf(trading_session: str, data_asof: str) -> bytes:
+    """
+    Creates a simple title page:
+    - centered logo
+    - centered title: "Markmentum Research Pack"
+    - date line
+    """
+    buffer = io.BytesIO()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        leftMargin=0.75*inch, rightMargin=0.75*inch,
+        topMargin=0.75*inch, bottomMargin=0.75*inch
+    )
+
+    flow = []
+
+    # Spacer down a bit so it feels like a cover
+    flow.append(Spacer(1, 0.6 * inch))
+
+    if LOGO_PATH.exists():
+        img = RLImage(str(LOGO_PATH))
+        img.drawHeight = 0.9 * inch
+        img.drawWidth = 7.2 * inch
+        img.hAlign = "CENTER"
+        flow.append(img)
+
+    flow.append(Spacer(1, 0.5 * inch))
+    flow.append(Spacer(1, 0.5 * inch))
+
+    # Big centered title
+    cover_title = Paragraph("Research Pack", ParagraphStyle(
+        "COVER_TITLE",
+        parent=styles["Heading1"],
+        alignment=TA_CENTER,
+        fontSize=22,
+        spaceAfter=12
+    ))
+    flow.append(cover_title)
+
+    flow.append(Spacer(1, 0.5 * inch))
+    
+    if trading_session:
+        flow.append(Paragraph(
+            f"<b>Trading Session:</b> {trading_session}",
+            ParagraphStyle(
+                "COVER_SESSION",
+                parent=styles["BodyText"],
+                alignment=TA_CENTER,
+                fontSize=14,
+                spaceAfter=6
+            )
+        ))
+    
+    flow.append(Spacer(1, 0.5 * inch))
+
+    data_asof = get_last_trading_date()
+
+    if data_asof:
+        flow.append(Paragraph(
+            f"Data as of: {data_asof}",
+            ParagraphStyle(
+                "COVER_ASOF",
+                parent=styles["BodyText"],
+                alignment=TA_CENTER,
+                fontSize=11,
+                textColor=colors.HexColor("#666666")
+            )
+        ))
+
+    # IMPORTANT: no disclaimer/footer on title page
+    doc.build(flow)
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def build_morning_compass_pdf(
+    include_correlations: bool,
+    include_macro: bool,
+    include_pct: bool,
+    include_mm: bool,
+    include_delta: bool,
+    tf_key: str
+) -> bytes:
+    buffer = io.BytesIO()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        leftMargin=0.45*inch, rightMargin=0.45*inch,
+        topMargin=0.50*inch, bottomMargin=0.95*inch
+    )
+
+    flow = []
+
+    # Logo + title only for Daily (matches your current behavior)
+    if tf_key == "Daily":
+        #if LOGO_PATH.exists():
+        #    img = RLImage(str(LOGO_PATH))
+        #    img.drawHeight = 0.55 * inch
+        #    img.drawWidth = 4.8 * inch
+        #    img.hAlign = "CENTER"
+        #    flow.append(img)
+        #    flow.append(Spacer(1, 8))
+        #else:
+        #    flow.append(Paragraph("Markmentum Research", H1))
+
+        asof = _asof_date_from_main(tf_key)
+        title = f"Morning Compass" if asof else "Morning Compass"
+        flow.append(Paragraph(title, H1))
+        #flow.append(Spacer(1, 3))
+
+
+    cfg = TIMEFRAMES[tf_key]
+
+    if include_macro:
+        _section_macro_table(
+            flowables=flow,
+            tf_key=tf_key,
+            title=cfg["title_macro"],
+            csv_id=cfg["ids"]["main"],
+            bottom_docx=cfg["docx_macro"]
+        )
+        if not (tf_key == "Daily" and include_correlations):
+            flow.append(PageBreak())
+
+    # Correlations (Daily only)
+    if include_correlations and tf_key == "Daily":
+        _section_correlations(flow)
+        flow.append(PageBreak())
+
+
+    if include_pct:
+        _section_macro_table(
+            flowables=flow,
+            tf_key=tf_key,
+            title=cfg["title_leaders"],
+            csv_id=cfg["ids"]["leaders"],
+            bottom_docx=""
+        )
+        flow.append(PageBreak())
+
+    if include_mm:
+        _section_macro_table(
+            flowables=flow,
+            tf_key=tf_key,
+            title=cfg["title_mm"],
+            csv_id=cfg["ids"]["mm"],
+            bottom_docx=""
+        )
+        flow.append(PageBreak())
+
+    if include_delta:
+        _section_macro_table(
+            flowables=flow,
+            tf_key=tf_key,
+            title=cfg["title_delta"],
+            csv_id=cfg["ids"]["delta"],
+            bottom_docx=""
+        )
+        flow.append(PageBreak())
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def build_market_overview_pdf(
+    tf_key: str,
+    include_top_cards: bool = True,
+    include_score_change_cards: bool = True,
+    include_daily_extras: bool = True,      # highest/lowest/hist + opp density (Daily only)
+    include_market_read: bool = True
+) -> bytes:
+    buffer = io.BytesIO()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        leftMargin=0.45*inch, rightMargin=0.45*inch,
+        topMargin=0.50*inch, bottomMargin=0.95*inch
+    )
+
+    flow: list = []
+
+    dfs = mo_load_for_timeframe(tf_key)
+    asof = _mo_asof_from_df(dfs[0])
+
+    # Header
+    title = f"{tf_key} Market Overview" 
+    flow.append(Paragraph(clean_text(title), H1))
+    flow.append(Spacer(1, 6))
+
+    def _simple_card(title_txt: str, df: pd.DataFrame, value_header: str = "Value"):
+        if df.empty:
+            flow.append(Paragraph(f"{title_txt} (no data)", NOTE))
+            flow.append(Spacer(1, 8))
+            return
+
+        # Try to map columns robustly (tolerant like your page)
+        cols_lower = {str(c).lower(): c for c in df.columns}
+        tcol = cols_lower.get("ticker", None)
+        ncol = cols_lower.get("ticker_name", None) or cols_lower.get("company", None)
+        ccol = cols_lower.get("category", None) or cols_lower.get("exposure", None)
+
+        # pick the "value" column: last numeric-ish column that isn't the known text columns
+        known = {tcol, ncol, ccol}
+        value_col = None
+        for c in df.columns[::-1]:
+            if c in known:
+                continue
+            value_col = c
+            break
+
+        # Build output with 4 columns max (Name/Ticker/Category/Value)
+        use_cols = []
+        if ncol: use_cols.append(ncol)
+        if tcol: use_cols.append(tcol)
+        if ccol: use_cols.append(ccol)
+        if value_col: use_cols.append(value_col)
+
+        d = df[use_cols].copy() if use_cols else df.copy()
+
+        # rename
+        rename_map = {}
+        if ncol: rename_map[ncol] = "Name"
+        if tcol: rename_map[tcol] = "Ticker"
+        if ccol: rename_map[ccol] = "Category"
+        if value_col: rename_map[value_col] = value_header
+        d = d.rename(columns=rename_map)
+
+        # formatting: if looks like percent (0.xx), show %; else int
+        if value_header in d.columns:
+            def _fmt_val(v):
+                try:
+                    fv = float(v)
+                except Exception:
+                    return str(v) if v is not None else ""
+
+                # Formatting by type
+                if value_header.lower() == "percent":
+                    return fmt_pct(fv, 2)
+                if value_header.lower() == "shares":
+                    return fmt_num(fv, 2)  # you can switch to fmt_int if you want no decimals
+                if value_header.lower() in ("change", "score"):
+                    return fmt_int(fv)
+                return fmt_num(fv, 2)
+
+            d[value_header] = d[value_header].map(_fmt_val)
+
+        header = [th(c) for c in d.columns.tolist()]
+        data_rows = [header] + d.values.tolist()
+
+        # widths
+        widths = []
+        for col in d.columns.tolist():
+            if col == "Name":
+                widths.append(2.8*inch)
+            elif col == "Ticker":
+                widths.append(0.8*inch)
+            elif col == "Category":
+                widths.append(1.7*inch)
+            else:
+                widths.append(1.0*inch)
+
+        flow.append(Paragraph(clean_text(title_txt), H2))
+        flow.append(_build_table(data_rows, widths))
+        flow.append(Spacer(1, 10))
+
+    # -------------------------
+    # Row 1: gainers/decliners/most active
+    # -------------------------
+    if include_top_cards:
+        _simple_card(f"{tf_key} – Top Ten Percentage Gainers", dfs[0], value_header="Percent")
+        flow.append(PageBreak())
+        _simple_card(f"{tf_key} – Top Ten Percentage Decliners", dfs[1], value_header="Percent")
+        flow.append(PageBreak())
+        _simple_card(f"{tf_key} – Most Active (Shares)", dfs[2], value_header="Shares")
+        flow.append(PageBreak())
+
+    # -------------------------
+    # Row 2: Score gainers/decliners + score change distribution
+    # -------------------------
+    if include_score_change_cards:
+        _simple_card(f"{tf_key} – Top Ten Markmentum Score Gainers", dfs[3], value_header="Change")
+        _simple_card(f"{tf_key} – Top Ten Markmentum Score Decliners", dfs[4], value_header="Change")
+
+        # Dist table (Score Bin / Ticker Count)
+        df_dist = dfs[5].copy()
+        flow.append(Paragraph(clean_text(f"{tf_key} – Markmentum Score Change Distribution"), H2))
+        if df_dist.empty:
+            flow.append(Paragraph("No data.", NOTE))
+        else:
+            # normalize columns
+            cols_lower = {str(c).lower(): c for c in df_dist.columns}
+            score_bin_col = cols_lower.get("score_bin") or cols_lower.get("score bin")
+            count_col = cols_lower.get("tickercount") or cols_lower.get("ticker_count") or cols_lower.get("ticker count")
+            if score_bin_col and count_col:
+                d = df_dist[[score_bin_col, count_col]].copy()
+                d.columns = ["Score Bin", "Ticker Count"]
+                data_rows = [[th("Score Bin"), th("Ticker Count")]] + d.values.tolist()
+                flow.append(_build_table(data_rows, [2.2*inch, 1.4*inch]))
+            else:
+                flow.append(Paragraph("Missing Score Bin / Count columns.", NOTE))
+        flow.append(Spacer(1, 10))
+        flow.append(PageBreak())
+
+    # -------------------------
+    # Daily extras: highest/lowest/hist + opportunity density
+    # -------------------------
+    if tf_key == "Daily" and include_daily_extras:
+        _simple_card("Daily – Highest Markmentum Score", dfs[6], value_header="Score")
+        _simple_card("Daily – Lowest Markmentum Score", dfs[7], value_header="Score")
+
+        # Histogram table
+        df_hist = dfs[8].copy()
+        flow.append(Paragraph("Daily – Markmentum Score Histogram", H2))
+        if df_hist.empty:
+            flow.append(Paragraph("No data.", NOTE))
+        else:
+            cols_lower = {str(c).lower(): c for c in df_hist.columns}
+            score_bin_col = cols_lower.get("score_bin") or cols_lower.get("score bin")
+            count_col = cols_lower.get("tickercount") or cols_lower.get("ticker_count") or cols_lower.get("ticker count")
+
+            if score_bin_col and count_col:
+                mapping = {
+                    "Below -100": "Strong Sell",
+                    "-100 to -26": "Sell",
+                    "-25 to 25": "Neutral",
+                    "26 to 100": "Buy",
+                    "Above 100": "Strong Buy",
+                }
+                df_hist["Classification"] = df_hist[score_bin_col].map(mapping)
+                d = df_hist[["Classification", score_bin_col, count_col]].copy()
+                d.columns = ["Classification", "Score Bin", "Ticker Count"]
+                data_rows = [[th("Classification"), th("Score Bin"), th("Ticker Count")]] + d.values.tolist()
+                flow.append(_build_table(data_rows, [2.2*inch, 1.6*inch, 1.4*inch]))
+            else:
+                flow.append(Paragraph("Missing histogram columns.", NOTE))
+
+        flow.append(Spacer(1, 10))
+        flow.append(PageBreak())
+
+        # Opportunity Density (qry_graph_data_92.csv)
+        df_od = load_csv_by_id(MO_OPPORTUNITY_DENSITY_CSV_ID, DATA_DIR).copy()
+        flow.append(Paragraph("Opportunity Density", H2))
+        if df_od.empty:
+            flow.append(Paragraph("No data.", NOTE))
+        else:
+            # format percent columns if present
+            for col in ["Buy %", "Neutral %", "Sell %"]:
+                if col in df_od.columns:
+                    df_od[col] = df_od[col].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "")
+            header = [th(c) for c in df_od.columns.tolist()]
+            data_rows = [header] + df_od.values.tolist()
+
+            # widths: first column wide
+            widths = [2.3*inch] + [0.70*inch]*(len(df_od.columns)-1)
+            flow.append(_build_table(data_rows, widths))
+            flow.append(Spacer(1, 6))
+            flow.append(Paragraph(
+                "Note: Buy classifications require Risk/Reward ≥ 3 and MM Score > 25. "
+                "Sell classifications require Risk/Reward ≤ −3 and MM Score < −25.",
+                NOTE
+            ))
+
+        flow.append(Spacer(1, 10))
+        flow.append(PageBreak())
+
+    # -------------------------
+    # Market Read (docx)
+    # -------------------------
+    if include_market_read:
+        docx_name = MO_MARKET_READ_DOCX.get(tf_key, "")
+        mr_text = _read_plain_text_any(DATA_DIR / docx_name) if docx_name else ""
+
+        if not mr_text:
+            flow.append(Paragraph(f"Market Read missing or empty: {docx_name}", NOTE))
+        else:
+            mr_items = _market_read_to_flowables(mr_text)
+
+            mr_box = KeepInFrame(
+                maxWidth=doc.width,
+                maxHeight=doc.height,
+                content=mr_items,
+                mode="shrink",
+                hAlign="LEFT",
+                vAlign="TOP",
+            )
+            flow.append(mr_box)
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+# =========================================================
+# PERFORMANCE HEATMAP (PDF)
+# =========================================================
+
+PH_CSV = latest_frames.PERF_CSV   # same source as the portal page
+
+PH_COL_MAP = {
+    "Daily": "day_pct_change",
+    "WTD": "week_pct_change",
+    "MTD": "month_pct_change",
+    "QTD": "quarter_pct_change",
+}
+
+PH_MACRO_LIST = [
+    "SPX","NDX","DJI","RUT",
+    "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
+    "GLD","DXY","TLT","BTC=F"
+]
+
+PH_CATEGORY_ORDER = [
+    "Sector & Style ETFs","Indices","Futures","Currencies","Commodities","Bonds","Yields","Volatility","Foreign",
+    "Communication Services","Consumer Discretionary","Consumer Staples",
+    "Energy","Financials","Health Care","Industrials","Information Technology",
+    "Materials","Real Estate","Utilities","MR Discretion"
+]
+
+def _ph_load_latest() -> tuple[pd.DataFrame, str]:
+    """ticker_data.csv, latest row per ticker + as-of date string (shared with the portal page)."""
+    return latest_frames.performance()
+
+
+def _ph_interp_color(val: float, vmax: float):
+    """
+    Use Sharpe Rank delta shading philosophy for Performance Heatmap:
+    alpha = 0.05 + 0.14 * min(abs(val)/vmax, 1)
+    green if val>0, red if val<0, white if 0/NA.
+    """
+    from reportlab.lib import colors
+
+    c = _sr_delta_bg(pd.to_numeric(val, errors="coerce"), vmax)
+    return c if c is not None else colors.white
+
+def _ph_fmt_pct(x) -> str:
+    """Format values like the portal: 2 decimals + %.
+    Handles either fractions (0.0043) or already-percent values (0.43).
+    """
+    try:
+        v = float(x)
+    except Exception:
+        return ""
+
+    # If it's likely a fraction (like 0.0043), convert to percent
+    if abs(v) <= 2.0:
+        v = v * 100.0
+
+    return f"{v:.2f}%"
+
+def _ph_make_colored_table(df: pd.DataFrame, vmax: dict[str, float], title: str) -> list:
+    """ReportLab flowables for a titled % table with per-column shading."""
+    flow = []
+    #flow.append(Paragraph(f"<b>{title}</b>", STYLES["Heading3"]))
+    flow.append(Paragraph(clean_text(title), H2))
+    flow.append(Spacer(1, 6))
+
+    # build table data (whole columns at a time)
+    pct_cols = ("Δ Daily", "Δ WTD", "Δ MTD", "Δ QTD")
+    cols = list(df.columns)
+    data = [cols] + rlt.rows(*[
+        rlt.fmt_pct_auto(df[c]) if c in pct_cols else df[c].tolist()
+        for c in cols
+    ])
+
+    # base table
+    t = Table(data, hAlign="CENTER")
+
+    # table styling
+    ts = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),
+        ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+
+    # apply per-column shading for % columns
+    for j, c in enumerate(cols):
+        if c in pct_cols:
+            col_vmax = vmax.get(c.replace("Δ ", ""), 0.0) or 0.0
+            for cmd in rlt.background_runs(j, rlt.delta_rgb_or_white(df[c], col_vmax)):
+                ts.add(*cmd)
+
+    t.setStyle(ts)
+    flow.append(t)
+    flow.append(Spacer(1, 14))
+    return flow
+
+
+def build_performance_heatmap_pdf(
+    include_macro_orientation: bool = True,
+    include_category_averages: bool = True,
+    include_category_heatmap: bool = False,
+) -> bytes:
+    buffer = io.BytesIO()
+
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        leftMargin=0.60*inch, rightMargin=0.60*inch,
+        topMargin=0.60*inch, bottomMargin=0.85*inch
+    )
+
+    perf, asof_str = _ph_load_latest()
+    flow = []
+
+    # Header
+    flow.append(Paragraph("<b>Performance Heatmap</b>", STYLES["Title"]))
+    #if asof_str:
+    #    flow.append(Paragraph(asof_str, STYLES["Normal"]))
+    flow.append(Spacer(1, 10))
+
+    if perf.empty:
+        flow.append(Paragraph("No performance data available (ticker_data.csv missing or empty).", STYLES["Normal"]))
+        doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+        return buffer.getvalue()
+
+    # ---- Macro Orientation (subset of tickers) ----
+    if include_macro_orientation:
+        m = perf[perf["Ticker"].isin(PH_MACRO_LIST)].copy()
+        m["__ord__"] = m["Ticker"].map({t:i for i, t in enumerate(PH_MACRO_LIST)})
+        m = m.sort_values("__ord__", kind="stable")
+
+        # build table frame
+        def _col(tf): return PH_COL_MAP[tf]
+        macro_df = pd.DataFrame({
+            "Name": m.get("Ticker_name", m["Ticker"]),
+            "Ticker": m["Ticker"],
+            "Δ Daily": m[_col("Daily")],
+            "Δ WTD":   m[_col("WTD")],
+            "Δ MTD":   m[_col("MTD")],
+            "Δ QTD":   m[_col("QTD")],
+        })
+
+
+        # numeric vmax per column (independent scaling)
+        vmax = {
+            "Daily": float(m[_col("Daily")].abs().max(skipna=True) or 0.0),
+            "WTD":   float(m[_col("WTD")].abs().max(skipna=True) or 0.0),
+            "MTD":   float(m[_col("MTD")].abs().max(skipna=True) or 0.0),
+            "QTD":   float(m[_col("QTD")].abs().max(skipna=True) or 0.0),
+        }
+
+        flow.extend(_ph_make_colored_table(macro_df, vmax, "Macro Orientation"))
+
+    # ---- Category Averages ----
+    if include_category_averages:
+        if "Category" in perf.columns:
+            g = (
+                perf.groupby("Category", dropna=False)[
+                    [PH_COL_MAP["Daily"], PH_COL_MAP["WTD"], PH_COL_MAP["MTD"], PH_COL_MAP["QTD"]]
+                ]
+                .mean(numeric_only=True)
+                .reset_index()
+            )
+            g = g.rename(columns={
+                PH_COL_MAP["Daily"]: "Daily",
+                PH_COL_MAP["WTD"]: "WTD",
+                PH_COL_MAP["MTD"]: "MTD",
+                PH_COL_MAP["QTD"]: "QTD",
+            })
+
+            order_map = {name: i for i, name in enumerate(PH_CATEGORY_ORDER)}
+            g["__ord__"] = g["Category"].map(order_map)
+            g = g.sort_values(["__ord__", "Category"], kind="stable").drop(columns="__ord__")
+
+            cat_df = pd.DataFrame({
+                "Name": g["Category"],
+                "Δ Daily": g["Daily"],
+                "Δ WTD": g["WTD"],
+                "Δ MTD": g["MTD"],
+                "Δ QTD": g["QTD"],
+            })
+
+            vmaxC = {
+                "Daily": float(pd.to_numeric(cat_df["Δ Daily"], errors="coerce").abs().max(skipna=True) or 0.0),
+                "WTD":   float(pd.to_numeric(cat_df["Δ WTD"],   errors="coerce").abs().max(skipna=True) or 0.0),
+                "MTD":   float(pd.to_numeric(cat_df["Δ MTD"],   errors="coerce").abs().max(skipna=True) or 0.0),
+                "QTD":   float(pd.to_numeric(cat_df["Δ QTD"],   errors="coerce").abs().max(skipna=True) or 0.0),
+            }
+
+            flow.append(PageBreak())
+
+            flow.extend(_ph_make_colored_table(cat_df, vmaxC, "Category Averages"))
+
+            # Optional: a second page “heatmap” (matrix) — default OFF to control page count
+            if include_category_heatmap:
+                flow.append(PageBreak())
+                flow.append(Paragraph("<b>Category Heatmap – Avg % Change</b>", STYLES["Heading2"]))
+                flow.append(Spacer(1, 8))
+
+                # Build matrix table: rows=Category, cols=Daily/WTD/MTD/QTD
+                matrix = g[["Category","Daily","WTD","MTD","QTD"]].copy()
+                data = [["Category","Daily","WTD","MTD","QTD"]] + matrix.values.tolist()
+
+                t = Table(data, hAlign="CENTER")
+                ts = TableStyle([
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 9),
+                    ("GRID", (0, 0), (-1, -1), 0.35, colors.lightgrey),
+                    ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+                    ("ALIGN", (0, 1), (0, -1), "LEFT"),
+                    ("TOPPADDING", (0, 0), (-1, -1), 3),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+                ])
+
+                # column shading
+                for col_idx, col_name in enumerate(["Daily","WTD","MTD","QTD"], start=1):
+                    col_vmax = vmaxC.get(col_name, 0.0) or 0.0
+                    for cmd in rlt.background_runs(col_idx, rlt.delta_rgb_or_white(matrix[col_name], col_vmax)):
+                        ts.add(*cmd)
+
+                t.setStyle(ts)
+                flow.append(t)
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+    return buffer.getvalue()
+
+# =========================================================
+# SHARPE RANK HEATMAP (PDF)
+#   - Macro Orientation + Category Averages ONLY
+#   - Uses existing global styles + same red/green delta shading logic
+# =========================================================
+
+SR_CSV_BASE = latest_frames.SR_CSV_BASE  # Sharpe_Rank + daily change (and/or previous)
+SR_CSV_WTD  = latest_frames.SR_CSV_WTD  # Sharpe_Rank_wtd_change
+SR_CSV_MTD  = latest_frames.SR_CSV_MTD  # Sharpe_Rank_mtd_change
+SR_CSV_QTD  = latest_frames.SR_CSV_QTD  # Sharpe_Rank_qtd_change
+
+# Reuse the same ordering you use on the portal page (05_Sharpe_Rank_Heatmap.py)
+SR_MACRO_LIST = [
+    "SPX","NDX","DJI","RUT",
+    "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
+    "GLD","DXY","TLT","BTC=F"
+]
+
+SR_CATEGORY_ORDER = [
+    "Sector & Style ETFs","Indices","Futures","Currencies","Commodities","Bonds","Yields","Volatility","Foreign",
+    "Communication Services","Consumer Discretionary","Consumer Staples",
+    "Energy","Financials","Health Care","Industrials","Information Technology",
+    "Materials","Real Estate","Utilities","MR Discretion"
+]
+
+def _sr_load_latest() -> tuple[pd.DataFrame, str]:
+    """
+    The portal page's Sharpe Rank frame (latest row per ticker), relabeled for
+    the PDF tables: Name, Ticker, Category, Rank, Daily, WTD, MTD, QTD.
+    """
+    df, asof_str = latest_frames.sharpe_rank()
+    if df.empty:
+        return df, asof_str
+
+    df = df.rename(columns={"ΔDaily": "Daily", "ΔWTD": "WTD", "ΔMTD": "MTD", "ΔQTD": "QTD"})
+    # keep only the fields we need (Category may be absent in some bad exports)
+    keep = [c for c in ["Name","Ticker","Category","Rank","Daily","WTD","MTD","QTD"] if c in df.columns]
+    return df[keep], asof_str
+
+
+def _sr_rank_bg_color(rank_val: float) -> colors.Color:
+    """
+    Rank tint: High=green, Neutral=gray, Low=red (same concept as portal page).
+    """
+    try:
+        if rank_val is None or pd.isna(rank_val):
+            return colors.white
+        v = float(rank_val)
+    except Exception:
+        return colors.white
+
+    # simple bands: 0-30 low, 30-70 neutral, 70-100 high
+    if v >= 70:
+        return colors.Color(0.90, 0.98, 0.95)  # light green
+    if v <= 30:
+        return colors.Color(0.99, 0.92, 0.92)  # light red
+    return colors.Color(0.95, 0.95, 0.95)      # neutral gray
+
+
+def _sr_fmt_int(x) -> str:
+    try:
+        if x is None or pd.isna(x):
+            return ""
+        v = int(round(float(x)))
+        # avoid "-0"
+        return "0" if v == 0 else str(v)
+    except Exception:
+        return ""
+
+
+def _sr_vmax(series: pd.Series, floor: float = 1.0) -> float:
+    s = pd.to_numeric(series, errors="coerce").abs().dropna()
+    if s.empty:
+        return floor
+    return max(floor, float(s.max()))
+
+
+def _sr_make_colored_table(df: pd.DataFrame, vmax_map: dict[str, float], include_ticker: bool) -> Table:
+    """
+    Match Performance Heatmap look:
+      - centered table (hAlign="CENTER")
+      - same header style/padding/grid weights as _ph_make_colored_table
+      - Rank column uses rank shading
+      - change columns use _ph_interp_color with per-column vmax
+    """
+    cols = df.columns.tolist()
+
+    # display headers (PDF only)
+    display_headers = []
+    for c in cols:
+        if c == "Daily":
+            display_headers.append("Δ Daily")
+        elif c == "WTD":
+            display_headers.append("Δ WTD")
+        elif c == "MTD":
+            display_headers.append("Δ MTD")
+        elif c == "QTD":
+            display_headers.append("Δ QTD")
+        else:
+            display_headers.append(c)
+
+    # build table data (header row as strings, like Performance)
+    data = [display_headers] + rlt.rows(*[
+        rlt.fmt_int_plain(df[c]) if c in ("Rank", "Daily", "WTD", "MTD", "QTD") else ht._text(df[c])
+        for c in cols
+    ])
+
+    # IMPORTANT: match Performance alignment behavior
+    t = Table(data, hAlign="CENTER")
+
+    ts = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),      # Name left
+        ("ALIGN", (1, 1), (-1, -1), "CENTER"),   # rest centered like Performance
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+
+    # Rank shading
+    if "Rank" in cols:
+        for cmd in rlt.background_runs(cols.index("Rank"), rlt.rank_rgb(df["Rank"])):
+            ts.add(*cmd)
+
+    # Change shading (independent per timeframe)
+    for c in ("Daily", "WTD", "MTD", "QTD"):
+        if c not in cols:
+            continue
+        col_vmax = vmax_map.get(c, 1.0) or 1.0
+        for cmd in rlt.background_runs(cols.index(c), rlt.delta_rgb(df[c], col_vmax)):
+            ts.add(*cmd)
+
+    t.setStyle(ts)
+    return t
+
+
+def build_sharpe_rank_heatmap_pdf(
+    include_macro_orientation: bool = True,
+    include_category_averages: bool = True,
+) -> bytes:
+    ranks, asof_str = _sr_load_latest()
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=landscape(letter),
+        leftMargin=36, rightMargin=36,
+        topMargin=36, bottomMargin=40
+    )
+
+    flow: list = []
+    flow.append(Paragraph("<b>Sharpe Rank Heatmap</b>", STYLES["Title"]))
+    # If you later want the date line like the portal, uncomment:
+    # if asof_str:
+    #     flow.append(Paragraph(asof_str, STYLES["Normal"]))
+    flow.append(Spacer(1, 10))
+
+    if ranks.empty:
+        flow.append(Paragraph("No sharpe rank data available (qry_graph_data_48–51.csv missing or empty).", STYLES["Normal"]))
+        doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+        return buf.getvalue()
+
+    # -------------------------
+    # Macro Orientation
+    # -------------------------
+    if include_macro_orientation:
+        flow.append(Paragraph("Macro Orientation", H2))
+        flow.append(Spacer(1, 6))
+
+        m = ranks[ranks.get("Ticker").isin(SR_MACRO_LIST) if "Ticker" in ranks.columns else False].copy()
+        if not m.empty and "Ticker" in m.columns:
+            order = {t: i for i, t in enumerate(SR_MACRO_LIST)}
+            m["__ord__"] = m["Ticker"].map(order)
+            m = m.sort_values(["__ord__"], kind="stable")
+
+        # columns for the PDF table
+        want = ["Name", "Ticker", "Rank", "Daily", "WTD", "MTD", "QTD"]
+        m = m[[c for c in want if c in m.columns]].copy()
+
+        if m.empty:
+            flow.append(Paragraph("No macro orientation rows found.", NOTE))
+        else:
+            vmax = {c: _robust_vmax(m[c], q=0.98, floor=1.0, step=1.0)
+                for c in ["Daily", "WTD", "MTD", "QTD"] if c in m.columns}
+            flow.append(_sr_make_colored_table(m, vmax, include_ticker=("Ticker" in m.columns)))
+
+        flow.append(Spacer(1, 12))
+
+    # -------------------------
+    # Category Averages
+    # -------------------------
+    if include_category_averages and ("Category" in ranks.columns):
+        flow.append(PageBreak())
+        flow.append(Paragraph("Category Averages", H2))
+        flow.append(Spacer(1, 6))
+
+        g = (
+            ranks.dropna(subset=["Category"])
+                 .groupby("Category", as_index=False)
+                 .agg(
+                     Rank=("Rank", "mean"),
+                     Daily=("Daily", "mean"),
+                     WTD=("WTD", "mean"),
+                     MTD=("MTD", "mean"),
+                     QTD=("QTD", "mean"),
+                 )
+        )
+
+        # enforce preferred order
+        order_map = {name: i for i, name in enumerate(SR_CATEGORY_ORDER)}
+        g["__ord__"] = g["Category"].map(order_map).fillna(10_000).astype(int)
+        g = g.sort_values(["__ord__", "Category"], kind="stable")
+
+        cat = g.rename(columns={"Category": "Name"})[["Name", "Rank", "Daily", "WTD", "MTD", "QTD"]].copy()
+
+        vmax = {c: _robust_vmax(cat[c], q=0.98, floor=1.0, step=1.0)
+            for c in ["Daily", "WTD", "MTD", "QTD"] if c in cat.columns}
+        flow.append(_sr_make_colored_table(cat, vmax, include_ticker=False))
+
+    elif include_category_averages:
+        # Category column missing in export
+        flow.append(PageBreak())
+        flow.append(Paragraph("Category Averages", H2))
+        flow.append(Spacer(1, 6))
+        flow.append(Paragraph("Category data not available (missing 'Category' column).", NOTE))
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+    return buf.getvalue()
+
+
+# =========================================================
+# MARKMENTUM HEATMAP (PDF)
+#   - Macro Orientation + Category Averages ONLY
+#   - Uses Sharpe-style blended shading for deltas
+#   - Uses existing _mm_bg_color for Score shading (neutral ±25 band)
+# =========================================================
+
+MM_CSV_BASE = latest_frames.MM_CSV_BASE
+MM_CSV_WTD  = latest_frames.MM_CSV_WTD
+MM_CSV_MTD  = latest_frames.MM_CSV_MTD
+MM_CSV_QTD  = latest_frames.MM_CSV_QTD
+
+# Reuse the same macro list + category order already used across the portal
+MM_MACRO_LIST = [
+    "SPX","NDX","DJI","RUT",
+    "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
+    "GLD","DXY","TLT","BTC=F"
+]
+
+MM_CATEGORY_ORDER = [
+    "Sector & Style ETFs","Indices","Futures","Currencies","Commodities","Bonds","Yields","Volatility","Foreign",
+    "Communication Services","Consumer Discretionary","Consumer Staples",
+    "Energy","Financials","Health Care","Industrials","Information Technology",
+    "Materials","Real Estate","Utilities","MR Discretion"
+]
+
+def _mmhm_load_latest() -> tuple[pd.DataFrame, str]:
+    """
+    The portal page's Markmentum frame (latest row per ticker) in the PDF's
+    category order: Name, Ticker, Category, Score, ΔDaily, ΔWTD, ΔMTD, ΔQTD.
+    """
+    out, asof_str = latest_frames.markmentum()
+    if out.empty:
+        return out, asof_str
+
+    out = out[["Ticker", "Name", "Category", "Score", "ΔDaily", "ΔWTD", "ΔMTD", "ΔQTD"]]
+
+    # enforce preferred category order (stable)
+    order_map = {name: i for i, name in enumerate(MM_CATEGORY_ORDER)}
+    out["__ord__"] = out["Category"].map(order_map).fillna(10_000).astype(int)
+    out = out.sort_values(["__ord__", "Category", "Ticker"], kind="stable").drop(columns="__ord__")
+
+    return out, asof_str
+
+
+def _mmhm_make_colored_table(df: pd.DataFrame, vmax: dict, include_ticker: bool) -> Table:
+    """
+    PDF table:
+      - Score column shaded via _mm_bg_color
+      - Δ columns shaded via _sr_delta_bg with provided vmax per column
+    """
+    cols = ["Name"]
+    if include_ticker:
+        cols.append("Ticker")
+    cols += ["Score", "Δ Daily", "Δ WTD", "Δ MTD", "Δ QTD"]
+
+    # header row as plain strings (Sharpe-style sizing/behavior)
+    data = [cols]
+
+    # rows (whole columns at a time)
+    col = lambda c: df[c] if c in df.columns else pd.Series([None] * len(df), dtype=object)  # noqa: E731
+    text_cols = [[clean_text(x) for x in col("Name").fillna("").tolist()]]
+    if include_ticker:
+        text_cols.append([clean_text(x) for x in col("Ticker").fillna("").tolist()])
+    data += rlt.rows(*text_cols, *[ht.fmt_int(col(c)) for c in ("Score", "Daily", "WTD", "MTD", "QTD")])
+
+    # Sharpe Rank Heatmap sizing approach (NO fixed colWidths)
+    t = Table(data, hAlign="CENTER")
+
+    ts = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (0, 1), (0, -1), "LEFT"),      # Name left
+        ("ALIGN", (1, 1), (-1, -1), "CENTER"),   # rest centered
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ])
+
+    # column indices
+    c_score = 1 if not include_ticker else 2
+    c_d0 = c_score + 1  # Δ Daily
+    c_d1 = c_score + 2  # Δ WTD
+    c_d2 = c_score + 3  # Δ MTD
+    c_d3 = c_score + 4  # Δ QTD
+
+    # Score shading
+    for cmd in rlt.background_runs(c_score, rlt.mm_rgb(col("Score"))):
+        ts.add(*cmd)
+
+    # Delta shading (independent per timeframe, same as Sharpe logic)
+    for (col_idx, key) in [
+        (c_d0, "Daily"),
+        (c_d1, "WTD"),
+        (c_d2, "MTD"),
+        (c_d3, "QTD"),
+    ]:
+        col_vmax = vmax.get(key, 1.0) or 1.0
+        for cmd in rlt.background_runs(col_idx, rlt.delta_rgb(col(key), col_vmax)):
+            ts.add(*cmd)
+
+    t.setStyle(ts)
+    return t
+
+
+def build_markmentum_heatmap_pdf(
+    include_macro_orientation: bool = True,
+    include_category_averages: bool = True,
+) -> bytes:
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=landscape(letter),
+        leftMargin=36, rightMargin=36,
+        topMargin=36, bottomMargin=40
+    )
+
+    flow: list = []
+
+    df, asof = _mmhm_load_latest()
+    title = "Markmentum Heatmap" #+ (f" – {asof}" if asof else "")
+    flow.append(Paragraph(clean_text(title), H1))
+    flow.append(Spacer(1, 6))
+
+    if df.empty:
+        flow.append(Paragraph("Markmentum Heatmap data missing or empty.", NOTE))
+        doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+        return buf.getvalue()
+
+    # -------------------------
+    # Macro Orientation
+    # -------------------------
+    if include_macro_orientation:
+        m = df[df["Ticker"].isin(MM_MACRO_LIST)].copy()
+        if not m.empty:
+            # keep macro order
+            m["__ord__"] = m["Ticker"].map({t:i for i,t in enumerate(MM_MACRO_LIST)})
+            m = m.sort_values(["__ord__"], kind="stable").drop(columns="__ord__")
+
+            flow.append(Paragraph("Macro Orientation", H2))
+            flow.append(Spacer(1, 6))
+
+            vmax = {
+                "Daily": _robust_vmax(m["ΔDaily"], q=0.98, floor=1.0, step=1.0),
+                "WTD":   _robust_vmax(m["ΔWTD"],   q=0.98, floor=1.0, step=1.0),
+                "MTD":   _robust_vmax(m["ΔMTD"],   q=0.98, floor=1.0, step=1.0),
+                "QTD":   _robust_vmax(m["ΔQTD"],   q=0.98, floor=1.0, step=1.0),
+            }
+            m_tbl = m.rename(columns={"ΔDaily":"Daily","ΔWTD":"WTD","ΔMTD":"MTD","ΔQTD":"QTD"})[
+                ["Name","Ticker","Score","Daily","WTD","MTD","QTD"]
+            ].copy()
+            flow.append(_mmhm_make_colored_table(m_tbl, vmax, include_ticker=True))
+            flow.append(Spacer(1, 10))
+            flow.append(PageBreak())
+
+    # -------------------------
+    # Category Averages
+    # -------------------------
+    if include_category_averages and "Category" in df.columns and df["Category"].astype(str).str.len().gt(0).any():
+        g = (
+            df.groupby("Category", as_index=False)
+              .agg(
+                  Score=("Score", "mean"),
+                  Daily=("ΔDaily", "mean"),
+                  WTD=("ΔWTD", "mean"),
+                  MTD=("ΔMTD", "mean"),
+                  QTD=("ΔQTD", "mean"),
+              )
+        )
+
+        # enforce preferred order
+        order_map = {name: i for i, name in enumerate(MM_CATEGORY_ORDER)}
+        g["__ord__"] = g["Category"].map(order_map).fillna(10_000).astype(int)
+        g = g.sort_values(["__ord__", "Category"], kind="stable")
+
+        cat = g.rename(columns={"Category":"Name"})[["Name","Score","Daily","WTD","MTD","QTD"]].copy()
+
+        vmax = {
+            "Daily": _robust_vmax(cat["Daily"], q=0.98, floor=1.0, step=1.0),
+            "WTD":   _robust_vmax(cat["WTD"],   q=0.98, floor=1.0, step=1.0),
+            "MTD":   _robust_vmax(cat["MTD"],   q=0.98, floor=1.0, step=1.0),
+            "QTD":   _robust_vmax(cat["QTD"],   q=0.98, floor=1.0, step=1.0),
+        }
+
+        flow.append(Paragraph("Category Averages", H2))
+        flow.append(Spacer(1, 6))
+        flow.append(_mmhm_make_colored_table(cat, vmax, include_ticker=False))
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+    return buf.getvalue()
+
+# =========================================================
+# DIRECTIONAL TRENDS (PDF) — MACRO ORIENTATION ONLY
+# Source: qry_graph_data_88.csv
+# =========================================================
+
+DT_CSV = latest_frames.DT_CSV
+
+DT_MACRO_LIST = [
+    "SPX","NDX","DJI","RUT",
+    "XLB","XLC","XLE","XLF","XLI","XLK","XLP","XLRE","XLU","XLV","XLY",
+    "GLD","DXY","TLT","BTC=F"
+]
+
+def _dt_load_latest() -> tuple[pd.DataFrame, str]:
+    """qry_graph_data_88.csv, latest row per ticker + as-of date string (shared with the portal page)."""
+    return latest_frames.directional_trends()
+
+
+def _dt_tape_bias_label(st, mt, lt, stc, mtc) -> str:
+    """Exact tape-bias logic from 07_Directional_Trends.py (m2_label)."""
+    vals = [st, mt, lt, stc, mtc]
+    if any(pd.isna(v) for v in vals):
+        return "Insufficient data"
+    try:
+        st, mt, lt, stc, mtc = map(float, vals)
+    except Exception:
+        return "Insufficient data"
+
+    threshold = 0.0005  # = 0.05%
+    both_up        = (stc >= threshold and mtc >= threshold)
+    both_down      = (stc <= -threshold and mtc <= -threshold)
+    st_up_mt_down  = (stc >= threshold and mtc <= -threshold)
+    st_down_mt_up  = (stc <= -threshold and mtc >= threshold)
+
+    if abs(stc) <= threshold or abs(mtc) <= threshold:
+        return "Neutral"
+
+    # A) Confirmed bullish stack: ST < MT < LT
+    if st < mt < lt:
+        if both_up:
+            return "Buy"
+        if st_up_mt_down:
+            return "Bottoming"
+        if st_down_mt_up:
+            return "Bottoming"
+        if both_down:
+            return "Sell"
+        return "Neutral"
+
+    # B) LT in the middle (ST < LT < MT)
+    if st < lt < mt:
+        if both_up:
+            return "Leaning Bullish"
+        if st_up_mt_down:
+            return "Neutral"
+        if st_down_mt_up:
+            return "Leaning Bullish"
+        if both_down:
+            return "Leaning Bearish"
+        return "Neutral"
+
+    # C) Bullish half, not the stack (MT < ST < LT)
+    if mt < st < lt:
+        if both_up:
+            return "Leaning Bullish"
+        if st_up_mt_down:
+            return "Neutral"
+        if st_down_mt_up:
+            return "Neutral"
+        if both_down:
+            return "Leaning Bearish"
+        return "Neutral"
+
+    # D) LT in the middle (MT < LT < ST)
+    if mt < lt < st:
+        if both_up:
+            return "Leaning Bullish"
+        if st_up_mt_down:
+            return "Neutral"
+        if st_down_mt_up:
+            return "Neutral"
+        if both_down:
+            return "Leaning Bearish"
+        return "Neutral"
+
+    # E) Bearish half, not the stack (LT < ST < MT)
+    if lt < st < mt:
+        if both_up:
+            return "Leaning Bullish"
+        if st_up_mt_down:
+            return "Leaning Bearish"
+        if st_down_mt_up:
+            return "Neutral"
+        if both_down:
+            return "Leaning Bearish"
+        return "Neutral"
+
+    # F) Confirmed bearish stack (LT < MT < ST)
+    if lt < mt < st:
+        if both_up:
+            return "Buy"
+        if st_up_mt_down:
+            return "Topping"
+        if st_down_mt_up:
+            return "Topping"
+        if both_down:
+            return "Sell"
+        return "Neutral"
+
+    return "Neutral"
+
+
+def _dt_make_colored_table(df: pd.DataFrame, vmax: dict) -> Table:
+    """Macro table with Sharpe-rank delta shading philosophy."""
+    cols = [
+        "Name", "Ticker",
+        "ST", "MT", "LT",
+        "ST Change", "MT Change", "LT Change",
+        "Tape Bias",
+    ]
+
+    # ✅ Display labels (only affect header text, not dataframe keys)
+    header_labels = [
+        "Name", "Ticker",
+        "ST", "MT", "LT",
+        "Δ ST", "Δ MT", "Δ LT",
+        "Tape Bias",
+    ]
+
+    header = [th(c) for c in header_labels]
+    #header = [th(c) for c in cols]
+
+    data = [header] + rlt.rows(
+        [clean_text(x) for x in df["Name"].tolist()],
+        [pdf_safe_text(x) for x in df["Ticker"].tolist()],
+        *[ht.fmt_pct(df[c], 1) for c in ("ST", "MT", "LT", "ST Change", "MT Change", "LT Change")],
+        [pdf_safe_text(x) for x in df["Tape Bias"].tolist()],
+    )
+
+    widths = [
+        2.6*inch, 0.75*inch,
+        0.78*inch, 0.78*inch, 0.78*inch,
+        0.90*inch, 0.90*inch, 0.90*inch,
+        1.20*inch,
+    ]
+
+    t = Table(data, colWidths=widths, repeatRows=1)
+
+    ts = TableStyle([
+        ("FONT", (0,0), (-1,0), "Helvetica-Bold", 9),
+        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#f2f2f2")),
+        ("TEXTCOLOR", (0,0), (-1,0), colors.HexColor("#1a1a1a")),
+        ("GRID", (0,0), (-1,-1), 0.5, colors.HexColor("#d9d9d9")),
+        ("FONT", (0,1), (-1,-1), "Helvetica", 9),
+        ("ALIGN", (0,0), (0,-1), "LEFT"),
+        ("ALIGN", (1,0), (1,-1), "CENTER"),
+        ("ALIGN", (2,0), (7,-1), "RIGHT"),
+        ("ALIGN", (8,0), (8,-1), "LEFT"),
+        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+        ("TOPPADDING", (0,0), (-1,-1), 4),
+        ("BOTTOMPADDING", (0,0), (-1,-1), 4),
+    ])
+
+    # Shade numeric columns with _sr_delta_bg (same philosophy as Sharpe Rank)
+    shade_cols = ["ST", "MT", "LT", "ST Change", "MT Change", "LT Change"]
+    col_index = {c: i for i, c in enumerate(cols)}
+    for c in shade_cols:
+        col_vmax = float(vmax.get(c) or 1e-6)
+        for cmd in rlt.background_runs(col_index[c], rlt.delta_rgb(df[c], col_vmax)):
+            ts.add(*cmd)
+
+    t.setStyle(ts)
+    return t
+
+
+def build_directional_trends_pdf() -> bytes:
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=landscape(letter),
+        leftMargin=36, rightMargin=36,
+        topMargin=36, bottomMargin=40,
+    )
+
+    flow: list = []
+
+    df, asof = _dt_load_latest()
+    title = "Directional Trends"
+    flow.append(Paragraph(clean_text(title), H1))
+    flow.append(Spacer(1, 6))
+
+    if df.empty:
+        flow.append(Paragraph("Directional Trends data missing or empty (qry_graph_data_88.csv).", NOTE))
+        doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+        return buf.getvalue()
+
+    # Macro Orientation only
+    m = df[df["Ticker"].isin(DT_MACRO_LIST)].copy()
+    if m.empty:
+        flow.append(Paragraph("Directional Trends Macro Orientation is empty.", NOTE))
+        doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+        return buf.getvalue()
+
+    # keep macro order
+    m["__ord__"] = m["Ticker"].map({t:i for i, t in enumerate(DT_MACRO_LIST)})
+    m = m.sort_values(["__ord__"], kind="stable").drop(columns=["__ord__"], errors="ignore")
+
+    for c in ["st_trend","mt_trend","lt_trend","st_trend_change","mt_trend_change","lt_trend_change"]:
+        if c in m.columns:
+            m[c] = pd.to_numeric(m[c], errors="coerce")
+
+    m_tbl = pd.DataFrame({
+        "Name": m.get("Ticker_name", ""),
+        "Ticker": m.get("Ticker", ""),
+        "ST": m.get("st_trend"),
+        "MT": m.get("mt_trend"),
+        "LT": m.get("lt_trend"),
+        "ST Change": m.get("st_trend_change"),
+        "MT Change": m.get("mt_trend_change"),
+        "LT Change": m.get("lt_trend_change"),
+    })
+    m_tbl["Tape Bias"] = [
+        _dt_tape_bias_label(st, mt, lt, stc, mtc)
+        for st, mt, lt, stc, mtc in zip(
+            m_tbl["ST"], m_tbl["MT"], m_tbl["LT"],
+            m_tbl["ST Change"], m_tbl["MT Change"],
+        )
+    ]
+
+    flow.append(Paragraph("Macro Orientation", H2))
+    flow.append(Spacer(1, 6))
+
+    vmax = {
+        "ST":        _robust_vmax(m_tbl["ST"],        q=0.98, floor=1e-6, step=1e-6),
+        "MT":        _robust_vmax(m_tbl["MT"],        q=0.98, floor=1e-6, step=1e-6),
+        "LT":        _robust_vmax(m_tbl["LT"],        q=0.98, floor=1e-6, step=1e-6),
+        "ST Change": _robust_vmax(m_tbl["ST Change"], q=0.98, floor=1e-6, step=1e-6),
+        "MT Change": _robust_vmax(m_tbl["MT Change"], q=0.98, floor=1e-6, step=1e-6),
+        "LT Change": _robust_vmax(m_tbl["LT Change"], q=0.98, floor=1e-6, step=1e-6),
+    }
+
+    flow.append(_dt_make_colored_table(m_tbl, vmax))
+    flow.append(Spacer(1, 8))
+    flow.append(Paragraph(
+        "Legend: Buy – Uptrend confirmed · Leaning Bullish – Bullish setup, confirmation pending · "
+        "Neutral – Crosscurrents / mixed trends · Topping / Bottoming – Transition zones where trends may reverse · "
+        "Leaning Bearish – Bearish bias but not fully aligned · Sell – Downtrend confirmed.",
+        NOTE,
+    ))
+
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+    return buf.getvalue()
+
+# =========================================================
+# DEEP DIVE TEAR SHEETS (PDF)
+# Sources: qry_graph_data_25.csv (stat box) + the Deep Dive graph files
+# One page per ticker (stat box + 4 charts), optional detail page (4 more).
+# Chart images come from utils/tear_sheet.py (cached per release).
+# =========================================================
+
+TSH_MAX_TICKERS = 50
+
+TSH_TITLE = ParagraphStyle("TSH_TITLE", parent=styles["Heading1"], alignment=TA_LEFT,
+                           fontSize=15, leading=18, spaceAfter=0)
+
+def _tsh_usd(x) -> str:
+    try:
+        v = float(x)
+        return f"${v:,.2f}" if np.isfinite(v) else ""
+    except Exception:
+        return ""
+
+def _tsh_pct(x) -> str:
+    try:
+        v = float(x) * 100
+        return f"{v:,.1f}%" if np.isfinite(v) else ""
+    except Exception:
+        return ""
+
+def _tsh_rr(x) -> str:
+    try:
+        v = float(x)
+        if not np.isfinite(v):
+            return ""
+        return f"{v:,.2f}" if v >= 0 else f"({abs(v):,.2f})"
+    except Exception:
+        return ""
+
+def _tsh_score(x) -> str:
+    try:
+        return f"{int(round(float(x)))}"
+    except Exception:
+        return ""
+
+def _tsh_grid_style(extra=()) -> TableStyle:
+    return TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.lightgrey),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+        *extra,
+    ])
+
+def _tsh_stat_box(row: dict) -> Table:
+    """Deep Dive stat box: quote + vol/score tables stacked on the left, probable ranges on the right."""
+    quote = Table([
+        ["Ticker", "Close", "LT Anchor", "Change %", "Rating"],
+        [str(row.get("ticker", "")).upper(), _tsh_usd(row.get("close")), _tsh_usd(row.get("lt_pt_sm")),
+         _tsh_pct(row.get("change_pct")),
+         "" if pd.isna(row.get("rating")) else str(row.get("rating")).title()],
+    ], colWidths=[62] * 5, style=_tsh_grid_style())
+
+    vol = Table([
+        ["Ivol", "Rvol", "Ivol P/D", "MM Score"],
+        [_tsh_pct(row.get("ivol")), _tsh_pct(row.get("rvol")), _tsh_pct(row.get("prem_disc")),
+         _tsh_score(row.get("model_score"))],
+    ], colWidths=[77.5] * 4,
+       style=_tsh_grid_style(rlt.background_runs(3, rlt.mm_rgb([row.get("model_score")]))))
+
+    periods = [("Day", "day"), ("Week", "week"), ("Month", "month")]
+    rr = [row.get(f"{p}_rr_ratio") for _, p in periods]
+    ranges = Table(
+        [["Period", "PR Low", "PR High", "Down %", "Up %", "R/R Ratio"]] + [
+            [label, _tsh_usd(row.get(f"{p}_pr_low")), _tsh_usd(row.get(f"{p}_pr_high")),
+             _tsh_pct(row.get(f"{p}_dn")), _tsh_pct(row.get(f"{p}_up")), _tsh_rr(row.get(f"{p}_rr_ratio"))]
+            for label, p in periods
+        ],
+        colWidths=[50, 62, 62, 52, 52, 62],
+        style=_tsh_grid_style([("FONTNAME", (0, 1), (0, -1), "Helvetica-Bold"),
+                               *rlt.background_runs(5, rlt.rr_rgb(rr))]),
+    )
+
+    left = Table([[quote], [Spacer(1, 6)], [vol]], style=[("LEFTPADDING", (0, 0), (-1, -1), 0),
+                                                          ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                                                          ("TOPPADDING", (0, 0), (-1, -1), 0),
+                                                          ("BOTTOMPADDING", (0, 0), (-1, -1), 0)])
+    return Table([[left, ranges]], colWidths=[330, 360], hAlign="LEFT",
+                 style=[("VALIGN", (0, 0), (-1, -1), "TOP"), ("LEFTPADDING", (0, 0), (-1, -1), 0)])
+
+def _tsh_chart_grid(release: str, ticker: str, charts: list[str], window: str) -> Table:
+    cells = []
+    for chart in charts:
+        png = ts.chart_png(release, ticker, chart, window)
+        if png is None:
+            cells.append(Paragraph(f"No {ts.CHARTS[chart]['title']} data for {ticker}.", NOTE))
+        else:
+            cells.append(RLImage(io.BytesIO(png), width=ts.CHART_W_PT, height=ts.CHART_H_PT))
+    rows = [cells[i:i + 2] + [""] * (2 - len(cells[i:i + 2])) for i in range(0, len(cells), 2)]
+    return Table(rows, colWidths=[ts.CHART_W_PT + 8] * 2, rowHeights=[ts.CHART_H_PT + 6] * len(rows),
+                 style=[("ALIGN", (0, 0), (-1, -1), "CENTER"), ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                        ("LEFTPADDING", (0, 0), (-1, -1), 0), ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                        ("TOPPADDING", (0, 0), (-1, -1), 0), ("BOTTOMPADDING", (0, 0), (-1, -1), 0)])
+
+def build_tear_sheet_pdf(tickers: list[str], window: str = "6M", detail: bool = False,
+                         release: str | None = None) -> bytes:
+    """Tear sheet pages for `tickers` (unknown tickers are skipped); b"" if none are known."""
+    release = release or pack_release_id()
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=landscape(letter),
+        leftMargin=36, rightMargin=36,
+        topMargin=30, bottomMargin=72,
+    )
+
+    flow: list = []
+    for ticker in tickers:
+        row = ts.stat_row(ticker)
+        if row is None:
+            continue
+        if flow:
+            flow.append(PageBreak())
+        name = str(row.get("ticker_name") or ticker)
+        asof = pd.to_datetime(row.get("date"), errors="coerce")
+        asof_str = f"{asof.month}/{asof.day}/{asof.year}" if pd.notna(asof) else ""
+        sub = " · ".join(x for x in [str(row.get("category") or ""), "Deep Dive Tear Sheet",
+                                    f"Data as of {asof_str}" if asof_str else "", f"Charts: {window}"] if x)
+
+        flow.append(Paragraph(pdf_safe_text(clean_text(f"{name} ({ticker})")), TSH_TITLE))
+        flow.append(Paragraph(pdf_safe_text(clean_text(sub)), NOTE))
+        flow.append(Spacer(1, 8))
+        flow.append(_tsh_stat_box(row))
+        flow.append(Spacer(1, 10))
+        flow.append(_tsh_chart_grid(release, ticker, ts.SUMMARY_CHARTS, window))
+
+        if detail:
+            flow.append(PageBreak())
+            flow.append(Paragraph(pdf_safe_text(clean_text(f"{name} ({ticker}) – Detail")), TSH_TITLE))
+            flow.append(Spacer(1, 10))
+            flow.append(_tsh_chart_grid(release, ticker, ts.DETAIL_CHARTS, window))
+
+    if not flow:
+        return b""
+    doc.build(flow, onFirstPage=_footer, onLaterPages=_footer)
+    return buf.getvalue()
+
+# =========================================================
+# MODULAR PACKET ARCHITECTURE (NEW)
+# =========================================================
+def write_pdfs_in_order(pdf_blobs: list[bytes], out) -> None:
+    """
+    Merge already-built PDFs into `out` (order preserved).  ReportLab parts
+    are stitched at the byte level (utils/pdf_merge.py); anything else falls
+    back to a pypdf re-parse.
+    """
+    start = out.tell()
+    try:
+        write_merged_pdf(pdf_blobs, out, dedupe=PACK_OPTIMIZE)
+        return
+    except UnsupportedPDF:
+        out.seek(start)
+        out.truncate()
+    writer = PdfWriter()
+    for blob in pdf_blobs:
+        reader = PdfReader(io.BytesIO(blob))
+        for page in reader.pages:
+            writer.add_page(page)
+    writer.write(out)
+
+def merge_pdf_bytes_in_order(pdf_blobs: list[bytes]) -> bytes:
+    """Merge already-built PDFs into one PDF (order preserved)."""
+    out = io.BytesIO()
+    write_pdfs_in_order(pdf_blobs, out)
+    return out.getvalue()
+
+def normalize_timeframes(selected: list[str]) -> list[str]:
+    """Enforce your current behavior: Daily always included for Morning Compass packet."""
+    if not selected:
+        return ["Daily"]
+    # ensure Daily first if included
+    s = list(dict.fromkeys(selected))
+    if "Daily" in s:
+        s = ["Daily"] + [x for x in s if x != "Daily"]
+    return s
+
+def pack_session_dates() -> tuple[str, str]:
+    """
+    (trading_session, data_asof) for the cover page, from the Daily as-of.
+    Trading session = Daily main date; data-as-of = prior weekday.
+    """
+    session_str = _asof_date_from_main("Daily")  # this is your "Trading Session" date
+    if not session_str:
+        return "", ""
+    dt_session = datetime.strptime(session_str, "%m/%d/%Y")
+
+    # Data-as-of = prior trading day (simple weekday fallback)
+    dt_asof = dt_session - timedelta(days=1)
+    while dt_asof.weekday() >= 5:  # 5=Sat, 6=Sun
+        dt_asof -= timedelta(days=1)
+
+    # Windows-safe formatting (no %-m / %-d)
+    trading_session = f"{dt_session.month}/{dt_session.day}/{dt_session.year}"
+    data_asof = f"{dt_asof.month}/{dt_asof.day}/{dt_asof.year}"
+    return trading_session, data_asof
+
+class ReportModuleBase:
+    key: str = "base"
+    label: str = "Base Module"
+
+    def default_options(self) -> dict:
+        """
+        Options ui() returns when nothing is touched (used by the prebuilt
+        standard packs, so their cache keys match a default Generate click).
+        """
+        return {}
+
+    def ui(self) -> dict:
+        """
+        Render module UI and return an options dict.
+        Must be deterministic given Streamlit state.
+        """
+        return {}
+
+    def parts(self, options: dict) -> list[dict]:
+        """
+        Options for each pack part this module is built as.  Parts are built
+        (and cached) separately, in parallel; most modules are a single part.
+        """
+        return [options]
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        """
+        Return (pdfs_in_order, filename_stub)
+        - pdfs_in_order: list of pdf bytes blobs
+        - filename_stub: used to name download file
+        """
+        return ([], "report")
+
+
+class MorningCompassModule(ReportModuleBase):
+    key = "morning_compass"
+    label = "Morning Compass"
+
+    def default_options(self) -> dict:
+        return {
+            "tf_keys": ["Daily"],
+            "include_correlations": True,
+            "include_macro": True,
+            "include_pct": True,
+            "include_mm": True,
+            "include_delta": True,
+        }
+
+    def ui(self) -> dict:
+        left, mid, right = st.columns([1, 1, 1])
+
+        with left:
+            extra_tfs = st.multiselect(
+                "Add Timeframes (Optional)",
+                ["Weekly", "Monthly"],
+                default=[]
+            )
+
+            # If user picked any extra timeframe, let them exclude Daily
+            allow_exclude_daily = len(extra_tfs) > 0
+            include_daily = st.checkbox(
+                "Include Daily",
+                value=True,
+                disabled=not allow_exclude_daily,
+                help="Daily is required unless you select Weekly and/or Monthly."
+            )
+
+            tf_keys = (["Daily"] if include_daily else []) + extra_tfs
+
+        # Safety: never allow empty selection
+        if not tf_keys:
+            tf_keys = ["Daily"]
+
+        st.caption(
+            "Select Weekly and/or Monthly to add them to the report. "
+            "If you select another timeframe, you may uncheck 'Include Daily' to exclude Daily."
+        )
+
+        daily_selected = "Daily" in tf_keys
+
+        with mid:
+            st.markdown("**Include Sections**")
+            include_macro = st.checkbox("Macro Orientation (by timeframe)", value=True)
+
+            corr_key = f"{self.key}_include_correlations"
+
+            # If Daily isn't in tf_keys, force correlations OFF (prevents stale True)
+            if not daily_selected:
+                st.session_state[corr_key] = False
+
+            include_correlations = st.checkbox(
+                "Correlations (USD + Rates) (Daily only)",
+                value=st.session_state.get(corr_key, True),
+                key=corr_key,
+                disabled=not daily_selected,
+            )
+            
+        with right:
+            st.markdown("**Top Five Cards (by timeframe)**")
+            include_pct   = st.checkbox("Top Five Leaders/Laggards by % Change", value=True)
+            include_mm    = st.checkbox("Top Five Leaders/Laggards by MM Score", value=True)
+            include_delta = st.checkbox("Top Five Leaders/Laggards by MM Score Change", value=True)
+
+        # Preview metadata (show all selected timeframes)
+        preview_parts = []
+        for k in tf_keys:
+            asof_k = _asof_date_from_main(k)
+            preview_parts.append(f"{k}: {asof_k if asof_k else '(date not found)'}")
+        st.markdown("**Preview:** Morning Compass – " + " | ".join(preview_parts))
+
+        return {
+            "tf_keys": tf_keys,
+            "include_correlations": include_correlations,
+            "include_macro": include_macro,
+            "include_pct": include_pct,
+            "include_mm": include_mm,
+            "include_delta": include_delta,
+        }
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        tf_keys = options.get("tf_keys", ["Daily"])
+        # already Daily-first; keep as-is
+        blobs: list[bytes] = []
+
+        for tf_key in tf_keys:
+            blobs.append(
+                build_morning_compass_pdf(
+                    include_correlations=options.get("include_correlations", True),
+                    include_macro=options.get("include_macro", True),
+                    include_pct=options.get("include_pct", True),
+                    include_mm=options.get("include_mm", True),
+                    include_delta=options.get("include_delta", True),
+                    tf_key=tf_key
+                )
+            )
+
+        # naming: matches your current logic using Daily date if present
+        tf_for_date = "Daily" if "Daily" in tf_keys else tf_keys[0]
+        asof = _asof_date_from_main(tf_for_date)
+        tf_slug = "-".join([t.lower() for t in tf_keys])
+        filename_stub = f"markmentum_morning_compass_{tf_slug}_{asof.replace('/','-') if asof else 'report'}"
+        return (blobs, filename_stub)
+
+
+class MarketOverviewModule(ReportModuleBase):
+    key = "market_overview"
+    label = "Market Overview"
+
+    #def ui(self) -> dict:
+    #    tf_key = st.selectbox(
+    #        "Timeframe",
+    #        MO_TF_LABELS,
+    #        index=0
+    #    )
+
+    def default_options(self) -> dict:
+        return {
+            "tf_keys": ["Daily"],
+            "include_top_cards": True,
+            "include_score_change_cards": True,
+            "include_daily_extras": True,
+            "include_market_read": True,
+        }
+
+    def ui(self) -> dict:
+        extra_tfs = st.multiselect(
+            "Add Timeframes (Optional)",
+            ["Weekly", "Monthly", "Quarterly"],
+            default=[]
+        )
+
+        allow_exclude_daily = len(extra_tfs) > 0
+        include_daily = st.checkbox(
+            "Include Daily",
+            value=True,
+            disabled=not allow_exclude_daily,
+            help="Daily is required unless you select Weekly, Monthly, or Quarterly."
+        )
+
+        tf_keys = (["Daily"] if include_daily else []) + extra_tfs
+
+        if not tf_keys:
+            tf_keys = ["Daily"]
+
+        c1, c2, c3 = st.columns([1, 1, 1])
+
+        with c1:
+            include_top_cards = st.checkbox("Include Top % Gainers / Top % Decliners / Most Active", value=True)
+            include_score_change_cards = st.checkbox("Include MM Score Gainers / Decliners / Change Distribution", value=True)
+
+        with c2:
+#            include_daily_extras = st.checkbox(
+#                "Include Daily extras (Highest/Lowest/Histogram + Opportunity Density)",
+#                value=True,
+#                disabled=(tf_key != "Daily")
+#            )
+            daily_selected = "Daily" in tf_keys
+
+            extras_key = f"{self.key}_include_daily_extras"
+
+            # If Daily isn't in tf_keys, force extras OFF (prevents stale True)
+            if not daily_selected:
+                st.session_state[extras_key] = False
+            
+            include_daily_extras = st.checkbox(
+                "Include Daily extras (Highest/Lowest/Histogram + Opportunity Density)",
+                value=st.session_state.get(extras_key, True),
+                key=extras_key,
+                disabled=not daily_selected,
+            )
+            
+
+        with c3:
+            include_market_read = st.checkbox("Include Market Read", value=True)
+
+        st.caption(
+            "Select Weekly, Monthly, Quarterly to add them to the report. "
+            "If you select another timeframe, you may uncheck 'Include Daily' to exclude Daily."
+        )
+
+        # Preview
+        preview_parts = []
+        for k in tf_keys:
+            dfs = mo_load_for_timeframe(k)
+            asof = _mo_asof_from_df(dfs[0])
+            preview_parts.append(f"{k}: {asof if asof else '(date not found)'}")
+        st.markdown("**Preview:** Market Overview – " + " | ".join(preview_parts))
+
+        return {
+            "tf_keys": tf_keys,
+            "include_top_cards": include_top_cards,
+            "include_score_change_cards": include_score_change_cards,
+            "include_daily_extras": include_daily_extras,   # applies to Daily only in build()
+            "include_market_read": include_market_read,
+        }
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        tf_keys = options.get("tf_keys", ["Daily"])
+
+        # enforce order: Daily, Weekly, Monthly, Quarterly
+        order = ["Daily", "Weekly", "Monthly", "Quarterly"]
+        tf_keys = [t for t in order if t in tf_keys]
+
+        blobs: list[bytes] = []
+
+        for tf_key in tf_keys:
+            blobs.append(
+                build_market_overview_pdf(
+                    tf_key=tf_key,
+                    include_top_cards=options.get("include_top_cards", True),
+                    include_score_change_cards=options.get("include_score_change_cards", True),
+                    include_daily_extras=(tf_key == "Daily" and options.get("include_daily_extras", True)),
+                    include_market_read=options.get("include_market_read", True),
+                )
+            )
+
+        # filename stub
+        tf_for_date = "Daily" if "Daily" in tf_keys else tf_keys[0]
+        asof = _mo_asof_from_df(mo_load_for_timeframe(tf_for_date)[0])
+        date_slug = asof.replace("/", "-") if asof else "report"
+        tf_slug = "-".join([t.lower() for t in tf_keys])
+        stub = f"market_overview_{tf_slug}_{date_slug}"
+
+        return (blobs, stub)
+
+
+class PerformanceHeatmapModule(ReportModuleBase):
+    key = "performance_heatmap"
+    label = "Performance Heatmap"
+
+    def default_options(self) -> dict:
+        return {"include_macro": True, "include_cat": True, "include_heatmap": False}
+
+    def ui(self) -> dict:
+        # defaults: keep it tight; table shading already conveys “heatmap”
+        include_macro = st.checkbox(
+            "Include Macro Orientation",
+            value=True,
+            key=f"{self.key}_include_macro",
+        )
+        include_cat = st.checkbox(
+            "Include Category Averages",
+            value=True,
+            key=f"{self.key}_include_cat",
+        )
+        include_heatmap = False #skip for now
+
+        # preview date
+        _, asof = _ph_load_latest()
+        if asof:
+            st.markdown(f"**Preview:** Performance Heatmap – {asof}")
+
+        st.caption("Note: Per-ticker category breakouts are intentionally excluded from the report pack.")
+        return {
+            "include_macro": include_macro,
+            "include_cat": include_cat,
+            "include_heatmap": include_heatmap,
+        }
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        blob = build_performance_heatmap_pdf(
+            include_macro_orientation=options.get("include_macro", True),
+            include_category_averages=options.get("include_cat", True),
+            include_category_heatmap=options.get("include_heatmap", False),
+        )
+        # filename stub
+        return ([blob], "performance_heatmap")
+
+class SharpeRankHeatmapModule(ReportModuleBase):
+    key = "sharpe_rank_heatmap"
+    label = "Sharpe Rank Heatmap"
+
+    def default_options(self) -> dict:
+        return {"include_macro": True, "include_cat": True}
+
+    def ui(self) -> dict:
+        include_macro = st.checkbox(
+            "Include Macro Orientation",
+            value=True,
+            key=f"{self.key}_include_macro",
+        )
+        include_cat = st.checkbox(
+            "Include Category Averages",
+            value=True,
+            key=f"{self.key}_include_cat",
+        )
+
+        # preview date
+        _, asof = _sr_load_latest()
+        if asof:
+            st.markdown(f"**Preview:** Sharpe Rank Heatmap – {asof}")
+
+        st.caption("Note: Per-ticker category breakouts are intentionally excluded from the report pack.")
+        return {
+            "include_macro": include_macro,
+            "include_cat": include_cat,
+        }
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        blob = build_sharpe_rank_heatmap_pdf(
+            include_macro_orientation=options.get("include_macro", True),
+            include_category_averages=options.get("include_cat", True),
+        )
+        return ([blob], "sharpe_rank_heatmap")
+
+
+class MarkmentumHeatmapModule(ReportModuleBase):
+    key = "markmentum_heatmap"
+    label = "Markmentum Heatmap"
+
+    def default_options(self) -> dict:
+        return {"include_macro": True, "include_cat": True}
+
+    def ui(self) -> dict:
+        include_macro = st.checkbox(
+            "Include Macro Orientation",
+            value=True,
+            key=f"{self.key}_include_macro",
+        )
+        include_cat = st.checkbox(
+            "Include Category Averages",
+            value=True,
+            key=f"{self.key}_include_cat",
+        )
+
+        # preview date
+        _, asof = _mmhm_load_latest()
+        if asof:
+            st.markdown(f"**Preview:** Markmentum Heatmap – {asof}")
+
+        st.caption("Note: Per-ticker category breakouts are intentionally excluded from the report pack.")
+        return {
+            "include_macro": include_macro,
+            "include_cat": include_cat,
+        }
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        blob = build_markmentum_heatmap_pdf(
+            include_macro_orientation=options.get("include_macro", True),
+            include_category_averages=options.get("include_cat", True),
+        )
+        return ([blob], "markmentum_heatmap")
+
+
+class PlaceholderModule(ReportModuleBase):
+    """Safe placeholder so you can turn on modules without breaking the packet builder."""
+    def __init__(self, key: str, label: str):
+        self.key = key
+        self.label = label
+
+    def ui(self) -> dict:
+        st.info(f"{self.label} module is not wired to PDF yet. (Placeholder)")
+        return {}
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        # returns no pdfs; packet builder will skip it
+        return ([], self.key)
+
+
+class DirectionalTrendsModule(ReportModuleBase):
+    key = "directional_trends"
+    label = "Directional Trends"
+
+    def ui(self) -> dict:
+        # No options: research pack includes Macro Orientation only.
+        st.caption("Macro Orientation only (no options)")
+
+        # preview date
+        _, asof = _dt_load_latest()
+        if asof:
+            st.markdown(f"**Preview:** Directional Trends – {asof}")
+
+        return {}
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        blob = build_directional_trends_pdf()
+        return ([blob], "directional_trends")
+
+
+class DeepDiveTearSheetModule(ReportModuleBase):
+    key = "deep_dive_tear_sheets"
+    label = "Deep Dive Tear Sheets"
+
+    def default_options(self) -> dict:
+        return {"tickers": [], "window": "6M", "detail": False}
+
+    def ui(self) -> dict:
+        directory = ts.ticker_directory()
+        names = dict(zip(directory["Ticker"], directory["Ticker_name"]))
+
+        left, right = st.columns([2, 1])
+        with left:
+            picked = st.multiselect(
+                "Watchlist",
+                list(names),
+                format_func=lambda t: f"{t} – {names.get(t, '')}",
+                max_selections=TSH_MAX_TICKERS,
+                key=f"{self.key}_tickers",
+            )
+            pasted = ts.parse_watchlist(st.text_area(
+                "Or paste tickers (comma / space / line separated)",
+                key=f"{self.key}_pasted",
+                height=80,
+            ))
+        with right:
+            window = st.selectbox("Chart range", ts.WINDOWS, index=ts.WINDOWS.index("6M"),
+                                  key=f"{self.key}_window")
+            detail = st.checkbox("Include detail page (4 more charts)", value=False,
+                                 key=f"{self.key}_detail")
+
+        unknown = [t for t in pasted if t not in names]
+        tickers = list(dict.fromkeys(picked + [t for t in pasted if t in names]))
+        if unknown:
+            st.caption("Not in the Deep Dive universe (skipped): " + ", ".join(unknown))
+        if len(tickers) > TSH_MAX_TICKERS:
+            st.caption(f"Watchlist trimmed to the first {TSH_MAX_TICKERS} tickers.")
+            tickers = tickers[:TSH_MAX_TICKERS]
+
+        pages = len(tickers) * (2 if detail else 1)
+        st.markdown(f"**Preview:** Deep Dive Tear Sheets – {len(tickers)} ticker(s), {pages} page(s)")
+        return {"tickers": tickers, "window": window, "detail": detail}
+
+    def parts(self, options: dict) -> list[dict]:
+        # one part per ticker: pages build in parallel, and each ticker's
+        # sheet is cached on its own, so overlapping watchlists share them
+        return [{**options, "tickers": [t]} for t in options.get("tickers", [])]
+
+    def build(self, options: dict) -> tuple[list[bytes], str]:
+        tickers = options.get("tickers", [])
+        blob = build_tear_sheet_pdf(
+            tickers,
+            window=options.get("window", "6M"),
+            detail=options.get("detail", False),
+        )
+        return ([blob] if blob else [], "deep_dive_" + "-".join(tickers).lower())
+
+
+REGISTERED_MODULES: list[ReportModuleBase] = [
+    MorningCompassModule(),
+    MarketOverviewModule(),
+    PerformanceHeatmapModule(),
+    SharpeRankHeatmapModule(),
+    MarkmentumHeatmapModule(),
+    DirectionalTrendsModule(),
+    DeepDiveTearSheetModule(),
+    #PlaceholderModule("vantage_point", "Vantage Point"),
+]
+
+MODULE_BY_KEY = {m.key: m for m in REGISTERED_MODULES}
+
+
+# =========================================================
+# PARALLEL BUILDS (process pool)
+# =========================================================
+# reportlab layout is pure-Python CPU work, so modules are built in worker
+# processes instead of one after another on the script thread.  The pool is
+# shared by every session on the server and bounded by MM_PACK_WORKERS, so
+# pack builds can't take over the whole machine.
+#
+# Workers are spawned (the server process is multi-threaded, so no fork).
+# A spawned child re-imports the parent's __main__, which under Streamlit is
+# whatever page script ran last; the pool is therefore started eagerly
+# (multiprocessing.Pool, not ProcessPoolExecutor's lazy spawning) while a
+# bare __main__ is swapped in.
+#
+# If a build times out waiting on the pool (a worker died or hung), the pool
+# is only torn down once no other build_parts() call is using it; until then
+# new builds run inline, and the calls still on the pool keep their results.
+import multiprocessing
+import queue
+import sys
+import threading
+import types
+from contextlib import contextmanager
+
+from utils import pack_cache
+
+COVER_KEY = "cover"
+PACK_WORKERS = max(1, int(os.environ.get("MM_PACK_WORKERS", min(4, os.cpu_count() or 1))))
+PACK_BUILD_TIMEOUT_S = float(os.environ.get("MM_PACK_BUILD_TIMEOUT_S", 300))
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_users = 0          # build_parts() calls with tasks on _pool
+_pool_stuck = False      # a build timed out on _pool; terminate it when the last user leaves
+
+
+@contextmanager
+def _bare_main():
+    saved = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = saved
+
+
+def _start_pool() -> None:
+    """Start the pool if there is none (call with _pool_lock held)."""
+    global _pool
+    if _pool is None:
+        with _bare_main():
+            _pool = multiprocessing.get_context("spawn").Pool(PACK_WORKERS)
+
+
+def warm_pool() -> None:
+    """Start the workers (non-blocking) so their imports overlap with the user picking options."""
+    if PACK_WORKERS > 1:
+        with _pool_lock:
+            if not _pool_stuck:
+                _start_pool()
+
+
+def _acquire_pool():
+    """The shared pool, counted as in use until _release_pool(); None while a stuck pool drains."""
+    global _pool_users
+    with _pool_lock:
+        if _pool_stuck:
+            return None
+        _start_pool()
+        _pool_users += 1
+        return _pool
+
+
+def _release_pool(stuck: bool) -> None:
+    """Done with the pool; stuck=True if a task never came back.  The last user out tears a stuck pool down."""
+    global _pool, _pool_users, _pool_stuck
+    with _pool_lock:
+        _pool_users -= 1
+        _pool_stuck = _pool_stuck or stuck
+        if _pool_stuck and _pool_users == 0:
+            if _pool is not None:
+                _pool.terminate()
+            _pool, _pool_stuck = None, False
+
+
+def module_label(key: str) -> str:
+    return "Cover Page" if key == COVER_KEY else MODULE_BY_KEY[key].label
+
+
+def build_part(key: str, options: dict) -> tuple[list[bytes], str]:
+    """Build one pack part: a registered module, or the cover page (COVER_KEY)."""
+    if key == COVER_KEY:
+        pdf = build_title_page_pdf(options.get("trading_session", ""), options.get("data_asof", ""))
+        return ([pdf], COVER_KEY)
+    return MODULE_BY_KEY[key].build(options)
+
+
+def pack_release_id() -> str:
+    """Cache release id: data/ fingerprint plus the PDF layout code (this file, frames, tables, charts)."""
+    rid = pack_cache.release_id(DATA_DIR, Path(__file__), Path(latest_frames.__file__),
+                                Path(rlt.__file__), Path(ts.__file__))
+    return rid if PACK_OPTIMIZE else f"{rid}-plain"
+
+
+def build_parts(parts: list[tuple[str, dict]], release: str | None = None,
+                on_done=None, parallel: bool = True) -> list[tuple[list[bytes], str]]:
+    """
+    Build [(key, options), ...] and return [(pdfs_in_order, filename_stub), ...]
+    in the same order.  Cached parts are served from pack_cache; misses run on
+    the process pool (or inline if parallel=False / one worker / the pool is
+    stuck) and are written back.  on_done(key, n_done, n_total) is called
+    from the calling thread as each part finishes.
+    """
+    release = release or pack_release_id()
+    results: list[tuple[list[bytes], str] | None] = [None] * len(parts)
+    done = 0
+
+    def _finish(i: int, res: tuple[list[bytes], str]) -> None:
+        nonlocal done
+        key, options = parts[i]
+        results[i] = res
+        if res[0]:
+            pack_cache.put(release, key, options, *res)
+        done += 1
+        if on_done:
+            on_done(key, done, len(parts))
+
+    misses = []
+    for i, (key, options) in enumerate(parts):
+        hit = pack_cache.get(release, key, options)
+        if hit is not None:
+            _finish(i, hit)
+        else:
+            misses.append(i)
+
+    pool = _acquire_pool() if parallel and PACK_WORKERS > 1 and len(misses) > 1 else None
+    if pool is not None:
+        finished: queue.Queue = queue.Queue()
+        stuck = False
+        try:
+            for i in misses:
+                pool.apply_async(
+                    build_part, parts[i],
+                    callback=lambda res, i=i: finished.put((i, res, None)),
+                    error_callback=lambda exc, i=i: finished.put((i, None, exc)),
+                )
+            for _ in range(len(misses)):
+                i, res, exc = finished.get(timeout=PACK_BUILD_TIMEOUT_S)
+                if exc is not None:
+                    raise exc
+                _finish(i, res)
+        except queue.Empty:
+            stuck = True    # a worker died or hung (e.g. OOM-killed); build the rest inline
+        finally:
+            _release_pool(stuck)
+        misses = [i for i in misses if results[i] is None]
+
+    for i in misses:
+        _finish(i, build_part(*parts[i]))
+
+    return results
+
+
+# =========================================================
+# WHOLE PACK (cover + modules, merged)
+# =========================================================
+def pack_parts(selected: list[tuple[str, dict]]) -> list[tuple[str, dict]]:
+    """Cover page (dated from the Daily release) followed by the selected (key, options), split into module parts."""
+    trading_session, data_asof = pack_session_dates()
+    return [(COVER_KEY, {"trading_session": trading_session, "data_asof": data_asof})] + [
+        (key, part) for key, options in selected for part in MODULE_BY_KEY[key].parts(options)
+    ]
+
+
+def pack_filename(parts: list[tuple[str, dict]]) -> str:
+    trading_session = parts[0][1].get("trading_session", "") if parts and parts[0][0] == COVER_KEY else ""
+    date_slug = trading_session.replace("/", "-") if trading_session else "report"
+    return f"Markmentum Research Pack - {date_slug}.pdf"
+
+
+def build_pack(parts: list[tuple[str, dict]], out, release: str | None = None,
+               on_done=None, parallel: bool = True) -> bool:
+    """
+    Build pack_parts() output and stream the merged PDF into `out`.
+    Returns False (nothing written) if no module produced a PDF.
+    """
+    results = build_parts(parts, release=release, on_done=on_done, parallel=parallel)
+    cover = [blob for blobs, _ in results[:1] for blob in blobs]
+    modules = [blob for blobs, _ in results[1:] for blob in blobs]
+    if not modules:
+        return False
+    # Always prepend cover page; merge into one PDF (cover + content)
+    write_pdfs_in_order(cover + modules, out)
+    return True
@@ -0,0 +1,146 @@
+# utils/rl_tables.py
+#
+# Vectorized cell shading for the Research Pack's ReportLab tables.
+#
+# The PDF tables used to walk rows with iterrows() / df.iloc, run each cell
+# through pd.to_numeric and a per-cell color function, and add one
+# BACKGROUND command per cell (the Morning Compass tables even called
+# setStyle() once per cell).  Here a whole column is converted once, colors
+# are computed as an (n, 3) RGB array with the same arithmetic as the old
+# per-cell helpers (so the tints are identical), and adjacent cells with the
+# same color are merged into a single BACKGROUND command.
+#
+# Column formatting reuses the vectorized formatters in utils/html_tables.py.
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+
+from utils.html_tables import _values
+
+GREEN = (16, 185, 129)
+RED   = (239, 68, 68)
+GRAY  = (156, 163, 175)
+WHITE = (1.0, 1.0, 1.0)
+
+
+# -------------------------
+# Columns
+# -------------------------
+def parse_display(col) -> np.ndarray:
+    """Formatted labels ("1,234.5") back to floats; "" / junk -> NaN."""
+    s = pd.Series(col, copy=False).astype(str).str.replace(",", "", regex=False)
+    return pd.to_numeric(s, errors="coerce").to_numpy(dtype=float)
+
+
+def fmt_int_plain(col) -> list[str]:
+    """Rounded integers without separators, "0" instead of "-0"; NaN -> ""."""
+    v = np.rint(_values(col)) + 0.0
+    return ["" if x != x else str(int(x)) for x in v.tolist()]
+
+
+def fmt_pct_auto(col, nd: int = 2) -> list[str]:
+    """Percent labels from fractions (|v| <= 2 -> x100) or already-percent values."""
+    v = _values(col)
+    v = np.where(np.abs(v) <= 2.0, v * 100.0, v)
+    spec = f".{nd}f"
+    return ["" if x != x else f"{x:{spec}}%" for x in v.tolist()]
+
+
+def rows(*cols) -> list[list]:
+    """Column lists -> row lists for Table()."""
+    return [list(r) for r in zip(*cols)]
+
+
+# -------------------------
+# Colors (n, 3) arrays; NaN rows = no BACKGROUND command
+# -------------------------
+def _blend(rgb_255, alpha: np.ndarray) -> np.ndarray:
+    """CSS rgba(rgb, alpha) over white, as _blend_with_white() does per cell."""
+    a = np.clip(alpha, 0.0, 1.0)[:, None]
+    c = np.array([x / 255.0 for x in rgb_255])
+    return 1.0 * (1.0 - a) + c * a
+
+
+def _pick(n: int, *choices) -> np.ndarray:
+    """Stack (mask, rgb) choices into one (n, 3) array; unmatched rows are NaN."""
+    out = np.full((n, 3), np.nan)
+    for mask, rgb in choices:
+        out[mask] = rgb[mask] if np.ndim(rgb) == 2 else rgb
+    return out
+
+
+def delta_rgb(col, vmax) -> np.ndarray:
+    """_sr_delta_bg: green/red, alpha 0.05 + 0.14 * min(|v| / vmax, 1); none for 0 / NaN."""
+    v = _values(col)
+    if vmax is None or pd.isna(vmax) or float(vmax) <= 0:
+        return np.full((len(v), 3), np.nan)
+    alpha = 0.05 + 0.14 * np.minimum(np.abs(v) / float(vmax), 1.0)
+    return _pick(len(v), (v > 0, _blend(GREEN, alpha)), (v < 0, _blend(RED, alpha)))
+
+
+def delta_rgb_or_white(col, vmax) -> np.ndarray:
+    """_ph_interp_color: delta tint, white where there is none."""
+    out = delta_rgb(col, vmax)
+    out[np.isnan(out[:, 0])] = WHITE
+    return out
+
+
+def rank_rgb(col, cap: float = 100.0) -> np.ndarray:
+    """_sr_rank_bg: >=70 green, <=30 red (stronger toward the ends), gray between; none for NaN."""
+    s = np.clip(_values(col), 0.0, float(cap))
+    a_up = 0.05 + 0.14 * np.clip((s - 70.0) / 30.0, 0.0, 1.0)
+    a_dn = 0.05 + 0.14 * np.clip((30.0 - s) / 30.0, 0.0, 1.0)
+    ok = ~np.isnan(s)
+    gray = _blend(GRAY, np.full(len(s), 0.08))
+    return _pick(len(s), (ok, gray), (ok & (s >= 70.0), _blend(GREEN, a_up)),
+                 (ok & (s <= 30.0), _blend(RED, a_dn)))
+
+
+def rr_rgb(col, cap: float = 3.0) -> np.ndarray:
+    """_rr_bg_color: green/red, alpha 0.05 + 0.14 * min(|v| / cap, 1); white for 0, none for NaN."""
+    v = _values(col)
+    alpha = 0.05 + 0.14 * np.minimum(np.abs(v) / float(cap), 1.0)
+    return _pick(len(v), (v == 0, np.array(WHITE)),
+                 (v > 0, _blend(GREEN, alpha)), (v < 0, _blend(RED, alpha)))
+
+
+def mm_rgb(col, cap: float = 150.0) -> np.ndarray:
+    """_mm_bg_color: gray inside +/-25, green/red beyond (alpha 0.08 .. 0.26); none for NaN."""
+    v = np.clip(_values(col), -float(cap), float(cap))
+    band = 25.0
+    s = np.clip((np.abs(v) - band) / (float(cap) - band), 0.0, 1.0)
+    alpha = 0.08 + 0.18 * s
+    neutral = (v >= -band) & (v <= band)
+    return _pick(len(v), (neutral, _blend(GRAY, np.full(len(v), 0.10))),
+                 (~neutral & (v > 0), _blend(GREEN, alpha)),
+                 (~neutral & (v < 0), _blend(RED, alpha)))
+
+
+# -------------------------
+# Style commands
+# -------------------------
+def background_runs(j: int, rgb: np.ndarray, row0: int = 1) -> list[tuple]:
+    """
+    BACKGROUND commands for column j (data starting at table row `row0`),
+    one per run of vertically adjacent cells with the same color.
+    """
+    n = len(rgb)
+    if n == 0:
+        return []
+    missing = np.isnan(rgb[:, 0])
+    same = np.zeros(n, dtype=bool)
+    same[1:] = (np.all(rgb[1:] == rgb[:-1], axis=1)) | (missing[1:] & missing[:-1])
+    starts = np.flatnonzero(~same)
+    ends = np.append(starts[1:], n) - 1
+    cache: dict[tuple, colors.Color] = {}
+    cmds = []
+    for a, b in zip(starts.tolist(), ends.tolist()):
+        if missing[a]:
+            continue
+        key = tuple(rgb[a].tolist())
+        c = cache.get(key)
+        if c is None:
+            c = cache[key] = colors.Color(*key)
+        cmds.append(("BACKGROUND", (j, row0 + a), (j, row0 + b), c))
+    return cmds
@@ -0,0 +1,205 @@
+# utils/screener.py
+#
+# Query engine for the Signal Screener over signal_box.csv (one row per
+# ticker: returns, Sharpe Rank and MM Score levels / changes, trends,
+# Tape_Bias, Volatility_Spread_Quadrant).
+#
+# Everything a query needs is precomputed once per data release:
+#   - per numeric column, the row order sorted by value (NaN last), so a
+#     range filter is two np.searchsorted calls and a slice of row ids;
+#   - per categorical column (Category, Tape_Bias, quadrant), one packed
+#     bitmap per value, so "any of these values" is a bitwise OR;
+#   - per column, ascending / descending row orders for sorting.
+# A query ANDs the packed bitmaps of its filters, unpacks once and walks the
+# chosen sort order, so it costs a few vector ops over n bits regardless of
+# how many filters are combined.
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR  = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+
+SIGNAL_BOX = DATA_DIR / "signal_box.csv"
+
+# column -> (label, kind); "pct" values are fractions shown as percent, "int" whole numbers
+NUMERIC = {
+    "Close":                      ("Close", "num"),
+    "day_pct_change":             ("% Daily", "pct"),
+    "week_pct_change":            ("% WTD", "pct"),
+    "month_pct_change":           ("% MTD", "pct"),
+    "quarter_pct_change":         ("% QTD", "pct"),
+    "Sharpe_Rank":                ("Sharpe Rank", "num"),
+    "Sharpe_Rank_daily_change":   ("Sharpe Rank Δ Daily", "num"),
+    "Sharpe_Rank_wtd_change":     ("Sharpe Rank Δ WTD", "num"),
+    "Sharpe_Rank_mtd_change":     ("Sharpe Rank Δ MTD", "num"),
+    "Sharpe_Rank_qtd_change":     ("Sharpe Rank Δ QTD", "num"),
+    "MM_Score":                   ("MM Score", "int"),
+    "MM_Score_daily_change":      ("MM Score Δ Daily", "int"),
+    "MM_Score_wtd_change":        ("MM Score Δ WTD", "int"),
+    "MM_Score_mtd_change":        ("MM Score Δ MTD", "int"),
+    "MM_Score_qtd_change":        ("MM Score Δ QTD", "int"),
+    "st_trend":                   ("ST Trend", "pct"),
+    "mt_trend":                   ("MT Trend", "pct"),
+    "lt_trend":                   ("LT Trend", "pct"),
+    "st_trend_change":            ("ST Trend Δ", "pct"),
+    "mt_trend_change":            ("MT Trend Δ", "pct"),
+    "lt_trend_change":            ("LT Trend Δ", "pct"),
+}
+CATEGORICAL = {
+    "Category":                   "Category",
+    "Tape_Bias":                  "Tape Bias",
+    "Volatility_Spread_Quadrant": "Volatility Spread Quadrant",
+}
+TEXT = {
+    "Ticker":      "Ticker",
+    "Ticker_name": "Name",
+}
+
+
+@dataclass(frozen=True)
+class Range:
+    """lo <= column <= hi (either bound may be None); NaN never matches."""
+    column: str
+    lo: float | None = None
+    hi: float | None = None
+
+
+@dataclass(frozen=True)
+class OneOf:
+    """column value is any of `values` (empty = no constraint)."""
+    column: str
+    values: tuple
+
+
+class SignalScreener:
+    """Indexes over one signal_box frame; query() returns matching rows, sorted."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.reset_index(drop=True)
+        self.n = len(self.df)
+        self.asof = ""
+        if "Date" in self.df.columns:
+            d = pd.to_datetime(self.df["Date"], errors="coerce").max()
+            self.asof = f"{d.month}/{d.day}/{d.year}" if pd.notna(d) else ""
+
+        # ties broken by ticker; integer ranks keep the lexsorts numeric
+        tickers = (pd.factorize(self.df["Ticker"].astype(str), sort=True)[0]
+                   if "Ticker" in self.df.columns else np.arange(self.n))
+
+        # numeric: values sorted (NaN excluded) + the row ids in that order
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self.numeric = [c for c in NUMERIC if c in self.df.columns]
+        for c in self.numeric:
+            v = pd.to_numeric(self.df[c], errors="coerce").to_numpy(dtype=float)
+            self.df[c] = v
+            ok = np.flatnonzero(~np.isnan(v))
+            order = ok[np.lexsort((tickers[ok], v[ok]))]
+            self._sorted[c] = (v[order], order)
+
+        # categorical: packed bitmap per value
+        self._bitmaps: dict[str, dict[str, np.ndarray]] = {}
+        self.categorical = [c for c in CATEGORICAL if c in self.df.columns]
+        for c in self.categorical:
+            codes, uniques = pd.factorize(self.df[c], sort=True)
+            self._bitmaps[c] = {str(u): np.packbits(codes == i) for i, u in enumerate(uniques)}
+
+        # sort orders for every column (NaN / blank last in both directions)
+        self._orders: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for c in self.numeric:
+            _, order = self._sorted[c]
+            missing = np.setdiff1d(np.arange(self.n), order, assume_unique=True)
+            v = self.df[c].to_numpy()
+            desc = order[np.lexsort((tickers[order], -v[order]))]
+            self._orders[c] = (np.concatenate([order, missing]), np.concatenate([desc, missing]))
+        for c in self.categorical + [c for c in TEXT if c in self.df.columns]:
+            s = self.df[c].fillna("").astype(str)
+            rank = pd.factorize(s, sort=True)[0]
+            blank = (s == "").to_numpy()
+            asc = np.lexsort((tickers, rank, blank))
+            desc = np.lexsort((tickers, -rank, blank))
+            self._orders[c] = (asc, desc)
+
+        self._all = np.packbits(np.ones(self.n, dtype=bool))
+
+    # -------------------------
+    # Introspection for the UI
+    # -------------------------
+    def values(self, column: str) -> list[str]:
+        """Distinct values of a categorical column, sorted."""
+        return list(self._bitmaps.get(column, {}))
+
+    def bounds(self, column: str) -> tuple[float, float] | None:
+        """(min, max) of a numeric column, or None if it has no values."""
+        v, _ = self._sorted.get(column, (np.array([]), None))
+        return (float(v[0]), float(v[-1])) if len(v) else None
+
+    # -------------------------
+    # Query
+    # -------------------------
+    def _range_bits(self, f: Range) -> np.ndarray:
+        v, order = self._sorted[f.column]
+        lo = 0 if f.lo is None else np.searchsorted(v, f.lo, side="left")
+        hi = len(v) if f.hi is None else np.searchsorted(v, f.hi, side="right")
+        hit = np.zeros(self.n, dtype=bool)
+        hit[order[lo:hi]] = True
+        return np.packbits(hit)
+
+    def _one_of_bits(self, f: OneOf) -> np.ndarray:
+        maps = self._bitmaps[f.column]
+        bits = np.zeros_like(self._all)
+        for value in f.values:
+            m = maps.get(str(value))
+            if m is not None:
+                bits |= m
+        return bits
+
+    def mask(self, filters) -> np.ndarray:
+        """Boolean row mask for the AND of all filters."""
+        bits = self._all.copy()
+        for f in filters:
+            if isinstance(f, Range):
+                if f.column in self._sorted and (f.lo is not None or f.hi is not None):
+                    bits &= self._range_bits(f)
+            elif isinstance(f, OneOf):
+                if f.column in self._bitmaps and f.values:
+                    bits &= self._one_of_bits(f)
+            else:
+                raise TypeError(f"unsupported filter: {f!r}")
+        return np.unpackbits(bits, count=self.n).astype(bool)
+
+    def query(self, filters=(), sort_by: str | None = None, descending: bool = True,
+              limit: int | None = None) -> tuple[pd.DataFrame, int]:
+        """(matching rows in sort order, limited; total match count)."""
+        m = self.mask(filters)
+        if sort_by in self._orders:
+            order = self._orders[sort_by][1 if descending else 0]
+            idx = order[m[order]]
+        else:
+            idx = np.flatnonzero(m)
+        total = len(idx)
+        if limit is not None:
+            idx = idx[:limit]
+        return self.df.iloc[idx], total
+
+
+# -------------------------
+# One screener per data release
+# -------------------------
+@lru_cache(maxsize=2)
+def _screener(path: str, mtime_ns: int) -> SignalScreener:
+    df = pd.read_csv(path)
+    if "Ticker" not in df.columns:
+        df = pd.DataFrame(columns=["Ticker"])
+    return SignalScreener(df)
+
+
+def signal_screener() -> SignalScreener:
+    """The screener for the current signal_box.csv (rebuilt when the file changes)."""
+    if not SIGNAL_BOX.exists():
+        return SignalScreener(pd.DataFrame(columns=["Ticker"]))
+    return _screener(str(SIGNAL_BOX), SIGNAL_BOX.stat().st_mtime_ns)
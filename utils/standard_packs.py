@@ -0,0 +1,72 @@
+# utils/standard_packs.py
+#
+# Pre-built standard Research Packs.
+#
+# Most members download the same packs (Morning Compass Daily, or every
+# module with default options), so these are built once per data release
+# and stored where pack_jobs looks for finished packs.  A default Generate
+# click then finds the job already done and the download is instant.
+#
+# Runs headless (no Streamlit runtime needed), from the release pipeline
+# after the data drop:
+#
+#   python -m utils.standard_packs [--pack all_modules] [--force] [--serial]
+#
+# and prints per-pack timings, so it doubles as a quick benchmark.  The
+# Research Pack page also queues them in the background (ensure_built())
+# the first time it is opened on a new release.
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from utils import pack_jobs  # noqa: E402
+from utils.research_pack import MODULE_BY_KEY, REGISTERED_MODULES, pack_parts, pack_release_id  # noqa: E402
+
+STANDARD_PACKS: dict[str, list[str]] = {
+    "morning_compass_daily": ["morning_compass"],
+    "all_modules": [m.key for m in REGISTERED_MODULES],
+}
+
+
+def standard_parts(name: str) -> list:
+    """pack_parts() for a standard pack: its modules with their default options, page order."""
+    return pack_parts([(key, MODULE_BY_KEY[key].default_options()) for key in STANDARD_PACKS[name]])
+
+
+def ensure_built(release: str | None = None) -> list[pack_jobs.PackJob]:
+    """Queue every standard pack as a background job (no-op for ones already built)."""
+    release = release or pack_release_id()
+    return [pack_jobs.submit(standard_parts(name), release=release) for name in STANDARD_PACKS]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build the standard Research Packs for the current data release.")
+    ap.add_argument("--pack", action="append", choices=sorted(STANDARD_PACKS),
+                    help="pack to build (repeatable; default: all)")
+    ap.add_argument("--force", action="store_true", help="rebuild even if already built for this release")
+    ap.add_argument("--serial", action="store_true", help="build modules inline instead of on the process pool")
+    args = ap.parse_args(argv)
+
+    release = pack_release_id()
+    print(f"release {release}")
+    failed = 0
+    for name in args.pack or list(STANDARD_PACKS):
+        t0 = time.perf_counter()
+        job = pack_jobs.build_now(standard_parts(name), release=release,
+                                  force=args.force, parallel=not args.serial)
+        dt = time.perf_counter() - t0
+        print(f"{name:24s} {job.status:7s} {dt:7.2f} s {job.size:>10,d} B  {job.path}")
+        if job.status == pack_jobs.FAILED:
+            print(f"  {job.error}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
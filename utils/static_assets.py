@@ -0,0 +1,170 @@
+# utils/static_assets.py
+#
+# Page assets (logo, documents, shared CSS) without re-encoding them on every rerun.
+#
+# Images (and downloadable documents) are copied once per process into
+# ./static under a content-hashed name and referenced by URL (Streamlit
+# serves ./static at app/static when server.enableStaticServing is on).
+# Reruns then resend a short <img src> instead of ~23 KB of base64, and the
+# browser keeps its cached copy until the file (and therefore its name)
+# changes.  If static serving is off or ./static is not writable we fall
+# back to a data: URI, built once per process (static_url() has no
+# fallback; it is meant for files too large to inline).
+#
+# Files are hashed and copied in chunks, never held in memory whole.  The
+# static route has no session check: anything published here can be
+# fetched by whoever has the link, logged in or not, so it is only for
+# page assets.  Member data (the Downloads exports) stays behind the page
+# gate and goes out through st.download_button; unpublish() removes copies
+# an earlier version published here.
+#
+# Shared CSS lives in assets/css/<name>.css and is read once per process.
+# Streamlit serves unknown static types as text/plain + nosniff, so the
+# browser would refuse a <link rel="stylesheet">; CSS therefore still goes
+# out as a <style> block, just without re-reading / re-building it per run.
+
+import base64
+import glob
+import hashlib
+import mimetypes
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+
+import streamlit as st
+
+APP_DIR    = Path(__file__).resolve().parent.parent
+STATIC_DIR = APP_DIR / "static"
+CSS_DIR    = APP_DIR / "assets" / "css"
+STATIC_URL = "./app/static"
+
+
+def _mtime(p: Path) -> int:
+    return p.stat().st_mtime_ns
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _static_serving() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+# -------------------------
+# Images / files
+# -------------------------
+def _publish(data: bytes, stem: str, suffix: str) -> str | None:
+    """Write `data` to ./static/<stem>.<hash><suffix> (once) and return its URL."""
+    name = f"{stem}.{_digest(data)}{suffix}"
+    dst = STATIC_DIR / name
+    try:
+        if not dst.exists():
+            STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = STATIC_DIR / f".{name}.{os.getpid()}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, dst)   # atomic: concurrent sessions never see a partial file
+    except OSError:
+        return None
+    return f"{STATIC_URL}/{quote(name)}"
+
+
+def _file_digest(src: Path) -> str:
+    with open(src, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()[:10]
+
+
+def _prune(stem: str, suffix: str, keep: str = "") -> None:
+    """Remove published versions of <stem><suffix> other than `keep` (best effort)."""
+    for old in STATIC_DIR.glob(f"{glob.escape(stem)}.*{glob.escape(suffix)}"):
+        rest = old.name[len(stem) + 1:len(old.name) - len(suffix)]
+        if old.name != keep and len(rest) == 10 and "." not in rest:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=64)
+def _published_url(path: str, mtime_ns: int) -> str | None:
+    """Copy a file to ./static/<stem>.<hash><suffix> (streamed, once) and return its URL."""
+    src = Path(path)
+    try:
+        name = f"{src.stem}.{_file_digest(src)}{src.suffix}"
+        dst = STATIC_DIR / name
+        if not dst.exists():
+            STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = STATIC_DIR / f".{name}.{os.getpid()}.tmp"
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+    except OSError:
+        return None
+    return f"{STATIC_URL}/{quote(name)}"
+
+
+def _encode(data: bytes, mime: str) -> str:
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+@lru_cache(maxsize=64)
+def _data_uri(path: str, mtime_ns: int) -> str:
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return _encode(Path(path).read_bytes(), mime)
+
+
+def static_url(path: Path | str) -> str | None:
+    """
+    Hashed static URL for a file, or None when static serving is off / ./static
+    is not writable.  For large files where a data: URI is not an option.
+    """
+    if not _static_serving():
+        return None
+    p = Path(path)
+    return _published_url(str(p), _mtime(p))
+
+
+def unpublish(name: str) -> None:
+    """Remove every published (hashed) copy of a file name from ./static."""
+    stem, suffix = os.path.splitext(name)
+    _prune(stem, suffix)
+
+
+def asset_url(path: Path | str) -> str:
+    """
+    src/href for an asset: hashed static URL when static serving is enabled,
+    otherwise a (process-memoized) data: URI.  Keyed on mtime, so replacing
+    the file on disk is picked up without a restart.
+    """
+    p = Path(path)
+    return static_url(p) or _data_uri(str(p), _mtime(p))
+
+
+def bytes_url(data: bytes, name: str) -> str:
+    """Like asset_url() for in-memory content (e.g. images pulled out of a .docx)."""
+    stem, suffix = os.path.splitext(name)
+    url = _publish(data, stem, suffix) if _static_serving() else None
+    return url or _encode(data, mimetypes.guess_type(name)[0] or "application/octet-stream")
+
+
+# -------------------------
+# Shared CSS
+# -------------------------
+@lru_cache(maxsize=32)
+def _css_text(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def css(name: str) -> str:
+    """Contents of assets/css/<name>.css (read once per process)."""
+    p = CSS_DIR / f"{name}.css"
+    return _css_text(str(p), _mtime(p))
+
+
+def stylesheet(name: str) -> str:
+    """<style> block for assets/css/<name>.css, ready for st.markdown(unsafe_allow_html=True)."""
+    return f"<style>\n{css(name)}</style>"
@@ -0,0 +1,274 @@
+# utils/tear_sheet.py
+#
+# Deep Dive series and chart images for the Research Pack tear sheets.
+#
+# The Deep Dive page loads each graph for one ticker by scanning its whole
+# CSV in chunks (load_gN_ticker), which is fine interactively but means a
+# full scan of every graph file per name for a watchlist.  Here each graph
+# file is read once per process and split by ticker (series()), and each
+# chart is rendered once per (release, ticker, chart, window) to a PNG under
+# the pack cache (chart_png()), so later packs reuse the images instead of
+# re-plotting them.
+#
+# Charts mirror the Deep Dive plotters (same series, colors, bands and
+# titles), drawn on a bare matplotlib Figure (no pyplot state, safe in pool
+# workers and threads) at the size they are placed on the page.
+
+import io
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import pack_cache
+
+APP_DIR  = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+
+FILE_STATS = DATA_DIR / "qry_graph_data_25.csv"   # stat box (latest row per ticker)
+
+EXCEL_BLUE   = "#4472C4"
+EXCEL_ORANGE = "#FFC000"
+
+WINDOWS = ["3M", "6M", "YTD", "1Y", "All"]
+
+# Chart size on the page (points); images are rendered at CHART_DPI for print.
+CHART_W_PT = 352
+CHART_H_PT = 172
+CHART_DPI  = 144
+
+# key -> Deep Dive graph: source file, {canonical column: accepted names}, plot kind.
+# "pct" series are scaled to percent when they come in as fractions (as the page does).
+CHARTS = {
+    "anchors": {
+        "file": "qry_graph_data_03.csv", "title": "Probable Anchors", "kind": "lines",
+        "cols": {"close": ["close"], "mt": ["mt_pb_anchor"], "lt": ["lt_pb_anchor"]},
+        "labels": {"close": "Close", "mt": "Mid Term Probable Anchor", "lt": "Long Term Probable Anchor"},
+        "yfmt": "{x:,.0f}",
+    },
+    "zscore": {
+        "file": "qry_graph_data_05.csv", "title": "30-Day Rvol Z-Score", "kind": "bands",
+        "cols": {"value": ["z-score", "zscore"], "avg": ["z-score_avg", "zscore_avg"],
+                 "hi": ["z-score_hi", "zscore_hi"], "lo": ["z-score_lo", "zscore_lo"]},
+        "yfmt": "{x:,.2f}",
+    },
+    "zscore_rank": {
+        "file": "qry_graph_data_06.csv", "title": "Z-Score Percentile Rank", "kind": "rank",
+        "cols": {"value": ["z-score rank", "zscore rank", "zscore_rank", "z_rank", "rank"]},
+    },
+    "sharpe": {
+        "file": "qry_graph_data_08.csv", "title": "30-Day Sharpe Ratio", "kind": "bands",
+        "cols": {"value": ["sharpe_ratio", "sharpe"], "avg": ["sharpe_avg"],
+                 "hi": ["sharpe_hi"], "lo": ["sharpe_lo", "sharpe_low"]},
+        "yfmt": "{x:,.2f}",
+    },
+    "sharpe_rank": {
+        "file": "qry_graph_data_09.csv", "title": "Sharpe Ratio Percentile Rank", "kind": "rank",
+        "cols": {"value": ["sharpe_rank", "sharpe percentile", "percentile", "rank"]},
+    },
+    "weekly_returns": {
+        "file": "qry_graph_data_16.csv", "title": "Weekly Returns", "kind": "bars", "pct": True,
+        "cols": {"value": ["weekly_return_pct"], "avg": ["weekly_return_avg_pct"],
+                 "hi": ["weekly_return_hi_pct"], "lo": ["weekly_return_lo_pct"]},
+    },
+    "mt_trend": {
+        "file": "qry_graph_data_23.csv", "title": "Mid Term Trend Line", "kind": "bands", "pct": True,
+        "cols": {"value": ["mt_trend"], "avg": ["mt_avg"], "hi": ["mt_hi"], "lo": ["mt_lo"]},
+    },
+    "lt_trend": {
+        "file": "qry_graph_data_24.csv", "title": "Long Term Trend Line", "kind": "bands", "pct": True,
+        "cols": {"value": ["lt_trend"], "avg": ["lt_avg"], "hi": ["lt_hi"], "lo": ["lt_lo"]},
+    },
+}
+
+# Tear sheet layout: page 1 sits under the stat box, page 2 is the optional detail page.
+SUMMARY_CHARTS = ["anchors", "lt_trend", "zscore_rank", "sharpe_rank"]
+DETAIL_CHARTS  = ["zscore", "sharpe", "weekly_returns", "mt_trend"]
+
+
+# -------------------------
+# Series (one read per file per process)
+# -------------------------
+def _mtime(p: Path) -> int:
+    return p.stat().st_mtime_ns
+
+
+@lru_cache(maxsize=len(CHARTS) + 1)
+def _frames_by_ticker(path: str, mtime_ns: int) -> dict[str, pd.DataFrame]:
+    df = pd.read_csv(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns:
+        return {}
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df = df.sort_values(["ticker", "date"], kind="stable")
+    return {str(t).upper(): g.reset_index(drop=True) for t, g in df.groupby("ticker", sort=False)}
+
+
+def series(chart: str, ticker: str) -> pd.DataFrame:
+    """The Deep Dive series for one chart and ticker, columns renamed to CHARTS[chart]["cols"]; empty if missing."""
+    spec = CHARTS[chart]
+    p = DATA_DIR / spec["file"]
+    if not p.exists():
+        return pd.DataFrame()
+    df = _frames_by_ticker(str(p), _mtime(p)).get(ticker.upper())
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    out = pd.DataFrame({"date": df["date"]})
+    for canon, names in spec["cols"].items():
+        src = next((n for n in names if n in df.columns), None)
+        if src is None:
+            return pd.DataFrame()
+        out[canon] = pd.to_numeric(df[src], errors="coerce")
+
+    values = out.drop(columns="date")
+    if spec["kind"] == "rank" or spec.get("pct"):
+        mx = values.abs().max().max()
+        if pd.notna(mx) and mx <= 1.0:
+            out[values.columns] = values * 100.0
+    return out.dropna(subset=["date"])
+
+
+def apply_window(df: pd.DataFrame, window: str, gutter_days: int = 5) -> pd.DataFrame:
+    """Deep Dive range selector (3M / 6M / YTD / 1Y / All) with the page's 5-day gutter."""
+    if df.empty or window == "All":
+        return df
+    end = df["date"].max()
+    if window == "3M":
+        start = end - pd.DateOffset(months=3)
+    elif window == "6M":
+        start = end - pd.DateOffset(months=6)
+    elif window == "YTD":
+        start = pd.Timestamp(end.year, 1, 1)
+    elif window == "1Y":
+        start = end - pd.DateOffset(years=1)
+    else:
+        return df
+    return df[df["date"] >= start - pd.Timedelta(days=gutter_days)]
+
+
+@lru_cache(maxsize=2)
+def _stats(path: str, mtime_ns: int) -> dict[str, dict]:
+    df = pd.read_csv(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    df["_dt"] = pd.to_datetime(df.get("date"), errors="coerce")
+    df = df.sort_values("_dt").drop_duplicates("ticker", keep="last")
+    return {str(r["ticker"]).upper(): r for r in df.to_dict("records")}
+
+
+def stat_row(ticker: str) -> dict | None:
+    """Latest stat box row (lower-cased qry_graph_data_25 columns) for a ticker."""
+    if not FILE_STATS.exists():
+        return None
+    return _stats(str(FILE_STATS), _mtime(FILE_STATS)).get(ticker.upper())
+
+
+def ticker_directory() -> pd.DataFrame:
+    """Ticker, Ticker_name, Category for the watchlist picker (stat box universe)."""
+    if not FILE_STATS.exists():
+        return pd.DataFrame(columns=["Ticker", "Ticker_name", "Category"])
+    rows = _stats(str(FILE_STATS), _mtime(FILE_STATS)).values()
+    df = pd.DataFrame([{"Ticker": r["ticker"], "Ticker_name": r.get("ticker_name", ""),
+                        "Category": r.get("category", "")} for r in rows])
+    return df.sort_values("Ticker").reset_index(drop=True)
+
+
+def parse_watchlist(text: str) -> list[str]:
+    """Tickers pasted as comma / space / newline separated text: upper-cased, order kept, no duplicates."""
+    return list(dict.fromkeys(t.upper() for t in re.split(r"[\s,;]+", text or "") if t))
+
+
+# -------------------------
+# Charts
+# -------------------------
+def _render(chart: str, ticker: str, df: pd.DataFrame) -> bytes:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import PercentFormatter, StrMethodFormatter
+
+    spec = CHARTS[chart]
+    kind = spec["kind"]
+    with matplotlib.rc_context({
+        "font.family": ["sans-serif"],
+        "font.sans-serif": ["Segoe UI", "Arial", "Helvetica", "DejaVu Sans", "Liberation Sans", "sans-serif"],
+    }):
+        fig = Figure(figsize=(CHART_W_PT / 72, CHART_H_PT / 72), dpi=CHART_DPI)
+        ax = fig.add_subplot()
+
+        if kind == "lines":
+            for col, color in zip(spec["labels"], (EXCEL_BLUE, EXCEL_ORANGE, "black")):
+                ax.plot(df["date"], df[col], color=color, linewidth=1.1, label=spec["labels"][col])
+        elif kind == "bars":
+            v = df["value"].to_numpy()
+            ax.bar(df["date"], v, width=5.0, linewidth=0, color=np.where(v >= 0, "green", "red"))
+        else:
+            ax.plot(df["date"], df["value"], color=EXCEL_BLUE, linewidth=1.1, label=spec["title"])
+
+        if kind in ("bands", "bars"):
+            ax.axhline(y=df["avg"].iloc[0], color="black", linewidth=1.0, label="Avg")
+            ax.axhline(y=df["hi"].iloc[0],  color="red",   linewidth=0.9, label="High")
+            ax.axhline(y=df["lo"].iloc[0],  color="green", linewidth=0.9, label="Low")
+
+        ax.text(0.5, 0.5, "Markmentum", transform=ax.transAxes, ha="center", va="center",
+                rotation=30, color="gray", alpha=0.12, fontsize=22, zorder=0, clip_on=True)
+
+        ax.set_title(f"{ticker} – {spec['title']}", fontsize=8, pad=4)
+        if kind == "rank":
+            ax.set_ylim(0, 100)
+        elif spec.get("pct"):
+            ax.yaxis.set_major_formatter(PercentFormatter(xmax=100))
+        elif spec.get("yfmt"):
+            ax.yaxis.set_major_formatter(StrMethodFormatter(spec["yfmt"]))
+        ax.grid(True, linewidth=0.3, alpha=0.4)
+        ax.tick_params(labelsize=5.5, length=2, pad=1.5)
+
+        locator = mdates.AutoDateLocator(minticks=4, maxticks=10)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d/%y"))
+        for label in ax.get_xticklabels():
+            label.set_rotation(90)
+        pad = pd.Timedelta(days=5)
+        ax.set_xlim(df["date"].min() - pad, df["date"].max() + pad)
+
+        if kind != "rank":
+            ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.30), ncol=4,
+                      frameon=False, handlelength=2.2, fontsize=5.5)
+        fig.subplots_adjust(left=0.09, right=0.98, top=0.90, bottom=0.33 if kind != "rank" else 0.24)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", pil_kwargs={"compress_level": 1})
+    return buf.getvalue()
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._=-]", "_", name)
+
+
+def chart_png(release: str, ticker: str, chart: str, window: str) -> bytes | None:
+    """
+    PNG for (ticker, chart, window) in this release, rendered on first use and
+    cached on disk; None when the ticker has no data for the chart.
+    """
+    path = pack_cache.CACHE_DIR / release / "charts" / _safe(ticker.upper()) / f"{chart}-{_safe(window)}.png"
+    try:
+        return path.read_bytes()
+    except OSError:
+        pass
+    df = apply_window(series(chart, ticker), window)
+    if df.empty:
+        return None
+    png = _render(chart, ticker.upper(), df)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)      # atomic: parallel builds of the same chart never see a partial file
+    except OSError:                # the cache is best-effort
+        pass
+    return png
@@ -0,0 +1,100 @@
+# utils/theme.py
+#
+# Page stylesheets injected once per browser session, plus the shared footer.
+#
+# A st.markdown("<style>...") block has to be re-sent on every rerun
+# (Streamlit removes any element a run doesn't emit), so several KB of CSS
+# rode along with every widget interaction.  apply_theme() instead adds each
+# sheet (assets/css/<name>.css) to the parent document as
+# <style id="mm-css-<name>-<version>"> from a zero-height component and
+# remembers in session_state what the current page asked for:
+#   - rerun on the same page  -> nothing is sent
+#   - switching pages         -> that page's sheets are (re)sent once; sheets
+#                                already in the document are just re-enabled,
+#                                everything else is disabled so page-specific
+#                                rules don't leak across pages
+# The version is a content hash, so editing a .css file replaces the old
+# sheet on the next page switch / new session.
+
+import hashlib
+import json
+from functools import lru_cache
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from utils.static_assets import css
+
+_SESSION_KEY = "_mm_theme"
+
+DISCLAIMER_HTML = (
+    "© 2026 Markmentum Research LLC. <b>Disclaimer</b>: This content is for informational purposes only. "
+    "Nothing herein constitutes an offer to sell, a solicitation of an offer to buy, or a recommendation regarding any security, "
+    "investment vehicle, or strategy. It does not represent legal, tax, accounting, or investment advice by Markmentum Research LLC "
+    "or its employees. The information is provided without regard to individual objectives or risk parameters and is general, "
+    "non-tailored, and non-specific. Sources are believed to be reliable, but accuracy and completeness are not guaranteed. "
+    "Markmentum Research LLC is not responsible for errors, omissions, or losses arising from use of this material. "
+    "Investments involve risk, and financial markets are subject to fluctuation. Consult your financial professional before "
+    "making investment decisions."
+)
+
+# Styles go at the end of <body>, i.e. after Streamlit's own <head> styles,
+# which is the same cascade position the old in-page <style> blocks had.
+_INJECT_JS = """
+<script>
+(function () {
+  const doc = window.parent.document;
+  const sheets = %s;
+  const keep = new Set(sheets.map(s => s[1]));
+  doc.querySelectorAll("style[data-mm-sheet]").forEach(el => {
+    if (!keep.has(el.id)) el.disabled = true;
+  });
+  for (const [name, id, text] of sheets) {
+    let el = doc.getElementById(id);
+    if (!el) {
+      doc.querySelectorAll('style[data-mm-sheet="' + name + '"]').forEach(old => old.remove());
+      el = doc.createElement("style");
+      el.id = id;
+      el.dataset.mmSheet = name;
+      el.textContent = text;
+      doc.body.appendChild(el);
+    }
+    el.disabled = false;
+  }
+})();
+</script>
+"""
+
+
+@lru_cache(maxsize=64)
+def _version(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:10]
+
+
+def apply_theme(*names: str) -> None:
+    """
+    Make assets/css/<name>.css (in order) the active page stylesheets.
+    Call once near the top of every page, with no names for pages without
+    their own CSS, so sheets from the previous page get switched off.
+    """
+    sheets = []
+    for name in names:
+        text = css(name)
+        sheets.append([name, f"mm-css-{name}-{_version(text)}", text])
+
+    page_key = tuple(s[1] for s in sheets)
+    if st.session_state.get(_SESSION_KEY) == page_key:
+        return  # already active in this browser session
+
+    payload = json.dumps(sheets).replace("</", "<\\/")   # keep it inside the <script>
+    components.html(_INJECT_JS % payload, height=0, width=0)
+    st.session_state[_SESSION_KEY] = page_key
+
+
+def render_footer() -> None:
+    """Rule + disclaimer shown at the bottom of every page."""
+    st.markdown("---")
+    st.markdown(
+        f'<div style="font-size: 12px; color: gray;">{DISCLAIMER_HTML}</div>',
+        unsafe_allow_html=True,
+    )
@@ -0,0 +1,156 @@
+# utils/universe.py
+#
+# Search / sort / paging engine for the Universe page (pages/10) over
+# ticker_data.csv (one row per instrument: Category, Date, Close, Day /
+# Week / Month / Quarter % change).
+#
+# The page used to copy the whole frame on every keystroke, run
+# str.lower().str.contains over Ticker and Name, and ship every matching
+# row to st.dataframe.  Everything a query needs is now built once per data
+# release:
+#   - a lower-cased "ticker\nname" search key per row, so a search is one
+#     vectorised substring test (and a longer query that contains the
+#     previous one only re-tests the previous hits);
+#   - per column, ascending / descending row orders (NaN / blank last,
+#     ties by Category then Ticker, the page's default order).
+# A query walks the chosen order with the hit mask and returns one page of
+# rows plus the match count, so the payload is a page whatever the size of
+# the universe.
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR  = Path(__file__).resolve().parent.parent
+DATA_DIR = APP_DIR / "data"
+
+TICKER_DATA = DATA_DIR / "ticker_data.csv"
+
+REQUIRED = [
+    "Ticker", "Ticker_name", "Category", "Date", "Close",
+    "day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change",
+]
+# source column -> column shown on the page, in display order
+COLUMNS = {
+    "Ticker":             "Ticker",
+    "Ticker_name":        "Name",
+    "Category":           "Category",
+    "Date":               "Date",
+    "Close":              "Close",
+    "day_pct_change":     "Day %",
+    "week_pct_change":    "Week %",
+    "month_pct_change":   "Month %",
+    "quarter_pct_change": "Quarter %",
+}
+NUMERIC = ["Date", "Close", "Day %", "Week %", "Month %", "Quarter %"]
+
+_QUERY_CACHE = 64   # recent searches kept per release (incremental refinement)
+
+
+class Universe:
+    """Search and sort indexes over one ticker_data frame; page() returns one page of a query."""
+
+    def __init__(self, df: pd.DataFrame):
+        missing = [c for c in REQUIRED if c not in df.columns]
+        self.missing = missing
+        if missing:
+            df = pd.DataFrame(columns=REQUIRED)
+        df = df.copy()
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+        for c in ["Close", "day_pct_change", "week_pct_change", "month_pct_change", "quarter_pct_change"]:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+        df = df.rename(columns=COLUMNS)[list(COLUMNS.values())]
+
+        # default (stable) ordering: Category, then Ticker
+        self.df = df.sort_values(["Category", "Ticker"], kind="mergesort").reset_index(drop=True)
+        self.n = len(self.df)
+        self.updated = self.df["Date"].max().date() if self.df["Date"].notna().any() else None
+
+        ticker = self.df["Ticker"].fillna("").astype(str).str.lower()
+        name = self.df["Name"].fillna("").astype(str).str.lower()
+        self._keys = (ticker + "\n" + name).to_numpy(dtype=str)
+
+        # sort orders per column; row position is the default order, so it breaks ties
+        pos = np.arange(self.n)
+        self._orders: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for c in self.df.columns:
+            if c in NUMERIC:
+                col = self.df[c]
+                blank = col.isna().to_numpy()
+                v = col.to_numpy(dtype="datetime64[ns]").view("int64") if c == "Date" else col.to_numpy(dtype=float)
+                v = np.where(blank, 0, v)
+                rank_asc, rank_desc = v, -v
+            else:
+                s = self.df[c].fillna("").astype(str)
+                rank = pd.factorize(s, sort=True)[0]
+                blank = (s == "").to_numpy()
+                rank_asc, rank_desc = rank, -rank
+            self._orders[c] = (np.lexsort((pos, rank_asc, blank)), np.lexsort((pos, rank_desc, blank)))
+
+        self._hits: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Search
+    # -------------------------
+    def mask(self, query: str) -> np.ndarray:
+        """Rows whose ticker or name contains `query` (case-insensitive); all rows for a blank query."""
+        q = query.strip().lower()
+        if not q:
+            return np.ones(self.n, dtype=bool)
+        with self._lock:
+            hit = self._hits.get(q)
+            if hit is not None:
+                self._hits.move_to_end(q)
+                return hit
+            # a cached query contained in this one already narrows the rows to test
+            base = max((k for k in self._hits if k in q), key=len, default=None)
+            base_hit = self._hits[base] if base is not None else None
+        rows = np.flatnonzero(base_hit) if base_hit is not None else np.arange(self.n)
+        hit = np.zeros(self.n, dtype=bool)
+        hit[rows[np.char.find(self._keys[rows], q) >= 0]] = True
+        with self._lock:
+            self._hits[q] = hit
+            while len(self._hits) > _QUERY_CACHE:
+                self._hits.popitem(last=False)
+        return hit
+
+    # -------------------------
+    # Query
+    # -------------------------
+    def rows(self, query: str = "", sort_by: str | None = None, descending: bool = False) -> np.ndarray:
+        """Row ids matching `query`, in sort order (default order if sort_by is None)."""
+        m = self.mask(query)
+        if sort_by in self._orders:
+            order = self._orders[sort_by][1 if descending else 0]
+            return order[m[order]]
+        return np.flatnonzero(m)
+
+    def page(self, query: str = "", sort_by: str | None = None, descending: bool = False,
+             page: int = 0, size: int = 50) -> tuple[pd.DataFrame, int]:
+        """(rows of page `page` (0-based) of the query; total match count)."""
+        idx = self.rows(query, sort_by, descending)
+        return self.df.iloc[idx[page * size:(page + 1) * size]], len(idx)
+
+    def csv(self, query: str = "", sort_by: str | None = None, descending: bool = False) -> bytes:
+        """Every row of the query as CSV (for the download button; built on click)."""
+        return self.df.iloc[self.rows(query, sort_by, descending)].to_csv(index=False).encode("utf-8")
+
+
+# -------------------------
+# One engine per data release
+# -------------------------
+@lru_cache(maxsize=2)
+def _universe(path: str, mtime_ns: int) -> Universe:
+    return Universe(pd.read_csv(path))
+
+
+def universe() -> Universe | None:
+    """The engine for the current ticker_data.csv (rebuilt when the file changes); None if missing."""
+    if not TICKER_DATA.exists():
+        return None
+    return _universe(str(TICKER_DATA), TICKER_DATA.stat().st_mtime_ns)
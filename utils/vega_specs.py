@@ -0,0 +1,72 @@
+# utils/vega_specs.py
+#
+# Altair charts as ready-to-send Vega-Lite specs.
+#
+# st.altair_chart() converts the chart on every rerun: Altair builds and
+# validates the full spec, and Streamlit serialises each DataFrame the chart
+# uses to Arrow.  to_vega_lite() does that once, so a page can cache the
+# result (per selection and data release) and hand it to
+# st.vega_lite_chart(), which passes Arrow bytes straight through.
+#
+# Every dataset goes into spec["datasets"] under a name derived from its
+# content, and the chart refers to it by that name.  Two specs that differ
+# only in encoding or filters (e.g. the date within a history block) share
+# the dataset name and bytes, so the browser can keep the data it already
+# has.
+
+import hashlib
+import io
+import json
+import threading
+from contextlib import nullcontext
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+
+_lock = threading.Lock()    # Altair's theme / transformer switches are process-wide
+
+
+def _arrow_bytes(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _named_arrow(data, datasets: dict) -> dict:
+    """Altair data transformer: DataFrame -> {"name": ...}, keeping its Arrow bytes in `datasets`."""
+    blob = _arrow_bytes(data)
+    name = "data-" + hashlib.sha1(blob).hexdigest()[:16]
+    datasets[name] = blob
+    return {"name": name}
+
+
+alt.data_transformers.register("named_arrow", _named_arrow)
+
+
+def to_vega_lite(chart) -> dict:
+    """
+    Vega-Lite dict for an Altair chart with every dataset stored as Arrow
+    bytes under spec["datasets"] (for st.vega_lite_chart).  Rendered like
+    st.altair_chart: Altair's default theme (width/height defaults) is off.
+    """
+    datasets: dict[str, bytes] = {}
+    with _lock:
+        theme = alt.theme.enable("none") if alt.theme.active == "default" else nullcontext()
+        with theme, alt.data_transformers.enable("named_arrow", datasets=datasets):
+            spec = chart.to_dict()
+    spec["datasets"] = {**spec.get("datasets", {}), **datasets}
+    return spec
+
+
+def payload_size(spec: dict) -> dict:
+    """Bytes a spec sends: the JSON without datasets, and the Arrow datasets."""
+    data = spec.get("datasets", {})
+    rest = {k: v for k, v in spec.items() if k != "datasets"}
+    return {
+        "spec_bytes": len(json.dumps(rest, separators=(",", ":")).encode()),
+        "dataset_bytes": sum(len(b) for b in data.values()),
+        "datasets": len(data),
+    }